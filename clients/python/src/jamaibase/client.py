@@ -2,9 +2,21 @@ import platform
 import warnings
 from contextlib import contextmanager
 from datetime import datetime
-from os.path import basename, split
+from itertools import islice
+from os import remove, replace
+from os.path import basename, exists, getsize, split
 from time import perf_counter
-from typing import Any, AsyncGenerator, BinaryIO, Generator, Literal, Self, Type
+from typing import (
+    Any,
+    AsyncGenerator,
+    BinaryIO,
+    Callable,
+    Generator,
+    Iterable,
+    Literal,
+    Self,
+    Type,
+)
 from urllib.parse import quote
 from warnings import warn
 
@@ -32,6 +44,7 @@ from jamaibase.types import (
     ColumnDropRequest,
     ColumnRenameRequest,
     ColumnReorderRequest,
+    CombinedUsageResponse,
     ConversationCreateRequest,
     ConversationMetaResponse,
     ConversationThreadsResponse,
@@ -86,6 +99,7 @@ from jamaibase.types import (
     RerankingRequest,
     RerankingResponse,
     Role,
+    RowBulkAddResponse,
     RowUpdateRequest,
     SearchRequest,
     SecretCreate,
@@ -94,6 +108,9 @@ from jamaibase.types import (
     StripePaymentInfo,
     TableDataImportRequest,
     TableImportRequest,
+    TableImportUploadCompleteRequest,
+    TableImportUploadPart,
+    TableImportUploadResponse,
     TableMetaResponse,
     UsageResponse,
     UserCreate,
@@ -114,7 +131,9 @@ from jamaibase.utils.exceptions import (
     ServerBusyError,
     UnexpectedError,
 )
+from jamaibase.utils.http import RequestEvent, RetryTransport
 from jamaibase.utils.io import guess_mime, json_loads
+from jamaibase.utils.sse import SSEDecoder, StreamFormat, aiter_sse_lines
 from jamaibase.version import __version__
 
 USER_AGENT = f"SDK/{__version__} (Python/{platform.python_version()}; {platform.system()} {platform.release()}; {platform.machine()})"
@@ -134,6 +153,14 @@ class EnvConfig(BaseSettings):
     project_id: str = "default"
     timeout_sec: float = 60.0 * 5  # Default to 5 minutes
     file_upload_timeout_sec: float = 60.0 * 15  # Default to 15 minutes
+    # Connection pool, `None` means no limit
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry_sec: float | None = 5.0
+    http2: bool = False  # Requires `pip install jamaibase[http2]`
+    # Retries of connection errors, and of idempotent requests that are busy or rate limited
+    max_retries: int = 3
+    retry_backoff_sec: float = 0.5
 
     @property
     def token_plain(self):
@@ -158,6 +185,7 @@ class _ClientAsync:
         http_client: httpx.Client | httpx.AsyncClient,
         timeout: float | None,
         file_upload_timeout: float | None = None,
+        stream_format: StreamFormat = "model",
     ) -> None:
         """
         Base client.
@@ -169,6 +197,7 @@ class _ClientAsync:
             api_base (str): The base URL for the API.
             headers (dict | None): Additional headers to include in requests.
             http_client (httpx.Client | httpx.AsyncClient): The HTTPX client.
+            stream_format (str, optional): How streamed chunks are returned. Defaults to "model".
         """
         if api_base.endswith("/"):
             api_base = api_base[:-1]
@@ -190,6 +219,7 @@ class _ClientAsync:
         self.http_client = http_client
         self.timeout = timeout
         self.file_upload_timeout = file_upload_timeout
+        self.stream_format = stream_format
 
     async def close(self) -> None:
         """
@@ -564,7 +594,7 @@ class _ClientAsync:
         params: dict[str, Any] | BaseModel | None = None,
         timeout: float | None = None,
         **kwargs,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
         Make an asynchronous streaming POST request to the specified endpoint.
 
@@ -575,7 +605,7 @@ class _ClientAsync:
             **kwargs (Any): Keyword arguments for `httpx.stream`.
 
         Yields:
-            str: The response chunks.
+            bytes: The non-empty SSE lines of the response.
         """
         with self._log_call():
             async with self.http_client.stream(
@@ -588,12 +618,64 @@ class _ClientAsync:
                 **kwargs,
             ) as response:
                 response = await self._raise_exception(response)
-                async for chunk in response.aiter_lines():
-                    chunk = chunk.strip()
-                    if chunk == "" or chunk == "data: [DONE]":
-                        continue
+                # Split raw bytes instead of decoding every line with `aiter_lines`
+                async for chunk in aiter_sse_lines(response.aiter_bytes()):
                     yield chunk
 
+    async def _download(
+        self,
+        endpoint: str,
+        file_path: str,
+        *,
+        params: dict[str, Any] | BaseModel | None = None,
+        on_progress: Callable[[int, int | None], None] | None = None,
+        timeout: float | None = None,
+        **kwargs,
+    ) -> str:
+        """
+        Make an asynchronous streaming GET request and write the response body to a file.
+        The body is written to `{file_path}.part` and only renamed to `file_path` once complete.
+
+        Args:
+            endpoint (str): The API endpoint.
+            file_path (str): The output file path.
+            params (dict[str, Any] | None, optional): Query parameters. Defaults to None.
+            on_progress (Callable[[int, int | None], None] | None, optional): Called after every chunk
+                with the number of bytes written so far and the total size if known. Defaults to None.
+            timeout (float | None, optional): Timeout for the request. Defaults to None.
+            **kwargs (Any): Keyword arguments for `httpx.stream`.
+
+        Returns:
+            file_path (str): The output file path.
+        """
+        tmp_path = f"{file_path}.part"
+        try:
+            with self._log_call():
+                async with self.http_client.stream(
+                    "GET",
+                    f"{self.api_base}{endpoint}",
+                    headers=self.headers,
+                    params=self._filter_params(params),
+                    timeout=timeout or self.timeout,
+                    **kwargs,
+                ) as response:
+                    response = await self._raise_exception(response)
+                    total = response.headers.get("content-length", None)
+                    total = None if total is None else int(total)
+                    num_bytes = 0
+                    with open(tmp_path, "wb") as f:
+                        async for data in response.aiter_bytes(1024**2):
+                            f.write(data)
+                            num_bytes += len(data)
+                            if on_progress is not None:
+                                on_progress(num_bytes, total)
+        except BaseException:
+            if exists(tmp_path):
+                remove(tmp_path)
+            raise
+        replace(tmp_path, file_path)
+        return file_path
+
     async def _delete(
         self,
         endpoint: str,
@@ -657,15 +739,12 @@ class _ClientAsync:
             # Return empty async generator
             return self._empty_async_generator()
 
-        def _process(_chunk: str) -> BaseModel | str:
-            if stream_models is None:
-                return _chunk
-            for m in stream_models:
-                try:
-                    return m.model_validate_json(_chunk[5:])
-                except Exception:
-                    pass
-            raise RuntimeError(f"Unexpected SSE chunk: {chunk}")
+        decoder = None if stream_models is None else SSEDecoder(stream_models, self.stream_format)
+
+        def _process(_chunk: bytes) -> Any:
+            if decoder is None:
+                return _chunk.decode()
+            return decoder.decode(_chunk)
 
         # For streaming responses, return an asynchronous generator
         async def gen():
@@ -1103,6 +1182,7 @@ class _ModelsAsync(_ClientAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[ModelConfigRead]:
         return await self._get(
@@ -1113,6 +1193,7 @@ class _ModelsAsync(_ClientAsync):
                 order_by=order_by,
                 order_ascending=order_ascending,
                 organization_id=organization_id,
+                after=after,
             ),
             response_model=Page[ModelConfigRead],
             **kwargs,
@@ -1183,6 +1264,7 @@ class _ModelsAsync(_ClientAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[DeploymentRead]:
         return await self._get(
@@ -1192,6 +1274,7 @@ class _ModelsAsync(_ClientAsync):
                 limit=limit,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                after=after,
             ),
             response_model=Page[DeploymentRead],
             **kwargs,
@@ -1285,6 +1368,7 @@ class _OrganizationsAsync(_ClientAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[OrganizationRead]:
         return await self._get(
@@ -1294,6 +1378,7 @@ class _OrganizationsAsync(_ClientAsync):
                 limit=limit,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                after=after,
             ),
             response_model=Page[OrganizationRead],
             **kwargs,
@@ -1387,6 +1472,7 @@ class _OrganizationsAsync(_ClientAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[OrgMemberRead]:
         return await self._get(
@@ -1397,6 +1483,7 @@ class _OrganizationsAsync(_ClientAsync):
                 order_by=order_by,
                 order_ascending=order_ascending,
                 organization_id=organization_id,
+                after=after,
             ),
             response_model=Page[OrgMemberRead],
             **kwargs,
@@ -1714,6 +1801,7 @@ class _ProjectsAsync(_ClientAsync):
         order_by: str = "updated_at",
         order_ascending: bool = True,
         list_chat_agents: bool = False,
+        after: str | None = None,
         **kwargs,
     ) -> Page[ProjectRead]:
         return await self._get(
@@ -1726,6 +1814,7 @@ class _ProjectsAsync(_ClientAsync):
                 order_ascending=order_ascending,
                 organization_id=organization_id,
                 list_chat_agents=list_chat_agents,
+                after=after,
             ),
             response_model=Page[ProjectRead],
             **kwargs,
@@ -1909,6 +1998,7 @@ class _ProjectsAsync(_ClientAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[ProjectMemberRead]:
         return await self._get(
@@ -1919,6 +2009,7 @@ class _ProjectsAsync(_ClientAsync):
                 order_by=order_by,
                 order_ascending=order_ascending,
                 project_id=project_id,
+                after=after,
             ),
             response_model=Page[ProjectMemberRead],
             **kwargs,
@@ -2847,6 +2938,161 @@ class _GenTableClientAsync(_ClientAsync):
                 **kwargs,
             )
 
+    @staticmethod
+    def _iter_row_chunks(
+        rows: Any, chunk_size: int
+    ) -> Generator[list[dict[str, Any]], None, None]:
+        import pandas as pd
+
+        if isinstance(rows, pd.DataFrame):
+            for i in range(0, len(rows), chunk_size):
+                # Cast to object so that values are Python scalars instead of NumPy scalars
+                yield rows.iloc[i : i + chunk_size].astype(object).to_dict(orient="records")
+        elif hasattr(rows, "to_batches"):
+            # Arrow table
+            for batch in rows.to_batches(max_chunksize=chunk_size):
+                if batch.num_rows > 0:
+                    yield batch.to_pylist()
+        else:
+            rows = iter(rows)
+            while chunk := list(islice(rows, chunk_size)):
+                yield chunk
+
+    async def bulk_add_rows(
+        self,
+        table_type: str,
+        table_id: str,
+        rows: Iterable[dict[str, Any]] | Any,
+        *,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        max_retries: int = 8,
+        checkpoint_path: str = "",
+        concurrent: bool = True,
+        verbose: bool = False,
+        **kwargs,
+    ) -> RowBulkAddResponse:
+        """
+        Add a large number of rows to a table, in chunks of `chunk_size` rows.
+
+        Up to `concurrency` chunks are uploaded at a time. When the server is busy or rate limited,
+        all uploads pause for the server's `Retry-After` duration (or an exponential backoff)
+        before the chunk is retried.
+
+        Args:
+            table_type (str): The type of the table.
+            table_id (str): The ID of the table.
+            rows (Iterable[dict[str, Any]] | pd.DataFrame | pa.Table): The rows to add.
+                Can be a list or iterator of rows, a pandas DataFrame or an Arrow table.
+            chunk_size (int, optional): Number of rows per request (min 1, max 100). Defaults to 100.
+            concurrency (int, optional): Maximum number of requests in flight. Defaults to 4.
+            max_retries (int, optional): Maximum number of retries of a chunk when the server is busy
+                or rate limited. Defaults to 8.
+            checkpoint_path (str, optional): Path to a file that records completed chunks.
+                If the file exists, chunks recorded in it are skipped, so that an interrupted load
+                can be resumed by calling this method again with the same rows and `chunk_size`.
+                Defaults to "" (no checkpoint).
+            concurrent (bool, optional): Whether or not to concurrently generate the output rows and columns.
+                Defaults to True.
+            verbose (bool, optional): Log the progress and throughput after each chunk. Defaults to False.
+
+        Returns:
+            response (RowBulkAddResponse): The number of rows added and the throughput.
+        """
+        from asyncio import FIRST_COMPLETED, create_task, sleep, wait
+        from random import random
+
+        if not (1 <= chunk_size <= 100):
+            raise ValueError("`chunk_size` must be between 1 and 100.")
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be at least 1.")
+        done_chunks = set()
+        lines = []
+        if checkpoint_path and exists(checkpoint_path):
+            with open(checkpoint_path, "rb") as f:
+                lines = f.read().splitlines()
+        if lines:
+            header = orjson.loads(lines[0])
+            if header != {"table_id": table_id, "chunk_size": chunk_size}:
+                raise ValueError(
+                    f'Checkpoint "{checkpoint_path}" was created for {header}, '
+                    f"but received table_id={table_id} and chunk_size={chunk_size}."
+                )
+            done_chunks = {orjson.loads(line)["chunk"] for line in lines[1:]}
+        elif checkpoint_path:
+            # A new checkpoint, or an empty file (eg interrupted before the header was written)
+            with open(checkpoint_path, "wb") as f:
+                f.write(orjson.dumps({"table_id": table_id, "chunk_size": chunk_size}) + b"\n")
+
+        num_rows = 0
+        num_chunks = 0
+        num_skipped_chunks = 0
+        resume_at = 0.0
+        t0 = perf_counter()
+
+        async def _add(index: int, data: list[dict[str, Any]]) -> None:
+            nonlocal num_rows, num_chunks, resume_at
+            request = MultiRowAddRequest(
+                table_id=table_id, data=data, stream=False, concurrent=concurrent
+            )
+            for attempt in range(max_retries + 1):
+                if (delay := resume_at - perf_counter()) > 0:
+                    await sleep(delay)
+                try:
+                    # Always call the async method, the sync client overrides `add_table_rows`
+                    await _GenTableClientAsync.add_table_rows(self, table_type, request, **kwargs)
+                    break
+                except (ServerBusyError, RateLimitExceedError) as e:
+                    if attempt == max_retries:
+                        raise
+                    retry_after = getattr(e, "retry_after", None)
+                    if retry_after is None:
+                        retry_after = min(0.5 * 2**attempt, 30.0) * (0.5 + random())
+                    # Pause all uploads so that the server can recover
+                    resume_at = max(resume_at, perf_counter() + retry_after)
+                    logger.warning(
+                        f"{self.__class__.__name__}: Chunk {index} is retried in "
+                        f"{retry_after:.1f} seconds: {repr(e)}"
+                    )
+            num_rows += len(data)
+            num_chunks += 1
+            if checkpoint_path:
+                with open(checkpoint_path, "ab") as f:
+                    f.write(orjson.dumps({"chunk": index, "rows": len(data)}) + b"\n")
+            if verbose:
+                elapsed = perf_counter() - t0
+                logger.info(
+                    f"{self.__class__.__name__}: Added {num_rows:,d} rows to table "
+                    f'"{table_id}" ({num_rows / elapsed:,.1f} rows/s)'
+                )
+
+        pending = set()
+        try:
+            for index, data in enumerate(self._iter_row_chunks(rows, chunk_size)):
+                if index in done_chunks:
+                    num_skipped_chunks += 1
+                    continue
+                if len(pending) >= concurrency:
+                    done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                pending.add(create_task(_add(index, data)))
+            if pending:
+                done, pending = await wait(pending)
+                for task in done:
+                    task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        elapsed = perf_counter() - t0
+        return RowBulkAddResponse(
+            num_rows=num_rows,
+            num_chunks=num_chunks,
+            num_skipped_chunks=num_skipped_chunks,
+            elapsed_sec=elapsed,
+            rows_per_sec=num_rows / elapsed if elapsed > 0 else 0.0,
+        )
+
     async def list_table_rows(
         self,
         table_type: str,
@@ -2919,6 +3165,102 @@ class _GenTableClientAsync(_ClientAsync):
             **kwargs,
         )
 
+    async def iter_table_rows(
+        self,
+        table_type: str,
+        table_id: str,
+        *,
+        page_size: int = 100,
+        prefetch: int = 4,
+        order_by: str = "ID",
+        order_ascending: bool = True,
+        columns: list[str] | None = None,
+        where: str = "",
+        search_query: str = "",
+        search_columns: list[str] | None = None,
+        float_decimals: int = 0,
+        vec_decimals: int = 0,
+        on_page: Callable[[Page[dict[str, Any]], float], None] | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Iterate over all rows in a table, page by page.
+
+        The first page gives the total row count, after which up to `prefetch` following pages
+        are requested concurrently while the consumer processes the current page.
+        Rows added after the first page is fetched are not included.
+
+        Args:
+            table_type (str): The type of the table.
+            table_id (str): The ID of the table.
+            page_size (int, optional): Number of rows per page (min 1, max 100). Defaults to 100.
+            prefetch (int, optional): Maximum number of pages requested ahead of the consumer.
+                Bounds memory usage to `prefetch` pages. Defaults to 4.
+            order_by (str, optional): Column name to order by. Defaults to "ID".
+            order_ascending (bool, optional): Whether to sort by ascending order. Defaults to True.
+            columns (list[str] | None, optional): List of column names to include in the response.
+                Defaults to None (all columns).
+            where (str, optional): SQL where clause. Can be nested ie `x = '1' AND ("y (1)" = 2 OR z = '3')`.
+                It will be combined other filters using `AND`. Defaults to "" (no filter).
+            search_query (str, optional): A string to search for within the rows as a filter.
+                Defaults to "" (no filter).
+            search_columns (list[str] | None, optional): A list of column names to search for `search_query`.
+                Defaults to None (search all columns).
+            float_decimals (int, optional): Number of decimals for float values.
+                Defaults to 0 (no rounding).
+            vec_decimals (int, optional): Number of decimals for vectors.
+                If its negative, exclude vector columns. Defaults to 0 (no rounding).
+            on_page (Callable[[Page[dict[str, Any]], float], None] | None, optional):
+                Called with each page and its request latency in seconds, in page order.
+                Defaults to None.
+
+        Yields:
+            row (dict[str, Any]): The row data.
+        """
+        from asyncio import create_task
+
+        if prefetch < 1:
+            raise ValueError("`prefetch` must be at least 1.")
+        params = dict(
+            limit=page_size,
+            order_by=order_by,
+            order_ascending=order_ascending,
+            columns=columns,
+            where=where,
+            search_query=search_query,
+            search_columns=search_columns,
+            float_decimals=float_decimals,
+            vec_decimals=vec_decimals,
+            **kwargs,
+        )
+
+        async def _fetch(offset: int) -> tuple[Page[dict[str, Any]], float]:
+            t0 = perf_counter()
+            # Always call the async method, the sync client overrides `list_table_rows`
+            page = await _GenTableClientAsync.list_table_rows(
+                self, table_type, table_id, offset=offset, **params
+            )
+            return page, perf_counter() - t0
+
+        page, latency = await _fetch(0)
+        offsets = iter(range(page_size, page.total, page_size))
+        # Bounded queue of in-flight page requests, consumed in order
+        pending = [create_task(_fetch(o)) for _, o in zip(range(prefetch), offsets, strict=False)]
+        try:
+            while True:
+                if on_page is not None:
+                    on_page(page, latency)
+                for row in page.items:
+                    yield row
+                if not pending:
+                    break
+                page, latency = await pending.pop(0)
+                if (offset := next(offsets, None)) is not None:
+                    pending.append(create_task(_fetch(offset)))
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def get_table_row(
         self,
         table_type: str,
@@ -3427,6 +3769,131 @@ class _GenTableClientAsync(_ClientAsync):
         )
         return response.content
 
+    async def import_table_chunked(
+        self,
+        table_type: str,
+        request: TableImportRequest,
+        *,
+        upload_id: str = "",
+        concurrency: int = 4,
+        on_progress: Callable[[int, int], None] | None = None,
+        **kwargs,
+    ) -> TableMetaResponse | OkResponse:
+        """
+        Imports a table (data and schema) from a parquet file, uploading the file in parts.
+        Unlike `import_table`, the file is never read into memory as a whole,
+        and an interrupted upload can be resumed by passing its `upload_id`.
+        Parts that were already received by the server are then skipped.
+
+        Args:
+            table_type (str): Table type.
+            request (TableImportRequest): Table import request.
+            upload_id (str, optional): ID of an interrupted upload to resume.
+                Defaults to "" (start a new upload).
+            concurrency (int, optional): Maximum number of parts uploaded concurrently. Defaults to 4.
+            on_progress (Callable[[int, int], None] | None, optional): Called after every part
+                with the number of bytes uploaded so far and the file size. Defaults to None.
+
+        Returns:
+            response (TableMetaResponse | OkResponse): The table metadata response if blocking is True,
+                otherwise OkResponse.
+        """
+        from asyncio import Semaphore, gather
+
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be at least 1.")
+        file_size = getsize(request.file_path)
+        if file_size == 0:
+            raise ValueError(f'File "{request.file_path}" is empty.')
+        endpoint = f"/v2/gen_tables/{table_type}/import/uploads"
+        if upload_id:
+            upload = await self._get(
+                f"{endpoint}/{upload_id}", response_model=TableImportUploadResponse, **kwargs
+            )
+        else:
+            upload = await self._post(
+                endpoint, body=None, response_model=TableImportUploadResponse, **kwargs
+            )
+            upload_id = upload.upload_id
+        part_size = upload.part_size
+        num_parts = -(-file_size // part_size)
+        # Parts with an unexpected size (ie from a different file) are uploaded again
+        sizes = {
+            i: min(part_size, file_size - (i - 1) * part_size) for i in range(1, num_parts + 1)
+        }
+        done = {p.part_number for p in upload.parts if sizes.get(p.part_number, None) == p.size}
+        num_bytes = sum(sizes[i] for i in done)
+        semaphore = Semaphore(concurrency)
+
+        async def _upload(part_number: int) -> None:
+            nonlocal num_bytes
+            async with semaphore:
+                with open(request.file_path, "rb") as f:
+                    f.seek((part_number - 1) * part_size)
+                    content = f.read(part_size)
+                await self._put(
+                    f"{endpoint}/{upload_id}/parts/{part_number}",
+                    content=content,
+                    response_model=TableImportUploadPart,
+                    timeout=self.file_upload_timeout,
+                    **kwargs,
+                )
+            num_bytes += len(content)
+            if on_progress is not None:
+                on_progress(num_bytes, file_size)
+
+        results = await gather(
+            *[_upload(i) for i in range(1, num_parts + 1) if i not in done],
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) > 0:
+            logger.warning(
+                f'Upload "{upload_id}" is incomplete ({num_bytes:,d} of {file_size:,d} bytes). '
+                f'Pass `upload_id="{upload_id}"` to resume it.'
+            )
+            raise errors[0]
+        return await self._post(
+            f"{endpoint}/{upload_id}/complete",
+            body=TableImportUploadCompleteRequest(
+                table_id_dst=request.table_id_dst, blocking=request.blocking
+            ),
+            response_model=TableMetaResponse if request.blocking else OkResponse,
+            timeout=self.file_upload_timeout,
+            **kwargs,
+        )
+
+    async def export_table_to_file(
+        self,
+        table_type: str,
+        table_id: str,
+        file_path: str,
+        *,
+        on_progress: Callable[[int, int | None], None] | None = None,
+        **kwargs,
+    ) -> str:
+        """
+        Exports a table (data and schema) as a parquet file, streaming it to disk.
+        Unlike `export_table`, the file is never held in memory as a whole.
+
+        Args:
+            table_type (str): Table type.
+            table_id (str): ID or name of the table to be exported.
+            file_path (str): The output parquet file path.
+            on_progress (Callable[[int, int | None], None] | None, optional): Called after every chunk
+                with the number of bytes written so far and the file size if known. Defaults to None.
+
+        Returns:
+            file_path (str): The output parquet file path.
+        """
+        return await self._download(
+            f"/v2/gen_tables/{table_type}/export",
+            file_path,
+            params=dict(table_id=table_id),
+            on_progress=on_progress,
+            **kwargs,
+        )
+
 
 class _MeterClientAsync(_ClientAsync):
     """Meter methods."""
@@ -3531,6 +3998,33 @@ class _MeterClientAsync(_ClientAsync):
             response_model=UsageResponse,
         )
 
+    async def get_combined_metrics(
+        self,
+        from_: datetime,
+        window_size: str,
+        categories: list[str] | None = None,
+        org_ids: list[str] | None = None,
+        proj_ids: list[str] | None = None,
+        to: datetime | None = None,
+        group_by: list[str] | None = None,
+        data_source: Literal["clickhouse", "victoriametrics"] = "clickhouse",
+    ) -> CombinedUsageResponse:
+        params = {
+            "from": from_.isoformat(),  # Use string key to avoid keyword conflict
+            "categories": categories,
+            "orgIds": org_ids,
+            "windowSize": window_size,
+            "projIds": proj_ids,
+            "to": to.isoformat() if to else None,
+            "groupBy": group_by,
+            "dataSource": data_source,
+        }
+        return await self._get(
+            "/v2/meters/combined",
+            params=params,
+            response_model=CombinedUsageResponse,
+        )
+
 
 class _TaskClientAsync(_ClientAsync):
     """Task methods."""
@@ -3603,15 +4097,15 @@ class _ConversationClientAsync(_ClientAsync):
             return self._empty_async_generator()
 
         def _process(
-            _chunk: str,
+            _chunk: bytes,
         ) -> ConversationMetaResponse | CellCompletionResponse | CellReferencesResponse | None:
             nonlocal current_event
-            if _chunk.startswith("event:"):
-                current_event = _chunk[6:].strip()
+            if _chunk.startswith(b"event:"):
+                current_event = _chunk[6:].strip().decode()
                 return None
 
-            if _chunk.startswith("data:"):
-                data_obj = json_loads(_chunk[5:])
+            if _chunk.startswith(b"data:"):
+                data_obj = orjson.loads(_chunk[5:])
 
                 if current_event == "metadata":
                     # This is the special metadata event
@@ -3619,7 +4113,12 @@ class _ConversationClientAsync(_ClientAsync):
                     return ConversationMetaResponse.model_validate(data_obj)
                 else:
                     # This is a standard gen_table chunk
-                    if data_obj.get("object") == "gen_table.completion.chunk":
+                    if self.stream_format == "dict" and data_obj.get("object") in (
+                        "gen_table.completion.chunk",
+                        "gen_table.references",
+                    ):
+                        return data_obj
+                    elif data_obj.get("object") == "gen_table.completion.chunk":
                         return CellCompletionResponse.model_validate(data_obj)
                     elif data_obj.get("object") == "gen_table.references":
                         return CellReferencesResponse.model_validate(data_obj)
@@ -3836,6 +4335,9 @@ class _ConversationClientAsync(_ClientAsync):
         self,
         conversation_id: str,
         column_ids: list[str] | None = None,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
         **kwargs,
     ) -> ConversationThreadsResponse:
         """
@@ -3844,6 +4346,9 @@ class _ConversationClientAsync(_ClientAsync):
         Args:
             conversation_id (str): Conversation ID.
             column_ids (list[str] | None): Columns to fetch as conversation threads.
+            limit (int | None, optional): Number of latest turns to return.
+                Defaults to None (return all turns).
+            offset (int, optional): Number of latest turns to skip. Defaults to 0.
 
         Returns:
             response (ConversationThreadsResponse): The conversation threads.
@@ -3853,6 +4358,8 @@ class _ConversationClientAsync(_ClientAsync):
             params=dict(
                 conversation_id=conversation_id,
                 column_ids=column_ids,
+                limit=limit,
+                offset=offset,
             ),
             response_model=ConversationThreadsResponse,
             **kwargs,
@@ -4100,6 +4607,7 @@ class _NotificationsAsync(_ClientAsync):
         order_by: str = "created_at",
         order_ascending: bool = False,
         unread_only: bool = False,
+        after: str | None = None,
         **kwargs,
     ) -> Page[NotificationRead]:
         return await self._get(
@@ -4110,6 +4618,7 @@ class _NotificationsAsync(_ClientAsync):
                 order_by=order_by,
                 order_ascending=order_ascending,
                 unread_only=unread_only,
+                after=after,
             ),
             response_model=Page[NotificationRead],
             **kwargs,
@@ -4172,6 +4681,14 @@ class JamAIAsync(_ClientAsync):
         file_upload_timeout: float | None = ENV_CONFIG.file_upload_timeout_sec,
         *,
         user_id: str = "",
+        stream_format: StreamFormat = "model",
+        max_connections: int | None = ENV_CONFIG.max_connections,
+        max_keepalive_connections: int | None = ENV_CONFIG.max_keepalive_connections,
+        keepalive_expiry: float | None = ENV_CONFIG.keepalive_expiry_sec,
+        http2: bool = ENV_CONFIG.http2,
+        max_retries: int = ENV_CONFIG.max_retries,
+        retry_backoff: float = ENV_CONFIG.retry_backoff_sec,
+        on_request: Callable[[RequestEvent], None] | None = None,
     ) -> None:
         """
         Initialize the JamAI async client.
@@ -4196,6 +4713,34 @@ class JamAIAsync(_ClientAsync):
                 `JAMAI_FILE_UPLOAD_TIMEOUT_SEC` var in environment or `.env` file.
             user_id (str, optional): User ID. For development purposes.
                 Defaults to "".
+            stream_format (str, optional): How chunks of streaming responses are returned.
+                "model" validates each chunk into its pydantic model;
+                "dict" returns the parsed JSON dicts without validation, which is the fastest;
+                "lazy" returns proxies that are only validated when an attribute is first accessed.
+                Defaults to "model".
+            max_connections (int | None, optional): Maximum number of concurrent connections.
+                Requests beyond this limit wait for a free connection. `None` means no limit.
+                Defaults to 100, but can be overridden via
+                `JAMAI_MAX_CONNECTIONS` var in environment or `.env` file.
+            max_keepalive_connections (int | None, optional): Maximum number of idle connections kept alive.
+                Defaults to 20, but can be overridden via
+                `JAMAI_MAX_KEEPALIVE_CONNECTIONS` var in environment or `.env` file.
+            keepalive_expiry (float | None, optional): Seconds before an idle connection is closed.
+                Defaults to 5 seconds, but can be overridden via
+                `JAMAI_KEEPALIVE_EXPIRY_SEC` var in environment or `.env` file.
+            http2 (bool, optional): Whether to use HTTP/2 if the server supports it. Requires `jamaibase[http2]`.
+                Defaults to False, but can be overridden via
+                `JAMAI_HTTP2` var in environment or `.env` file.
+            max_retries (int, optional): Maximum number of retries of connection errors, and of
+                idempotent requests that fail with status 429, 502, 503 or 504.
+                Defaults to 3, but can be overridden via
+                `JAMAI_MAX_RETRIES` var in environment or `.env` file.
+            retry_backoff (float, optional): Initial backoff in seconds between retries, doubled after
+                each retry. `Retry-After` headers take precedence.
+                Defaults to 0.5, but can be overridden via
+                `JAMAI_RETRY_BACKOFF_SEC` var in environment or `.env` file.
+            on_request (Callable[[RequestEvent], None] | None, optional): Called after each request
+                attempt with its latency, status and connection pool usage. Defaults to None.
         """
         if not isinstance(project_id, str):
             raise TypeError("`project_id` must be a string.")
@@ -4211,9 +4756,27 @@ class JamAIAsync(_ClientAsync):
             raise TypeError("`file_upload_timeout` must be a float, int or None.")
         if not isinstance(user_id, str):
             raise TypeError("`user_id` must be a string.")
+        if stream_format not in ("model", "dict", "lazy"):
+            raise ValueError('`stream_format` must be one of ["model", "dict", "lazy"].')
+        if not (isinstance(max_retries, int) and max_retries >= 0):
+            raise ValueError("`max_retries` must be a non-negative integer.")
         http_client = httpx.AsyncClient(
             timeout=timeout,
-            transport=httpx.AsyncHTTPTransport(retries=3),
+            transport=RetryTransport(
+                httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive_connections,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                    http2=http2,
+                    retries=max_retries,
+                ),
+                max_retries=max_retries,
+                backoff_sec=retry_backoff,
+                max_connections=max_connections,
+                on_request=on_request,
+            ),
         )
         kwargs = dict(
             user_id=user_id,
@@ -4224,6 +4787,7 @@ class JamAIAsync(_ClientAsync):
             http_client=http_client,
             timeout=timeout,
             file_upload_timeout=file_upload_timeout,
+            stream_format=stream_format,
         )
         super().__init__(**kwargs)
         self.auth = _AuthAsync(**kwargs)
@@ -4683,6 +5247,7 @@ class _Models(_ModelsAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[ModelConfigRead]:
         return LOOP.run(
@@ -4692,6 +5257,7 @@ class _Models(_ModelsAsync):
                 limit=limit,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                after=after,
                 **kwargs,
             )
         )
@@ -4734,6 +5300,7 @@ class _Models(_ModelsAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[DeploymentRead]:
         return LOOP.run(
@@ -4742,6 +5309,7 @@ class _Models(_ModelsAsync):
                 limit=limit,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                after=after,
                 **kwargs,
             )
         )
@@ -4795,6 +5363,7 @@ class _Organizations(_OrganizationsAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[OrganizationRead]:
         return LOOP.run(
@@ -4803,6 +5372,7 @@ class _Organizations(_OrganizationsAsync):
                 limit=limit,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                after=after,
                 **kwargs,
             )
         )
@@ -4872,6 +5442,7 @@ class _Organizations(_OrganizationsAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[OrgMemberRead]:
         return LOOP.run(
@@ -4881,6 +5452,7 @@ class _Organizations(_OrganizationsAsync):
                 limit=limit,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                after=after,
                 **kwargs,
             )
         )
@@ -5164,6 +5736,7 @@ class _Projects(_ProjectsAsync):
         order_by: str = "updated_at",
         order_ascending: bool = True,
         list_chat_agents: bool = False,
+        after: str | None = None,
         **kwargs,
     ) -> Page[ProjectRead]:
         return LOOP.run(
@@ -5175,6 +5748,7 @@ class _Projects(_ProjectsAsync):
                 order_by=order_by,
                 order_ascending=order_ascending,
                 list_chat_agents=list_chat_agents,
+                after=after,
                 **kwargs,
             )
         )
@@ -5240,6 +5814,7 @@ class _Projects(_ProjectsAsync):
         limit: int = 100,
         order_by: str = "updated_at",
         order_ascending: bool = True,
+        after: str | None = None,
         **kwargs,
     ) -> Page[ProjectMemberRead]:
         return LOOP.run(
@@ -5249,6 +5824,7 @@ class _Projects(_ProjectsAsync):
                 limit=limit,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                after=after,
                 **kwargs,
             )
         )
@@ -5956,6 +6532,62 @@ class _GenTableClient(_GenTableClientAsync):
         agen = LOOP.run(super().add_table_rows(table_type, request, **kwargs))
         return self._return_iterator(agen, request.stream)
 
+    def bulk_add_rows(
+        self,
+        table_type: str,
+        table_id: str,
+        rows: Iterable[dict[str, Any]] | Any,
+        *,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        max_retries: int = 8,
+        checkpoint_path: str = "",
+        concurrent: bool = True,
+        verbose: bool = False,
+        **kwargs,
+    ) -> RowBulkAddResponse:
+        """
+        Add a large number of rows to a table, in chunks of `chunk_size` rows.
+
+        Up to `concurrency` chunks are uploaded at a time. When the server is busy or rate limited,
+        all uploads pause for the server's `Retry-After` duration (or an exponential backoff)
+        before the chunk is retried.
+
+        Args:
+            table_type (str): The type of the table.
+            table_id (str): The ID of the table.
+            rows (Iterable[dict[str, Any]] | pd.DataFrame | pa.Table): The rows to add.
+                Can be a list or iterator of rows, a pandas DataFrame or an Arrow table.
+            chunk_size (int, optional): Number of rows per request (min 1, max 100). Defaults to 100.
+            concurrency (int, optional): Maximum number of requests in flight. Defaults to 4.
+            max_retries (int, optional): Maximum number of retries of a chunk when the server is busy
+                or rate limited. Defaults to 8.
+            checkpoint_path (str, optional): Path to a file that records completed chunks.
+                If the file exists, chunks recorded in it are skipped, so that an interrupted load
+                can be resumed by calling this method again with the same rows and `chunk_size`.
+                Defaults to "" (no checkpoint).
+            concurrent (bool, optional): Whether or not to concurrently generate the output rows and columns.
+                Defaults to True.
+            verbose (bool, optional): Log the progress and throughput after each chunk. Defaults to False.
+
+        Returns:
+            response (RowBulkAddResponse): The number of rows added and the throughput.
+        """
+        return LOOP.run(
+            super().bulk_add_rows(
+                table_type,
+                table_id,
+                rows,
+                chunk_size=chunk_size,
+                concurrency=concurrency,
+                max_retries=max_retries,
+                checkpoint_path=checkpoint_path,
+                concurrent=concurrent,
+                verbose=verbose,
+                **kwargs,
+            )
+        )
+
     def list_table_rows(
         self,
         table_type: str,
@@ -6014,6 +6646,84 @@ class _GenTableClient(_GenTableClientAsync):
             )
         )
 
+    def iter_table_rows(
+        self,
+        table_type: str,
+        table_id: str,
+        *,
+        page_size: int = 100,
+        prefetch: int = 4,
+        order_by: str = "ID",
+        order_ascending: bool = True,
+        columns: list[str] | None = None,
+        where: str = "",
+        search_query: str = "",
+        search_columns: list[str] | None = None,
+        float_decimals: int = 0,
+        vec_decimals: int = 0,
+        on_page: Callable[[Page[dict[str, Any]], float], None] | None = None,
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Iterate over all rows in a table, page by page.
+
+        The first page gives the total row count, after which up to `prefetch` following pages
+        are requested concurrently while the consumer processes the current page.
+        Rows added after the first page is fetched are not included.
+
+        Args:
+            table_type (str): The type of the table.
+            table_id (str): The ID of the table.
+            page_size (int, optional): Number of rows per page (min 1, max 100). Defaults to 100.
+            prefetch (int, optional): Maximum number of pages requested ahead of the consumer.
+                Bounds memory usage to `prefetch` pages. Defaults to 4.
+            order_by (str, optional): Column name to order by. Defaults to "ID".
+            order_ascending (bool, optional): Whether to sort by ascending order. Defaults to True.
+            columns (list[str] | None, optional): List of column names to include in the response.
+                Defaults to None (all columns).
+            where (str, optional): SQL where clause. Can be nested ie `x = '1' AND ("y (1)" = 2 OR z = '3')`.
+                It will be combined other filters using `AND`. Defaults to "" (no filter).
+            search_query (str, optional): A string to search for within the rows as a filter.
+                Defaults to "" (no filter).
+            search_columns (list[str] | None, optional): A list of column names to search for `search_query`.
+                Defaults to None (search all columns).
+            float_decimals (int, optional): Number of decimals for float values.
+                Defaults to 0 (no rounding).
+            vec_decimals (int, optional): Number of decimals for vectors.
+                If its negative, exclude vector columns. Defaults to 0 (no rounding).
+            on_page (Callable[[Page[dict[str, Any]], float], None] | None, optional):
+                Called with each page and its request latency in seconds, in page order.
+                Defaults to None.
+
+        Yields:
+            row (dict[str, Any]): The row data.
+        """
+        agen = super().iter_table_rows(
+            table_type,
+            table_id,
+            page_size=page_size,
+            prefetch=prefetch,
+            order_by=order_by,
+            order_ascending=order_ascending,
+            columns=columns,
+            where=where,
+            search_query=search_query,
+            search_columns=search_columns,
+            float_decimals=float_decimals,
+            vec_decimals=vec_decimals,
+            on_page=on_page,
+            **kwargs,
+        )
+        try:
+            while True:
+                try:
+                    yield LOOP.run(anext(agen))
+                except StopAsyncIteration:
+                    break
+        finally:
+            # Cancel in-flight page requests if the consumer stops early
+            LOOP.run(agen.aclose())
+
     def get_table_row(
         self,
         table_type: str,
@@ -6382,6 +7092,75 @@ class _GenTableClient(_GenTableClientAsync):
         """
         return LOOP.run(super().export_table(table_type, table_id, **kwargs))
 
+    def import_table_chunked(
+        self,
+        table_type: str,
+        request: TableImportRequest,
+        *,
+        upload_id: str = "",
+        concurrency: int = 4,
+        on_progress: Callable[[int, int], None] | None = None,
+        **kwargs,
+    ) -> TableMetaResponse | OkResponse:
+        """
+        Imports a table (data and schema) from a parquet file, uploading the file in parts.
+        Unlike `import_table`, the file is never read into memory as a whole,
+        and an interrupted upload can be resumed by passing its `upload_id`.
+        Parts that were already received by the server are then skipped.
+
+        Args:
+            table_type (str): Table type.
+            request (TableImportRequest): Table import request.
+            upload_id (str, optional): ID of an interrupted upload to resume.
+                Defaults to "" (start a new upload).
+            concurrency (int, optional): Maximum number of parts uploaded concurrently. Defaults to 4.
+            on_progress (Callable[[int, int], None] | None, optional): Called after every part
+                with the number of bytes uploaded so far and the file size. Defaults to None.
+
+        Returns:
+            response (TableMetaResponse | OkResponse): The table metadata response if blocking is True,
+                otherwise OkResponse.
+        """
+        return LOOP.run(
+            super().import_table_chunked(
+                table_type,
+                request,
+                upload_id=upload_id,
+                concurrency=concurrency,
+                on_progress=on_progress,
+                **kwargs,
+            )
+        )
+
+    def export_table_to_file(
+        self,
+        table_type: str,
+        table_id: str,
+        file_path: str,
+        *,
+        on_progress: Callable[[int, int | None], None] | None = None,
+        **kwargs,
+    ) -> str:
+        """
+        Exports a table (data and schema) as a parquet file, streaming it to disk.
+        Unlike `export_table`, the file is never held in memory as a whole.
+
+        Args:
+            table_type (str): Table type.
+            table_id (str): ID or name of the table to be exported.
+            file_path (str): The output parquet file path.
+            on_progress (Callable[[int, int | None], None] | None, optional): Called after every chunk
+                with the number of bytes written so far and the file size if known. Defaults to None.
+
+        Returns:
+            file_path (str): The output parquet file path.
+        """
+        return LOOP.run(
+            super().export_table_to_file(
+                table_type, table_id, file_path, on_progress=on_progress, **kwargs
+            )
+        )
+
 
 class _MeterClient(_MeterClientAsync):
     def get_usage_metrics(
@@ -6440,6 +7219,23 @@ class _MeterClient(_MeterClientAsync):
             super().get_storage_metrics(from_, window_size, org_ids, proj_ids, to, group_by)
         )
 
+    def get_combined_metrics(
+        self,
+        from_,
+        window_size,
+        categories=None,
+        org_ids=None,
+        proj_ids=None,
+        to=None,
+        group_by=None,
+        data_source="clickhouse",
+    ) -> CombinedUsageResponse:
+        return LOOP.run(
+            super().get_combined_metrics(
+                from_, window_size, categories, org_ids, proj_ids, to, group_by, data_source
+            )
+        )
+
 
 class _TaskClient(_TaskClientAsync):
     """Task methods."""
@@ -6644,6 +7440,9 @@ class _ConversationClient(_ConversationClientAsync):
         self,
         conversation_id: str,
         column_ids: list[str] | None = None,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
         **kwargs,
     ) -> ConversationThreadsResponse:
         """
@@ -6652,11 +7451,16 @@ class _ConversationClient(_ConversationClientAsync):
         Args:
             conversation_id (str): Conversation ID.
             column_ids (list[str] | None): Columns to fetch as conversation threads.
+            limit (int | None, optional): Number of latest turns to return.
+                Defaults to None (return all turns).
+            offset (int, optional): Number of latest turns to skip. Defaults to 0.
 
         Returns:
             response (ConversationThreadsResponse): The conversation threads.
         """
-        return LOOP.run(super().get_threads(conversation_id, column_ids, **kwargs))
+        return LOOP.run(
+            super().get_threads(conversation_id, column_ids, limit=limit, offset=offset, **kwargs)
+        )
 
 
 class _Secrets(_SecretsAsync):
@@ -6846,6 +7650,7 @@ class _Notifications(_NotificationsAsync):
         order_by: str = "created_at",
         order_ascending: bool = False,
         unread_only: bool = False,
+        after: str | None = None,
         **kwargs,
     ) -> Page[NotificationRead]:
         return LOOP.run(
@@ -6855,6 +7660,7 @@ class _Notifications(_NotificationsAsync):
                 order_by=order_by,
                 order_ascending=order_ascending,
                 unread_only=unread_only,
+                after=after,
                 **kwargs,
             )
         )
@@ -6883,6 +7689,14 @@ class JamAI(JamAIAsync):
         file_upload_timeout: float | None = ENV_CONFIG.file_upload_timeout_sec,
         *,
         user_id: str = "",
+        stream_format: StreamFormat = "model",
+        max_connections: int | None = ENV_CONFIG.max_connections,
+        max_keepalive_connections: int | None = ENV_CONFIG.max_keepalive_connections,
+        keepalive_expiry: float | None = ENV_CONFIG.keepalive_expiry_sec,
+        http2: bool = ENV_CONFIG.http2,
+        max_retries: int = ENV_CONFIG.max_retries,
+        retry_backoff: float = ENV_CONFIG.retry_backoff_sec,
+        on_request: Callable[[RequestEvent], None] | None = None,
     ) -> None:
         """
         Initialize the JamAI client.
@@ -6907,6 +7721,34 @@ class JamAI(JamAIAsync):
                 `JAMAI_FILE_UPLOAD_TIMEOUT_SEC` var in environment or `.env` file.
             user_id (str, optional): User ID. For development purposes.
                 Defaults to "".
+            stream_format (str, optional): How chunks of streaming responses are returned.
+                "model" validates each chunk into its pydantic model;
+                "dict" returns the parsed JSON dicts without validation, which is the fastest;
+                "lazy" returns proxies that are only validated when an attribute is first accessed.
+                Defaults to "model".
+            max_connections (int | None, optional): Maximum number of concurrent connections.
+                Requests beyond this limit wait for a free connection. `None` means no limit.
+                Defaults to 100, but can be overridden via
+                `JAMAI_MAX_CONNECTIONS` var in environment or `.env` file.
+            max_keepalive_connections (int | None, optional): Maximum number of idle connections kept alive.
+                Defaults to 20, but can be overridden via
+                `JAMAI_MAX_KEEPALIVE_CONNECTIONS` var in environment or `.env` file.
+            keepalive_expiry (float | None, optional): Seconds before an idle connection is closed.
+                Defaults to 5 seconds, but can be overridden via
+                `JAMAI_KEEPALIVE_EXPIRY_SEC` var in environment or `.env` file.
+            http2 (bool, optional): Whether to use HTTP/2 if the server supports it. Requires `jamaibase[http2]`.
+                Defaults to False, but can be overridden via
+                `JAMAI_HTTP2` var in environment or `.env` file.
+            max_retries (int, optional): Maximum number of retries of connection errors, and of
+                idempotent requests that fail with status 429, 502, 503 or 504.
+                Defaults to 3, but can be overridden via
+                `JAMAI_MAX_RETRIES` var in environment or `.env` file.
+            retry_backoff (float, optional): Initial backoff in seconds between retries, doubled after
+                each retry. `Retry-After` headers take precedence.
+                Defaults to 0.5, but can be overridden via
+                `JAMAI_RETRY_BACKOFF_SEC` var in environment or `.env` file.
+            on_request (Callable[[RequestEvent], None] | None, optional): Called after each request
+                attempt with its latency, status and connection pool usage. Defaults to None.
         """
         super().__init__(
             project_id=project_id,
@@ -6916,6 +7758,14 @@ class JamAI(JamAIAsync):
             timeout=timeout,
             file_upload_timeout=file_upload_timeout,
             user_id=user_id,
+            stream_format=stream_format,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            on_request=on_request,
         )
         kwargs = dict(
             user_id=self.user_id,
@@ -6926,6 +7776,7 @@ class JamAI(JamAIAsync):
             http_client=self.http_client,
             timeout=self.timeout,
             file_upload_timeout=self.file_upload_timeout,
+            stream_format=self.stream_format,
         )
         self.auth = _Auth(**kwargs)
         self.prices = _Prices(**kwargs)
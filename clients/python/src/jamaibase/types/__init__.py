@@ -176,12 +176,16 @@ from jamaibase.types.gen_table import (  # noqa: F401
     MultiRowUpdateRequest,
     MultiRowUpdateRequestWithLimit,
     PythonGenConfig,
+    RowBulkAddResponse,
     RowCompletionResponse,
     RowRegen,
     RowUpdateRequest,
     SearchRequest,
     TableDataImportRequest,
     TableImportRequest,
+    TableImportUploadCompleteRequest,
+    TableImportUploadPart,
+    TableImportUploadResponse,
     TableMeta,
     TableMetaResponse,
     TableSchemaCreate,
@@ -255,6 +259,7 @@ from jamaibase.types.model import (  # noqa: F401
     RerankingModelPrice,
 )
 from jamaibase.types.telemetry import (  # noqa: F401
+    CombinedUsageResponse,
     Host,
     Metric,
     Usage,
@@ -277,6 +282,16 @@ class Page(BaseModel, Generic[T]):
     offset: Annotated[int, Field(description="Number of skipped items.", examples=[0])] = 0
     limit: Annotated[int, Field(description="Number of items per page.", examples=[0])] = 0
     total: Annotated[int, Field(description="Total number of items.", examples=[0])] = 0
+    total_is_estimate: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether `total` is an estimate by the database query planner rather than an exact count. "
+                "Only large lists are estimated, and only if enabled on the server."
+            ),
+            examples=[False],
+        ),
+    ] = False
     # start_cursor: Annotated[
     #     str | None,
     #     Field(
@@ -291,7 +306,8 @@ class Page(BaseModel, Generic[T]):
         Field(
             description=(
                 "Opaque cursor token for the last item in this page. "
-                "Pass it as `after=<end_cursor>` to request the page that follows the current window."
+                "Pass it as `after=<end_cursor>` to request the page that follows the current window. "
+                "`None` if there are no more items."
             )
         ),
     ] = None
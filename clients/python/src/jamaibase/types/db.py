@@ -1201,6 +1201,14 @@ class ProjectUpdate(_BaseModel):
         None,
         description="URL of the cover picture.",
     )
+    llm_response_cache: bool = Field(
+        False,
+        description=(
+            "Whether to cache LLM chat completion responses of deterministic requests "
+            "(`temperature` of 0) in this project. "
+            "Identical requests will return the cached response instead of calling the model."
+        ),
+    )
 
 
 class ProjectCreate(ProjectUpdate):
@@ -1395,6 +1403,14 @@ class NotificationGroup_(NotificationGroupCreate, _TableBase):
     id: str = Field(
         description="Notification group ID.",
     )
+    fan_out_count: int = Field(
+        0,
+        description="Number of recipients that the notification is fanned out to.",
+    )
+    fan_out_completed_at: DatetimeUTC | None = Field(
+        None,
+        description="Datetime when the fan-out completed (UTC). None while the fan-out is in progress.",
+    )
 
 
 class NotificationGroupRead(NotificationGroup_):
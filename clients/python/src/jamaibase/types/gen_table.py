@@ -81,6 +81,32 @@ class MultiRowCompletionResponse(BaseModel):
     rows: list[RowCompletionResponse]
 
 
+class RowBulkAddResponse(BaseModel):
+    num_rows: int = Field(description="Number of rows added by this call.")
+    num_chunks: int = Field(description="Number of chunks added by this call.")
+    num_skipped_chunks: int = Field(
+        0, description="Number of chunks skipped as they were added by a previous call."
+    )
+    elapsed_sec: float = Field(description="Wall time of the load in seconds.")
+    rows_per_sec: float = Field(description="Average throughput of the load.")
+
+
+class TableImportUploadPart(BaseModel):
+    part_number: int = Field(description="Part number, starting from 1.")
+    size: int = Field(description="Size of the part in bytes.")
+    etag: str = Field(description="Entity tag of the part.")
+
+
+class TableImportUploadResponse(BaseModel):
+    upload_id: str = Field(description="ID of the chunked upload.")
+    part_size: int = Field(
+        description="Size of each part in bytes. Only the last part can be smaller."
+    )
+    parts: list[TableImportUploadPart] = Field(
+        [], description="Parts received so far, sorted by part number."
+    )
+
+
 class LLMGenConfig(ChatRequestBase):
     object: Literal["gen_config.llm"] = Field(
         "gen_config.llm",
@@ -197,6 +223,14 @@ class PythonGenConfig(BaseModel):
         description="The python code to execute.",
         examples=["row['output_column']='Hello World!'"],
     )
+    batch: bool = Field(
+        False,
+        description=(
+            "Whether to execute this column for multiple rows in a single code execution call. "
+            "The code is run once per row in a warm interpreter, which is faster for small transforms. "
+            "Each row still gets its own result or error. Defaults to False."
+        ),
+    )
 
 
 def _gen_config_discriminator(x: Any) -> str | None:
@@ -722,3 +756,18 @@ class TableImportRequest(BaseModel):
             ),
         ),
     ] = True
+
+
+class TableImportUploadCompleteRequest(BaseModel):
+    table_id_dst: Annotated[
+        str | None, Field(description="_Optional_. The ID or name of the new table.")
+    ] = None
+    blocking: Annotated[
+        bool,
+        Field(
+            description=(
+                "If True, waits until import finishes. "
+                "If False, the task is submitted to a task queue and returns immediately."
+            ),
+        ),
+    ] = True
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Any, ClassVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Metric(BaseModel):
@@ -160,3 +160,14 @@ class UsageResponse(BaseModel):
     data: list[Usage]
     start: str
     end: str
+
+
+class CombinedUsageResponse(BaseModel):
+    windowSize: str
+    data: dict[str, UsageResponse] = Field(
+        description="Usage metrics of each category that was queried successfully.",
+    )
+    errors: dict[str, str] = Field(
+        {},
+        description="Error message of each category that failed or timed out.",
+    )
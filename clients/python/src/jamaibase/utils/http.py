@@ -0,0 +1,158 @@
+from asyncio import sleep
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from random import random
+from time import perf_counter, time
+from typing import Callable
+
+import httpx
+from loguru import logger
+
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """Emitted once per attempt of a request, when its response headers arrive or it fails."""
+
+    method: str
+    url: str
+    status_code: int | None
+    # Seconds until the response headers arrived, including any wait for a pooled connection
+    latency_sec: float
+    attempt: int
+    # Requests in flight on the client when this request was sent, including itself
+    in_flight: int
+    max_connections: int | None
+    error: BaseException | None = None
+
+    @property
+    def saturated(self) -> bool:
+        """Whether this request had to wait for a connection to be freed (HTTP/1.1 only)."""
+        return self.max_connections is not None and self.in_flight > self.max_connections
+
+
+def _retry_after_sec(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after", None)
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _InFlightStream(httpx.AsyncByteStream):
+    """Wraps a response stream to count its request as in flight until the stream is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, transport: "RetryTransport") -> None:
+        self.stream = stream
+        self.transport = transport
+        self.closed = False
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.transport.in_flight -= 1
+        await self.stream.aclose()
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport to retry idempotent requests that failed with a retryable status code,
+    with exponential backoff and jitter. `Retry-After` headers take precedence over the backoff.
+
+    Connection errors are retried by the wrapped `httpx.AsyncHTTPTransport` itself.
+    A request counts towards `in_flight` until its response stream is closed.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        *,
+        max_retries: int = 3,
+        backoff_sec: float = 0.5,
+        max_backoff_sec: float = 30.0,
+        max_connections: int | None = None,
+        on_request: Callable[[RequestEvent], None] | None = None,
+    ) -> None:
+        self.transport = transport
+        self.max_retries = max_retries
+        self.backoff_sec = backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+        self.max_connections = max_connections
+        self.on_request = on_request
+        self.in_flight = 0
+
+    def _emit(self, event: RequestEvent) -> None:
+        if self.on_request is None:
+            return
+        try:
+            self.on_request(event)
+        except Exception as e:
+            logger.warning(f"Request event hook failed: {repr(e)}")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        retryable = request.method in RETRY_METHODS
+        attempt = 0
+        while True:
+            self.in_flight += 1
+            in_flight = self.in_flight
+            t0 = perf_counter()
+            response = None
+            try:
+                response = await self.transport.handle_async_request(request)
+            except Exception as e:
+                self._emit(
+                    RequestEvent(
+                        method=request.method,
+                        url=str(request.url),
+                        status_code=None,
+                        latency_sec=perf_counter() - t0,
+                        attempt=attempt,
+                        in_flight=in_flight,
+                        max_connections=self.max_connections,
+                        error=e,
+                    )
+                )
+                raise
+            finally:
+                if response is None:
+                    self.in_flight -= 1
+            # The connection is only released once the body is read or the response is closed
+            response.stream = _InFlightStream(response.stream, self)
+            self._emit(
+                RequestEvent(
+                    method=request.method,
+                    url=str(request.url),
+                    status_code=response.status_code,
+                    latency_sec=perf_counter() - t0,
+                    attempt=attempt,
+                    in_flight=in_flight,
+                    max_connections=self.max_connections,
+                )
+            )
+            if (
+                not retryable
+                or attempt >= self.max_retries
+                or response.status_code not in RETRY_STATUS_CODES
+            ):
+                return response
+            delay = _retry_after_sec(response)
+            if delay is None:
+                delay = min(self.backoff_sec * 2**attempt, self.max_backoff_sec) * (0.5 + random())
+            await response.aclose()
+            await sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,145 @@
+import re
+from typing import Any, AsyncGenerator, AsyncIterable, Literal, Type
+
+import orjson
+from pydantic import BaseModel, ValidationError
+
+SSE_DONE = b"data: [DONE]"
+StreamFormat = Literal["model", "dict", "lazy"]
+# Top-level fields are serialised before nested ones, so the first match is usually the object type.
+# Only used to pick the model to validate against first, a wrong match falls back to every model.
+_OBJECT_PATTERN = re.compile(rb'"object"\s*:\s*"([^"]+)"')
+
+
+async def aiter_sse_lines(stream: AsyncIterable[bytes]) -> AsyncGenerator[bytes, None]:
+    """
+    Split a byte stream into stripped SSE lines, without decoding into `str`.
+    Blank lines and the `[DONE]` sentinel are skipped.
+
+    Args:
+        stream (AsyncIterable[bytes]): The response byte stream, ie `httpx.Response.aiter_bytes()`.
+
+    Yields:
+        line (bytes): A non-empty SSE line such as `data: {...}` or `event: metadata`.
+    """
+    buffer = bytearray()
+    async for data in stream:
+        buffer += data
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line = bytes(buffer[start:end]).strip()
+            start = end + 1
+            if line and line != SSE_DONE:
+                yield line
+        del buffer[:start]
+    line = bytes(buffer).strip()
+    if line and line != SSE_DONE:
+        yield line
+
+
+class LazyModel:
+    """
+    A streamed chunk that is only validated into its model when an attribute is first accessed.
+
+    `isinstance` checks against the model class work without triggering validation.
+    """
+
+    __slots__ = ("_model_cls", "_data", "_model")
+
+    def __init__(self, model_cls: Type[BaseModel], data: bytes) -> None:
+        self._model_cls = model_cls
+        self._data = data
+        self._model = None
+
+    @property
+    def __class__(self) -> Type[BaseModel]:
+        return self._model_cls
+
+    def model(self) -> BaseModel:
+        """Validate the chunk (once) and return the model."""
+        if self._model is None:
+            self._model = self._model_cls.model_validate_json(self._data)
+        return self._model
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model(), name)
+
+    def __eq__(self, other: Any) -> bool:
+        return self.model() == other
+
+    def __repr__(self) -> str:
+        if self._model is None:
+            return f"LazyModel[{self._model_cls.__name__}]({self._data.decode()})"
+        return repr(self._model)
+
+
+class SSEDecoder:
+    """
+    Decodes SSE `data:` lines into one of several pydantic models, raw dicts or lazy models.
+
+    The model is chosen by the chunk's `object` field, so that each chunk is parsed only once
+    instead of being validated against every candidate model in turn.
+    """
+
+    def __init__(
+        self,
+        models: list[Type[BaseModel]],
+        stream_format: StreamFormat = "model",
+    ) -> None:
+        if stream_format not in ("model", "dict", "lazy"):
+            raise ValueError(
+                f'`stream_format` must be one of ["model", "dict", "lazy"], received: {stream_format}'
+            )
+        self.models = models
+        self.stream_format = stream_format
+        self._models_by_object = {
+            m.model_fields["object"].default.encode(): m
+            for m in models
+            if "object" in m.model_fields
+        }
+
+    def _model_cls(self, data: bytes) -> Type[BaseModel] | None:
+        match = _OBJECT_PATTERN.search(data)
+        return None if match is None else self._models_by_object.get(match.group(1))
+
+    def _lazy_model_cls(self, data: bytes) -> Type[BaseModel] | None:
+        # Lazy chunks are not validated, so read the top-level field instead of relying on order
+        try:
+            obj = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(obj, dict) or not isinstance(obj.get("object", None), str):
+            return None
+        return self._models_by_object.get(obj["object"].encode())
+
+    def decode(self, line: bytes | str) -> BaseModel | LazyModel | dict[str, Any]:
+        """
+        Decode a single `data:` line.
+
+        Args:
+            line (bytes | str): The SSE line.
+
+        Returns:
+            chunk (BaseModel | LazyModel | dict[str, Any]): The decoded chunk.
+        """
+        if isinstance(line, str):
+            line = line.encode()
+        data = line[5:]
+        if self.stream_format == "dict":
+            return orjson.loads(data)
+        if self.stream_format == "lazy":
+            model_cls = self._lazy_model_cls(data)
+            if model_cls is not None:
+                return LazyModel(model_cls, data)
+        elif (model_cls := self._model_cls(data)) is not None:
+            try:
+                return model_cls.model_validate_json(data)
+            except ValidationError:
+                pass
+        # Fall back to trying every model
+        for m in self.models:
+            try:
+                return m.model_validate_json(data)
+            except ValidationError:
+                pass
+        raise RuntimeError(f"Unexpected SSE chunk: {line.decode()}")
@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+
+from jamaibase.utils.http import RequestEvent, RetryTransport
+
+
+def _client(statuses: list[int], events: list[RequestEvent], **kwargs) -> httpx.AsyncClient:
+    statuses = iter(statuses)
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), headers={"retry-after": "0"})
+
+    transport = RetryTransport(
+        httpx.MockTransport(_handler), backoff_sec=0.01, on_request=events.append, **kwargs
+    )
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_retry_idempotent_requests():
+    events = []
+    async with _client([503, 429, 200], events) as client:
+        response = await client.get("/health")
+    assert response.status_code == 200
+    assert [(e.attempt, e.status_code) for e in events] == [(0, 503), (1, 429), (2, 200)]
+    assert all(e.latency_sec >= 0 and e.in_flight == 1 for e in events)
+
+
+async def test_retry_limit():
+    events = []
+    async with _client([503, 503, 503], events, max_retries=2) as client:
+        response = await client.delete("/resource")
+    assert response.status_code == 503
+    assert len(events) == 3
+
+
+async def test_no_retry_for_post():
+    events = []
+    async with _client([503, 200], events) as client:
+        response = await client.post("/rows/add", json={})
+    assert response.status_code == 503
+    assert len(events) == 1
+
+
+async def test_pool_saturation():
+    events = []
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200)
+
+    transport = RetryTransport(
+        httpx.MockTransport(_handler), max_connections=2, on_request=events.append
+    )
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await asyncio.gather(*[client.get("/health") for _ in range(4)])
+    assert max(e.in_flight for e in events) == 4
+    assert any(e.saturated for e in events)
+    assert transport.in_flight == 0
+
+
+async def test_in_flight_until_stream_closed():
+    events = []
+    async with _client([200, 200], events) as client:
+        transport: RetryTransport = client._transport
+        async with client.stream("GET", "/stream") as response:
+            assert response.status_code == 200
+            assert transport.in_flight == 1
+            await client.get("/health")
+            assert events[-1].in_flight == 2
+        assert transport.in_flight == 0
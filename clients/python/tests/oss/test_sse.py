@@ -0,0 +1,60 @@
+import pytest
+
+from jamaibase.types import CellCompletionResponse, CellReferencesResponse
+from jamaibase.utils.sse import LazyModel, SSEDecoder, aiter_sse_lines
+
+COMPLETION = (
+    b'data: {"id":"x","object":"gen_table.completion.chunk","created":1,"model":"m",'
+    b'"choices":[{"index":0,"delta":{"role":"assistant","content":"Hi"}}],'
+    b'"output_column_name":"out","row_id":"r"}'
+)
+REFERENCES = (
+    b'data: {"object":"gen_table.references","chunks":[],"search_query":"q",'
+    b'"output_column_name":"out","row_id":"r"}'
+)
+
+
+async def _split(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+async def test_aiter_sse_lines(size: int):
+    data = (
+        REFERENCES + b"\n\n" + COMPLETION + b"\r\n\nevent: metadata\ndata: [DONE]\n\n" + COMPLETION
+    )
+    lines = [line async for line in aiter_sse_lines(_split(data, size))]
+    assert lines == [REFERENCES, COMPLETION, b"event: metadata", COMPLETION]
+
+
+def test_sse_decoder():
+    models = [CellCompletionResponse, CellReferencesResponse]
+    # Models
+    decoder = SSEDecoder(models)
+    chunk = decoder.decode(COMPLETION)
+    assert isinstance(chunk, CellCompletionResponse)
+    assert chunk.content == "Hi"
+    assert isinstance(decoder.decode(REFERENCES.decode()), CellReferencesResponse)
+    # Dicts
+    chunk = SSEDecoder(models, "dict").decode(COMPLETION)
+    assert isinstance(chunk, dict)
+    assert chunk["object"] == "gen_table.completion.chunk"
+    # Lazy models are validated on first access
+    chunk = SSEDecoder(models, "lazy").decode(REFERENCES)
+    assert isinstance(chunk, LazyModel)
+    assert isinstance(chunk, CellReferencesResponse)
+    assert chunk._model is None
+    assert chunk.search_query == "q"
+    assert chunk == decoder.decode(REFERENCES)
+    # Lazy models are chosen by the top-level object type, even if a nested one comes first
+    chunk = SSEDecoder(models, "lazy").decode(
+        b'data: {"meta":{"object":"gen_table.completion.chunk"},' + REFERENCES[7:]
+    )
+    assert isinstance(chunk, CellReferencesResponse)
+    assert chunk._model is None
+    # Unknown chunks
+    with pytest.raises(RuntimeError, match="Unexpected SSE chunk"):
+        decoder.decode(b'data: {"object":"unknown"}')
+    with pytest.raises(ValueError, match="stream_format"):
+        SSEDecoder(models, "raw")
@@ -78,7 +78,8 @@ export const CodeGenConfigSchema = z.object({
 
 export const PythonGenConfigSchema = z.object({
     object: z.literal("gen_config.python").default("gen_config.python"),
-    python_code: z.string()
+    python_code: z.string(),
+    batch: z.boolean().default(false)
 });
 
 export const ColumnSchemaSchema = z.object({
@@ -12,6 +12,7 @@ export const ProjectCreateSchema = z.object({
     tags: z.array(z.string()).optional(),
     profile_picture_url: z.string().nullable().optional(),
     cover_picture_url: z.string().nullable().optional(),
+    llm_response_cache: z.boolean().optional(),
     meta: z.record(z.any()).optional()
 });
 
@@ -26,6 +27,7 @@ export const ProjectUpdateSchema = z.object({
     tags: z.array(z.string()).optional(),
     profile_picture_url: z.string().nullable().optional(),
     cover_picture_url: z.string().nullable().optional(),
+    llm_response_cache: z.boolean().optional(),
     meta: z.record(z.any()).optional()
 });
 
@@ -42,6 +44,7 @@ export const ProjectReadSchema = z.object({
     tags: z.array(z.string()).optional(),
     profile_picture_url: z.string().nullable().optional(),
     cover_picture_url: z.string().nullable().optional(),
+    llm_response_cache: z.boolean().optional(),
     created_by: z.string(),
     owner: z.string(),
     organization: z.any().optional(),
@@ -202,3 +202,7 @@ clickhouse-client --query="ALTER TABLE jamaibase_owl.embed_usage MODIFY COLUMN c
 clickhouse-client --query="ALTER TABLE jamaibase_owl.rerank_usage MODIFY COLUMN cost Decimal128(12)"
 clickhouse-client --query="ALTER TABLE jamaibase_owl.egress_usage MODIFY COLUMN cost Decimal128(12)"
 clickhouse-client --query="ALTER TABLE jamaibase_owl.egress_usage MODIFY COLUMN amount_gib Decimal128(12)"
+# Keep recent insert dedup tokens so that retried usage flushes are idempotent
+for table in llm_usage image_gen_usage embed_usage rerank_usage egress_usage file_storage_usage db_storage_usage; do
+    clickhouse-client --query="ALTER TABLE jamaibase_owl.${table} MODIFY SETTING non_replicated_deduplication_window = 1000"
+done
@@ -0,0 +1,87 @@
+"""
+Microbenchmark OpenTelemetry event emission of `BillingManager.process_all` on a single core.
+
+Simulates a Generative Table request that generates `--cells` LLM cells with a handful of
+models, and compares the legacy per-event emission (`to_dict` + instrument lookup + `add`
+for every event) with the aggregated emission (`aggregate_otel_events` + `emit_otel_points`).
+
+Usage:
+    python scripts/bench_billing_events.py --cells 10000 --repeats 20
+"""
+
+import argparse
+from time import perf_counter
+
+from cloudevents.conversion import to_dict
+from cloudevents.http import CloudEvent
+
+from owl.types import ProductType
+from owl.utils.billing.oss import (
+    OPENTELEMETRY_CLIENT,
+    aggregate_otel_events,
+    emit_otel_points,
+)
+
+VALUE_KEYS = {
+    ProductType.LLM_TOKENS: ("llm_token_usage", "tokens"),
+}
+
+
+def _make_events(num_cells: int, num_models: int) -> list[CloudEvent]:
+    events = []
+    for i in range(num_cells):
+        for t, v in [("input", 1000), ("output", 200)]:
+            events.append(
+                CloudEvent(
+                    attributes={"type": ProductType.LLM_TOKENS, "source": "owl", "subject": "org"},
+                    data={
+                        "model": f"model-{i % num_models}",
+                        "tokens": v,
+                        "type": t,
+                        "proj_id": "proj",
+                        "org_id": "org",
+                        "user_id": "user",
+                    },
+                )
+            )
+    return events
+
+
+def legacy(events: list[CloudEvent]) -> int:
+    for event in events:
+        attributes = to_dict(event)
+        name, value_key = VALUE_KEYS[attributes["type"]]
+        counter = OPENTELEMETRY_CLIENT.get_counter(name=name)
+        counter.add(
+            attributes["data"][value_key],
+            {k: v for k, v in attributes["data"].items() if k != value_key},
+        )
+    return len(events)
+
+
+def aggregated(events: list[CloudEvent]) -> int:
+    points = aggregate_otel_events(events)
+    emit_otel_points(points)
+    return len(points)
+
+
+def main(num_cells: int, num_models: int, repeats: int) -> None:
+    events = _make_events(num_cells, num_models)
+    for name, fn in [("legacy", legacy), ("aggregated", aggregated)]:
+        t0 = perf_counter()
+        for _ in range(repeats):
+            num_points = fn(events)
+        elapsed = (perf_counter() - t0) / repeats
+        print(
+            f"{name:<12} events={len(events):,d}  measurements={num_points:,d}  "
+            f"t/request={elapsed * 1e3:,.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cells", type=int, default=10_000)
+    parser.add_argument("--models", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    main(args.cells, args.models, args.repeats)
@@ -0,0 +1,99 @@
+"""
+Benchmark throughput of the Python client against a local server with fixed latency.
+
+A minimal ASGI app is served by Uvicorn in a background thread, and answers `/api/health` after
+`--latency-ms`. `JamAIAsync.health` is then called `--requests` times with `--concurrency`
+requests in flight, once for each `--max-connections` value. Latencies and pool saturation are
+collected through the client's `on_request` hook. Uvicorn only speaks HTTP/1.1, so HTTP/2 is not
+covered here.
+
+Usage:
+    python scripts/bench_client_pool.py --requests 5000 --concurrency 200 --max-connections 10 100 200
+"""
+
+import argparse
+import asyncio
+import threading
+from statistics import median, quantiles
+from time import perf_counter, sleep
+
+import uvicorn
+
+from jamaibase import JamAIAsync
+from jamaibase.utils.http import RequestEvent
+
+
+def _make_app(latency_sec: float):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(latency_sec)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b'{"ok":true}'})
+
+    return app
+
+
+def _serve(port: int, latency_sec: float) -> uvicorn.Server:
+    config = uvicorn.Config(
+        _make_app(latency_sec), host="127.0.0.1", port=port, log_level="warning", backlog=4096
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        sleep(0.05)
+    return server
+
+
+async def run(port: int, num_requests: int, concurrency: int, max_connections: int) -> None:
+    events: list[RequestEvent] = []
+    client = JamAIAsync(
+        api_base=f"http://127.0.0.1:{port}/api",
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        on_request=events.append,
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _call() -> None:
+        async with semaphore:
+            await client.health()
+
+    t0 = perf_counter()
+    await asyncio.gather(*[_call() for _ in range(num_requests)])
+    elapsed = perf_counter() - t0
+    await client.close()
+    latencies = [e.latency_sec * 1e3 for e in events]
+    p95 = quantiles(latencies, n=20)[-1]
+    saturated = sum(e.saturated for e in events) / len(events)
+    print(
+        f"max_connections={max_connections:<5d} throughput={num_requests / elapsed:,.0f} req/s  "
+        f"latency_p50={median(latencies):,.1f} ms  latency_p95={p95:,.1f} ms  "
+        f"saturated={saturated:.0%}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    for max_connections in args.max_connections:
+        await run(args.port, args.requests, args.concurrency, max_connections)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--max-connections", type=int, nargs="+", default=[10, 100, 200])
+    args = parser.parse_args()
+    server = _serve(args.port, args.latency_ms / 1e3)
+    try:
+        asyncio.run(main(args))
+    finally:
+        server.should_exit = True
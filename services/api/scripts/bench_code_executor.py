@@ -0,0 +1,130 @@
+"""
+Benchmark Python column execution against a local stand-in code executor.
+
+Compares the legacy path (new HTTP client and secrets fetch per cell, full row payload)
+with the pooled `code_executor` (shared client pool, cached secrets, pruned payload).
+
+Usage:
+    python scripts/bench_code_executor.py --rows 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import base64
+import pickle
+import threading
+from time import perf_counter, sleep
+from types import SimpleNamespace
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+
+from owl.configs import CACHE
+from owl.types import ColumnDtype
+from owl.utils import code as code_module
+from owl.utils.code import CODE_EXECUTOR_POOL, code_executor, select_row_columns
+
+SOURCE_CODE = "row['out'] = row['name'].title()"
+SECRETS_FETCH_SEC = 0.002  # Simulated DB round trip + decryption
+stats = {"secret_fetches": 0, "payload_bytes": 0}
+app = FastAPI()
+
+
+@app.post("/execute")
+async def execute(request: Request) -> str:
+    body = await request.json()
+    stats["payload_bytes"] += len(body["row_data"]) + len(body["env_vars"])
+    row = pickle.loads(base64.b64decode(body["row_data"]))
+    exec(body["source_code"], {"row": row})
+    return base64.b64encode(pickle.dumps(row[body["output_column"]])).decode("utf-8")
+
+
+async def _fetch_accessible_secrets(project_id: str) -> dict[str, str]:
+    stats["secret_fetches"] += 1
+    await asyncio.sleep(SECRETS_FETCH_SEC)
+    return {"API_KEY": "secret"}
+
+
+async def _get_secrets_version(organization_id: str) -> int:
+    return 0
+
+
+def _make_row(i: int) -> dict:
+    # A wide row with a few large columns that the code does not read
+    row = {"ID": str(i), "name": f"user number {i}", "out": None}
+    row.update({f"doc_{j}": "lorem ipsum " * 500 for j in range(5)})
+    return row
+
+
+async def legacy_executor(row_data: dict, endpoint: str) -> str:
+    secrets = await _fetch_accessible_secrets("proj")
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            f"{endpoint}/execute",
+            json={
+                "source_code": SOURCE_CODE,
+                "output_column": "out",
+                "row_data": base64.b64encode(pickle.dumps(row_data)).decode("utf-8"),
+                "env_vars": base64.b64encode(pickle.dumps(secrets)).decode("utf-8"),
+            },
+        )
+        response.raise_for_status()
+        return pickle.loads(base64.b64decode(response.text.strip('"')))
+
+
+async def pooled_executor(row_data: dict) -> str:
+    return await code_executor(
+        request=SimpleNamespace(state=SimpleNamespace(id="bench")),
+        organization_id="org",
+        project_id="proj",
+        source_code=SOURCE_CODE,
+        output_column="out",
+        row_data=select_row_columns(SOURCE_CODE, row_data, "out"),
+        dtype=ColumnDtype.STR,
+    )
+
+
+async def run(name: str, fn, rows: int, concurrency: int) -> None:
+    stats.update(secret_fetches=0, payload_bytes=0)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _task(i: int):
+        async with sem:
+            return await fn(_make_row(i))
+
+    t0 = perf_counter()
+    results = await asyncio.gather(*[_task(i) for i in range(rows)])
+    elapsed = perf_counter() - t0
+    assert results[1] == "User Number 1", results[1]
+    print(
+        f"{name:<8} rows={rows:,d}  t={elapsed:,.2f} s  rows/s={rows / elapsed:,.1f}  "
+        f"secret_fetches={stats['secret_fetches']:,d}  "
+        f"payload={stats['payload_bytes'] / rows:,.0f} B/row"
+    )
+
+
+async def main(rows: int, concurrency: int, port: int) -> None:
+    endpoint = f"http://127.0.0.1:{port}"
+    code_module._fetch_accessible_secrets = _fetch_accessible_secrets
+    CACHE.get_secrets_version = _get_secrets_version
+    CODE_EXECUTOR_POOL.base_url = endpoint
+    await run("legacy", lambda r: legacy_executor(r, endpoint), rows, concurrency)
+    await run("pooled", pooled_executor, rows, concurrency)
+    await CODE_EXECUTOR_POOL.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=13000)
+    args = parser.parse_args()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        sleep(0.05)
+    asyncio.run(main(args.rows, args.concurrency, args.port))
+    server.should_exit = True
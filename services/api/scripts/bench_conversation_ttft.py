@@ -0,0 +1,69 @@
+"""
+Benchmark time-to-first-token (TTFT) of conversation messages against a running API server.
+
+The agent should use a mock LLM model with a fixed TTFT (a model ID containing `-ttft-N`,
+see `owl.entrypoints.llm`), so that the reported overhead is the server-side setup time
+(table open, history loading, quota checks) on top of the model's TTFT.
+Messages are sent one after another to the same conversation, so later messages carry
+a longer history.
+
+Usage:
+    python scripts/bench_conversation_ttft.py --agent-id my-agent --messages 50 --ttft-ms 200
+"""
+
+import argparse
+import asyncio
+from statistics import median, quantiles
+from time import perf_counter
+
+from jamaibase import JamAIAsync
+from jamaibase.types import (
+    CellCompletionResponse,
+    ConversationCreateRequest,
+    ConversationMetaResponse,
+    MessageAddRequest,
+)
+
+
+async def main(agent_id: str, num_messages: int, ttft_ms: float, project_id: str) -> None:
+    # Defaults to the project ID of the client's environment
+    client = JamAIAsync(project_id=project_id) if project_id else JamAIAsync()
+    conversation_id = None
+    async for chunk in client.conversations.create_conversation(
+        ConversationCreateRequest(agent_id=agent_id, data={"User": "Hi"}, title="TTFT bench")
+    ):
+        if isinstance(chunk, ConversationMetaResponse):
+            conversation_id = chunk.conversation_id
+    if conversation_id is None:
+        raise RuntimeError("Conversation metadata was not received.")
+
+    ttfts = []
+    try:
+        for i in range(num_messages):
+            t0 = perf_counter()
+            ttft = None
+            async for chunk in client.conversations.send_message(
+                MessageAddRequest(conversation_id=conversation_id, data={"User": f"Message {i}"})
+            ):
+                if ttft is None and isinstance(chunk, CellCompletionResponse) and chunk.content:
+                    ttft = perf_counter() - t0
+            ttfts.append(ttft * 1e3)
+    finally:
+        await client.conversations.delete_conversation(conversation_id)
+
+    p95 = quantiles(ttfts, n=20)[-1] if len(ttfts) > 1 else ttfts[0]
+    print(
+        f"messages={len(ttfts):,d}  ttft_p50={median(ttfts):,.1f} ms  ttft_p95={p95:,.1f} ms  "
+        f"overhead_p50={median(ttfts) - ttft_ms:,.1f} ms  "
+        f"first={ttfts[0]:,.1f} ms  last={ttfts[-1]:,.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agent-id", type=str, required=True)
+    parser.add_argument("--project-id", type=str, default="")
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--ttft-ms", type=float, default=0.0, help="TTFT of the mock model.")
+    args = parser.parse_args()
+    asyncio.run(main(args.agent_id, args.messages, args.ttft_ms, args.project_id))
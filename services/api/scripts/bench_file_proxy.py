@@ -0,0 +1,107 @@
+"""
+Benchmark memory usage of the file proxy under concurrent large downloads.
+
+Serves a large file from a local stand-in S3 endpoint and downloads it concurrently through
+the legacy proxy (whole object buffered in memory) and the streaming `proxy_file`.
+Peak memory is measured with `tracemalloc` in the server process.
+
+Usage:
+    python scripts/bench_file_proxy.py --size-mib 8 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import threading
+import tracemalloc
+from time import perf_counter, sleep
+from urllib.parse import quote
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+from owl.configs import ENV_CONFIG
+from owl.routers.file import router
+from owl.utils.io import HTTP_ACLIENT
+
+CHUNK = b"\x00" * (64 * 1024)
+app = FastAPI()
+app.include_router(router)
+size_bytes = 0
+
+
+@app.get("/s3/{path:path}")
+async def s3_get_object(path: str) -> StreamingResponse:
+    async def _stream():
+        remaining = size_bytes
+        while remaining > 0:
+            yield CHUNK[: min(len(CHUNK), remaining)]
+            remaining -= len(CHUNK)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="audio/wav",
+        headers={"Content-Length": str(size_bytes), "ETag": '"bench"'},
+    )
+
+
+@app.get("/legacy/{path:path}")
+async def legacy_proxy_file(request: Request, path: str) -> Response:
+    original_url = f"{ENV_CONFIG.s3_endpoint}/{quote(path)}?{request.query_params}"
+    response = await HTTP_ACLIENT.get(original_url)
+    response.headers["Content-Disposition"] = "inline"
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        headers=response.headers,
+    )
+
+
+async def run(name: str, url: str, concurrency: int) -> None:
+    async def _download(client: httpx.AsyncClient) -> int:
+        num_bytes = 0
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_raw():
+                num_bytes += len(chunk)
+        return num_bytes
+
+    tracemalloc.reset_peak()
+    t0 = perf_counter()
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        sizes = await asyncio.gather(*[_download(client) for _ in range(concurrency)])
+    elapsed = perf_counter() - t0
+    assert all(s == size_bytes for s in sizes), sizes
+    _, peak = tracemalloc.get_traced_memory()
+    print(
+        f"{name:<10} downloads={concurrency:,d}  t={elapsed:,.2f} s  "
+        f"throughput={concurrency * size_bytes / elapsed / 1024**2:,.1f} MiB/s  "
+        f"peak_mem={peak / 1024**2:,.1f} MiB"
+    )
+
+
+async def main(concurrency: int, port: int) -> None:
+    endpoint = f"http://127.0.0.1:{port}"
+    await run("legacy", f"{endpoint}/legacy/s3/file.wav", concurrency)
+    await run("streaming", f"{endpoint}/v2/files/s3/file.wav", concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mib", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--port", type=int, default=13001)
+    args = parser.parse_args()
+    size_bytes = args.size_mib * 1024**2
+    ENV_CONFIG.s3_endpoint = f"http://127.0.0.1:{args.port}"
+    tracemalloc.start()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        sleep(0.05)
+    asyncio.run(main(args.concurrency, args.port))
+    server.should_exit = True
@@ -0,0 +1,130 @@
+"""
+Benchmark offset versus keyset (`after` cursor) pagination of ORM `list_` queries.
+
+`--records` users are inserted into the configured database (IDs prefixed with "bench-"), and
+pages of `--limit` items are fetched at increasing depths with each pagination mode, for each
+`--order-by` column. Only the page query is timed, since the count query is the same for both
+modes. The users are deleted afterwards.
+
+Run `migrate_db` (ie start the API once) beforehand so that the keyset indexes exist.
+
+Usage:
+    python scripts/bench_list_pagination.py --records 100000 --limit 100 --repeats 20
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+from statistics import median
+from time import perf_counter
+
+from sqlalchemy import insert
+from sqlmodel import delete
+
+from owl.db import async_session
+from owl.db.models import User
+from owl.utils.dates import now
+
+ID_PREFIX = "bench-"
+NAMES = ["alice", "Bob", "carol", "Dave", "erin", "Frank", "grace", "Heidi"]
+
+
+async def _insert_users(num_records: int, batch_size: int = 5000) -> None:
+    t0 = now()
+    columns = [c.name for c in User.__table__.columns]
+    async with async_session() as session:
+        conn = await session.connection()
+        for start in range(0, num_records, batch_size):
+            rows = []
+            for i in range(start, min(start + batch_size, num_records)):
+                user = User(
+                    id=f"{ID_PREFIX}{i:07d}",
+                    name=f"{NAMES[i % len(NAMES)]} {i}",
+                    email=f"{ID_PREFIX}{i}@bench.com",
+                    created_at=t0 + timedelta(milliseconds=i),
+                    # Plenty of ties, so that the primary key tiebreaker matters
+                    updated_at=t0 + timedelta(seconds=i // 10),
+                )
+                rows.append({c: getattr(user, c) for c in columns})
+            await conn.execute(insert(User), rows)
+        await session.commit()
+
+
+async def _delete_users() -> None:
+    async with async_session() as session:
+        await session.exec(delete(User).where(User.id.startswith(ID_PREFIX)))
+        await session.commit()
+
+
+async def _time_page(
+    order_by: str,
+    limit: int,
+    repeats: int,
+    *,
+    offset: int = 0,
+    after: str | None = None,
+) -> float:
+    items, _ = User._list(
+        offset=offset,
+        limit=limit,
+        order_by=order_by,
+        order_ascending=True,
+        search_query=None,
+        search_columns=None,
+        after=after,
+    )
+    latencies = []
+    async with async_session() as session:
+        for _ in range(repeats):
+            t0 = perf_counter()
+            (await session.exec(items)).all()
+            latencies.append(perf_counter() - t0)
+    return median(latencies)
+
+
+async def _cursor_at(order_by: str, depth: int) -> str:
+    """Cursor of the item just before `depth`, as returned in `end_cursor` by the previous page."""
+    items, _ = User._list(
+        offset=depth - 1,
+        limit=1,
+        order_by=order_by,
+        order_ascending=True,
+        search_query=None,
+        search_columns=None,
+    )
+    async with async_session() as session:
+        item = (await session.exec(items)).one()
+    return item._generate_cursor(order_by)
+
+
+async def main(args: argparse.Namespace) -> None:
+    await _delete_users()
+    t0 = perf_counter()
+    await _insert_users(args.records)
+    print(f"Inserted {args.records:,d} users in {perf_counter() - t0:,.1f} s")
+    depths = [d for d in (0, 1_000, 10_000, 50_000, args.records - args.limit) if d >= 0]
+    try:
+        for order_by in args.order_by:
+            print(f"order_by={order_by}")
+            for depth in sorted(set(depths)):
+                offset_sec = await _time_page(order_by, args.limit, args.repeats, offset=depth)
+                after = await _cursor_at(order_by, depth) if depth > 0 else None
+                keyset_sec = await _time_page(order_by, args.limit, args.repeats, after=after)
+                print(
+                    f"  depth={depth:<8,d} offset={offset_sec * 1e3:8,.2f} ms  "
+                    f"keyset={keyset_sec * 1e3:8,.2f} ms  speedup={offset_sec / keyset_sec:6,.1f}x"
+                )
+    finally:
+        await _delete_users()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument(
+        "--order-by", type=str, nargs="+", default=["id", "name", "created_at", "updated_at"]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,136 @@
+"""
+Microbenchmark the MCP server's tool catalogue, `tools/list` and `tools/call` on a single core.
+
+A synthetic FastAPI app with `--tools` MCP tool routes (spread over the permission tags used by
+the API) is wrapped by `MCPServer`. Measures:
+- Catalogue build from the OpenAPI schema versus loading a snapshot file.
+- `tools/list` JSON-RPC requests with the per-role memo cleared before every call (the previous
+  behaviour) versus memoised, for a mix of users with different roles.
+- `tools/call` JSON-RPC requests dispatched through the ASGI client and in-process ("direct"),
+  versus a plain request to the same route through the ASGI client.
+
+Usage:
+    python scripts/bench_mcp_tools.py --tools 200 --iterations 2000
+"""
+
+import argparse
+import asyncio
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from jamaibase.types import Role, UserAuth
+from owl.configs import ENV_CONFIG
+from owl.utils.mcp.server import MCP_TOOL_TAG, MCPServer
+
+PERMISSION_TAGS = [
+    ["system.MEMBER"],
+    ["organization.ADMIN"],
+    ["organization.MEMBER", "project.MEMBER"],
+    ["organization.GUEST"],
+    ["project.MEMBER"],
+    ["project.ADMIN"],
+]
+
+
+class ItemCreate(BaseModel):
+    name: str
+    description: str = ""
+    tags: list[str] = []
+    metadata: dict[str, str] = {}
+
+
+def _make_app(num_tools: int) -> FastAPI:
+    app = FastAPI(title="MCP Bench", version="0.0.1")
+    for i in range(num_tools):
+        tags = [MCP_TOOL_TAG, *PERMISSION_TAGS[i % len(PERMISSION_TAGS)]]
+        if i % 2 == 0:
+
+            async def _get(item_id: str, limit: int = 10, offset: int = 0) -> dict:
+                return {"id": item_id, "limit": limit, "offset": offset}
+
+            app.get(f"/v1/items_{i}/{{item_id}}", tags=tags, operation_id=f"get_item_{i}")(_get)
+        else:
+
+            async def _post(body: ItemCreate) -> dict:
+                return body.model_dump()
+
+            app.post(f"/v1/items_{i}", tags=tags, operation_id=f"create_item_{i}")(_post)
+    return app
+
+
+def _user(org_roles: list[Role], proj_roles: list[Role]) -> UserAuth:
+    return UserAuth.model_construct(
+        org_memberships=[SimpleNamespace(organization_id="org", role=r) for r in org_roles],
+        proj_memberships=[SimpleNamespace(project_id="proj", role=r) for r in proj_roles],
+    )
+
+
+USERS = [
+    _user([Role.ADMIN], [Role.ADMIN]),
+    _user([Role.MEMBER], [Role.MEMBER]),
+    _user([Role.GUEST], []),
+    _user([], [Role.MEMBER]),
+]
+
+
+def _report(name: str, n: int, elapsed: float) -> None:
+    print(f"{name:<24} n={n:<7,d} total={elapsed:,.3f} s  per_call={elapsed / n * 1e6:,.1f} us")
+
+
+async def bench_list(server: MCPServer, iterations: int) -> None:
+    body = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+    for name, memoised in (("tools/list (no memo)", False), ("tools/list (memoised)", True)):
+        t0 = perf_counter()
+        for i in range(iterations):
+            if not memoised:
+                server._list_tools_cache.clear()
+            await server.post(user=USERS[i % len(USERS)], body=body)
+        _report(name, iterations, perf_counter() - t0)
+
+
+async def bench_call(server: MCPServer, iterations: int) -> None:
+    user = USERS[0]
+    body = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "get_item_0", "arguments": {"item_id": "abc", "limit": 5}},
+    }
+    t0 = perf_counter()
+    for _ in range(iterations):
+        await server.client.request("GET", "/v1/items_0/abc", params={"limit": 5})
+    _report("plain ASGI request", iterations, perf_counter() - t0)
+    for dispatch in ("asgi", "direct"):
+        server.dispatch = dispatch
+        t0 = perf_counter()
+        for _ in range(iterations):
+            await server.post(user=user, body=body)
+        _report(f"tools/call ({dispatch})", iterations, perf_counter() - t0)
+
+
+async def main(num_tools: int, iterations: int) -> None:
+    app = _make_app(num_tools)
+    with TemporaryDirectory() as tmp_dir:
+        ENV_CONFIG.mcp_tool_snapshot_path = join(tmp_dir, "mcp_tools.json")
+        t0 = perf_counter()
+        MCPServer(app)
+        print(f"Catalogue from OpenAPI:  {(perf_counter() - t0) * 1e3:,.1f} ms")
+        t0 = perf_counter()
+        server = MCPServer(app)
+        print(f"Catalogue from snapshot: {(perf_counter() - t0) * 1e3:,.1f} ms")
+    print(f"Tools: {len(server.tools):,d}")
+    await bench_list(server, iterations)
+    await bench_call(server, iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tools", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.tools, args.iterations))
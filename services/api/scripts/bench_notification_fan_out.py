@@ -0,0 +1,129 @@
+"""
+Benchmark SYSTEM audience notification fan-out against a dev database.
+
+Synthetic users are inserted into the `"User"` table, then a notification is fanned out to
+every user twice: with the legacy single `INSERT ... SELECT` transaction, and with the chunked
+fan-out of `owl.utils.notifications`. The longest transaction approximates how long row locks
+are held and WAL is retained. Synthetic users and their notifications are deleted afterwards.
+
+Usage:
+    python scripts/bench_notification_fan_out.py --users 500000 --chunk-size 5000
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from sqlalchemy import insert, text
+from sqlmodel import delete
+
+from owl.db import SCHEMA, async_session
+from owl.db.models import NotificationGroup, User
+from owl.types import NotificationAudience, NotificationType
+from owl.utils.dates import now
+from owl.utils.notifications import _fan_out_notifications
+
+USER_ID_PREFIX = "bench-fan-out-"
+
+
+async def _create_users(num_users: int, batch_size: int = 10_000) -> None:
+    async with async_session() as session:
+        for start in range(0, num_users, batch_size):
+            users = [
+                User(
+                    id=f"{USER_ID_PREFIX}{i:08d}",
+                    name=f"Bench {i}",
+                    email=f"{USER_ID_PREFIX}{i}@bench.local",
+                ).model_dump()
+                for i in range(start, min(start + batch_size, num_users))
+            ]
+            await session.exec(insert(User).values(users))
+            await session.commit()
+
+
+async def _create_group(message: str) -> NotificationGroup:
+    async with async_session() as session:
+        group = NotificationGroup(
+            audience=NotificationAudience.SYSTEM,
+            event_type=NotificationType.ANNOUNCEMENT,
+            message=message,
+        )
+        session.add(group)
+        await session.commit()
+        return group
+
+
+async def legacy(message: str) -> tuple[int, float]:
+    group = await _create_group(message)
+    async with async_session() as session:
+        t0 = perf_counter()
+        result = await session.exec(
+            text(
+                f'INSERT INTO {SCHEMA}."Notification" '
+                "(user_id, notification_group_id, message, meta, created_at, updated_at) "
+                "SELECT u.id, :group_id, :message, '{}'::jsonb, :ts, :ts "
+                f'FROM {SCHEMA}."User" u'
+            ),
+            params=dict(group_id=group.id, message=message, ts=now()),
+        )
+        await session.commit()
+        elapsed = perf_counter() - t0
+    await _delete_group(group.id)
+    return result.rowcount, elapsed
+
+
+async def chunked(message: str, chunk_size: int) -> tuple[int, float, list[float]]:
+    group = await _create_group(message)
+    durations = []
+    async with async_session() as session:
+        t0 = perf_counter()
+        t_chunk = t0
+        async for _ in _fan_out_notifications(session, group, chunk_size=chunk_size):
+            t = perf_counter()
+            durations.append(t - t_chunk)
+            t_chunk = t
+        elapsed = perf_counter() - t0
+    await _delete_group(group.id)
+    return group.fan_out_count, elapsed, durations
+
+
+async def _delete_group(group_id: str) -> None:
+    async with async_session() as session:
+        await session.exec(delete(NotificationGroup).where(NotificationGroup.id == group_id))
+        await session.commit()
+
+
+async def _delete_users() -> None:
+    async with async_session() as session:
+        await session.exec(delete(User).where(User.id.startswith(USER_ID_PREFIX)))
+        await session.commit()
+
+
+async def main(num_users: int, chunk_size: int) -> None:
+    t0 = perf_counter()
+    await _create_users(num_users)
+    print(f"Inserted {num_users:,d} synthetic users in {perf_counter() - t0:,.1f} s")
+    try:
+        count, elapsed = await legacy("Legacy fan-out benchmark.")
+        print(
+            f"{'legacy':<8} recipients={count:,d}  total={elapsed:,.2f} s  "
+            f"transactions=1  longest_txn={elapsed * 1e3:,.0f} ms"
+        )
+        count, elapsed, durations = await chunked("Chunked fan-out benchmark.", chunk_size)
+        durations.sort()
+        print(
+            f"{'chunked':<8} recipients={count:,d}  total={elapsed:,.2f} s  "
+            f"transactions={len(durations):,d}  "
+            f"median_txn={durations[len(durations) // 2] * 1e3:,.0f} ms  "
+            f"longest_txn={durations[-1] * 1e3:,.0f} ms"
+        )
+    finally:
+        await _delete_users()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.chunk_size))
@@ -0,0 +1,107 @@
+"""
+Microbenchmark SSE serialisation of chat completion chunks on a single core.
+
+Chunks are shaped like the output of the mock LLM (`owl.entrypoints.llm`).
+Compares the legacy framing (`model_dump_json` + f-string + `encode` for egress accounting)
+with `owl.utils.sse`, with and without coalescing.
+
+Usage:
+    python scripts/bench_sse.py --chunks 200000 --coalesce-bytes 4096
+"""
+
+import argparse
+import asyncio
+from time import perf_counter, time
+
+from owl.types import (
+    ChatCompletionChoice,
+    ChatCompletionChunkResponse,
+    ChatCompletionDelta,
+    ChatCompletionUsage,
+)
+from owl.utils.sse import SSEBuffer, sse_stream
+
+
+def _make_chunks(n: int) -> list[ChatCompletionChunkResponse]:
+    chunks = [
+        ChatCompletionChunkResponse(
+            id="chatcmpl-bench",
+            model="ellm/describe",
+            choices=[
+                ChatCompletionChoice(
+                    index=0,
+                    delta=ChatCompletionDelta(role="assistant", content=f"token{i % 100} "),
+                    logprobs=None,
+                    finish_reason=None,
+                )
+            ],
+            usage=None,
+            object="chat.completion.chunk",
+            created=int(time()),
+        )
+        for i in range(n - 1)
+    ]
+    chunks.append(
+        ChatCompletionChunkResponse(
+            id="chatcmpl-bench",
+            model="ellm/describe",
+            choices=[],
+            usage=ChatCompletionUsage(prompt_tokens=10, completion_tokens=n, total_tokens=n + 10),
+        )
+    )
+    return chunks
+
+
+async def _aiter(chunks: list[ChatCompletionChunkResponse]):
+    for chunk in chunks:
+        yield chunk
+
+
+async def legacy(chunks: list[ChatCompletionChunkResponse]) -> tuple[int, int]:
+    content_length = num_writes = 0
+    async for chunk in _aiter(chunks):
+        sse = f"data: {chunk.model_dump_json(exclude_unset=True)}\n\n"
+        content_length += len(sse.encode("utf-8"))
+        # Starlette encodes str chunks before writing
+        sse.encode("utf-8")
+        num_writes += 1
+    sse = "data: [DONE]\n\n"
+    content_length += len(sse.encode("utf-8"))
+    return content_length, num_writes + 1
+
+
+async def single_pass(
+    chunks: list[ChatCompletionChunkResponse], buffer: SSEBuffer
+) -> tuple[int, int]:
+    num_writes = 0
+    async for _ in sse_stream(_aiter(chunks), buffer=buffer, exclude_unset=True):
+        num_writes += 1
+    return buffer.num_bytes, num_writes
+
+
+async def main(num_chunks: int, coalesce_bytes: int) -> None:
+    chunks = _make_chunks(num_chunks)
+    runs = [
+        ("legacy", lambda: legacy(chunks)),
+        ("encoder", lambda: single_pass(chunks, SSEBuffer(max_bytes=0, max_delay_ms=0))),
+        (
+            f"coalesce {coalesce_bytes}B",
+            lambda: single_pass(chunks, SSEBuffer(max_bytes=coalesce_bytes, max_delay_ms=0)),
+        ),
+    ]
+    for name, fn in runs:
+        t0 = perf_counter()
+        num_bytes, num_writes = await fn()
+        elapsed = perf_counter() - t0
+        print(
+            f"{name:<16} chunks/s={num_chunks / elapsed:,.0f}  writes={num_writes:,d}  "
+            f"egress={num_bytes:,d} B  t={elapsed:,.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=200_000)
+    parser.add_argument("--coalesce-bytes", type=int, default=4096)
+    args = parser.parse_args()
+    asyncio.run(main(args.chunks, args.coalesce_bytes))
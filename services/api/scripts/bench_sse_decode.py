@@ -0,0 +1,109 @@
+"""
+Microbenchmark client-side decoding of a recorded gen table SSE stream on a single core.
+
+The stream is replayed from `--input` (a raw response body, ie `curl -N ... > stream.txt`)
+or synthesised with `--chunks` cells shaped like multi-row add responses. It is fed to the
+decoder in network-sized pieces. Compares the legacy path of `jamaibase` (`aiter_lines` and
+validating each chunk against every candidate model) with `jamaibase.utils.sse` in each
+stream format.
+
+Usage:
+    python scripts/bench_sse_decode.py --chunks 100000 --read-size 4096
+"""
+
+import argparse
+import asyncio
+from time import perf_counter, time
+
+import httpx
+
+from jamaibase.types import CellCompletionResponse, CellReferencesResponse
+from jamaibase.utils.sse import SSEDecoder, aiter_sse_lines
+
+MODELS = [CellCompletionResponse, CellReferencesResponse]
+
+
+def _make_stream(n: int, num_rows: int = 100) -> bytes:
+    frames = []
+    for i in range(n):
+        if i < num_rows:
+            chunk = CellReferencesResponse(
+                chunks=[],
+                search_query="What is the capital of France?",
+                output_column_name="Answer",
+                row_id=f"row-{i}",
+            )
+        else:
+            chunk = CellCompletionResponse(
+                id="chatcmpl-bench",
+                model="ellm/describe",
+                created=int(time()),
+                choices=[dict(index=0, delta=dict(role="assistant", content=f"token{i % 100} "))],
+                output_column_name="Answer",
+                row_id=f"row-{i % num_rows}",
+            )
+        frames.append(b"data: " + chunk.model_dump_json().encode() + b"\n\n")
+    frames.append(b"data: [DONE]\n\n")
+    return b"".join(frames)
+
+
+def _response(data: bytes, read_size: int) -> httpx.Response:
+    async def _aiter():
+        for i in range(0, len(data), read_size):
+            yield data[i : i + read_size]
+
+    return httpx.Response(200, content=_aiter())
+
+
+async def legacy(data: bytes, read_size: int) -> int:
+    n = 0
+    async for chunk in _response(data, read_size).aiter_lines():
+        chunk = chunk.strip()
+        if chunk == "" or chunk == "data: [DONE]":
+            continue
+        for m in MODELS:
+            try:
+                m.model_validate_json(chunk[5:])
+                break
+            except Exception:
+                pass
+        n += 1
+    return n
+
+
+async def decoder(data: bytes, read_size: int, stream_format: str) -> int:
+    n = 0
+    _decoder = SSEDecoder(MODELS, stream_format)
+    async for line in aiter_sse_lines(_response(data, read_size).aiter_bytes()):
+        _decoder.decode(line)
+        n += 1
+    return n
+
+
+async def main(input_path: str, num_chunks: int, read_size: int) -> None:
+    if input_path:
+        with open(input_path, "rb") as f:
+            data = f.read()
+    else:
+        data = _make_stream(num_chunks)
+    print(f"Stream size: {len(data) / 1024**2:,.1f} MiB")
+    runs = [("legacy", legacy(data, read_size))] + [
+        (f"sse:{fmt}", decoder(data, read_size, fmt)) for fmt in ("model", "lazy", "dict")
+    ]
+    for name, coro in runs:
+        t0 = perf_counter()
+        n = await coro
+        elapsed = perf_counter() - t0
+        print(
+            f"{name:<10} chunks={n:,d}  total={elapsed:,.2f} s  "
+            f"throughput={n / elapsed:,.0f} chunks/s  per_chunk={elapsed / n * 1e6:,.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", type=str, default="", help="Recorded SSE response body.")
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--read-size", type=int, default=4096)
+    args = parser.parse_args()
+    asyncio.run(main(args.input, args.chunks, args.read_size))
@@ -14,6 +14,8 @@ ENV_CONFIG = EnvConfig()
 CACHE = Cache(
     redis_url=f"redis://{ENV_CONFIG.redis_host}:{ENV_CONFIG.redis_port}/1",
     clickhouse_buffer_key=ENV_CONFIG.clickhouse_buffer_key,
+    usage_bucket_sec=ENV_CONFIG.clickhouse_buffer_bucket_sec,
+    usage_spill_path=ENV_CONFIG.clickhouse_buffer_spill_path,
 )
 
 
@@ -1,5 +1,5 @@
 from functools import cached_property
-from os.path import abspath
+from os.path import abspath, join
 from pathlib import Path
 from typing import Annotated, Literal, Self
 
@@ -52,14 +52,53 @@ class EnvConfig(BaseSettings):
     audio_file_upload_max_bytes: int = 120 * 1024 * 1024  # 120MiB in bytes
     compute_storage_period_sec: Annotated[float, Field(ge=0, le=60 * 60)] = 60 * 5
     document_loader_cache_ttl_sec: int = 60 * 15  # 15 minutes
+    # List counts are estimated by the query planner if it expects this many rows (0 to disable)
+    db_list_count_estimate_min_rows: Annotated[int, Field(ge=0)] = 0
+    # File storage usage is counted in Redis and reconciled with a full S3 scan this often
+    file_storage_reconcile_sec: Annotated[int, Field(gt=0)] = 60 * 60 * 24
+    file_storage_scan_concurrency: Annotated[int, Field(gt=0)] = 8
+    # Chunked table import uploads, parts are kept in S3 until the upload is completed or aborted.
+    # Uploads older than the TTL are aborted hourly by the `starling` beat scheduler.
+    table_import_part_size_bytes: Annotated[int, Field(ge=5 * 1024**2)] = 16 * 1024**2
+    table_import_upload_ttl_sec: Annotated[int, Field(gt=0)] = 60 * 60 * 24
+    # MCP tool catalogue snapshot, skips building it from the OpenAPI schema at startup if fresh
+    mcp_tool_snapshot_path: str = ""
+    # MCP tool calls are dispatched to routes in-process ("direct") or through the ASGI client
+    mcp_tool_dispatch: Literal["asgi", "direct"] = "direct"
+    # Meters query cache, time buckets ending this long ago are closed and cached
+    meters_cache_settle_sec: Annotated[int, Field(ge=0)] = 60 * 10
+    meters_cache_max_entries: int = 1000  # In-process LRU size per cache
+    meters_closed_bucket_cache_ttl_sec: Annotated[int, Field(ge=0)] = 60 * 60 * 24 * 7  # 7 days
+    meters_open_bucket_cache_ttl_sec: Annotated[int, Field(ge=0)] = 2
+    # Combined meters queries run concurrently up to this limit, each with a timeout
+    meters_max_concurrent_queries: Annotated[int, Field(gt=0)] = 4
+    meters_query_timeout_sec: Annotated[float, Field(gt=0)] = 30.0
     # Starling configs
     s3_backup_bucket_name: str = ""
     # Starling database configs
     flush_clickhouse_buffer_sec: int = 60
+    # Notification fan-out is committed in chunks of this many recipients
+    notification_fan_out_chunk_size: Annotated[int, Field(gt=0)] = 5000
+    # Unfinished fan-outs without progress for this long are resumed by Starling
+    notification_fan_out_stale_sec: Annotated[int, Field(gt=0)] = 60 * 5
     # Generative Table configs
     concurrent_cell_batch_size: int = 15
     max_write_batch_size: int = 100
     max_file_cache_size: int = 20
+    # Opened table metadata is reused for this long by latency-sensitive paths (0 to disable)
+    table_meta_cache_ttl_sec: Annotated[int, Field(ge=0)] = 30
+    # Conversation messages only load the last N turns as context (0 loads the full history)
+    conversation_max_history_turns: Annotated[int, Field(ge=0)] = 100
+    # SSE coalescing, frames are buffered up to these limits (0 writes every frame immediately)
+    sse_coalesce_max_bytes: Annotated[int, Field(ge=0)] = 0
+    sse_coalesce_max_delay_ms: Annotated[int, Field(ge=0)] = 0
+    # Public template responses are cached in Redis and revalidated by ETag (0 to disable)
+    template_response_cache_ttl_sec: Annotated[int, Field(ge=0)] = 60 * 60  # 1 hour
+    template_cache_max_age_sec: Annotated[int, Field(ge=0)] = 60  # Cache-Control max-age
+    # Template tables up to this many rows are listed from an in-process snapshot (0 to disable)
+    template_rows_snapshot_max_rows: Annotated[int, Field(ge=0)] = 0
+    # Snapshots are keyed by template version, the TTL only frees those of idle templates
+    template_rows_snapshot_ttl_sec: Annotated[int, Field(gt=0)] = 60 * 60  # 1 hour
     # PDF Loader configs
     use_vlm_ocr: bool = True  # Enable VLM OCR (otherwise use Docling OCR)
     # VLM model ID for OCR, only used when use_vlm_ocr is True.
@@ -68,7 +107,19 @@ class EnvConfig(BaseSettings):
     llm_timeout_sec: Annotated[int, Field(gt=0, le=60 * 60)] = 60
     embed_timeout_sec: Annotated[int, Field(gt=0, le=60 * 60)] = 60
     code_timeout_sec: Annotated[int, Field(gt=0, le=60 * 60)] = 120
+    code_executor_max_connections: Annotated[int, Field(gt=0)] = 100
+    code_secrets_cache_ttl_sec: Annotated[int, Field(ge=0)] = 30
+    python_batch_max_size: Annotated[int, Field(gt=0)] = 50
+    python_batch_max_wait_ms: Annotated[int, Field(ge=0)] = 20
     cohere_api_base: str = "https://api.cohere.ai/v1"
+    # LM cache configs, a TTL of 0 disables the cache
+    lm_cache_max_entries: int = 10000  # In-process LRU size per cache
+    query_embedding_cache_ttl_sec: Annotated[int, Field(ge=0)] = 60 * 60 * 24  # 1 day
+    search_query_cache_ttl_sec: Annotated[int, Field(ge=0)] = 60 * 60  # 1 hour
+    llm_response_cache_ttl_sec: Annotated[int, Field(ge=0)] = 60 * 60 * 24  # 1 day
+    llm_response_cache_max_entry_bytes: Annotated[int, Field(gt=0)] = 256 * 1024  # 256 KiB
+    # Max bytes cached per project within a TTL window
+    llm_response_cache_project_budget_bytes: Annotated[int, Field(gt=0)] = 256 * 1024 * 1024
     jina_ai_api_base: str = "https://api.jina.ai/v1"
     voyage_api_base: str = "https://api.voyageai.com/v1"
     # Keys
@@ -90,8 +141,15 @@ class EnvConfig(BaseSettings):
     clickhouse_password: SecretStr = "owlpassword"
     clickhouse_db: str = "jamaibase_owl"
     clickhouse_max_buffer_queue_size: int = 10000
-    # Clickhouse Redis queue buffer
+    clickhouse_flush_chunk_size: Annotated[int, Field(gt=0, le=5000)] = 500  # Buffer entries
+    clickhouse_flush_max_sec: Annotated[int, Field(gt=0)] = 50  # Remainder is left for next run
+    # Clickhouse Redis queue buffer, on Redis Cluster wrap the key in a hash tag (eg "{owl}buffer")
+    # so that all buffer keys share one slot
     clickhouse_buffer_key: str = "<owl>clickhouse_insert_buffer"
+    clickhouse_buffer_bucket_sec: Annotated[int, Field(gt=0)] = 60  # Buffer shard time bucket
+    # Usage is appended to this local file when Redis is unavailable (empty to disable),
+    # relative paths are resolved against `log_dir`
+    clickhouse_buffer_spill_path: str = "_usage_spill.jsonl"
     # Stripe & Billing
     stripe_api_key: SecretStr = ""
     stripe_publishable_key_live: SecretStr = ""
@@ -132,6 +190,10 @@ class EnvConfig(BaseSettings):
     @model_validator(mode="after")
     def make_paths_absolute(self) -> Self:
         self.log_dir = abspath(self.log_dir)
+        if self.clickhouse_buffer_spill_path:
+            self.clickhouse_buffer_spill_path = join(
+                self.log_dir, self.clickhouse_buffer_spill_path
+            )
         return self
 
     @model_validator(mode="after")
@@ -330,6 +330,23 @@ async def _add_project_description_column(engine: AsyncEngine) -> bool:
         return True
 
 
+async def _add_project_llm_response_cache_column(engine: AsyncEngine) -> bool:
+    table_name = "Project"
+    column_name = "llm_response_cache"
+
+    async with engine.connect() as conn:
+        if await _check_column_exists(conn, table_name, column_name):
+            return False
+        await conn.execute(
+            text(
+                f"""ALTER TABLE {SCHEMA}."{table_name}" ADD COLUMN {column_name} BOOLEAN NOT NULL DEFAULT FALSE"""
+            )
+        )
+        await conn.commit()
+        logger.success(f'Successfully added column "{column_name}" to "{table_name}".')
+        return True
+
+
 async def _add_image_gen_quota_columns(engine: AsyncEngine) -> bool:
     table_name = "Organization"
     columns = [
@@ -722,6 +739,126 @@ async def _migrate_notification_schema(engine: AsyncEngine) -> bool:
     return migrated
 
 
+async def _add_notification_fan_out_columns(engine: AsyncEngine) -> bool:
+    """
+    Add fan-out checkpoint columns to NotificationGroup.
+    Existing groups were fanned out in a single transaction, so they are marked as completed.
+    """
+    table_name = "NotificationGroup"
+    async with engine.begin() as conn:
+        if await _check_column_exists(conn, table_name, "fan_out_completed_at"):
+            return False
+        await conn.execute(
+            text(
+                f'ALTER TABLE {SCHEMA}."{table_name}" '
+                f"ADD COLUMN IF NOT EXISTS fan_out_cursor TEXT NOT NULL DEFAULT '', "
+                f"ADD COLUMN IF NOT EXISTS fan_out_count INTEGER NOT NULL DEFAULT 0, "
+                f"ADD COLUMN fan_out_completed_at TIMESTAMPTZ DEFAULT NULL"
+            )
+        )
+        await conn.execute(
+            text(
+                f'UPDATE {SCHEMA}."{table_name}" g SET fan_out_completed_at = g.updated_at, '
+                f'fan_out_count = (SELECT COUNT(*) FROM {SCHEMA}."Notification" n '
+                f"WHERE n.notification_group_id = g.id)"
+            )
+        )
+        await conn.execute(
+            text(
+                f'CREATE INDEX IF NOT EXISTS "ix_{table_name}_fan_out_completed_at" '
+                f'ON {SCHEMA}."{table_name}" (fan_out_completed_at)'
+            )
+        )
+    logger.success(f'Successfully added fan-out columns to "{table_name}".')
+    return True
+
+
+async def _create_search_indexes(engine: AsyncEngine) -> bool:
+    """
+    Create `pg_trgm` GIN indexes on the `search_index_cols` of each model.
+    They serve the case-insensitive regex (`~*`) filters of `list_` search queries.
+    """
+    from owl.db.models import Deployment, ModelConfig, Organization, PricePlan, Project, User
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        logger.warning(f"Failed to create pg_trgm extension, skipping search indexes: {repr(e)}")
+        return False
+    created = []
+    async with engine.begin() as conn:
+        for model in (Deployment, ModelConfig, Organization, PricePlan, Project, User):
+            table_name = model.__tablename__
+            for column in model.search_index_cols:
+                index_name = f"ix_{table_name}_{column}_trgm"
+                index_exists = await conn.scalar(
+                    text("SELECT to_regclass(:name)"), dict(name=f'{SCHEMA}."{index_name}"')
+                )
+                if index_exists is not None:
+                    continue
+                await conn.execute(
+                    text(
+                        f'CREATE INDEX IF NOT EXISTS "{index_name}" '
+                        f'ON {SCHEMA}."{table_name}" USING gin ("{column}" gin_trgm_ops)'
+                    )
+                )
+                created.append(index_name)
+    if created:
+        logger.success(f"Successfully created search indexes: {created}")
+    return len(created) > 0
+
+
+async def _create_keyset_indexes(engine: AsyncEngine) -> bool:
+    """
+    Create composite indexes on the sort keys of `list_` keyset pagination, ie the sortable
+    column (lowercased if it is text) followed by the primary key.
+    """
+    from owl.db.models import (
+        Deployment,
+        ModelConfig,
+        NotificationGroup,
+        Organization,
+        PricePlan,
+        Project,
+        User,
+    )
+
+    created = []
+    async with engine.begin() as conn:
+        for model in (
+            Deployment,
+            ModelConfig,
+            NotificationGroup,
+            Organization,
+            PricePlan,
+            Project,
+            User,
+        ):
+            table_name = model.__tablename__
+            pk = ", ".join(f'"{c}"' for c in model.pk())
+            for column in ("created_at", "updated_at", "name"):
+                if column not in model.__table__.columns:
+                    continue
+                index_name = f"ix_{table_name}_{column}_keyset"
+                index_exists = await conn.scalar(
+                    text("SELECT to_regclass(:name)"), dict(name=f'{SCHEMA}."{index_name}"')
+                )
+                if index_exists is not None:
+                    continue
+                key = f'LOWER("{column}")' if column in model.str_cols() else f'"{column}"'
+                await conn.execute(
+                    text(
+                        f'CREATE INDEX IF NOT EXISTS "{index_name}" '
+                        f'ON {SCHEMA}."{table_name}" ({key}, {pk})'
+                    )
+                )
+                created.append(index_name)
+    if created:
+        logger.success(f"Successfully created keyset pagination indexes: {created}")
+    return len(created) > 0
+
+
 async def migrate_db():
     engine = create_db_engine_async()
     migrated = [
@@ -732,12 +869,16 @@ async def migrate_db():
         await _create_pg_functions(engine),
         await _add_egress_updated_at_column(engine),
         await _add_project_description_column(engine),
+        await _add_project_llm_response_cache_column(engine),
         await _add_image_gen_quota_columns(engine),
         await _add_image_gen_cost_columns(engine),
         await _backfill_price_plan_image_products(engine),
         await _migrate_verification_codes(engine),
         await _migrate_reasoning_jsonb_keys(engine),
         await _migrate_notification_schema(engine),
+        await _add_notification_fan_out_columns(engine),
+        await _create_search_indexes(engine),
+        await _create_keyset_indexes(engine),
     ]
     if any(migrated):
         logger.success("DB migrations performed.")
@@ -1,7 +1,7 @@
 import base64
 import mimetypes
 import re
-from asyncio import Queue, TaskGroup
+from asyncio import Queue, TaskGroup, wait_for
 from collections import defaultdict, deque
 from os.path import basename, splitext
 from time import perf_counter, time
@@ -65,7 +65,7 @@ from owl.types import (
 )
 from owl.utils import mask_string, uuid7_draft2_str, uuid7_str
 from owl.utils.billing import BillingManager
-from owl.utils.code import code_executor
+from owl.utils.code import CodeBatcher, code_executor, select_row_columns
 from owl.utils.concurrency import determine_concurrent_batches
 from owl.utils.exceptions import (
     BadInputError,
@@ -75,6 +75,7 @@ from owl.utils.exceptions import (
 )
 from owl.utils.io import open_uri_async, s3_upload
 from owl.utils.lm import LMEngine
+from owl.utils.sse import SSE_DONE, SSEBuffer, sse_frame
 
 
 class Task(BaseModel, validate_assignment=True):
@@ -265,6 +266,7 @@ class MultiRowGenExecutor(_Executor):
         organization: OrganizationRead,
         project: ProjectRead,
         body: MultiRowAddRequest | MultiRowRegenRequest,
+        history_max_turns: int | None = None,
     ) -> None:
         concurrent = body.concurrent
         multi_turn = (
@@ -308,6 +310,21 @@ class MultiRowGenExecutor(_Executor):
         self._col_batch_size = col_batch_size
         self._row_batch_size = row_batch_size
 
+        # Multi-turn columns only load the last N turns as context
+        _context["history_max_turns"] = history_max_turns
+        # Python columns in batch mode share a batcher across rows
+        if any(
+            isinstance(col.gen_config, PythonGenConfig) and col.gen_config.batch
+            for col in table.column_metadata
+        ):
+            _context["code_batcher"] = CodeBatcher(
+                request=request,
+                organization_id=organization.id,
+                project_id=project.id,
+                max_batch_size=min(self._row_batch_size, ENV_CONFIG.python_batch_max_size),
+                max_wait_sec=ENV_CONFIG.python_batch_max_wait_ms / 1000,
+            )
+
         # Executors
         if isinstance(body, MultiRowAddRequest):
             self._is_regen = False
@@ -354,17 +371,27 @@ class MultiRowGenExecutor(_Executor):
         self._queue: Queue[ResultT | None] = Queue()
         # Accumulated rows for batch write
         self._batch_rows: list[dict[str, Any]] = []
+        # SSE encoding and egress accounting
+        self._sse = SSEBuffer()
         # Billing
-        self.content_length = 0
         self._billing: BillingManager = self.request.state.billing
 
-    async def generate(self) -> AsyncGenerator[str, None] | MultiRowCompletionResponse:
+    async def generate(self) -> AsyncGenerator[bytes, None] | MultiRowCompletionResponse:
         if self._stream:
             return self._generate()
         else:
             return await anext(self._generate())
 
-    async def _generate(self) -> AsyncGenerator[str | MultiRowCompletionResponse, None]:
+    async def _next_result(self) -> ResultT | None:
+        """
+        Wait for the next task result.
+        Raises `TimeoutError` once buffered SSE frames are due to be flushed.
+        """
+        if (timeout := self._sse.timeout) is None:
+            return await self._queue.get()
+        return await wait_for(self._queue.get(), timeout)
+
+    async def _generate(self) -> AsyncGenerator[bytes | MultiRowCompletionResponse, None]:
         rows = {
             exe.row_id: RowCompletionResponse(columns={}, row_id=exe.row_id)
             for exe in self._executors
@@ -377,7 +404,11 @@ class MultiRowGenExecutor(_Executor):
                     tg.create_task(exe.generate(self._queue))
                 done_rows = 0
                 while done_rows < len(_execs):
-                    res = await self._queue.get()
+                    try:
+                        res = await self._next_result()
+                    except TimeoutError:
+                        yield self._sse.flush()
+                        continue
                     self.log(
                         "len(_execs)={a} done_rows={b}  res={c}",
                         "DEBUG",
@@ -390,9 +421,8 @@ class MultiRowGenExecutor(_Executor):
                     elif isinstance(res, TaskResult):
                         # logger.debug(f"{res.response.content=}")
                         if self._stream:
-                            _sse = f"data: {res.response.model_dump_json()}\n\n"
-                            self.content_length += len(_sse.encode("utf-8"))
-                            yield _sse
+                            if (data := self._sse.add(sse_frame(res.response))) is not None:
+                                yield data
                         else:
                             rows[res.row_id].columns[res.output_column_name] = res.response
                     else:
@@ -405,10 +435,10 @@ class MultiRowGenExecutor(_Executor):
         await self._write_rows_to_table()
         # End of all tasks
         if self._stream:
-            _sse = "data: [DONE]\n\n"
-            yield _sse
-            self.content_length += len(_sse.encode("utf-8"))
-            self._billing.create_egress_events(self.content_length / (1024**3))
+            if (data := self._sse.flush()) is not None:
+                yield data
+            yield self._sse.passthrough(SSE_DONE)
+            self._billing.create_egress_events(self._sse.num_bytes / (1024**3))
         else:
             yield MultiRowCompletionResponse(rows=list(rows.values()))
 
@@ -460,6 +490,8 @@ class GenExecutor(_Executor):
         body: RowAdd | RowRegen,
         col_batch_size: int,
         row_batch_size: int,
+        code_batcher: CodeBatcher | None = None,
+        history_max_turns: int | None = None,
     ) -> None:
         super().__init__(
             request=request,
@@ -470,6 +502,8 @@ class GenExecutor(_Executor):
             col_batch_size=col_batch_size,
             row_batch_size=row_batch_size,
         )
+        self._code_batcher = code_batcher
+        self._history_max_turns = history_max_turns
 
         # Engines
         self.lm = LMEngine(organization=organization, project=project, request=request)
@@ -718,6 +752,7 @@ class GenExecutor(_Executor):
                         column_id=output_column,
                         row_id="" if self._regen_strategy is None else self._row_id,
                         include_row=False,
+                        max_turns=self._history_max_turns,
                     )
                 ).thread
             else:
@@ -1094,6 +1129,8 @@ class GenExecutor(_Executor):
             # Replace error columns with None value
             for ec in error_cols:
                 row_data[ec] = None
+            # Only load and send the columns that the code reads
+            row_data = select_row_columns(source_code, row_data, output_column)
             for k, v in row_data.items():
                 col = next((col for col in self.table.column_metadata if col.column_id == k), None)
                 if col and (col.dtype == ColumnDtype.AUDIO or col.dtype == ColumnDtype.IMAGE):
@@ -1245,13 +1282,22 @@ class GenExecutor(_Executor):
             # Replace error columns with None value
             for ec in error_cols:
                 row_data[ec] = None
+            # Only load and send the columns that the code reads
+            row_data = select_row_columns(body.python_code, row_data, output_column)
             for k, v in row_data.items():
                 col = next((col for col in self.table.column_metadata if col.column_id == k), None)
                 if col and (col.dtype == ColumnDtype.AUDIO or col.dtype == ColumnDtype.IMAGE):
                     file_binary, _ = await _load_uri_as_bytes(v)
                     row_data[k] = file_binary
 
-            if body.python_code:
+            if body.python_code and body.batch and self._code_batcher is not None:
+                result = await self._code_batcher.submit(
+                    source_code=body.python_code,
+                    output_column=output_column,
+                    row_data=row_data,
+                    dtype=task.dtype,
+                )
+            elif body.python_code:
                 result = await code_executor(
                     request=self.request,
                     organization_id=self.organization.id,
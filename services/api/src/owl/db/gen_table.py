@@ -5,7 +5,7 @@ from asyncio import Semaphore
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import lru_cache
+from functools import lru_cache, wraps
 from inspect import iscoroutinefunction
 from pathlib import Path
 from time import perf_counter
@@ -93,6 +93,7 @@ from owl.types import (
     TextContent,
 )
 from owl.utils import merge_dict, uuid7_draft2_str, validate_where_expr
+from owl.utils.cache import LRUCache
 from owl.utils.crypt import hash_string_blake2b as blake2b_hash
 from owl.utils.dates import now, utc_datetime_from_iso
 from owl.utils.exceptions import (
@@ -529,6 +530,41 @@ class DBengine:
 
 
 GENTABLE_ENGINE = DBengine()
+# Maps "<schema ID>:<table ID>" to (Redis metadata version, table metadata, column metadata, row model)
+# of opened tables. Entries are only served while their version matches the one in Redis.
+_TABLE_META_CACHE: LRUCache[
+    tuple[str, TableMetadata, list[ColumnMetadata], Type[DataTableRow]]
+] = LRUCache(maxsize=1000, ttl_sec=ENV_CONFIG.table_meta_cache_ttl_sec)
+
+
+async def _bump_table_meta_version(schema_id: str, table_id: str | None = None) -> None:
+    # The change has already been committed, so a Redis error must not fail the request
+    try:
+        await CACHE.bump_table_meta_version(schema_id, table_id)
+    except Exception as e:
+        logger.warning(f'Failed to bump metadata version of "{schema_id}:{table_id}": {repr(e)}')
+
+
+def _evicts_table_meta(func):
+    """
+    Evicts the table's `_TABLE_META_CACHE` entry once the wrapped table or column mutation
+    returns (or fails), ie after its transaction has been committed or rolled back.
+    Evicting only then prevents a concurrent `open_table` from re-caching stale metadata.
+    The table's metadata version in Redis is bumped too, so that other processes drop their entries.
+    """
+
+    @wraps(func)
+    async def wrapper(self: "GenerativeTableCore", *args, **kwargs):
+        table_id = self.table_id
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            # `rename_table` changes the table ID in-place
+            for _table_id in {table_id, self.table_id}:
+                _TABLE_META_CACHE.delete(f"{self.schema_id}:{_table_id}")
+                await _bump_table_meta_version(self.schema_id, _table_id)
+
+    return wrapper
 
 
 class GenerativeTableCore:
@@ -550,6 +586,7 @@ class GenerativeTableCore:
         column_metadata_list: list[ColumnMetadata],
         num_rows: int = -1,
         request_id: str = "",
+        data_table_model: Type[DataTableRow] | None = None,
     ) -> None:
         self.project_id = project_id
         self.table_type = table_type
@@ -565,9 +602,11 @@ class GenerativeTableCore:
             "short_id": table_metadata.short_id,
             "schema_id": self.schema_id,
         }
-        self.data_table_model = self._create_data_table_row_model(
-            table_metadata.table_id, column_metadata_list
-        )
+        if data_table_model is None:
+            data_table_model = self._create_data_table_row_model(
+                table_metadata.table_id, column_metadata_list
+            )
+        self.data_table_model = data_table_model
         self.text_column_names = [
             col.column_id for col in self.column_metadata if col.is_text_column
         ]
@@ -1249,6 +1288,7 @@ class GenerativeTableCore:
         table_type: TableType,
         table_id: str,
         request_id: str = "",
+        count_rows: bool = True,
     ) -> Self:
         """
         Open an existing table.
@@ -1259,6 +1299,8 @@ class GenerativeTableCore:
             table_type (str): Table type.
             table_id (str): Name of the table.
             request_id (str, optional): Request ID for logging. Defaults to "".
+            count_rows (bool, optional): Whether to count the rows of the table.
+                Defaults to True.
 
         Returns:
             self (GenerativeTableCore): The table instance.
@@ -1296,7 +1338,8 @@ class GenerativeTableCore:
             ],
             request_id=request_id,
         )
-        await self._count_rows(conn)
+        if count_rows:
+            await self._count_rows(conn)
         return self
 
     async def _reload_table(self, conn: Connection) -> Self:
@@ -1611,6 +1654,9 @@ class GenerativeTableCore:
             for table_type in TableType:
                 schema_id = f"{project_id}_{table_type}"
                 await conn.execute(f'DROP SCHEMA IF EXISTS "{schema_id}" CASCADE')
+        for table_type in TableType:
+            _TABLE_META_CACHE.delete_prefix(f"{project_id}_{table_type}:")
+            await _bump_table_meta_version(f"{project_id}_{table_type}")
 
     @classmethod
     async def drop_schema(
@@ -1630,6 +1676,8 @@ class GenerativeTableCore:
         }
         async with GENTABLE_ENGINE.transaction(meta=_meta) as conn:
             await conn.execute(f'DROP SCHEMA IF EXISTS "{schema_id}" CASCADE')
+        _TABLE_META_CACHE.delete_prefix(f"{schema_id}:")
+        await _bump_table_meta_version(schema_id)
 
     ### --- Table CRUD --- ###
 
@@ -1855,6 +1903,8 @@ class GenerativeTableCore:
         table_id: str,
         created_by: str | None = None,
         request_id: str = "",
+        count_rows: bool = True,
+        use_cache: bool = False,
     ) -> Self:
         """
         Open an existing table.
@@ -1866,26 +1916,69 @@ class GenerativeTableCore:
             created_by (str | None, optional): User who created the table.
                 If provided, will check if the table was created by the user. Defaults to None (any user).
             request_id (str, optional): Request ID for logging. Defaults to "".
+            count_rows (bool, optional): Whether to count the rows of the table.
+                Defaults to True.
+            use_cache (bool, optional): Whether to reuse table and column metadata opened within
+                the last `table_meta_cache_ttl_sec` by this process. Cached metadata is only reused
+                if the table's metadata version in Redis is unchanged, so table and column changes
+                made by any process are visible immediately. Rows are never counted when
+                the cache is hit. Defaults to False.
 
         Returns:
             self (GenerativeTableCore): The table instance.
         """
-        _meta = {
-            "project_id": project_id,
-            "table_type": table_type,
-            "table_id": table_id,
-        }
-        async with GENTABLE_ENGINE.transaction(meta=_meta) as conn:
-            table = await cls._open_table(
-                conn=conn,
+        schema_id = f"{project_id}_{table_type}"
+        cache_key = f"{schema_id}:{table_id}"
+        cached = version = None
+        if use_cache:
+            try:
+                # Read before opening, so that a concurrent change makes the new entry stale
+                version = await CACHE.get_table_meta_version(schema_id, table_id)
+            except Exception as e:
+                logger.warning(f'Failed to get metadata version of "{cache_key}": {repr(e)}')
+            else:
+                cached = _TABLE_META_CACHE.get(cache_key)
+                if cached is not None and cached[0] != version:
+                    _TABLE_META_CACHE.delete(cache_key)
+                    cached = None
+        if cached is None:
+            _meta = {
+                "project_id": project_id,
+                "table_type": table_type,
+                "table_id": table_id,
+            }
+            async with GENTABLE_ENGINE.transaction(meta=_meta) as conn:
+                table = await cls._open_table(
+                    conn=conn,
+                    project_id=project_id,
+                    table_type=table_type,
+                    table_id=table_id,
+                    request_id=request_id,
+                    count_rows=count_rows,
+                )
+            if version is not None:
+                _TABLE_META_CACHE.set(
+                    cache_key,
+                    (
+                        version,
+                        table.table_metadata.model_copy(deep=True),
+                        [c.model_copy(deep=True) for c in table.column_metadata],
+                        table.data_table_model,
+                    ),
+                )
+        else:
+            _, table_metadata, column_metadata, data_table_model = cached
+            table = cls(
                 project_id=project_id,
                 table_type=table_type,
-                table_id=table_id,
+                table_metadata=table_metadata.model_copy(deep=True),
+                column_metadata_list=[c.model_copy(deep=True) for c in column_metadata],
                 request_id=request_id,
+                data_table_model=data_table_model,
             )
-            if created_by is not None and table.table_metadata.created_by != created_by:
-                raise ResourceNotFoundError(f'Table "{table_id}" not found.')
-            return table
+        if created_by is not None and table.table_metadata.created_by != created_by:
+            raise ResourceNotFoundError(f'Table "{table_id}" not found.')
+        return table
 
     @classmethod
     async def list_tables(
@@ -2057,6 +2150,7 @@ class GenerativeTableCore:
         return self.num_rows
 
     # Table Update Ops
+    @_evicts_table_meta
     async def rename_table(self, table_id_dst: TableName) -> Self:
         """
         Rename a table.
@@ -2127,6 +2221,7 @@ class GenerativeTableCore:
             except DuplicateTableError as e:
                 raise ResourceExistsError(f'Table "{table_id_dst}" already exists.') from e
 
+    @_evicts_table_meta
     async def update_table_title(self, title: str) -> Self:
         """
         Update the table title.
@@ -2144,6 +2239,7 @@ class GenerativeTableCore:
         return self
 
     # Table Delete Ops
+    @_evicts_table_meta
     async def drop_table(self) -> None:
         """
         Drop the table.
@@ -2910,6 +3006,7 @@ class GenerativeTableCore:
     ### --- Column CRUD --- ###
 
     # Column Create Ops
+    @_evicts_table_meta
     async def add_column(
         self,
         metadata: ColumnMetadata,
@@ -3005,6 +3102,7 @@ class GenerativeTableCore:
 
     # Column Read ops are implemented as table ops
     # Column Update Ops
+    @_evicts_table_meta
     async def rename_columns(
         self,
         column_map: dict[str, ColName],
@@ -3133,6 +3231,7 @@ class GenerativeTableCore:
             await self._set_updated_at(conn)
             return await self._reload_table(conn)
 
+    @_evicts_table_meta
     async def update_gen_config(
         self,
         update_mapping: dict[str, DiscriminatedGenConfig | None],
@@ -3217,6 +3316,7 @@ class GenerativeTableCore:
             )
         return self
 
+    @_evicts_table_meta
     async def reorder_columns(
         self,
         column_names: list[str],
@@ -3261,6 +3361,7 @@ class GenerativeTableCore:
             return await self._reload_table(conn)
 
     # Column Delete Ops
+    @_evicts_table_meta
     async def drop_columns(
         self,
         column_ids: list[str],
@@ -3786,6 +3887,8 @@ class GenerativeTableCore:
         column_id: str,
         row_id: str = "",
         include_row: bool = True,
+        max_turns: int | None = None,
+        offset: int = 0,
     ) -> ChatThreadResponse:
         """
         Get a conversation thread for a multi-turn LLM column.
@@ -3796,28 +3899,89 @@ class GenerativeTableCore:
                 Defaults to "" (export all rows)..
             include_row (bool, optional): Whether to include the row specified by `row_id`.
                 Defaults to True.
+            max_turns (int | None, optional): Only include the last N rows (turns) of the thread.
+                Defaults to None (include all rows).
+            offset (int, optional): Number of latest rows (turns) to skip. Defaults to 0.
 
         Returns:
             response (ChatThreadResponse): _description_
         """
-        gen_config = self.check_multiturn_column(column_id)
-        ref_col_ids = re.findall(GEN_CONFIG_VAR_PATTERN, gen_config.prompt)
-        columns = ref_col_ids + [column_id]
+        threads = await self.get_conversation_threads(
+            [column_id],
+            row_id=row_id,
+            include_row=include_row,
+            max_turns=max_turns,
+            offset=offset,
+        )
+        return threads[column_id]
+
+    async def get_conversation_threads(
+        self,
+        column_ids: list[str],
+        *,
+        row_id: str = "",
+        include_row: bool = True,
+        max_turns: int | None = None,
+        offset: int = 0,
+    ) -> dict[str, ChatThreadResponse]:
+        """
+        Get conversation threads for multiple multi-turn LLM columns.
+        The rows are read once, with only the columns needed by the threads.
+
+        Args:
+            column_ids (list[str]): IDs of the multi-turn LLM columns.
+            row_id (str, optional): ID of the last row in the threads.
+                Defaults to "" (export all rows).
+            include_row (bool, optional): Whether to include the row specified by `row_id`.
+                Defaults to True.
+            max_turns (int | None, optional): Only include the last N rows (turns) of the threads.
+                Defaults to None (include all rows).
+            offset (int, optional): Number of latest rows (turns) to skip. Defaults to 0.
+
+        Returns:
+            threads (dict[str, ChatThreadResponse]): Mapping of column ID to its thread.
+        """
+        gen_configs = {c: self.check_multiturn_column(c) for c in column_ids}
+        # No columns would otherwise read every column of every row
+        if len(gen_configs) == 0:
+            return {}
+        columns = list(
+            dict.fromkeys(
+                col
+                for column_id, gen_config in gen_configs.items()
+                for col in re.findall(GEN_CONFIG_VAR_PATTERN, gen_config.prompt) + [column_id]
+            )
+        )
         if row_id:
             where = '"ID" ' + (f"<= '{row_id}'" if include_row else f"< '{row_id}'")
         else:
             where = ""
+        # The latest turns are selected in descending order and then reversed
+        latest_first = max_turns is not None or offset > 0
         rows = (
             await self.list_rows(
-                limit=None,
-                offset=0,
+                limit=max_turns,
+                offset=offset,
                 order_by=None,
-                order_ascending=True,
+                order_ascending=not latest_first,
                 columns=columns,
                 where=where,
                 remove_state_cols=False,
             )
         ).items
+        if latest_first:
+            rows.reverse()
+        return {
+            column_id: self._build_conversation_thread(column_id, gen_config, rows)
+            for column_id, gen_config in gen_configs.items()
+        }
+
+    def _build_conversation_thread(
+        self,
+        column_id: str,
+        gen_config: LLMGenConfig,
+        rows: list[dict[str, Any]],
+    ) -> ChatThreadResponse:
         ref_cols = set(re.findall(GEN_CONFIG_VAR_PATTERN, gen_config.prompt))
         has_user_prompt = "User" in ref_cols
         thread = []
@@ -4471,6 +4635,8 @@ class ActionTable(GenerativeTableCore):
         table_id: str,
         created_by: str | None = None,
         request_id: str = "",
+        count_rows: bool = True,
+        use_cache: bool = False,
     ) -> Self:
         """
         Open an existing table.
@@ -4481,6 +4647,10 @@ class ActionTable(GenerativeTableCore):
             created_by (str | None, optional): User who created the table.
                 If provided, will check if the table was created by the user. Defaults to None (any user).
             request_id (str, optional): Request ID for logging. Defaults to "".
+            count_rows (bool, optional): Whether to count the rows of the table.
+                Defaults to True.
+            use_cache (bool, optional): Whether to reuse recently opened metadata.
+                See `GenerativeTableCore.open_table`. Defaults to False.
 
         Returns:
             self (GenerativeTableCore): The table instance.
@@ -4491,6 +4661,8 @@ class ActionTable(GenerativeTableCore):
             table_id=table_id,
             created_by=created_by,
             request_id=request_id,
+            count_rows=count_rows,
+            use_cache=use_cache,
         )
 
     @classmethod
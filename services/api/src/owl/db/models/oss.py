@@ -1,14 +1,17 @@
 from base64 import urlsafe_b64decode, urlsafe_b64encode
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from functools import lru_cache
-from typing import Any, Self, Type, TypeVar
+from typing import Any, ClassVar, Self, Type, TypeVar
 
+from loguru import logger
 from pydantic import BaseModel, computed_field
 from pydantic_extra_types.currency_code import ISO4217
 from pydantic_extra_types.timezone_name import TimeZoneName
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import declared_attr, selectinload
-from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.base import Executable, ExecutableOption
+from sqlalchemy.sql.expression import ClauseElement
 from sqlmodel import (
     VARCHAR,
     AutoString,
@@ -79,12 +82,21 @@ def _encode_cursor(values: dict[str, Any]) -> str:
 
 
 def _decode_cursor(token: str) -> dict[str, Any]:
-    raw = json_loads(urlsafe_b64decode(token.encode()).decode())
-    if "created_at" in raw and isinstance(raw["created_at"], str):
-        raw["created_at"] = datetime.fromisoformat(raw["created_at"])
-    elif "updated_at" in raw and isinstance(raw["updated_at"], str):
-        raw["updated_at"] = datetime.fromisoformat(raw["updated_at"])
-    return raw
+    return json_loads(urlsafe_b64decode(token.encode()).decode())
+
+
+class _Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a statement, executed with the statement's own bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: SelectBase) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kwargs) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
 
 
 def _relationship(
@@ -136,6 +148,8 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
         sa_type=DateTime(timezone=True),
         description="Update datetime (UTC).",
     )
+    # Columns with trigram GIN indexes (created by `migrate_db`) that back `search_query` filters
+    search_index_cols: ClassVar[tuple[str, ...]] = ()
 
     @classmethod
     @lru_cache(maxsize=1)
@@ -235,6 +249,17 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
             selection = selection.where(and_(allow, ~block_list.contains([filter_id])))
         return selection
 
+    @classmethod
+    def _cursor_value(cls, column_name: str, value: Any) -> Any:
+        """Convert a cursor value decoded from JSON back into the column's type."""
+        if isinstance(value, str):
+            column_type = getattr(cls, column_name).type
+            if isinstance(column_type, DateTime):
+                return datetime.fromisoformat(value)
+            if isinstance(column_type, Numeric):
+                return Decimal(value)
+        return value
+
     @classmethod
     def _pagination(
         cls,
@@ -251,6 +276,11 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
         if order_col is None:
             raise BadInputError(f'Unable to order by column "{order_by}" as it does not exist.')
         is_nullable = order_col.nullable
+        # Postgres ordering on Linux seems to be case-insensitive by default
+        # https://dba.stackexchange.com/a/131471
+        # Apply LOWER() on text columns
+        is_text = order_by in cls.str_cols()
+        pk_cols = tuple(getattr(cls, pk) for pk in cls.pk())
         # Postgres index sorts nulls last (nulls are larger than non-null)
         # But it is hard to get a string null coalesce value, so we sort null first
         null_order_func = nulls_first if order_ascending else nulls_last
@@ -268,13 +298,14 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
             except Exception as e:
                 raise BadInputError(f'Pagination failed due to invalid cursor: "{cursor}"') from e
             try:
-                pk_cols = tuple(getattr(cls, pk) for pk in cls.pk())
-                pk_vals = tuple(vals[pk] for pk in cls.pk())
-                cmp_val = vals[order_by]
+                pk_vals = tuple(cls._cursor_value(pk, vals[pk]) for pk in cls.pk())
+                cmp_val = cls._cursor_value(order_by, vals[order_by])
             except KeyError as e:
                 raise BadInputError(
                     f'Unable to order by column "{order_by}" as it is not found in the cursor.'
                 ) from e
+            except (TypeError, ValueError, ArithmeticError) as e:
+                raise BadInputError(f'Pagination failed due to invalid cursor: "{cursor}"') from e
             if is_nullable:
                 # This is mainly for JamaiBase rather than TokenVisor
                 if isinstance(order_col.type, Integer):
@@ -283,6 +314,8 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
                     coalesce_val = literal(float("-inf"))
                 elif isinstance(order_col.type, Boolean):
                     coalesce_val = False
+                elif isinstance(order_col.type, DateTime):
+                    coalesce_val = literal(datetime.min.replace(tzinfo=timezone.utc))
                 else:
                     coalesce_val = ""
                 # else:
@@ -291,20 +324,20 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
                 #     )
                 if cmp_val is None:
                     cmp_val = coalesce_val
-                order_by_expr = func.coalesce(order_col, coalesce_val)
+                cmp_expr = func.coalesce(order_col, coalesce_val)
             else:
-                order_by_expr = order_col
-            filter_cond = or_(
-                getattr(order_by_expr, op)(cmp_val),
-                and_(order_by_expr == cmp_val, getattr(tuple_(*pk_cols), op)(pk_vals)),
+                cmp_expr = order_col
+            # Compare with the same expression that rows are ordered by
+            if is_text:
+                cmp_expr = func.lower(cmp_expr)
+                cmp_val = func.lower(cmp_val)
+            # A row value comparison can be served by a composite index on the sort keys
+            selection = selection.where(
+                getattr(tuple_(cmp_expr, *pk_cols), op)(tuple_(cmp_val, *pk_vals))
             )
-            selection = selection.where(filter_cond)
         else:
             selection = selection.offset(offset)
-        # Postgres ordering on Linux seems to be case-insensitive by default
-        # https://dba.stackexchange.com/a/131471
-        # Apply LOWER() on text columns
-        if order_by in cls.str_cols():
+        if is_text:
             order_col = func.lower(order_col)
         # Determine order function based on sort direction
         order_func = asc if order_ascending else desc
@@ -313,16 +346,17 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
             order_by_expr = null_order_func(order_func(order_col))
         else:
             order_by_expr = order_func(order_col)
-        selection = selection.order_by(
-            order_by_expr, *(order_func(getattr(cls, pk)) for pk in cls.pk())
-        )
+        selection = selection.order_by(order_by_expr, *(order_func(pk) for pk in pk_cols))
         if limit is not None:
             selection = selection.limit(limit)
         return selection
 
     def _generate_cursor(self, order_by: str) -> str:
-        cursor_keys = [order_by, *self.pk()]
-        cursor_values = {k: getattr(self, k) for k in cursor_keys}
+        cursor_values = {}
+        for k in [order_by, *self.pk()]:
+            v = getattr(self, k)
+            # Decimals are not JSON serialisable
+            cursor_values[k] = str(v) if isinstance(v, Decimal) else v
         return _encode_cursor(cursor_values)
 
     @classmethod
@@ -364,6 +398,40 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
         )
         return items, total
 
+    @classmethod
+    async def _explain(cls, session: AsyncSession, selection: SelectBase) -> dict[str, Any]:
+        """Return the root node of the query plan of a statement."""
+        conn = await session.connection()
+        plan = (await conn.execute(_Explain(selection))).scalar_one()
+        if isinstance(plan, str):
+            plan = json_loads(plan)
+        return plan[0]["Plan"]
+
+    @classmethod
+    async def _count(cls, session: AsyncSession, total: SelectOfScalar[int]) -> tuple[int, bool]:
+        """
+        Run a count query. If `db_list_count_estimate_min_rows` is set and the query planner expects
+        at least that many matching rows, its estimate is returned instead of counting them.
+
+        Returns:
+            total (int): Number of matching rows.
+            is_estimate (bool): Whether `total` is the query planner's estimate.
+        """
+        min_rows = ENV_CONFIG.db_list_count_estimate_min_rows
+        if min_rows > 0:
+            try:
+                # Plan the matching rows rather than the aggregate
+                plan = await cls._explain(
+                    session, total.with_only_columns(literal(1)).select_from(cls)
+                )
+                estimate = int(plan["Plan Rows"])
+            except Exception as e:
+                logger.warning(f'Failed to estimate row count of "{cls.__name__}": {repr(e)}')
+            else:
+                if estimate >= min_rows:
+                    return estimate, True
+        return (await session.exec(total)).one(), False
+
     @classmethod
     async def _fetch_list_and_cursor(
         cls,
@@ -371,14 +439,16 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
         items: SelectOfScalar[Self],
         total: SelectOfScalar[int],
         order_by: str,
-    ) -> tuple[list[Self], int, str | None]:
+        limit: int | None = None,
+    ) -> tuple[list[Self], int, bool, str | None]:
         items: list[Self] = (await session.exec(items)).all()
-        total: int = (await session.exec(total)).one()
-        if items:
+        total, total_is_estimate = await cls._count(session, total)
+        # A short page is the last one, so there is no cursor to continue from
+        if items and limit is not None and len(items) >= limit:
             end_cursor = items[-1]._generate_cursor(order_by)
         else:
             end_cursor = None
-        return items, total, end_cursor
+        return items, total, total_is_estimate, end_cursor
 
     @classmethod
     async def create(
@@ -421,17 +491,19 @@ class _TableBase(JamaiSQLModel, str_strip_whitespace=True):
             options=options,
             after=after,
         )
-        items, total, end_cursor = await cls._fetch_list_and_cursor(
+        items, total, total_is_estimate, end_cursor = await cls._fetch_list_and_cursor(
             session=session,
             items=items,
             total=total,
             order_by=order_by,
+            limit=limit,
         )
         return Page[return_type](
             items=items,
             offset=offset,
             limit=total if limit is None else limit,
             total=total,
+            total_is_estimate=total_is_estimate,
             end_cursor=end_cursor,
         )
 
@@ -537,6 +609,7 @@ class PricePlan(_TableBase, table=True):
             "If empty, all orgs are allowed."
         ),
     )
+    search_index_cols: ClassVar[tuple[str, ...]] = ("name",)
     organizations: "Organization" = _relationship("price_plan", selectin=False)
 
     @computed_field(description="Stripe Price ID.")
@@ -584,17 +657,19 @@ class PricePlan(_TableBase, table=True):
         # Filter
         items = items.where(cls.allowed_orgs == [])
         total = total.where(cls.allowed_orgs == [])
-        items, total, end_cursor = await cls._fetch_list_and_cursor(
+        items, total, total_is_estimate, end_cursor = await cls._fetch_list_and_cursor(
             session=session,
             items=items,
             total=total,
             order_by=order_by,
+            limit=limit,
         )
         return Page[return_type](
             items=items,
             offset=offset,
             limit=total if limit is None else limit,
             total=total,
+            total_is_estimate=total_is_estimate,
             end_cursor=end_cursor,
         )
 
@@ -625,17 +700,19 @@ class PricePlan(_TableBase, table=True):
             filters=filters,
             after=after,
         )
-        items, total, end_cursor = await cls._fetch_list_and_cursor(
+        items, total, total_is_estimate, end_cursor = await cls._fetch_list_and_cursor(
             session=session,
             items=items,
             total=total,
             order_by=order_by,
+            limit=limit,
         )
         return Page[return_type](
             items=items,
             offset=offset,
             limit=total if limit is None else limit,
             total=total,
+            total_is_estimate=total_is_estimate,
             end_cursor=end_cursor,
         )
 
@@ -686,6 +763,7 @@ class Deployment(_TableBase, table=True):
         sa_type=DateTime(timezone=True),
         description="Cooldown until datetime (UTC).",
     )
+    search_index_cols: ClassVar[tuple[str, ...]] = ("name",)
     model: "ModelConfig" = _relationship("deployments")
 
 
@@ -848,6 +926,7 @@ class ModelConfig(ModelInfo, table=True):
             "Can be zero. Negative values will be overridden with a default value."
         ),
     )
+    search_index_cols: ClassVar[tuple[str, ...]] = ("id", "name")
     deployments: list[Deployment] = _relationship("model")
 
     @computed_field(
@@ -904,17 +983,19 @@ class ModelConfig(ModelInfo, table=True):
             subquery = select(Deployment).where(Deployment.model_id == cls.id)
             items = items.where(exists(subquery))
             total = total.where(exists(subquery))
-        items, total, end_cursor = await cls._fetch_list_and_cursor(
+        items, total, total_is_estimate, end_cursor = await cls._fetch_list_and_cursor(
             session=session,
             items=items,
             total=total,
             order_by=order_by,
+            limit=limit,
         )
         return Page[return_type](
             items=items,
             offset=offset,
             limit=total if limit is None else limit,
             total=total,
+            total_is_estimate=total_is_estimate,
             end_cursor=end_cursor,
         )
 
@@ -1045,6 +1126,7 @@ class User(_TableBase, table=True):
         sa_type=DateTime(timezone=True),
         description="GitHub user info update datetime (UTC).",
     )
+    search_index_cols: ClassVar[tuple[str, ...]] = ("name", "email")
     org_memberships: list[OrgMember] = _relationship("user")
     proj_memberships: list[ProjectMember] = _relationship("user")
     organizations: list["Organization"] = _relationship(None, link_model=OrgMember, selectin=False)
@@ -1291,6 +1373,7 @@ class Organization(_TableBase, table=True):
     owner: str = SqlField(
         description="ID of the user that owns this organization.",
     )
+    search_index_cols: ClassVar[tuple[str, ...]] = ("name",)
     users: list[User] = _relationship("organizations", link_model=OrgMember, selectin=False)
     members: list[OrgMember] = _relationship("organization", selectin=False)
     projects: list["Project"] = _relationship("organization", selectin=False)
@@ -1433,6 +1516,10 @@ class Project(_TableBase, table=True):
         None,
         description="URL of the cover picture.",
     )
+    llm_response_cache: bool = SqlField(
+        False,
+        description="Whether to cache LLM chat completion responses of deterministic requests.",
+    )
     created_by: str = SqlField(
         description="ID of the user that created this project.",
     )
@@ -1445,6 +1532,7 @@ class Project(_TableBase, table=True):
         foreign_key="User.id",
         description="ID of the user that owns this organization.",
     )
+    search_index_cols: ClassVar[tuple[str, ...]] = ("name",)
     organization: Organization = _relationship("projects")
     users: list[User] = _relationship("projects", link_model=ProjectMember, selectin=False)
     members: list[ProjectMember] = _relationship("project", selectin=False)
@@ -1485,17 +1573,19 @@ class Project(_TableBase, table=True):
             )
             items = items.where(exists(subquery))
             total = total.where(exists(subquery))
-        items, total, end_cursor = await cls._fetch_list_and_cursor(
+        items, total, total_is_estimate, end_cursor = await cls._fetch_list_and_cursor(
             session=session,
             items=items,
             total=total,
             order_by=order_by,
+            limit=limit,
         )
         return Page[return_type](
             items=items,
             offset=offset,
             limit=total if limit is None else limit,
             total=total,
+            total_is_estimate=total_is_estimate,
             end_cursor=end_cursor,
         )
 
@@ -1638,6 +1728,21 @@ class NotificationGroup(_TableBase, table=True):
         "",
         description="Notification message text (Markdown).",
     )
+    fan_out_cursor: str = SqlField(
+        "",
+        description="ID of the last recipient that the notification is fanned out to.",
+    )
+    fan_out_count: int = SqlField(
+        0,
+        description="Number of recipients that the notification is fanned out to.",
+    )
+    fan_out_completed_at: DatetimeUTC | None = SqlField(
+        None,
+        sa_type=DateTime(timezone=True),
+        nullable=True,
+        index=True,
+        description="Datetime when the fan-out completed (UTC).",
+    )
     actor: "User" = _relationship(
         None,
         selectin=True,
@@ -34,6 +34,7 @@ from owl.routers.projects import v1 as projects_v1
 from owl.types import UserAgent
 from owl.utils import uuid7_str
 from owl.utils.billing import CLICKHOUSE_CLIENT, BillingManager
+from owl.utils.code import CODE_EXECUTOR_POOL
 from owl.utils.exceptions import JamaiException
 from owl.utils.handlers import exception_handler, make_request_log_str, path_not_found_handler
 from owl.utils.io import HTTP_ACLIENT
@@ -94,8 +95,9 @@ async def lifespan(app: FastAPI):
     finally:
         await CLICKHOUSE_CLIENT.close()
 
-    # Close HTTPX client
+    # Close HTTPX clients
     await HTTP_ACLIENT.aclose()
+    await CODE_EXECUTOR_POOL.aclose()
     logger.info("Shutdown complete.")
 
 
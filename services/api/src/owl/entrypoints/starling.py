@@ -108,6 +108,16 @@ if ENV_CONFIG.service_key_plain != "":
         "schedule": timedelta(seconds=ENV_CONFIG.flush_clickhouse_buffer_sec),
     }
 
+celery_app.conf.beat_schedule["periodic-resume-notification-fan-outs"] = {
+    "task": "owl.tasks.database.run_periodic_resume_notification_fan_outs",
+    "schedule": timedelta(seconds=ENV_CONFIG.notification_fan_out_stale_sec),
+}
+
+celery_app.conf.beat_schedule["periodic-abort-table-import-uploads"] = {
+    "task": "owl.tasks.gen_table.run_periodic_abort_table_import_uploads",
+    "schedule": crontab(minute="30", hour="*"),
+}
+
 # Check if S3-related environment variables are present and non-empty
 if all(
     getattr(ENV_CONFIG, attr, "")  # Use getattr to safely access attributes
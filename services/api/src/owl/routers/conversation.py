@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 from loguru import logger
 
+from owl.configs import ENV_CONFIG
 from owl.db.gen_executor import MultiRowGenExecutor
 from owl.db.gen_table import ChatTable
 from owl.types import (
@@ -33,6 +34,7 @@ from owl.utils.billing import BillingManager
 from owl.utils.exceptions import ResourceNotFoundError, handle_exception
 from owl.utils.lm import LMEngine
 from owl.utils.mcp import MCP_TOOL_TAG
+from owl.utils.sse import SSE_DONE
 
 router = APIRouter()
 
@@ -142,7 +144,7 @@ async def create_conversation(
 
         generator = await executor.generate()
         async for chunk in generator:
-            if body.title is None and chunk == "data: [DONE]\n\n":
+            if body.title is None and chunk == SSE_DONE:
                 try:
                     await _generate_and_save_title(
                         request=request,
@@ -384,8 +386,13 @@ async def send_message(
     # Validate data early
     row_data = MultiRowAddRequest(table_id=conversation_id, data=[body.data], stream=True)
     try:
+        # Time-to-first-token matters here, so reuse recently opened metadata and skip row count
         table = await ChatTable.open_table(
-            project_id=project.id, table_id=conversation_id, created_by=user.id
+            project_id=project.id,
+            table_id=conversation_id,
+            created_by=user.id,
+            count_rows=False,
+            use_cache=True,
         )
     except ResourceNotFoundError as e:
         raise ResourceNotFoundError(f'Conversation "{conversation_id}" not found.') from e
@@ -396,12 +403,14 @@ async def send_message(
     billing.has_db_storage_quota()
     billing.has_egress_quota()
 
+    # The row is only written after generation completes, in a single transaction
     executor = MultiRowGenExecutor(
         request=request,
         table=table,
         organization=org,
         project=project,
         body=row_data,
+        history_max_turns=ENV_CONFIG.conversation_max_history_turns or None,
     )
 
     return StreamingResponse(
@@ -563,12 +572,12 @@ async def get_threads(
     elif table.table_metadata.created_by != user.id:
         raise ResourceNotFoundError(f'Conversation "{table_id}" not found.')
     if params.column_ids:
-        for column_id in params.column_ids:
-            table.check_multiturn_column(column_id)
         cols = params.column_ids
     else:
         cols = [c.column_id for c in table.column_metadata if c.is_chat_column]
     return ConversationThreadsResponse(
-        threads={c: await table.get_conversation_thread(column_id=c) for c in cols},
+        threads=await table.get_conversation_threads(
+            cols, max_turns=params.limit, offset=params.offset
+        ),
         conversation_id=table_id,
     )
@@ -1,10 +1,12 @@
 import os
 from os.path import splitext
-from typing import Annotated
+from typing import Annotated, AsyncGenerator
 from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, Request, Response, UploadFile
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.datastructures import MutableHeaders
 
 from owl.configs import ENV_CONFIG
 from owl.types import (
@@ -33,22 +35,57 @@ from owl.utils.io import (
 router = APIRouter()
 
 
+# Request headers forwarded to S3 for range and conditional requests
+_PROXY_REQUEST_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+# Hop-by-hop headers must not be passed through
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "upgrade"}
+_PROXY_CHUNK_BYTES = 64 * 1024
+
+
 @router.get("/v2/files/{path:path}")
 @router.get("/v1/files/{path:path}", deprecated=True)
 @handle_exception
 async def proxy_file(request: Request, path: str) -> Response:
+    """
+    Stream a file from S3.
+    `Range` and conditional request headers are forwarded to S3, so single range requests
+    return 206 Partial Content and unchanged files (`ETag` / `Last-Modified`) return 304.
+    """
     encoded_path = quote(path)
     original_url = f"{ENV_CONFIG.s3_endpoint}/{encoded_path}?{request.query_params}"
-    response = await HTTP_ACLIENT.get(original_url)
+    upstream = await HTTP_ACLIENT.send(
+        HTTP_ACLIENT.build_request(
+            "GET",
+            original_url,
+            headers={k: v for k in _PROXY_REQUEST_HEADERS if (v := request.headers.get(k))},
+        ),
+        stream=True,
+    )
+    # Case-insensitive, so that the overrides below replace the upstream headers
+    headers = MutableHeaders()
+    for k, v in upstream.headers.multi_items():
+        if k.lower() not in _HOP_BY_HOP_HEADERS:
+            headers.append(k, v)
     # Set the Content-Disposition header
-    response.headers["Content-Disposition"] = "inline"
+    headers["Content-Disposition"] = "inline"
     # Usually we can get the MIME type from S3 metadata
-    if "Content-Type" not in response.headers:
-        response.headers["Content-Type"] = guess_mime(path)
-    return Response(
-        content=response.content,
-        status_code=response.status_code,
-        headers=response.headers,
+    if "content-type" not in headers:
+        headers["Content-Type"] = guess_mime(path)
+
+    async def _stream() -> AsyncGenerator[bytes, None]:
+        try:
+            # Raw bytes, so that Content-Length and Content-Encoding stay valid
+            async for chunk in upstream.aiter_raw(_PROXY_CHUNK_BYTES):
+                yield chunk
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(
+        content=_stream(),
+        status_code=upstream.status_code,
+        headers=headers,
+        # Release the connection even if the body is never iterated
+        background=BackgroundTask(upstream.aclose),
     )
 
 
@@ -21,7 +21,7 @@ from fastapi.responses import FileResponse, StreamingResponse
 from loguru import logger
 from pydantic import Field
 
-from owl.configs import CACHE
+from owl.configs import CACHE, ENV_CONFIG
 from owl.db.gen_executor import MultiRowGenExecutor
 from owl.db.gen_table import (
     ActionTable,
@@ -63,6 +63,9 @@ from owl.types import (
     TableDataImportFormData,
     TableImportFormData,
     TableImportProgress,
+    TableImportUploadCompleteRequest,
+    TableImportUploadPart,
+    TableImportUploadResponse,
     TableMetaResponse,
     TableSchemaCreate,
     TableType,
@@ -76,7 +79,17 @@ from owl.utils.exceptions import (
     UnsupportedMediaTypeError,
     handle_exception,
 )
-from owl.utils.io import EMBED_WHITE_LIST_MIME, guess_mime, s3_temporary_file, s3_upload
+from owl.utils.io import (
+    EMBED_WHITE_LIST_MIME,
+    guess_mime,
+    s3_abort_table_import_upload,
+    s3_completed_table_import_upload,
+    s3_create_table_import_upload,
+    s3_list_table_import_parts,
+    s3_temporary_file,
+    s3_upload,
+    s3_upload_table_import_part,
+)
 from owl.utils.lm import LMEngine
 from owl.utils.mcp import MCP_TOOL_TAG
 
@@ -678,20 +691,15 @@ async def get_conversation_threads(
     table_id = params.table_id
     table = await TABLE_CLS[table_type].open_table(project_id=project.id, table_id=table_id)
     if params.column_ids:
-        for column_id in params.column_ids:
-            table.check_multiturn_column(column_id)
         cols = params.column_ids
     else:
         cols = [c.column_id for c in table.column_metadata if c.is_chat_column]
     return ChatThreadsResponse(
-        threads={
-            c: await table.get_conversation_thread(
-                column_id=c,
-                row_id=params.row_id,
-                include_row=params.include_row,
-            )
-            for c in cols
-        },
+        threads=await table.get_conversation_threads(
+            cols,
+            row_id=params.row_id,
+            include_row=params.include_row,
+        ),
         table_id=table_id,
     )
 
@@ -1121,6 +1129,43 @@ async def export_table_data(
     )
 
 
+async def _import_table_from_uri(
+    uri: str,
+    *,
+    project_id: str,
+    table_type: TableType,
+    table_id_dst: str | None,
+    blocking: bool,
+    progress_key: str,
+    reupload_files: bool,
+    verbose: bool,
+) -> TableMetaResponse | OkResponse:
+    result: AsyncResult = import_gen_table.delay(
+        source=uri,
+        project_id=project_id,
+        table_type=table_type,
+        table_id_dst=table_id_dst,
+        reupload_files=reupload_files,
+        progress_key=progress_key,
+        verbose=verbose,
+    )
+    # Poll progress
+    initial_wait: float = 0.5
+    max_wait: float = 30 * 60  # 30 minutes
+    t0 = perf_counter()
+    i = 1
+    while (not result.ready()) and ((perf_counter() - t0) < max_wait):
+        await sleep(min(initial_wait * i, 5.0))
+        if not blocking:
+            prog = await CACHE.get_progress(progress_key, TableImportProgress)
+            if prog.load_data.progress == 100:
+                return OkResponse(progress_key=progress_key)
+        i += 1
+    if (perf_counter() - t0) >= max_wait:
+        raise ServerBusyError("Table import took too long to complete. Please try again later.")
+    return TableMetaResponse.model_validate_json(result.get(propagate=True))
+
+
 @router.post(
     "/v2/gen_tables/{table_type}/import",
     summary="Import a table including its metadata.",
@@ -1151,32 +1196,177 @@ async def import_table(
     file_data = await data.file.read()
     await data.file.close()
     async with s3_temporary_file(file_data, "application/vnd.apache.parquet") as uri:
-        result: AsyncResult = import_gen_table.delay(
-            source=uri,
+        return await _import_table_from_uri(
+            uri,
             project_id=project.id,
             table_type=table_type,
             table_id_dst=data.table_id_dst,
-            reupload_files=data.reupload or not data.migrate,
+            blocking=data.blocking,
             progress_key=data.progress_key,
+            reupload_files=data.reupload or not data.migrate,
             verbose=data.migrate,
         )
-        # Poll progress
-        initial_wait: float = 0.5
-        max_wait: float = 30 * 60  # 30 minutes
-        t0 = perf_counter()
-        i = 1
-        while (not result.ready()) and ((perf_counter() - t0) < max_wait):
-            await sleep(min(initial_wait * i, 5.0))
-            if not data.blocking:
-                prog = await CACHE.get_progress(data.progress_key, TableImportProgress)
-                if prog.load_data.progress == 100:
-                    return OkResponse(progress_key=data.progress_key)
-            i += 1
-        if (perf_counter() - t0) >= max_wait:
-            raise ServerBusyError(
-                "Table import took too long to complete. Please try again later."
-            )
-        return TableMetaResponse.model_validate_json(result.get(propagate=True))
+
+
+@router.post(
+    "/v2/gen_tables/{table_type}/import/uploads",
+    summary="Start a chunked upload of a table to import.",
+    description=(
+        "Permissions: `organization.MEMBER` OR `project.MEMBER`. "
+        "Parts are uploaded with `PUT /v2/gen_tables/{table_type}/import/uploads/{upload_id}/parts/{part_number}`, "
+        "and the table is imported with `POST /v2/gen_tables/{table_type}/import/uploads/{upload_id}/complete`."
+    ),
+)
+@handle_exception
+async def create_table_import_upload(
+    request: Request,
+    auth_info: Annotated[
+        tuple[UserAuth, ProjectRead, OrganizationRead], Depends(auth_user_project)
+    ],
+    table_type: Annotated[TableType, Path(description="Table type.")],
+) -> TableImportUploadResponse:
+    user, project, org = auth_info
+    has_permissions(
+        user,
+        ["organization.MEMBER", "project.MEMBER"],
+        organization_id=org.id,
+        project_id=project.id,
+    )
+    # Check quota
+    billing: BillingManager = request.state.billing
+    billing.has_db_storage_quota()
+    billing.has_egress_quota()
+    upload_id = await s3_create_table_import_upload(project.id)
+    return TableImportUploadResponse(
+        upload_id=upload_id, part_size=ENV_CONFIG.table_import_part_size_bytes
+    )
+
+
+@router.get(
+    "/v2/gen_tables/{table_type}/import/uploads/{upload_id}",
+    summary="Get the parts received so far by a chunked table upload.",
+    description="Permissions: `organization.MEMBER` OR `project.MEMBER`.",
+)
+@handle_exception
+async def get_table_import_upload(
+    auth_info: Annotated[
+        tuple[UserAuth, ProjectRead, OrganizationRead], Depends(auth_user_project)
+    ],
+    table_type: Annotated[TableType, Path(description="Table type.")],
+    upload_id: Annotated[str, Path(description="Upload ID.")],
+) -> TableImportUploadResponse:
+    user, project, org = auth_info
+    has_permissions(
+        user,
+        ["organization.MEMBER", "project.MEMBER"],
+        organization_id=org.id,
+        project_id=project.id,
+    )
+    return TableImportUploadResponse(
+        upload_id=upload_id,
+        part_size=ENV_CONFIG.table_import_part_size_bytes,
+        parts=await s3_list_table_import_parts(upload_id, project.id),
+    )
+
+
+@router.put(
+    "/v2/gen_tables/{table_type}/import/uploads/{upload_id}/parts/{part_number}",
+    summary="Upload a part of a chunked table upload.",
+    description=(
+        "Permissions: `organization.MEMBER` OR `project.MEMBER`. "
+        "The request body is the raw bytes of the part. "
+        "Every part except the last must be exactly `part_size` bytes. "
+        "Uploading a part number again replaces the previous part."
+    ),
+)
+@handle_exception
+async def upload_table_import_part(
+    request: Request,
+    auth_info: Annotated[
+        tuple[UserAuth, ProjectRead, OrganizationRead], Depends(auth_user_project)
+    ],
+    table_type: Annotated[TableType, Path(description="Table type.")],
+    upload_id: Annotated[str, Path(description="Upload ID.")],
+    part_number: Annotated[int, Path(ge=1, le=10000, description="Part number.")],
+) -> TableImportUploadPart:
+    user, project, org = auth_info
+    has_permissions(
+        user,
+        ["organization.MEMBER", "project.MEMBER"],
+        organization_id=org.id,
+        project_id=project.id,
+    )
+    content = await request.body()
+    if len(content) == 0:
+        raise BadInputError("Part is empty.")
+    if len(content) > ENV_CONFIG.table_import_part_size_bytes:
+        raise BadInputError(
+            f"Part size exceeds {ENV_CONFIG.table_import_part_size_bytes:,d} bytes: {len(content):,d} bytes"
+        )
+    return await s3_upload_table_import_part(upload_id, project.id, part_number, content)
+
+
+@router.post(
+    "/v2/gen_tables/{table_type}/import/uploads/{upload_id}/complete",
+    summary="Complete a chunked table upload and import the table.",
+    description="Permissions: `organization.MEMBER` OR `project.MEMBER`.",
+)
+@handle_exception
+async def complete_table_import_upload(
+    request: Request,
+    auth_info: Annotated[
+        tuple[UserAuth, ProjectRead, OrganizationRead], Depends(auth_user_project)
+    ],
+    table_type: Annotated[TableType, Path(description="Table type.")],
+    upload_id: Annotated[str, Path(description="Upload ID.")],
+    body: TableImportUploadCompleteRequest,
+) -> TableMetaResponse | OkResponse:
+    user, project, org = auth_info
+    has_permissions(
+        user,
+        ["organization.MEMBER", "project.MEMBER"],
+        organization_id=org.id,
+        project_id=project.id,
+    )
+    # Check quota
+    billing: BillingManager = request.state.billing
+    billing.has_db_storage_quota()
+    billing.has_egress_quota()
+    async with s3_completed_table_import_upload(upload_id, project.id) as uri:
+        return await _import_table_from_uri(
+            uri,
+            project_id=project.id,
+            table_type=table_type,
+            table_id_dst=body.table_id_dst,
+            blocking=body.blocking,
+            progress_key=body.progress_key,
+            reupload_files=True,
+            verbose=False,
+        )
+
+
+@router.delete(
+    "/v2/gen_tables/{table_type}/import/uploads/{upload_id}",
+    summary="Abort a chunked table upload and discard its parts.",
+    description="Permissions: `organization.MEMBER` OR `project.MEMBER`.",
+)
+@handle_exception
+async def abort_table_import_upload(
+    auth_info: Annotated[
+        tuple[UserAuth, ProjectRead, OrganizationRead], Depends(auth_user_project)
+    ],
+    table_type: Annotated[TableType, Path(description="Table type.")],
+    upload_id: Annotated[str, Path(description="Upload ID.")],
+) -> OkResponse:
+    user, project, org = auth_info
+    has_permissions(
+        user,
+        ["organization.MEMBER", "project.MEMBER"],
+        organization_id=org.id,
+        project_id=project.id,
+    )
+    await s3_abort_table_import_upload(upload_id, project.id)
+    return OkResponse()
 
 
 @router.get(
@@ -1,15 +1,19 @@
+import asyncio
 from datetime import datetime
-from typing import Annotated, Literal
+from time import perf_counter
+from typing import Annotated, Awaitable, Callable, Literal
 
 from fastapi import APIRouter, Depends, Query
+from loguru import logger
 
+from owl.configs import ENV_CONFIG
 from owl.db import SCHEMA, async_session, cached_text
-from owl.types import UsageResponse, UserAuth
+from owl.types import CombinedUsageResponse, UsageResponse, UserAuth
 from owl.utils.auth import (
     auth_user_service_key,
     has_permissions,
 )
-from owl.utils.billing import CLICKHOUSE_CLIENT
+from owl.utils.billing import CLICKHOUSE_CLIENT, OPENTELEMETRY_CLIENT
 from owl.utils.billing_metrics import BillingMetrics
 from owl.utils.exceptions import (
     BadInputError,
@@ -22,6 +26,13 @@ telemetry = Telemetry()
 
 billing_metrics = BillingMetrics(clickhouse_client=CLICKHOUSE_CLIENT)
 
+QUERY_SECONDS = OPENTELEMETRY_CLIENT.get_histogram("meters_query_duration_seconds")
+
+MeterCategory = Literal[
+    "llm", "embedding", "reranking", "image", "billing", "bandwidth", "storage"
+]
+METER_CATEGORIES: tuple[MeterCategory, ...] = MeterCategory.__args__
+
 
 async def _check_permissions(
     user: UserAuth,
@@ -456,6 +467,166 @@ async def get_storage_metrics(
     return await metrics_client.query_storage(org_ids, proj_ids, from_, to, group_by, window_size)
 
 
+# Name of the query method of each category, not every data source supports every category
+_METER_QUERY_METHODS: dict[MeterCategory, str] = {
+    "llm": "query_llm_usage",
+    "embedding": "query_embedding_usage",
+    "reranking": "query_reranking_usage",
+    "image": "query_image_usage",
+    "billing": "query_billing",
+    "bandwidth": "query_bandwidth",
+    "storage": "query_storage",
+}
+
+
+def _meter_query(
+    metrics_client: BillingMetrics | Telemetry,
+    category: MeterCategory,
+    data_source: str,
+) -> Callable[..., Awaitable[UsageResponse]]:
+    query = getattr(metrics_client, _METER_QUERY_METHODS[category], None)
+    if query is None:
+        raise BadInputError(
+            f'Category "{category}" is not supported by data source "{data_source}".'
+        )
+    return query
+
+
+@router.get(
+    "/v2/meters/combined",
+    summary="Get the metrics of multiple categories in a single request.",
+    description=(
+        "Permissions: `system.MEMBER` to retrieve metrics for all organizations or all projects; "
+        "`organization.MEMBER` to retrieve metrics for a specific organization; "
+        "`project.MEMBER` to retrieve metrics for a specific project."
+    ),
+    response_model=CombinedUsageResponse,
+)
+@handle_exception
+async def get_combined_metrics(
+    user: Annotated[UserAuth, Depends(auth_user_service_key)],
+    from_: Annotated[
+        datetime, Query(alias="from", description="Start datetime for the metrics query.")
+    ],
+    window_size: Annotated[
+        str,
+        Query(
+            min_length=1,
+            description="The aggregation window size (e.g., '1d' for daily, '1w' for weekly).",
+            alias="windowSize",
+        ),
+    ],
+    categories: Annotated[
+        list[MeterCategory] | None,
+        Query(
+            description="Categories to query. If not provided, all categories are queried.",
+        ),
+    ] = None,
+    org_ids: Annotated[
+        list[str] | None,
+        Query(
+            description="List of organization IDs to filter the query. If not provided, data for all organizations is returned.",
+            alias="orgIds",
+        ),
+    ] = None,
+    proj_ids: Annotated[
+        list[str] | None,
+        Query(
+            description="List of project IDs to filter the query. If not provided, data for all projects is returned.",
+            alias="projIds",
+        ),
+    ] = None,
+    to: Annotated[
+        datetime | None,
+        Query(
+            description="End datetime for the metrics query. If not provided, data up to the current datetime is returned."
+        ),
+    ] = None,
+    group_by: Annotated[
+        list[str] | None,
+        Query(
+            min_length=1,
+            description="List of fields to group the metrics by. If not provided, no grouping is applied.",
+            alias="groupBy",
+        ),
+    ] = None,
+    data_source: Annotated[
+        Literal["clickhouse", "victoriametrics"],
+        Query(description="Data source to query. Defaults to 'clickhouse'.", alias="dataSource"),
+    ] = "clickhouse",
+) -> CombinedUsageResponse:
+    """
+    Retrieves the metrics of multiple categories, for example to build a usage page.
+
+    The per-category queries run concurrently, up to `meters_max_concurrent_queries` at a time,
+    and each is cancelled after `meters_query_timeout_sec`. Categories that fail or time out
+    are reported in `errors` while the rest are still returned.
+
+    Args:
+        user (UserAuth): The authenticated user making the request.
+        from_ (datetime): The start of the time range for the metrics.
+        window_size (str): The size of the time window for aggregating metrics
+            (e.g., "1d" for daily, "1w" for weekly).
+        categories (list[str] | None): Categories to query.
+            If not provided, all categories will be queried.
+        org_ids (list[str] | None): A list of organization IDs to filter the metrics.
+            If not provided, data for all organizations will be returned.
+        proj_ids (list[str] | None): A list of project IDs to filter the metrics.
+            If not provided, data for all projects will be returned.
+        to (datetime | None): The end of the time range for the metrics.
+            If not provided, data up to the current date will be returned.
+        group_by (list[str] | None): A list of fields to group the metrics by.
+            If not provided, the data will not be grouped.
+        data_source (str): The data source to query. Defaults to "clickhouse".
+
+    Returns:
+        CombinedUsageResponse: A response containing the metrics and errors of each category.
+    """
+    # RBAC
+    await _check_permissions(user, org_ids, proj_ids)
+    # Fetch
+    if group_by is None:
+        group_by = []
+    if data_source == "clickhouse":
+        metrics_client = billing_metrics
+    elif data_source == "victoriametrics":
+        metrics_client = telemetry
+    semaphore = asyncio.Semaphore(ENV_CONFIG.meters_max_concurrent_queries)
+    timeout = ENV_CONFIG.meters_query_timeout_sec
+
+    async def _run(category: MeterCategory) -> UsageResponse | str:
+        async with semaphore:
+            t0 = perf_counter()
+            outcome = "ok"
+            try:
+                return await asyncio.wait_for(
+                    _meter_query(metrics_client, category, data_source)(
+                        org_ids, proj_ids, from_, to, group_by.copy(), window_size
+                    ),
+                    timeout=timeout,
+                )
+            except TimeoutError:
+                outcome = "timeout"
+                return f"Query timed out after {timeout} seconds."
+            except Exception as e:
+                outcome = "error"
+                logger.warning(f'Failed to query "{category}" metrics: {repr(e)}')
+                return str(e) or e.__class__.__name__
+            finally:
+                QUERY_SECONDS.record(
+                    perf_counter() - t0,
+                    {"category": category, "data_source": data_source, "outcome": outcome},
+                )
+
+    categories = list(dict.fromkeys(categories or METER_CATEGORIES))
+    results = await asyncio.gather(*[_run(c) for c in categories])
+    return CombinedUsageResponse(
+        windowSize=window_size,
+        data={c: r for c, r in zip(categories, results, strict=True) if not isinstance(r, str)},
+        errors={c: r for c, r in zip(categories, results, strict=True) if isinstance(r, str)},
+    )
+
+
 # @router.get(
 #     "/v2/meters/models/throughput",
 #     summary="Get the model throughput statistics of the specified model type (llm, embedding, reranking), and metric type.",
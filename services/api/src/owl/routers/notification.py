@@ -163,6 +163,7 @@ async def list_notifications(
             deleted_at=None,
             **({"opened_at": None} if params.unread_only else {}),
         ),
+        after=params.after,
     )
 
 
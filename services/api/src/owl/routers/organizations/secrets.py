@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Query, Request
 from loguru import logger
 from sqlmodel import select
 
-from owl.configs import ENV_CONFIG
+from owl.configs import CACHE, ENV_CONFIG
 from owl.db import AsyncSession, yield_async_session
 from owl.db.models import Project, Secret
 from owl.types import (
@@ -98,6 +98,7 @@ async def create_secret(
     session.add(secret)
     await session.commit()
     await session.refresh(secret)
+    await CACHE.bump_secrets_version(organization_id)
 
     logger.bind(user_id=user.id).success(
         f'{user.name} ({user.email}) created secret "{secret.name}". ({request.state.id})'
@@ -270,6 +271,7 @@ async def update_secret(
     secret, updates = await Secret.update(
         session, (organization_id, normalized_name), body, name="Secret"
     )
+    await CACHE.bump_secrets_version(organization_id)
 
     logger.bind(user_id=user.id).success(
         f"{user.name} ({user.email}) updated the attributes "
@@ -319,6 +321,7 @@ async def delete_secret(
 
     await session.delete(secret)
     await session.commit()
+    await CACHE.bump_secrets_version(organization_id)
 
     logger.bind(user_id=user.id).success(
         f'{user.name} ({user.email}) deleted secret "{secret.name}".'
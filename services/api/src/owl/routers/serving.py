@@ -26,6 +26,7 @@ from owl.utils.billing import BillingManager
 from owl.utils.exceptions import ResourceNotFoundError, handle_exception
 from owl.utils.lm import LMEngine
 from owl.utils.mcp import MCP_TOOL_TAG
+from owl.utils.sse import SSEBuffer, sse_frame, sse_stream
 
 router = APIRouter()
 
@@ -181,23 +182,19 @@ async def chat_completion(
                 headers={"X-Accel-Buffering": "no"},
             )
 
+        async def _chunks():
+            yield chunk
+            async for c in agen:
+                yield c
+
         async def _generate():
-            content_length = 1
+            buffer = SSEBuffer()
             if references is not None:
-                sse = f"data: {references.model_dump_json()}\n\n"
-                content_length += len(sse.encode("utf-8"))
-                yield sse
-            nonlocal chunk
-            yield f"data: {chunk.model_dump_json(exclude_unset=True)}\n\n"
-            async for chunk in agen:
-                sse = f"data: {chunk.model_dump_json(exclude_unset=True)}\n\n"
-                content_length += len(sse.encode("utf-8"))
-                yield sse
-            sse = "data: [DONE]\n\n"
-            content_length += len(sse.encode("utf-8"))
-            yield sse
+                yield buffer.passthrough(sse_frame(references))
+            async for data in sse_stream(_chunks(), buffer=buffer, exclude_unset=True):
+                yield data
             # NOTE: We must create egress events here as SSE cannot be handled in the middleware
-            billing.create_egress_events(content_length / (1024**3))
+            billing.create_egress_events(buffer.num_bytes / (1024**3))
 
         response = StreamingResponse(
             content=_generate(),
@@ -1,9 +1,15 @@
-from typing import Annotated, Any
+from hashlib import blake2b
+from typing import Annotated, Any, Awaitable, Callable
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 from pydantic import BaseModel, Field
+from sqlmodel import func, select
 
+from owl.configs import CACHE, ENV_CONFIG
 from owl.db import TEMPLATE_ORG_ID, AsyncSession, yield_async_session
 from owl.db.gen_table import (
     ActionTable,
@@ -22,12 +28,89 @@ from owl.types import (
     TableMetaResponse,
     TableType,
 )
+from owl.utils.cache import LRUCache
 from owl.utils.exceptions import (
     ResourceNotFoundError,
     handle_exception,
 )
 
 router = APIRouter()
+# Raw rows of small template tables, keyed by template version so that updates invalidate them
+ROWS_SNAPSHOT_CACHE: LRUCache[tuple[list[dict[str, Any]] | None]] = LRUCache(
+    maxsize=100, ttl_sec=ENV_CONFIG.template_rows_snapshot_ttl_sec
+)
+
+
+async def _template_version(session: AsyncSession, template_id: str | None = None) -> str | None:
+    """
+    Version of a template derived from its last updated time, which is bumped by every write
+    to its tables. If `template_id` is None, returns the version of the template list instead.
+    Returns None if the template is not found.
+    """
+    if template_id is None:
+        updated_at, count = (
+            await session.exec(
+                select(func.max(Project.updated_at), func.count(Project.id)).where(
+                    Project.organization_id == TEMPLATE_ORG_ID
+                )
+            )
+        ).one()
+        return f"{updated_at}|{count}"
+    updated_at = (
+        await session.exec(select(Project.updated_at).where(Project.id == template_id))
+    ).one_or_none()
+    return None if updated_at is None else str(updated_at)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+async def _cached_response(
+    request: Request,
+    version: str | None,
+    fetch: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Serve a template response with a strong `ETag` derived from the template version and the
+    request, replying 304 if it matches `If-None-Match`. Response bodies are cached in Redis.
+
+    Args:
+        request (Request): The request.
+        version (str | None): Template version. If None, `fetch` is awaited without caching.
+        fetch (Callable[[], Awaitable[Any]]): Produces the response content on a cache miss.
+
+    Returns:
+        response (Any): The response.
+    """
+    if version is None:
+        return await fetch()
+    query = urlencode(sorted(request.query_params.multi_items()))
+    key = blake2b(f"{version}\n{request.url.path}\n{query}".encode(), digest_size=16).hexdigest()
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": f"public, max-age={ENV_CONFIG.template_cache_max_age_sec}",
+    }
+    if _etag_matches(request.headers.get("If-None-Match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    ttl = ENV_CONFIG.template_response_cache_ttl_sec
+    cache_key = f"template_response:{key}"
+    body = None
+    if ttl > 0:
+        try:
+            body = await CACHE.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Failed to read template response cache: {repr(e)}")
+    if body is None:
+        body = ORJSONResponse(jsonable_encoder(await fetch())).body.decode("utf-8")
+        if ttl > 0:
+            try:
+                await CACHE.set(cache_key, body, ex=ttl)
+            except Exception as e:
+                logger.warning(f"Failed to write template response cache: {repr(e)}")
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 class ListTemplateQuery(ListQuery):
@@ -47,31 +130,35 @@ class ListTemplateQuery(ListQuery):
 )
 @handle_exception
 async def list_templates(
+    request: Request,
     session: Annotated[AsyncSession, Depends(yield_async_session)],
     params: Annotated[ListTemplateQuery, Query()],
 ) -> Page[ProjectRead]:
-    # Ensure the organization exists
-    if (await session.get(Organization, TEMPLATE_ORG_ID)) is None:
-        logger.warning(f'Template organization "{TEMPLATE_ORG_ID}" does not exist.')
-        return Page[ProjectRead](
-            items=[],
+    async def _list() -> Page[ProjectRead]:
+        # Ensure the organization exists
+        if (await session.get(Organization, TEMPLATE_ORG_ID)) is None:
+            logger.warning(f'Template organization "{TEMPLATE_ORG_ID}" does not exist.')
+            return Page[ProjectRead](
+                items=[],
+                offset=params.offset,
+                limit=params.limit,
+                total=0,
+            )
+        # List
+        return await Project.list_(
+            session=session,
+            return_type=ProjectRead,
             offset=params.offset,
             limit=params.limit,
-            total=0,
+            order_by=params.order_by,
+            order_ascending=params.order_ascending,
+            search_query=params.search_query,
+            search_columns=params.search_columns,
+            filters=dict(organization_id=TEMPLATE_ORG_ID),
+            after=params.after,
         )
-    # List
-    return await Project.list_(
-        session=session,
-        return_type=ProjectRead,
-        offset=params.offset,
-        limit=params.limit,
-        order_by=params.order_by,
-        order_ascending=params.order_ascending,
-        search_query=params.search_query,
-        search_columns=params.search_columns,
-        filters=dict(organization_id=TEMPLATE_ORG_ID),
-        after=params.after,
-    )
+
+    return await _cached_response(request, await _template_version(session), _list)
 
 
 @router.get(
@@ -81,14 +168,18 @@ async def list_templates(
 )
 @handle_exception
 async def get_template(
+    request: Request,
     session: Annotated[AsyncSession, Depends(yield_async_session)],
     template_id: Annotated[str, Query(min_length=1, description="Template ID.")],
 ) -> ProjectRead:
-    # Fetch the template
-    template = await session.get(Project, template_id)
-    if template is None:
-        raise ResourceNotFoundError(f'Template "{template_id}" is not found.')
-    return template
+    async def _get() -> ProjectRead:
+        # Fetch the template
+        template = await session.get(Project, template_id)
+        if template is None:
+            raise ResourceNotFoundError(f'Template "{template_id}" is not found.')
+        return ProjectRead.model_validate(template)
+
+    return await _cached_response(request, await _template_version(session, template_id), _get)
 
 
 TABLE_CLS: dict[TableType, ActionTable | KnowledgeTable | ChatTable] = {
@@ -109,20 +200,26 @@ class _ListTableQuery(ListTableQuery):
 )
 @handle_exception
 async def list_tables(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(yield_async_session)],
     table_type: Annotated[TableType, Path(description="Table type.")],
     params: Annotated[_ListTableQuery, Query()],
 ) -> Page[TableMetaResponse]:
-    metas = await TABLE_CLS[table_type].list_tables(
-        project_id=params.template_id,
-        limit=params.limit,
-        offset=params.offset,
-        parent_id=params.parent_id,
-        search_query=params.search_query,
-        order_by=params.order_by,
-        order_ascending=params.order_ascending,
-        count_rows=params.count_rows,
+    async def _list() -> Page[TableMetaResponse]:
+        return await TABLE_CLS[table_type].list_tables(
+            project_id=params.template_id,
+            limit=params.limit,
+            offset=params.offset,
+            parent_id=params.parent_id,
+            search_query=params.search_query,
+            order_by=params.order_by,
+            order_ascending=params.order_ascending,
+            count_rows=params.count_rows,
+        )
+
+    return await _cached_response(
+        request, await _template_version(session, params.template_id), _list
     )
-    return metas
 
 
 class GetTableQuery(BaseModel):
@@ -137,19 +234,65 @@ class GetTableQuery(BaseModel):
 )
 @handle_exception
 async def get_table(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(yield_async_session)],
     table_type: Annotated[TableType, Path(description="Table type.")],
     params: Annotated[GetTableQuery, Query()],
 ) -> TableMetaResponse:
-    table = await TABLE_CLS[table_type].open_table(
-        project_id=params.template_id, table_id=params.table_id
+    async def _get() -> TableMetaResponse:
+        table = await TABLE_CLS[table_type].open_table(
+            project_id=params.template_id, table_id=params.table_id
+        )
+        return table.v1_meta_response
+
+    return await _cached_response(
+        request, await _template_version(session, params.template_id), _get
     )
-    return table.v1_meta_response
 
 
 class _ListTableRowQuery(ListTableRowQuery):
     template_id: Annotated[str, Field(min_length=1, description="Template ID.")]
 
 
+async def _list_rows_from_snapshot(
+    table: ActionTable | KnowledgeTable | ChatTable,
+    params: _ListTableRowQuery,
+    version: str,
+) -> Page[dict[str, Any]] | None:
+    """
+    List rows of a small template table from an in-process snapshot of all its rows.
+    Returns None if the query is not served by snapshots or the table is too large.
+    """
+    max_rows = ENV_CONFIG.template_rows_snapshot_max_rows
+    if max_rows == 0 or params.where or params.search_query or params.order_by != "ID":
+        return None
+    key = f"{params.template_id}:{table.table_type}:{table.table_id}:{version}"
+    snapshot = ROWS_SNAPSHOT_CACHE.get(key)
+    if snapshot is None:
+        rows = await table.list_rows(limit=max_rows + 1, order_by=["ID"], remove_state_cols=False)
+        snapshot = (rows.items if rows.total <= max_rows else None,)
+        ROWS_SNAPSHOT_CACHE.set(key, snapshot)
+    rows = snapshot[0]
+    if rows is None:
+        return None
+    total = len(rows)
+    if not params.order_ascending:
+        rows = rows[::-1]
+    rows = rows[params.offset : params.offset + params.limit]
+    columns = set(
+        table._filter_columns(
+            None if params.columns is None else list(params.columns), exclude_state=False
+        )
+    )
+    # Rows are post-processed in place, so the snapshot must not be handed out directly
+    return Page[dict[str, Any]](
+        items=[{k: v for k, v in row.items() if k in columns} for row in rows],
+        offset=params.offset,
+        limit=params.limit,
+        total=total,
+    )
+
+
 @router.get(
     "/v2/templates/gen_tables/{table_type}/rows/list",
     summary="List rows in a template table.",
@@ -157,33 +300,44 @@ class _ListTableRowQuery(ListTableRowQuery):
 )
 @handle_exception
 async def list_table_rows(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(yield_async_session)],
     table_type: Annotated[TableType, Path(description="Table type.")],
     params: Annotated[_ListTableRowQuery, Query()],
 ) -> Page[dict[str, Any]]:
-    table = await TABLE_CLS[table_type].open_table(
-        project_id=params.template_id, table_id=params.table_id
-    )
-    rows = await table.list_rows(
-        limit=params.limit,
-        offset=params.offset,
-        order_by=[params.order_by],
-        order_ascending=params.order_ascending,
-        columns=params.columns,
-        where=params.where,
-        search_query=params.search_query,
-        search_columns=params.search_columns,
-        remove_state_cols=False,
-    )
-    return Page[dict[str, Any]](
-        items=table.postprocess_rows(
-            rows.items,
-            float_decimals=params.float_decimals,
-            vec_decimals=params.vec_decimals,
-        ),
-        offset=params.offset,
-        limit=params.limit,
-        total=rows.total,
-    )
+    version = await _template_version(session, params.template_id)
+
+    async def _list() -> Page[dict[str, Any]]:
+        table = await TABLE_CLS[table_type].open_table(
+            project_id=params.template_id, table_id=params.table_id
+        )
+        rows = None
+        if version is not None:
+            rows = await _list_rows_from_snapshot(table, params, version)
+        if rows is None:
+            rows = await table.list_rows(
+                limit=params.limit,
+                offset=params.offset,
+                order_by=[params.order_by],
+                order_ascending=params.order_ascending,
+                columns=params.columns,
+                where=params.where,
+                search_query=params.search_query,
+                search_columns=params.search_columns,
+                remove_state_cols=False,
+            )
+        return Page[dict[str, Any]](
+            items=table.postprocess_rows(
+                rows.items,
+                float_decimals=params.float_decimals,
+                vec_decimals=params.vec_decimals,
+            ),
+            offset=params.offset,
+            limit=params.limit,
+            total=rows.total,
+        )
+
+    return await _cached_response(request, version, _list)
 
 
 class _GetTableRowQuery(GetTableRowQuery):
@@ -197,20 +351,27 @@ class _GetTableRowQuery(GetTableRowQuery):
 )
 @handle_exception
 async def get_table_row(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(yield_async_session)],
     table_type: Annotated[TableType, Path(description="Table type.")],
     params: Annotated[_GetTableRowQuery, Query()],
 ) -> dict[str, Any]:
-    table = await TABLE_CLS[table_type].open_table(
-        project_id=params.template_id, table_id=params.table_id
-    )
-    row = await table.get_row(
-        row_id=params.row_id,
-        columns=params.columns,
-        remove_state_cols=False,
+    async def _get() -> dict[str, Any]:
+        table = await TABLE_CLS[table_type].open_table(
+            project_id=params.template_id, table_id=params.table_id
+        )
+        row = await table.get_row(
+            row_id=params.row_id,
+            columns=params.columns,
+            remove_state_cols=False,
+        )
+        row = table.postprocess_rows(
+            [row],
+            float_decimals=params.float_decimals,
+            vec_decimals=params.vec_decimals,
+        )[0]
+        return row
+
+    return await _cached_response(
+        request, await _template_version(session, params.template_id), _get
     )
-    row = table.postprocess_rows(
-        [row],
-        float_decimals=params.float_decimals,
-        vec_decimals=params.vec_decimals,
-    )[0]
-    return row
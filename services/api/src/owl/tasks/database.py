@@ -2,6 +2,7 @@ import asyncio
 
 from owl.configs import celery_app
 from owl.utils.billing import CLICKHOUSE_CLIENT
+from owl.utils.notifications import resume_notification_fan_outs
 
 
 @celery_app.task
@@ -10,3 +11,11 @@ def run_periodic_flush_buffer():
     Flush redis buffer to clickhouse.
     """
     asyncio.get_event_loop().run_until_complete(CLICKHOUSE_CLIENT.flush_buffer())
+
+
+@celery_app.task
+def run_periodic_resume_notification_fan_outs():
+    """
+    Resume interrupted notification fan-outs from their checkpoints.
+    """
+    asyncio.get_event_loop().run_until_complete(resume_notification_fan_outs())
@@ -8,7 +8,7 @@ from owl.db.gen_table import ActionTable, ChatTable, KnowledgeTable
 from owl.types import TableType
 from owl.utils.exceptions import JamaiException, ResourceExistsError
 from owl.utils.gen_table_model_replace import GenTableModelReplacer, release_model_replace_lock
-from owl.utils.io import open_uri_async
+from owl.utils.io import open_uri_async, s3_abort_expired_table_import_uploads
 
 TABLE_CLS: dict[TableType, ActionTable | KnowledgeTable | ChatTable] = {
     TableType.ACTION: ActionTable,
@@ -87,3 +87,11 @@ def replace_gen_table_models(
     result = asyncio.get_event_loop().run_until_complete(_task())
     logger.info("GenTable model replace task completed.")
     return result.to_dict()
+
+
+@celery_app.task
+def run_periodic_abort_table_import_uploads():
+    """
+    Abort table import multipart uploads whose upload state has expired.
+    """
+    asyncio.get_event_loop().run_until_complete(s3_abort_expired_table_import_uploads())
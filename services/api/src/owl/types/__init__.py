@@ -47,6 +47,7 @@ from jamaibase.types import (  # noqa: F401
     CodeInterpreterTool,
     ColumnDropRequest,
     ColumnReorderRequest,
+    CombinedUsageResponse,
     CompletionUsageDetails,
     ConversationCreateRequest,
     ConversationMetaResponse,
@@ -190,6 +191,8 @@ from jamaibase.types import (  # noqa: F401
     TableDataImportRequest,
     TableImportProgress,
     TableImportRequest,
+    TableImportUploadPart,
+    TableImportUploadResponse,
     TableMeta,
     TableMetaResponse,
     TableType,
@@ -770,6 +773,17 @@ class GetConversationThreadsQuery(BaseModel):
             description="Columns to fetch as conversation threads. Defaults to None (fetch all)."
         ),
     ] = None
+    limit: Annotated[
+        int | None,
+        Field(
+            ge=1,
+            description="Number of latest turns to return. Defaults to None (return all turns).",
+        ),
+    ] = None
+    offset: Annotated[
+        int,
+        Field(ge=0, description="Number of latest turns to skip. Defaults to 0."),
+    ] = 0
 
 
 class ListTableQuery(BaseModel):
@@ -1032,3 +1046,27 @@ class TableImportFormData(BaseModel):
         bool,
         Field(description="Whether to reupload in migration mode (maybe removed without notice)."),
     ] = False
+
+
+class TableImportUploadCompleteRequest(BaseModel):
+    table_id_dst: Annotated[
+        TableImportName | None,
+        BeforeValidator(empty_string_to_none),
+        Field(description="The ID or name of the new table."),
+    ] = None
+    blocking: Annotated[
+        bool,
+        Field(
+            description=(
+                "If True, waits until import finishes. "
+                "If False, the task is submitted to a task queue and returns immediately."
+            ),
+        ),
+    ] = True
+    progress_key: Annotated[
+        str,
+        Field(
+            default_factory=uuid7_str,
+            description="The key to use to query progress. Defaults to a random string.",
+        ),
+    ]
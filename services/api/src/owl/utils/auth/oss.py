@@ -6,7 +6,7 @@ from fastapi import BackgroundTasks, Depends, Header, Request
 from loguru import logger
 
 from owl.configs import ENV_CONFIG
-from owl.db import async_session
+from owl.db import TEMPLATE_ORG_ID, async_session
 from owl.db.models.oss import ModelConfig, Project, User
 from owl.types import (
     ModelConfigRead,
@@ -132,6 +132,10 @@ async def auth_user_project(
     request.state.timing["Request"] = perf_counter() - t1
     # This will run BEFORE any responses are sent
 
+    # Template responses are cached by the project's last updated time,
+    # so it must be bumped before the response of a write is sent
+    if organization.id == TEMPLATE_ORG_ID:
+        await _set_project_updated_at(request=request, project_id=project_id)
     # Background tasks will run AFTER streaming responses are sent
     bg_tasks.add_task(
         _set_project_updated_at,
@@ -1,11 +1,15 @@
+import asyncio
 from asyncio.coroutines import iscoroutine
 from collections import defaultdict
+from contextlib import suppress
+from datetime import datetime, timezone
+from functools import cache
+from hashlib import blake2b
 from time import perf_counter
-from typing import Any, DefaultDict
+from typing import Any, DefaultDict, Literal
 
 import clickhouse_connect
 from clickhouse_connect.driver.asyncclient import AsyncClient
-from cloudevents.conversion import to_dict
 from cloudevents.http import CloudEvent
 from fastapi import Request
 from loguru import logger
@@ -131,7 +135,7 @@ class ClickHouseAsyncClient:
             self._log_error(f"Failed to execute query: {sql}. Error: {e}")
             raise
 
-    async def _insert_llm_usage(self, usages: list[LlmUsageData]):
+    async def _insert_llm_usage(self, usages: list[LlmUsageData], dedup_token: str | None = None):
         await self._get_client()
         try:
             usages_list = [usage.as_list() for usage in usages]
@@ -151,19 +155,16 @@ class ClickHouseAsyncClient:
                     "input_cost",
                     "output_cost",
                 ],
-                settings={
-                    "async_insert": 1,
-                    "wait_for_async_insert": 1,
-                    "async_insert_busy_timeout_ms": 1000,
-                    "async_insert_use_adaptive_busy_timeout": 1,
-                },
+                settings=self._insert_settings(dedup_token),
             )
             return result
         except Exception as e:
             self._log_error(f"Failed to insert data into table: llm_usage. Error: {e}")
             raise
 
-    async def _insert_image_gen_usage(self, usages: list[ImageGenUsageData]):
+    async def _insert_image_gen_usage(
+        self, usages: list[ImageGenUsageData], dedup_token: str | None = None
+    ):
         await self._get_client()
         try:
             usages_list = [usage.as_list() for usage in usages]
@@ -187,19 +188,16 @@ class ClickHouseAsyncClient:
                     "image_input_cost",
                     "image_output_cost",
                 ],
-                settings={
-                    "async_insert": 1,
-                    "wait_for_async_insert": 1,
-                    "async_insert_busy_timeout_ms": 1000,
-                    "async_insert_use_adaptive_busy_timeout": 1,
-                },
+                settings=self._insert_settings(dedup_token),
             )
             return result
         except Exception as e:
             self._log_error(f"Failed to insert data into table: image_gen_usage. Error: {e}")
             raise
 
-    async def _insert_embed_usage(self, usages: list[EmbedUsageData]):
+    async def _insert_embed_usage(
+        self, usages: list[EmbedUsageData], dedup_token: str | None = None
+    ):
         await self._get_client()
         try:
             usages_list = [usage.as_list() for usage in usages]
@@ -216,19 +214,16 @@ class ClickHouseAsyncClient:
                     "model",
                     "num_token",
                 ],
-                settings={
-                    "async_insert": 1,
-                    "wait_for_async_insert": 1,
-                    "async_insert_busy_timeout_ms": 1000,
-                    "async_insert_use_adaptive_busy_timeout": 1,
-                },
+                settings=self._insert_settings(dedup_token),
             )
             return result
         except Exception as e:
             self._log_error(f"Failed to insert data into table: embed_usage. Error: {e}")
             raise
 
-    async def _insert_rerank_usage(self, usages: list[RerankUsageData]):
+    async def _insert_rerank_usage(
+        self, usages: list[RerankUsageData], dedup_token: str | None = None
+    ):
         await self._get_client()
         try:
             usages_list = [usage.as_list() for usage in usages]
@@ -245,19 +240,16 @@ class ClickHouseAsyncClient:
                     "model",
                     "num_search",
                 ],
-                settings={
-                    "async_insert": 1,
-                    "wait_for_async_insert": 1,
-                    "async_insert_busy_timeout_ms": 1000,
-                    "async_insert_use_adaptive_busy_timeout": 1,
-                },
+                settings=self._insert_settings(dedup_token),
             )
             return result
         except Exception as e:
             self._log_error(f"Failed to insert data into table: rerank_usage. Error: {e}")
             raise
 
-    async def _insert_egress_usage(self, usages: list[EgressUsageData]):
+    async def _insert_egress_usage(
+        self, usages: list[EgressUsageData], dedup_token: str | None = None
+    ):
         await self._get_client()
         try:
             usages_list = [usage.as_list() for usage in usages]
@@ -273,19 +265,16 @@ class ClickHouseAsyncClient:
                     "cost",
                     "amount_gib",
                 ],
-                settings={
-                    "async_insert": 1,
-                    "wait_for_async_insert": 1,
-                    "async_insert_busy_timeout_ms": 1000,
-                    "async_insert_use_adaptive_busy_timeout": 1,
-                },
+                settings=self._insert_settings(dedup_token),
             )
             return result
         except Exception as e:
             self._log_error(f"Failed to insert data into table: egress_usage. Error: {e}")
             raise
 
-    async def _insert_file_storage_usage(self, usages: list[FileStorageUsageData]):
+    async def _insert_file_storage_usage(
+        self, usages: list[FileStorageUsageData], dedup_token: str | None = None
+    ):
         await self._get_client()
         try:
             usages_list = [usage.as_list() for usage in usages]
@@ -302,19 +291,16 @@ class ClickHouseAsyncClient:
                     "amount_gib",
                     "snapshot_gib",
                 ],
-                settings={
-                    "async_insert": 1,
-                    "wait_for_async_insert": 1,
-                    "async_insert_busy_timeout_ms": 1000,
-                    "async_insert_use_adaptive_busy_timeout": 1,
-                },
+                settings=self._insert_settings(dedup_token),
             )
             return result
         except Exception as e:
             self._log_error(f"Failed to insert data into table: file_storage_usage. Error: {e}")
             raise
 
-    async def _insert_db_storage_usage(self, usages: list[DBStorageUsageData]):
+    async def _insert_db_storage_usage(
+        self, usages: list[DBStorageUsageData], dedup_token: str | None = None
+    ):
         await self._get_client()
         try:
             usages_list = [usage.as_list() for usage in usages]
@@ -331,99 +317,146 @@ class ClickHouseAsyncClient:
                     "amount_gib",
                     "snapshot_gib",
                 ],
-                settings={
-                    "async_insert": 1,
-                    "wait_for_async_insert": 1,
-                    "async_insert_busy_timeout_ms": 1000,
-                    "async_insert_use_adaptive_busy_timeout": 1,
-                },
+                settings=self._insert_settings(dedup_token),
             )
             return result
         except Exception as e:
             self._log_error(f"Failed to insert data into table: db_storage_usage. Error: {e}")
             raise
 
+    @staticmethod
+    def _insert_settings(dedup_token: str | None = None) -> dict[str, Any]:
+        settings = {
+            "async_insert": 1,
+            "wait_for_async_insert": 1,
+            "async_insert_busy_timeout_ms": 1000,
+            "async_insert_use_adaptive_busy_timeout": 1,
+        }
+        if dedup_token:
+            # Retried inserts with the same token are dropped by ClickHouse
+            settings["async_insert_deduplicate"] = 1
+            settings["insert_deduplication_token"] = dedup_token
+        return settings
+
+    @staticmethod
+    def _dedup_token(data: str | bytes) -> str:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return blake2b(data, digest_size=16).hexdigest()
+
     @retry(
         wait=wait_exponential(multiplier=1, min=2, max=10),
         stop=stop_after_attempt(4),
         reraise=True,
     )
-    async def insert_usage(self, usage: UsageData):
-        llm_result = await self._insert_llm_usage(usage.llm_usage)
-        image_gen_result = await self._insert_image_gen_usage(usage.image_gen_usage)
-        embed_result = await self._insert_embed_usage(usage.embed_usage)
-        rerank_result = await self._insert_rerank_usage(usage.rerank_usage)
-        egress_result = await self._insert_egress_usage(usage.egress_usage)
-        file_storage_result = await self._insert_file_storage_usage(usage.file_storage_usage)
-        db_storage_result = await self._insert_db_storage_usage(usage.db_storage_usage)
-        return (
-            llm_result,
-            image_gen_result,
-            embed_result,
-            rerank_result,
-            egress_result,
-            file_storage_result,
-            db_storage_result,
-        )
+    async def _insert_category(self, category: str, usages: list, dedup_token: str):
+        insert_fn = getattr(self, f"_insert_{category}")
+        return await insert_fn(usages, dedup_token=f"{dedup_token}:{category}")
+
+    async def insert_usage(self, usage: UsageData, dedup_token: str | None = None):
+        """
+        Insert usage data into ClickHouse, one concurrent insert per usage table.
+        Each table is retried independently, and retries are deduplicated by ClickHouse.
+
+        Args:
+            usage (UsageData): Usage data to insert.
+            dedup_token (str | None, optional): Deduplication token of this batch of usage.
+                Defaults to None (derived from the usage data).
+
+        Returns:
+            results (tuple): Insert summary per usage table, None if the table has no usage.
+        """
+        if dedup_token is None:
+            dedup_token = self._dedup_token(usage.model_dump_json())
+        categories = list(UsageData.model_fields)
+        tasks = {
+            c: self._insert_category(c, getattr(usage, c), dedup_token)
+            for c in categories
+            if getattr(usage, c)
+        }
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        results = dict(zip(tasks, results, strict=True))
+        for result in results.values():
+            if isinstance(result, BaseException):
+                raise result
+        results = tuple(results.get(c, None) for c in categories)
+        return results
 
-    async def bulk_insert_usage(self, usages: list[UsageData]):
+    async def bulk_insert_usage(self, usages: list[UsageData], dedup_token: str | None = None):
         all_usages = sum(usages, start=UsageData())
-        results = await self.insert_usage(all_usages)
+        results = await self.insert_usage(all_usages, dedup_token=dedup_token)
         return results
 
-    async def flush_buffer(self):
-        buffer_key = ENV_CONFIG.clickhouse_buffer_key
-        buffer_count_key = buffer_key + "_count"
-        temp_key = buffer_key + "_temp"
-        lock_key = buffer_key + ":lock"
+    async def flush_buffer(self) -> int:
+        """
+        Flush the Redis usage buffer into ClickHouse in bounded chunks.
+
+        Only one flusher runs at a time. Each chunk is claimed atomically and only acknowledged
+        (removed from Redis) once inserted. A failed chunk stays claimed and is retried with the
+        same dedup token by the next flush, so it is never lost nor double-counted.
+        The flush stops early once `clickhouse_flush_max_sec` is exceeded, leaving the rest
+        of the backlog for the next run. Usage spilled to the local file while Redis was
+        unavailable is moved into the buffer first.
 
-        async with CACHE.alock(lock_key, blocking=False, expire=5) as lock_acquired:
+        Returns:
+            num_events (int): Number of usage events flushed.
+        """
+        lock_key = ENV_CONFIG.clickhouse_buffer_key + ":lock"
+        max_sec = ENV_CONFIG.clickhouse_flush_max_sec
+        num_events = 0
+        async with CACHE.alock(lock_key, blocking=False, expire=max_sec + 30) as lock_acquired:
             if lock_acquired:
                 self._log_debug("Acquired lock to flush buffer.")
             else:
                 self._log_debug("Could not acquire lock to flush buffer.")
-                return
-
-            # Exit if buffer key not found
-            if not await CACHE.exists(buffer_key):
-                self._log_debug("Buffer key not found, skipping insert operation.")
-                return
-
-            # Move data from buffer to temp key
-            # TODO: Maybe use async redis
-            with CACHE._redis.pipeline() as pipe:
-                pipe.multi()
-                pipe.rename(buffer_key, temp_key)
-                temp_count = pipe.get(buffer_count_key)
-                pipe.delete(buffer_count_key)
-                pipe.execute()
-
-            buffer_data = CACHE._redis.lrange(temp_key, 0, -1)
-            if buffer_data:
-                _t = perf_counter()
-                usages = [UsageData.model_validate_json(data) for data in buffer_data]
-                try:
-                    await self.bulk_insert_usage(usages)
-                    # Delete temp key on success
-                    del CACHE[temp_key]
-                    self._log_info(
-                        (
-                            f"{sum([usage.total_usage_events for usage in usages]):,d} buffered usage data inserted to DB, "
-                            f"time taken: {perf_counter() - _t:,.3} seconds"
-                        )
+                # Another flusher is running, let later appends elect a new one once it is done
+                with suppress(Exception):
+                    await CACHE.release_usage_flush_election()
+                return num_events
+
+            t0 = perf_counter()
+            num_chunks = 0
+            try:
+                await CACHE.replay_usage_spill()
+                while perf_counter() - t0 < max_sec:
+                    chunk = await CACHE.claim_usage_buffer_chunk(
+                        ENV_CONFIG.clickhouse_flush_chunk_size
                     )
-                except Exception as e:
-                    self._log_error(f"Failed to insert data. Error: {e}")
-                    # Move data back to buffer on failure
-                    # Append data back to buffer on failure
-                    with CACHE._redis.pipeline() as pipe:
-                        pipe.multi()
-                        for data in buffer_data:
-                            pipe.rpush(buffer_key, data)
-                        pipe.incrby(buffer_count_key, int(temp_count or 0))
-                        pipe.execute()
-                    # Delete temp key after appending data back to buffer
-                    del CACHE[temp_key]
+                    if not chunk:
+                        break
+                    num_events += await self._flush_chunk(chunk)
+                    num_chunks += 1
+            except Exception as e:
+                self._log_error(f"Failed to flush buffer, chunk will be retried. Error: {e}")
+            finally:
+                with suppress(Exception):
+                    await CACHE.release_usage_flush_election()
+                with suppress(Exception):
+                    OPENTELEMETRY_CLIENT.get_gauge("clickhouse_buffer_backlog").set(
+                        await CACHE.get_usage_buffer_count()
+                    )
+            if num_chunks > 0:
+                self._log_info(
+                    (
+                        f"{num_events:,d} buffered usage data inserted to DB in {num_chunks:,d} chunks, "
+                        f"time taken: {perf_counter() - t0:,.3f} seconds"
+                    )
+                )
+        return num_events
+
+    async def _flush_chunk(self, chunk: list[str]) -> int:
+        usage = sum((UsageData.model_validate_json(data) for data in chunk), start=UsageData())
+        # The token only depends on the chunk content, so a retried chunk has the same token
+        await self.insert_usage(usage, dedup_token=self._dedup_token("\n".join(chunk)))
+        await CACHE.ack_usage_buffer_chunk(usage.total_usage_events)
+        timestamps = [u.timestamp for c in UsageData.model_fields for u in getattr(usage, c)]
+        if timestamps:
+            lag_sec = (datetime.now(timezone.utc) - min(timestamps)).total_seconds()
+            OPENTELEMETRY_CLIENT.get_gauge("clickhouse_flush_lag_sec").set(lag_sec)
+            # Late usage (backlog, spill replay or retried chunk) may belong to cached closed buckets
+            if lag_sec > ENV_CONFIG.meters_cache_settle_sec:
+                await CACHE.bump_meters_cache_version()
+        return usage.total_usage_events
 
 
 # OPENTELEMETRY_CLIENT = OpenTelemetryClient(
@@ -444,6 +477,81 @@ def _log_exception(e: Exception, *_, **__):
     logger.exception(f"Billing event processing encountered an error: {repr(e)}")
 
 
+# Event type -> instruments as (kind, name, value key)
+# Events without a value key count as 1, and value keys are never used as attributes
+_EVENT_INSTRUMENTS: dict[str, tuple[tuple[Literal["counter", "gauge"], str, str | None], ...]] = {
+    "request_count": (("counter", "request_count", None),),
+    ProductType.LLM_TOKENS: (("counter", "llm_token_usage", "tokens"),),
+    ProductType.IMAGE_TOKENS: (("counter", "image_token_usage", "tokens"),),
+    ProductType.EMBEDDING_TOKENS: (("counter", "embedding_token_usage", "tokens"),),
+    ProductType.RERANKER_SEARCHES: (("counter", "reranker_search_usage", "searches"),),
+    "bandwidth": (("counter", "bandwidth_usage", "amount_gib"),),
+    "storage": (("gauge", "storage_usage", "amount_gib"),),
+    "llm_cache": (
+        ("counter", "llm_cache_requests", None),
+        ("counter", "llm_cache_saved_tokens", "saved_tokens"),
+    ),
+    "spent": (("counter", "spent", "spent_usd"),),
+}
+_EVENT_VALUE_KEYS = {
+    event_type: frozenset(key for _, _, key in instruments if key is not None)
+    for event_type, instruments in _EVENT_INSTRUMENTS.items()
+}
+# (kind, name, sorted attributes) -> value
+OtelPoints = dict[tuple[str, str, tuple[tuple[str, Any], ...]], float]
+
+
+@cache
+def _otel_instrument(kind: Literal["counter", "gauge"], name: str) -> Counter | _Gauge:
+    # Resolved once per process
+    if kind == "gauge":
+        return OPENTELEMETRY_CLIENT.get_gauge(name)
+    return OPENTELEMETRY_CLIENT.get_counter(name)
+
+
+def aggregate_otel_events(events: list[CloudEvent]) -> OtelPoints:
+    """
+    Aggregate OpenTelemetry events by instrument and attribute set.
+    Counter values are summed, gauges keep the last value.
+
+    Args:
+        events (list[CloudEvent]): Events to aggregate.
+
+    Returns:
+        points (OtelPoints): Mapping of (kind, name, attributes) to value.
+    """
+    points: OtelPoints = {}
+    for event in events:
+        event_type = event["type"]
+        instruments = _EVENT_INSTRUMENTS.get(event_type)
+        if instruments is None:
+            continue
+        data: dict[str, Any] = event.get_data()
+        value_keys = _EVENT_VALUE_KEYS[event_type]
+        attributes = tuple(sorted((k, v) for k, v in data.items() if k not in value_keys))
+        for kind, name, value_key in instruments:
+            value = 1 if value_key is None else data[value_key]
+            key = (kind, name, attributes)
+            if kind == "gauge":
+                points[key] = value
+            else:
+                points[key] = points.get(key, 0) + value
+    return points
+
+
+def emit_otel_points(points: OtelPoints) -> None:
+    """
+    Record aggregated points, one measurement per instrument and attribute set.
+    Counter points that sum to zero are skipped.
+    """
+    for (kind, name, attributes), value in points.items():
+        instrument = _otel_instrument(kind, name)
+        if kind == "gauge":
+            instrument.set(value, dict(attributes))
+        elif value != 0:
+            instrument.add(value, dict(attributes))
+
+
 class BillingManager:
     def __init__(
         self,
@@ -611,6 +719,32 @@ class BillingManager:
                 )
             )
 
+    def create_llm_cache_events(
+        self,
+        model_id: str,
+        *,
+        hit: bool,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        """
+        Record an LLM response cache lookup.
+        A cache hit does not call the model, so no token usage is created for it.
+        Instead, the tokens of the cached response are recorded as saved tokens.
+        """
+        self._check_project_id()
+        self._events.append(
+            self._cloud_event(
+                {"type": "llm_cache"},
+                {
+                    "model": model_id,
+                    "outcome": "hit" if hit else "miss",
+                    "saved_tokens": int(input_tokens) + int(output_tokens) if hit else 0,
+                    "proj_id": self.project_id,  # Update to proj_id to align with Clickhouse Column
+                },
+            )
+        )
+
     def create_image_gen_events(
         self,
         model_id: str,
@@ -849,7 +983,7 @@ class BillingManager:
         Process all events. In general, only call this as a BACKGROUND TASK after the response is sent.
         """
 
-        # Push usage to redis for queue if buffer less than 10000
+        # Push usage to the Redis buffer, it is flushed into ClickHouse in chunks
         usage_data = UsageData(
             llm_usage=self._llm_usage_events,
             image_gen_usage=self._image_gen_usage_events,
@@ -859,14 +993,15 @@ class BillingManager:
             file_storage_usage=self._file_storage_usage_events,
             db_storage_usage=self._db_storage_usage_events,
         )
-        usage_count = (await CACHE.get_usage_buffer_count()) + usage_data.total_usage_events
-        if usage_count >= ENV_CONFIG.clickhouse_max_buffer_queue_size:
-            await CLICKHOUSE_CLIENT.flush_buffer()
-            # We could use asyncio TaskGroup here if there are other async tasks downstream
-            # For now there isn't any, so we just simply await it
-            await CLICKHOUSE_CLIENT.insert_usage(usage_data)
-        elif usage_data.total_usage_events > 0:
-            await CACHE.add_usage_to_buffer(usage_data)
+        if usage_data.total_usage_events > 0:
+            # Exactly one request is elected to flush once the buffer is full
+            elected = await CACHE.add_usage_to_buffer(
+                usage_data,
+                flush_threshold=ENV_CONFIG.clickhouse_max_buffer_queue_size,
+                elect_ttl_sec=ENV_CONFIG.clickhouse_flush_max_sec + 30,
+            )
+            if elected:
+                await CLICKHOUSE_CLIENT.flush_buffer()
 
         # API request count
         req_scope = getattr(self.request, "scope", {})
@@ -886,61 +1021,17 @@ class BillingManager:
             ]
         # Send OpenTelemetry events
         if len(self._events) > 0:
+            # Aggregate first so that large requests record one measurement per series
             t0 = perf_counter()
-            for event in self._events:
-                attributes = to_dict(event)
-                event_type = attributes["type"]
-                if event_type == "request_count":
-                    counter = OPENTELEMETRY_CLIENT.get_counter(name="request_count")
-                    counter.add(1, attributes["data"])
-                elif event_type == ProductType.LLM_TOKENS:
-                    counter = OPENTELEMETRY_CLIENT.get_counter(name="llm_token_usage")
-                    counter.add(
-                        attributes["data"]["tokens"],
-                        {k: v for k, v in attributes["data"].items() if k != "tokens"},
-                    )
-                elif event_type == ProductType.IMAGE_TOKENS:
-                    counter = OPENTELEMETRY_CLIENT.get_counter(name="image_token_usage")
-                    counter.add(
-                        attributes["data"]["tokens"],
-                        {k: v for k, v in attributes["data"].items() if k != "tokens"},
-                    )
-                elif event_type == ProductType.EMBEDDING_TOKENS:
-                    counter = OPENTELEMETRY_CLIENT.get_counter(name="embedding_token_usage")
-                    counter.add(
-                        attributes["data"]["tokens"],
-                        {k: v for k, v in attributes["data"].items() if k != "tokens"},
-                    )
-                elif event_type == ProductType.RERANKER_SEARCHES:
-                    counter = OPENTELEMETRY_CLIENT.get_counter(name="reranker_search_usage")
-                    counter.add(
-                        attributes["data"]["searches"],
-                        {k: v for k, v in attributes["data"].items() if k != "searches"},
-                    )
-                elif event_type == "bandwidth":
-                    counter = OPENTELEMETRY_CLIENT.get_counter(name="bandwidth_usage")
-                    counter.add(
-                        attributes["data"]["amount_gib"],
-                        {k: v for k, v in attributes["data"].items() if k != "amount_gib"},
-                    )
-                elif event_type == "storage":
-                    gauge = OPENTELEMETRY_CLIENT.get_gauge(name="storage_usage")
-                    gauge.set(
-                        attributes["data"]["amount_gib"],
-                        {k: v for k, v in attributes["data"].items() if k != "amount_gib"},
-                    )
-                elif event_type == "spent":
-                    counter = OPENTELEMETRY_CLIENT.get_counter(name="spent")
-                    counter.add(
-                        attributes["data"]["spent_usd"],
-                        {k: v for k, v in attributes["data"].items() if k != "spent_usd"},
-                    )
+            points = aggregate_otel_events(self._events)
+            emit_otel_points(points)
             self._log_info(
                 (
                     f"OpenTelemetry events ingestion: "
                     f"t={(perf_counter() - t0) * 1e3:,.2f} ms   "
                     f"num_events={len(self._events):,d}   "
-                    f"event_types={set(str(e.get_attributes()['type']) for e in self._events)}"
+                    f"num_points={len(points):,d}   "
+                    f"event_types={set(name for _, name, _ in points)}"
                 )
             )
             # Force flush
@@ -4,13 +4,17 @@ import re
 from collections import namedtuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from typing import Any
 
+import orjson
 from loguru import logger
 
+from owl.configs import CACHE, ENV_CONFIG
 from owl.types import ProductType, Usage, UsageResponse
 from owl.utils.billing import ClickHouseAsyncClient
 from owl.utils.exceptions import BadInputError
+from owl.utils.lm_cache import ContentCache
 
 
 ###############################################################################
@@ -518,7 +522,89 @@ def _build_time_bucket_query(
 
 
 ###############################################################################
-# 4.  Billing service
+# 4.  Result cache
+###############################################################################
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_TS_INTERVAL = _BaseTable().ts_interval
+
+
+def _as_utc(t: datetime) -> datetime:
+    # Naive datetimes are treated as UTC, same as in the SQL filters
+    return t if t.tzinfo else t.replace(tzinfo=timezone.utc)
+
+
+def _closed_until(from_: datetime, to: datetime, window_size: str) -> datetime | None:
+    """
+    Return the end of the last closed time bucket within [from_, to), or None if there is none.
+
+    A bucket is closed once it ends `meters_cache_settle_sec` before now, so that late usage
+    flushes are counted. Only fixed-size units (s/m/h/d) are handled: their buckets are
+    aligned to the Unix epoch in UTC, matching `toStartOfInterval` on the UTC timestamp columns.
+    """
+    if re.fullmatch(r"\d+[smhd]", window_size) is None:
+        return None
+    step = _parse_duration(window_size)
+    if step <= timedelta(0):
+        return None
+    from_, to = _as_utc(from_), _as_utc(to)
+    cutoff = min(
+        to, datetime.now(timezone.utc) - timedelta(seconds=ENV_CONFIG.meters_cache_settle_sec)
+    )
+    split = _bucket_start(cutoff, step)
+    return split if split > from_ else None
+
+
+def _bucket_start(t: datetime, step: timedelta) -> datetime:
+    return _EPOCH + ((_as_utc(t) - _EPOCH) // step) * step
+
+
+def _next_bucket_start(t: datetime, step: timedelta) -> datetime:
+    """Return `t` if it is on a bucket boundary, otherwise the start of the next bucket."""
+    start = _bucket_start(t, step)
+    return start if start == _as_utc(t) else start + step
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _dumps_rows(rows: list[dict[str, Any]]) -> str:
+    return orjson.dumps(rows, default=_encode_value).decode("utf-8")
+
+
+def _loads_rows(data: str) -> list[dict[str, Any]]:
+    rows = orjson.loads(data)
+    for row in rows:
+        for k, v in row.items():
+            if isinstance(v, dict):
+                row[k] = Decimal(v["decimal"])
+        row[_TS_INTERVAL] = datetime.fromisoformat(row[_TS_INTERVAL])
+    return rows
+
+
+# Closed buckets only change when late usage is flushed, which bumps the version in their keys.
+# The long TTL only bounds the cache size.
+CLOSED_BUCKET_CACHE: ContentCache[list[dict[str, Any]]] = ContentCache(
+    namespace="meters_closed",
+    maxsize=ENV_CONFIG.meters_cache_max_entries,
+    ttl_sec=ENV_CONFIG.meters_closed_bucket_cache_ttl_sec,
+    dumps=_dumps_rows,
+    loads=_loads_rows,
+)
+# The open trailing bucket is recomputed, this only coalesces bursts of identical requests
+OPEN_BUCKET_CACHE: ContentCache[list[dict[str, Any]]] = ContentCache(
+    namespace="meters_open",
+    maxsize=ENV_CONFIG.meters_cache_max_entries,
+    ttl_sec=ENV_CONFIG.meters_open_bucket_cache_ttl_sec,
+    dumps=_dumps_rows,
+    loads=_loads_rows,
+)
+
+
+###############################################################################
+# 5.  Billing service
 ###############################################################################
 class BillingMetrics:
     def __init__(self, clickhouse_client: ClickHouseAsyncClient) -> None:
@@ -542,6 +628,65 @@ class BillingMetrics:
             logger.error(f"Query failed: {sql} – {e}")
             raise
 
+    async def _bucket_query(
+        self,
+        spec: _BaseTable,
+        org_ids: list[str] | None,
+        proj_ids: list[str] | None,
+        from_: datetime,
+        to: datetime,
+        group_by: list[str],
+        window_size: str,
+    ) -> tuple[list[dict[str, Any]], timedelta]:
+        """
+        Run a time-bucketed query, split at bucket boundaries into up to three ranges:
+        - The partial head bucket before the first boundary after `from_`.
+        - The closed buckets up to the end of the last closed bucket, which are served from
+          `CLOSED_BUCKET_CACHE`. This range is bucket-aligned, so that a rolling `from_`
+          keeps hitting the same entry until it crosses a bucket boundary. Entries are keyed
+          by the meters cache version, which is bumped whenever late usage is flushed.
+        - The open trailing range.
+        The head and open ranges are queried again, only concurrent identical queries are
+        coalesced.
+        """
+        split = _closed_until(from_, to, window_size)
+        if split is None:
+            ranges = [(from_, to)]
+        else:
+            head = _next_bucket_start(from_, _parse_duration(window_size))
+            ranges = [(from_, head), (head, split), (split, to)]
+            # Bumped whenever late usage is flushed, which invalidates every closed bucket
+            version = await CACHE.get_meters_cache_version()
+        # Ranges that end around now share a key, so that repeated polls are coalesced
+        open_ended = _as_utc(to) >= datetime.now(timezone.utc) - timedelta(
+            seconds=OPEN_BUCKET_CACHE.ttl_sec
+        )
+        rows, interval = [], _parse_duration(window_size)
+        for start, end in ranges:
+            if _as_utc(start) >= _as_utc(end):
+                continue
+            if end is split:
+                cache, end_key = CLOSED_BUCKET_CACHE, f"{end.isoformat()}@{version}"
+            elif end is to:
+                cache, end_key = OPEN_BUCKET_CACHE, "now" if open_ended else end.isoformat()
+            else:
+                cache, end_key = OPEN_BUCKET_CACHE, end.isoformat()
+            # Normalised so that the key does not depend on filter or group ordering
+            key = ContentCache.make_key(
+                type(spec).__name__,
+                sorted(org_ids or []),
+                sorted(proj_ids or []),
+                _as_utc(start).isoformat(),
+                end_key,
+                sorted(group_by),
+                window_size,
+            )
+            sql, interval = _build_time_bucket_query(
+                spec, org_ids, proj_ids, start, end, group_by.copy(), window_size
+            )
+            rows += await cache.get_or_compute(key, lambda sql=sql: self._query(sql))
+        return rows, interval
+
     @staticmethod
     def _process_group_by(group_by: list[str]) -> list[str]:
         # if "organization_id" in group_by:
@@ -568,10 +713,9 @@ class BillingMetrics:
         to = to or datetime.now(timezone.utc)
         group_by = self._process_group_by(group_by)
         # group_by might be modified
-        sql, interval = _build_time_bucket_query(
+        rows, interval = await self._bucket_query(
             table, filtered_by_org_id, filtered_by_proj_id, from_, to, group_by.copy(), window_size
         )
-        rows = await self._query(sql)
         if "type" in group_by:
             usages = []
             for r in rows:
@@ -629,10 +773,9 @@ class BillingMetrics:
         table = ImageGenTable()
         to = to or datetime.now(timezone.utc)
         group_by = self._process_group_by(group_by)
-        sql, interval = _build_time_bucket_query(
+        rows, interval = await self._bucket_query(
             table, filtered_by_org_id, filtered_by_proj_id, from_, to, group_by.copy(), window_size
         )
-        rows = await self._query(sql)
         if "type" in group_by:
             usages = []
             for r in rows:
@@ -712,10 +855,9 @@ class BillingMetrics:
         table = EmbedTable()
         to = to or datetime.now(timezone.utc)
         group_by = self._process_group_by(group_by)
-        sql, interval = _build_time_bucket_query(
+        rows, interval = await self._bucket_query(
             table, filtered_by_org_id, filtered_by_proj_id, from_, to, group_by.copy(), window_size
         )
-        rows = await self._query(sql)
         return UsageResponse(
             windowSize=window_size,
             data=[
@@ -746,7 +888,7 @@ class BillingMetrics:
         table = RerankTable()
         to = to or datetime.now(timezone.utc)
         group_by = self._process_group_by(group_by)
-        sql, interval = _build_time_bucket_query(
+        rows, interval = await self._bucket_query(
             table,
             filtered_by_org_id,
             filtered_by_proj_id,
@@ -755,7 +897,6 @@ class BillingMetrics:
             group_by.copy(),
             window_size,
         )
-        rows = await self._query(sql)
         return UsageResponse(
             windowSize=window_size,
             data=[
@@ -787,7 +928,7 @@ class BillingMetrics:
         to = to or datetime.now(timezone.utc)
         group_by = self._process_group_by(group_by)
         has_type = "type" in group_by
-        sql, interval = _build_time_bucket_query(
+        rows, interval = await self._bucket_query(
             table,
             filtered_by_org_id,
             filtered_by_proj_id,
@@ -796,7 +937,6 @@ class BillingMetrics:
             group_by.copy(),
             window_size,
         )
-        rows = await self._query(sql)
         return UsageResponse(
             windowSize=window_size,
             data=[
@@ -829,7 +969,7 @@ class BillingMetrics:
         to = to or datetime.now(timezone.utc)
         group_by = self._process_group_by(group_by)
         # group_by might be modified
-        file_sql, _ = _build_time_bucket_query(
+        file_rows, _ = await self._bucket_query(
             file_table,
             filtered_by_org_id,
             filtered_by_proj_id,
@@ -838,8 +978,7 @@ class BillingMetrics:
             group_by.copy(),
             window_size,
         )
-        file_rows = await self._query(file_sql)
-        db_sql, interval = _build_time_bucket_query(
+        db_rows, interval = await self._bucket_query(
             db_table,
             filtered_by_org_id,
             filtered_by_proj_id,
@@ -848,7 +987,6 @@ class BillingMetrics:
             group_by.copy(),
             window_size,
         )
-        db_rows = await self._query(db_sql)
         if "type" in group_by:  # to be compatible with VM query
             usages = []
             for r in file_rows:
@@ -921,7 +1059,7 @@ class BillingMetrics:
         has_category = "category" in group_by
         has_type = "type" in group_by
         has_model = "model" in group_by
-        sql, interval = _build_time_bucket_query(
+        rows, interval = await self._bucket_query(
             cost_table,
             filtered_by_org_id,
             filtered_by_proj_id,
@@ -930,7 +1068,6 @@ class BillingMetrics:
             group_by.copy(),  # group_by might be modified
             window_size,
         )
-        rows = await self._query(sql)
         usages = []
 
         gb_filters = _build_gb_filters(has_category, has_type, has_model)
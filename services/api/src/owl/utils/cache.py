@@ -1,8 +1,12 @@
 import asyncio
+import fcntl
+import os
+from collections import OrderedDict
 from contextlib import asynccontextmanager, suppress
+from hashlib import blake2b
 from random import random
-from time import time_ns
-from typing import Any, AsyncGenerator, Type, TypeVar
+from time import monotonic, time, time_ns
+from typing import Any, AsyncGenerator, Generic, Type, TypeVar
 
 from loguru import logger
 from pottery import AIORedlock, ReleaseUnlockedLock
@@ -16,6 +20,102 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from owl.types import Organization_, Progress, UsageData
 
 ProgressType = TypeVar("ProgressType", bound=Progress)
+T = TypeVar("T")
+# Spilled usage entries that were replayed into Redis are remembered for this long
+USAGE_SPILL_MARKER_TTL_SEC = 60 * 60 * 24
+
+
+def _append_line(path: str, line: str) -> None:
+    while True:
+        with open(path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Unlinked by `_remove_lines` while waiting for the lock, open the path again
+                if os.fstat(f.fileno()).st_nlink == 0:
+                    continue
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+                return
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _read_lines(path: str) -> list[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                return [line for line in f.read().splitlines() if line]
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    except FileNotFoundError:
+        return []
+
+
+def _remove_lines(path: str, lines: set[str]) -> None:
+    # Lines are removed by content, lines appended in the meantime are kept
+    with open(path, "r+", encoding="utf-8") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.fstat(f.fileno()).st_nlink == 0:
+                return
+            remaining = [line for line in f.read().splitlines() if line and line not in lines]
+            if not remaining:
+                # Unlinked while locked, so that `_append_line` never writes to the removed file
+                os.unlink(path)
+                return
+            f.seek(0)
+            f.truncate()
+            f.write("".join(f"{line}\n" for line in remaining))
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class LRUCache(Generic[T]):
+    """
+    A small in-process LRU cache with per-entry expiry.
+    Not thread-safe, meant to be used from a single event loop.
+    """
+
+    def __init__(self, *, maxsize: int, ttl_sec: float) -> None:
+        self.maxsize = max(0, int(maxsize))
+        self.ttl_sec = float(ttl_sec)
+        self._data: OrderedDict[str, tuple[float, T]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> T | None:
+        item = self._data.get(key, None)
+        if item is None:
+            return None
+        expiry, value = item
+        if expiry < monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: T) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = (monotonic() + self.ttl_sec, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        for key in [k for k in self._data if k.startswith(prefix)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
 
 
 class Cache:
@@ -25,6 +125,8 @@ class Cache:
         redis_url: str,
         clickhouse_buffer_key: str,
         cache_expiration: int = 5 * 60,  # 5 minutes
+        usage_bucket_sec: int = 60,
+        usage_spill_path: str = "",
     ):
         self._redis_kwargs = dict(
             # url=f"redis://[[username]:[password]]@{ENV_CONFIG.redis_host}:{ENV_CONFIG.redis_port}/1",
@@ -40,6 +142,9 @@ class Cache:
         self._redis_async_loop: asyncio.AbstractEventLoop | None = None
         self.clickhouse_buffer_key = clickhouse_buffer_key
         self.cache_expiration = int(cache_expiration)
+        self.usage_bucket_sec = int(usage_bucket_sec)
+        self.usage_spill_path = usage_spill_path
+        self._replaying_spill = False
         # try:
         #     self._redis.ping()
         # except ConnectionError as e:
@@ -144,6 +249,28 @@ class Cache:
     async def expire(self, key: str, seconds: int) -> bool:
         return await (await self._aredis()).expire(key, seconds)
 
+    async def incrby_with_expiry(self, key: str, amount: int, seconds: int) -> int:
+        """
+        Increment a counter, setting its expiry when it is first created.
+
+        Returns:
+            value (int): The counter value after the increment.
+        """
+        redis = await self._aredis()
+        return await redis.eval(
+            """
+            local value = redis.call("INCRBY", KEYS[1], ARGV[1])
+            if value == tonumber(ARGV[1]) then
+                redis.call("EXPIRE", KEYS[1], ARGV[2])
+            end
+            return value
+            """,
+            1,
+            key,
+            amount,
+            seconds,
+        )
+
     async def acquire_lock_value(self, key: str, value: str, *, ex: int) -> bool:
         return bool(await self.set(key, value, ex=ex, nx=True))
 
@@ -255,10 +382,144 @@ class Cache:
                 with suppress(ReleaseUnlockedLock):
                     await lock.release()
 
-    async def add_usage_to_buffer(self, usage: UsageData):
+    async def add_usage_to_buffer(
+        self,
+        usage: UsageData,
+        *,
+        flush_threshold: int | None = None,
+        elect_ttl_sec: int = 60,
+    ) -> bool:
+        """
+        Append usage data to the buffer shard of the current time bucket.
+
+        The append and the threshold check happen atomically in Redis. Once the buffered event
+        count reaches `flush_threshold`, exactly one caller is elected to flush, until the flusher
+        calls `release_usage_flush_election` or `elect_ttl_sec` passes.
+        If Redis is unavailable, the data is appended to the local spill file instead,
+        and replayed into Redis by a later call.
+
+        Args:
+            usage (UsageData): Usage data.
+            flush_threshold (int | None, optional): Buffered event count that triggers a flush.
+                Defaults to None (never elect a flusher).
+            elect_ttl_sec (int, optional): Expiry of the election. Defaults to 60.
+
+        Returns:
+            elected (bool): Whether the caller is elected to flush the buffer.
+        """
+        data = usage.model_dump_json()
+        try:
+            elected = await self._push_usage(
+                [(data, usage.total_usage_events)],
+                flush_threshold=flush_threshold,
+                elect_ttl_sec=elect_ttl_sec,
+            )
+        except (ConnectionError, TimeoutError) as e:
+            if not self.usage_spill_path:
+                raise
+            logger.warning(f"Redis is unavailable, spilling usage data to file: {repr(e)}")
+            await asyncio.to_thread(_append_line, self.usage_spill_path, data)
+            return False
+        if self.usage_spill_path and os.path.isfile(self.usage_spill_path):
+            try:
+                await self.replay_usage_spill()
+            except Exception as e:
+                logger.warning(f"Failed to replay spilled usage data: {repr(e)}")
+        return elected
+
+    async def _push_usage(
+        self,
+        entries: list[tuple[str, int]],
+        *,
+        markers: list[str] | None = None,
+        flush_threshold: int | None = None,
+        elect_ttl_sec: int = 60,
+    ) -> bool:
+        """
+        Atomically append `(data, num_events)` entries to the current buffer shard.
+        Entries with a `markers` key that already exists are skipped, so replays are idempotent.
+        """
+        bucket = int(time() // self.usage_bucket_sec)
+        key = self.clickhouse_buffer_key
+        markers = markers or []
         redis = await self._aredis()
-        await redis.rpush(self.clickhouse_buffer_key, usage.model_dump_json())
-        await redis.incrby(self.clickhouse_buffer_key + "_count", usage.total_usage_events)
+        elected = await redis.eval(
+            """
+            local pushed, added = 0, 0
+            for i = 1, (#ARGV - 4) / 2 do
+                if #KEYS == 4 or redis.call("SET", KEYS[4 + i], "1", "NX", "EX", ARGV[4]) then
+                    redis.call("RPUSH", KEYS[1], ARGV[3 + 2 * i])
+                    pushed = pushed + 1
+                    added = added + tonumber(ARGV[4 + 2 * i])
+                end
+            end
+            if pushed == 0 then
+                return 0
+            end
+            redis.call("ZADD", KEYS[2], ARGV[1], KEYS[1])
+            local count = redis.call("INCRBY", KEYS[3], added)
+            local threshold = tonumber(ARGV[2])
+            if threshold > 0 and count >= threshold
+                and redis.call("SET", KEYS[4], "1", "NX", "EX", ARGV[3]) then
+                return 1
+            end
+            return 0
+            """,
+            4 + len(markers),
+            f"{key}:{bucket}",
+            f"{key}:shards",
+            f"{key}_count",
+            f"{key}:elected",
+            *markers,
+            bucket,
+            flush_threshold or 0,
+            elect_ttl_sec,
+            USAGE_SPILL_MARKER_TTL_SEC,
+            *(v for entry in entries for v in entry),
+        )
+        return bool(elected)
+
+    async def release_usage_flush_election(self) -> None:
+        await self.delete(f"{self.clickhouse_buffer_key}:elected")
+
+    async def replay_usage_spill(self, batch_size: int = 500) -> int:
+        """
+        Move usage data from the local spill file into the Redis buffer.
+
+        Each entry is pushed at most once (tracked by a content hash in Redis),
+        so a crash between pushing and truncating the file cannot double count usage.
+
+        Returns:
+            num_entries (int): Number of entries read from the spill file.
+        """
+        if not self.usage_spill_path or self._replaying_spill:
+            return 0
+        self._replaying_spill = True
+        try:
+            lines = await asyncio.to_thread(_read_lines, self.usage_spill_path)
+            entries: list[tuple[str, int]] = []
+            for line in lines:
+                try:
+                    entries.append((line, UsageData.model_validate_json(line).total_usage_events))
+                except ValueError as e:
+                    # Most likely a partial write, nothing can be recovered from it
+                    logger.error(f"Dropping corrupted spilled usage data: {repr(e)}")
+            for i in range(0, len(entries), batch_size):
+                batch = entries[i : i + batch_size]
+                await self._push_usage(
+                    batch,
+                    markers=[
+                        f"{self.clickhouse_buffer_key}:spilled:"
+                        f"{blake2b(data.encode(), digest_size=16).hexdigest()}"
+                        for data, _ in batch
+                    ],
+                )
+            if lines:
+                await asyncio.to_thread(_remove_lines, self.usage_spill_path, set(lines))
+                logger.info(f"Replayed {len(entries):,d} spilled usage data into Redis.")
+            return len(entries)
+        finally:
+            self._replaying_spill = False
 
     # def retrieve_usage_buffer(self) -> list[UsageData]:
     #     return [
@@ -269,11 +530,174 @@ class Cache:
     async def get_usage_buffer_count(self) -> int:
         return int(await (await self._aredis()).get(self.clickhouse_buffer_key + "_count") or 0)
 
+    async def claim_usage_buffer_chunk(self, size: int) -> list[str]:
+        """
+        Claim a chunk of buffered usage data for flushing.
+
+        If a previously claimed chunk was not acknowledged (the flush failed or crashed),
+        that same chunk is returned again so that it can be retried with the same dedup token.
+        Otherwise, up to `size` entries are atomically moved from the head of the oldest
+        non-empty buffer shard into the processing list. Drained shards are removed.
+
+        Args:
+            size (int): Maximum number of buffer entries to claim.
+
+        Returns:
+            chunk (list[str]): Serialised `UsageData` entries. Empty if the buffer is empty.
+        """
+        redis = await self._aredis()
+        # Every key accessed by the script must be passed in KEYS (required by Redis Cluster)
+        shards = await redis.zrange(self.clickhouse_buffer_key + ":shards", 0, -1)
+        return await redis.eval(
+            """
+            local pending = redis.call("LRANGE", KEYS[2], 0, -1)
+            if #pending > 0 then
+                return pending
+            end
+            local size = tonumber(ARGV[1])
+            -- Unsharded buffer from older versions
+            local items = redis.call("LRANGE", KEYS[1], 0, size - 1)
+            if #items > 0 then
+                redis.call("LTRIM", KEYS[1], #items, -1)
+            else
+                for i = 4, #KEYS do
+                    local shard = KEYS[i]
+                    items = redis.call("LRANGE", shard, 0, size - 1)
+                    if #items > 0 then
+                        redis.call("LTRIM", shard, #items, -1)
+                        if redis.call("LLEN", shard) == 0 then
+                            redis.call("ZREM", KEYS[3], shard)
+                        end
+                        break
+                    end
+                    redis.call("ZREM", KEYS[3], shard)
+                end
+            end
+            if #items > 0 then
+                redis.call("RPUSH", KEYS[2], unpack(items))
+            end
+            return items
+            """,
+            3 + len(shards),
+            self.clickhouse_buffer_key,
+            self.clickhouse_buffer_key + "_temp",
+            self.clickhouse_buffer_key + ":shards",
+            *shards,
+            size,
+        )
+
+    async def ack_usage_buffer_chunk(self, num_events: int) -> None:
+        """
+        Acknowledge that the claimed chunk has been flushed.
+
+        Args:
+            num_events (int): Total number of usage events in the chunk.
+        """
+        redis = await self._aredis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self.clickhouse_buffer_key + "_temp")
+            pipe.decrby(self.clickhouse_buffer_key + "_count", num_events)
+            await pipe.execute()
+
     # def reset_buffer_and_count(self):
     #     # Delete the buffer and count keys
     #     del self[self.clickhouse_buffer_key]
     #     del self[self.clickhouse_buffer_key + "_count"]
 
+    async def get_meters_cache_version(self) -> int:
+        return int(await self.get("meters_closed_bucket_version") or 0)
+
+    async def bump_meters_cache_version(self) -> int:
+        """
+        Invalidate cached closed meter buckets.
+        Call this whenever usage that may belong to an already closed bucket is written.
+        """
+        return await (await self._aredis()).incr("meters_closed_bucket_version")
+
+    async def get_table_meta_version(self, schema_id: str, table_id: str) -> str:
+        schema_version, table_version = await (await self._aredis()).mget(
+            f"table_meta_version:{schema_id}", f"table_meta_version:{schema_id}:{table_id}"
+        )
+        return f"{schema_version or 0}.{table_version or 0}"
+
+    async def bump_table_meta_version(self, schema_id: str, table_id: str | None = None) -> None:
+        """
+        Invalidate table and column metadata cached by every process.
+        Call this whenever a table (or with `table_id=None`, any table of the schema) changes.
+        """
+        key = f"table_meta_version:{schema_id}"
+        if table_id is not None:
+            key = f"{key}:{table_id}"
+        await (await self._aredis()).incr(key)
+
+    async def get_secrets_version(self, organization_id: str) -> int:
+        return int(await self.get(f"secrets_version:{organization_id}") or 0)
+
+    async def bump_secrets_version(self, organization_id: str) -> int:
+        """
+        Invalidate cached decrypted secrets of an organization.
+        Call this whenever a secret is created, updated or deleted.
+        """
+        return await (await self._aredis()).incr(f"secrets_version:{organization_id}")
+
+    async def get_file_storage_bytes(self, organization_id: str) -> int | None:
+        value = await self.get(f"file_storage_bytes:{organization_id}")
+        return None if value is None else int(value)
+
+    async def add_file_storage_bytes(self, organization_id: str, num_bytes: int) -> int | None:
+        """
+        Adjust the file storage counter of an organization, keeping its expiry.
+        The counter is only adjusted if it exists, ie after a reconciliation scan has set it.
+        Adjustments made while a scan is running are also recorded, see `end_file_storage_scan`.
+
+        Returns:
+            value (int | None): The counter value after the adjustment, or None if it does not exist.
+        """
+        redis = await self._aredis()
+        return await redis.eval(
+            """
+            if redis.call("EXISTS", KEYS[2]) == 1 then
+                redis.call("INCRBY", KEYS[2], ARGV[1])
+            end
+            if redis.call("EXISTS", KEYS[1]) == 1 then
+                return redis.call("INCRBY", KEYS[1], ARGV[1])
+            end
+            return false
+            """,
+            2,
+            f"file_storage_bytes:{organization_id}",
+            f"file_storage_scan_delta:{organization_id}",
+            num_bytes,
+        )
+
+    async def begin_file_storage_scan(self, organization_id: str, *, ex: int) -> None:
+        """Start recording file storage adjustments made while the bucket is scanned."""
+        await self.set(f"file_storage_scan_delta:{organization_id}", "0", ex=ex)
+
+    async def end_file_storage_scan(self, organization_id: str, num_bytes: int, *, ex: int) -> int:
+        """
+        Set the file storage counter of an organization from a scan that started with
+        `begin_file_storage_scan`, adding the adjustments made in the meantime so that they are
+        not lost. Files written during the scan may be counted twice until the next scan.
+
+        Returns:
+            value (int): The counter value.
+        """
+        redis = await self._aredis()
+        return await redis.eval(
+            """
+            local value = tonumber(ARGV[1]) + tonumber(redis.call("GET", KEYS[2]) or "0")
+            redis.call("DEL", KEYS[2])
+            redis.call("SET", KEYS[1], value, "EX", ARGV[2])
+            return value
+            """,
+            2,
+            f"file_storage_bytes:{organization_id}",
+            f"file_storage_scan_delta:{organization_id}",
+            num_bytes,
+            ex,
+        )
+
     @staticmethod
     def get_capacity_search_keys(deployment_id: str) -> dict[str, str]:
         queue_key = f"capacity_search_model_queue:{deployment_id}"
@@ -1,8 +1,11 @@
+import ast
+import asyncio
 import base64
 import pickle
 import time
 import uuid
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Any
 
 import filetype
@@ -12,11 +15,12 @@ from loguru import logger
 from sqlalchemy import func
 from sqlmodel import or_, select
 
-from owl.configs import ENV_CONFIG
+from owl.configs import CACHE, ENV_CONFIG
 from owl.db import async_session
 from owl.db.models import Project, Secret
 from owl.types import AUDIO_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS, ColumnDtype
 from owl.utils.billing import OPENTELEMETRY_CLIENT
+from owl.utils.cache import LRUCache
 from owl.utils.crypt import decrypt
 from owl.utils.exceptions import BadInputError, JamaiException
 from owl.utils.io import s3_upload
@@ -24,6 +28,7 @@ from owl.utils.io import s3_upload
 REQ_COUNTER = OPENTELEMETRY_CLIENT.get_counter("code_executor_requests_total")
 REQ_SECONDS = OPENTELEMETRY_CLIENT.get_histogram("code_executor_duration_seconds")
 RES_BYTES = OPENTELEMETRY_CLIENT.get_histogram("code_executor_result_bytes")
+REQ_BYTES = OPENTELEMETRY_CLIENT.get_histogram("code_executor_request_bytes")
 
 
 def _status_class(code: int | None) -> str:
@@ -81,6 +86,142 @@ async def observe_code_execution(
         RES_BYTES.record(rec["result_bytes"], labels)
 
 
+class CodeExecutorPool:
+    """
+    Long-lived HTTP client pool to the code executor service.
+
+    httpx connections are bound to the event loop that created them, and this module can be
+    used from different loops (API workers, Celery tasks and tests),
+    so the client is recreated whenever the running loop changes, and the stale one is closed.
+    """
+
+    def __init__(self, *, base_url: str, timeout: float, max_connections: int) -> None:
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            # Swap before awaiting, so that concurrent callers share the new client
+            stale_client, stale_loop = self._client, self._loop
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._loop = loop
+            if stale_client is not None and not stale_client.is_closed:
+                await self._aclose_client(stale_client, stale_loop)
+        return self._client
+
+    async def aclose(self) -> None:
+        client, loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+        if client is not None and not client.is_closed:
+            await self._aclose_client(client, loop)
+
+    @staticmethod
+    async def _aclose_client(
+        client: httpx.AsyncClient,
+        loop: asyncio.AbstractEventLoop | None,
+    ) -> None:
+        try:
+            if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+                # The loop runs in another thread, close its connections over there
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close stale code executor client: {repr(e)}")
+
+
+CODE_EXECUTOR_POOL = CodeExecutorPool(
+    base_url=ENV_CONFIG.code_executor_endpoint,
+    timeout=ENV_CONFIG.code_timeout_sec,
+    max_connections=ENV_CONFIG.code_executor_max_connections,
+)
+# Maps "<org ID>:<project ID>:<secrets version>" to pickled and base64-encoded secrets
+_SECRETS_CACHE: LRUCache[str] = LRUCache(
+    maxsize=10000, ttl_sec=ENV_CONFIG.code_secrets_cache_ttl_sec
+)
+
+
+@lru_cache(maxsize=1000)
+def referenced_columns(source_code: str) -> frozenset[str] | None:
+    """
+    Statically find the columns read by Python code via `row["<column>"]` or `row.get("<column>")`.
+
+    Args:
+        source_code (str): Python source code.
+
+    Returns:
+        columns (frozenset[str] | None): Column IDs read by the code,
+            or None if `row` is accessed dynamically (or the code cannot be parsed),
+            in which case every column must be sent.
+    """
+    try:
+        tree = ast.parse(source_code)
+    except SyntaxError:
+        return None
+    columns = set()
+    allowed: set[int] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Subscript):
+            value, key = node.value, node.slice
+        elif (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "get"
+            and len(node.args) >= 1
+        ):
+            value, key = node.func.value, node.args[0]
+        else:
+            continue
+        if not (isinstance(value, ast.Name) and value.id == "row"):
+            continue
+        if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+            return None
+        columns.add(key.value)
+        allowed.add(id(value))
+    # Any other usage of `row` (iteration, `row.items()`, passing it around) needs the full row
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id == "row" and id(node) not in allowed:
+            if isinstance(node.ctx, ast.Load):
+                return None
+    return frozenset(columns)
+
+
+def select_row_columns(
+    source_code: str,
+    row_data: dict[str, Any],
+    output_column: str,
+) -> dict[str, Any]:
+    """
+    Drop columns that the code does not read, so that they are not loaded nor sent to the executor.
+
+    Args:
+        source_code (str): Python source code.
+        row_data (dict[str, Any]): Row data.
+        output_column (str): Output column ID, always kept.
+
+    Returns:
+        row_data (dict[str, Any]): Row data with only the referenced columns.
+    """
+    if not isinstance(source_code, str):
+        return row_data
+    columns = referenced_columns(source_code)
+    if columns is None:
+        return row_data
+    return {k: v for k, v in row_data.items() if k in columns or k == output_column}
+
+
 async def _fetch_accessible_secrets(project_id: str) -> dict[str, str]:
     """
     Fetch all secrets accessible to a given project.
@@ -117,6 +258,112 @@ async def _fetch_accessible_secrets(project_id: str) -> dict[str, str]:
     return secrets_dict
 
 
+async def _get_encoded_secrets(organization_id: str, project_id: str) -> str:
+    """
+    Fetch the secrets accessible to a project, pickled and base64-encoded.
+    Results are cached for a short while, keyed by the organization's secrets version
+    which is bumped whenever a secret is created, updated or deleted.
+    """
+    try:
+        version = await CACHE.get_secrets_version(organization_id)
+    except Exception as e:
+        logger.warning(f"Failed to get secrets version for organization {organization_id}: {e}")
+        version = None
+    key = f"{organization_id}:{project_id}:{version}"
+    if version is not None and (secrets := _SECRETS_CACHE.get(key)) is not None:
+        return secrets
+    secrets = await _fetch_accessible_secrets(project_id)
+    secrets = base64.b64encode(pickle.dumps(secrets)).decode("utf-8")
+    if version is not None:
+        _SECRETS_CACHE.set(key, secrets)
+    return secrets
+
+
+async def _execute(
+    *,
+    source_code: str,
+    output_column: str,
+    row_data: dict | None,
+    organization_id: str,
+    project_id: str,
+    dtype: str,
+    rec: Any,
+) -> Any:
+    # Fetch accessible secrets for this project
+    secrets = await _get_encoded_secrets(organization_id, project_id)
+    row_data = base64.b64encode(pickle.dumps(row_data)).decode("utf-8")
+    REQ_BYTES.record(
+        len(source_code) + len(row_data) + len(secrets),
+        {"org_id": organization_id, "proj_id": project_id, "dtype": dtype},
+    )
+    response = await (await CODE_EXECUTOR_POOL.client()).post(
+        "/execute",
+        json={
+            "source_code": source_code,
+            "output_column": output_column,
+            "row_data": row_data,
+            # Pass secrets as environment variables
+            # The code executor service (v8-kopi) should set these as environment
+            # variables in the execution context so they can be accessed via os.environ
+            "env_vars": secrets,
+        },
+    )
+    rec.set_status_code(response.status_code)
+    response.raise_for_status()
+    return pickle.loads(base64.b64decode(response.text.strip('"')))
+
+
+async def _process_result(
+    result: Any,
+    *,
+    organization_id: str,
+    project_id: str,
+    dtype: str,
+) -> tuple[str | None, int]:
+    """
+    Convert an execution result into a cell value.
+
+    Returns:
+        value (str | None): Cell value, which is a file URI for image and audio columns.
+        num_bytes (int): Result size in bytes.
+    """
+    # Return early if output column is ColumnDtype.STR
+    if dtype == ColumnDtype.STR:
+        return None if result is None else str(result), len(str(result).encode("utf-8"))
+
+    if not isinstance(result, bytes):
+        if isinstance(result, str):
+            content = result
+            if len(content) > 500:
+                content = content[:500] + "..."
+            msg = f"Execution exception: {content}"
+        else:
+            msg = f'Result type must be bytes for column type "{dtype}" but got {type(result)}.'
+        raise BadInputError(msg)
+
+    content_type = filetype.guess(result)
+    if not content_type:
+        raise BadInputError("Result type is bytes but could not determine content type.")
+
+    file_extension = f".{content_type.extension}"
+
+    # Handle different data types
+    if (dtype == ColumnDtype.IMAGE and file_extension in IMAGE_FILE_EXTENSIONS) or (
+        dtype == ColumnDtype.AUDIO and file_extension in AUDIO_FILE_EXTENSIONS
+    ):
+        filename = f"{uuid.uuid4()}{file_extension}"
+        # Upload the file
+        uri = await s3_upload(
+            organization_id=organization_id,
+            project_id=project_id,
+            content=result,
+            content_type=content_type.mime,
+            filename=filename,
+        )
+        return uri, len(result)
+    return None, len(result)
+
+
 async def code_executor(
     *,
     request: Request,
@@ -133,81 +380,206 @@ async def code_executor(
         dtype=dtype,
     ) as rec:
         try:
-            # Fetch accessible secrets for this project
-            secrets = await _fetch_accessible_secrets(project_id)
-            async with httpx.AsyncClient(timeout=ENV_CONFIG.code_timeout_sec) as client:
-                row_data = base64.b64encode(pickle.dumps(row_data)).decode("utf-8")
-                secrets = base64.b64encode(pickle.dumps(secrets)).decode("utf-8")
-                response = await client.post(
-                    f"{ENV_CONFIG.code_executor_endpoint}/execute",
-                    json={
-                        "source_code": source_code,
-                        "output_column": output_column,
-                        "row_data": row_data,
-                        # Pass secrets as environment variables
-                        # The code executor service (v8-kopi) should set these as environment
-                        # variables in the execution context so they can be accessed via os.environ
-                        "env_vars": secrets,
-                    },
-                )
-                rec.set_status_code(response.status_code)
-                response.raise_for_status()
-                result = pickle.loads(base64.b64decode(response.text.strip('"')))
-
-                # Return early if output column is ColumnDtype.STR
-                if dtype == ColumnDtype.STR:
-                    rec.set_result_bytes(len(str(result).encode("utf-8")))
-                    logger.info(
-                        f"Code Executor: {request.state.id} - Python code execution completed for column {output_column}"
-                    )
-                    return None if result is None else str(result)
-
-                if not isinstance(result, bytes):
-                    if isinstance(result, str):
-                        content = result
-                        if len(content) > 500:
-                            content = content[:500] + "..."
-                        msg = f"Execution exception: {content}"
-                    else:
-                        msg = (
-                            f'Result type must be bytes for column type "{dtype}" '
-                            f"but got {type(result)}."
-                        )
-                    raise BadInputError(msg)
-
-                rec.set_result_bytes(len(result))
-
-                content_type = filetype.guess(result)
-                if not content_type:
-                    raise BadInputError(
-                        "Result type is bytes but could not determine content type."
-                    )
+            result = await _execute(
+                source_code=source_code,
+                output_column=output_column,
+                row_data=row_data,
+                organization_id=organization_id,
+                project_id=project_id,
+                dtype=dtype,
+                rec=rec,
+            )
+            value, num_bytes = await _process_result(
+                result,
+                organization_id=organization_id,
+                project_id=project_id,
+                dtype=dtype,
+            )
+            rec.set_result_bytes(num_bytes)
+            logger.info(
+                f"Code Executor: {request.state.id} - Python code execution completed for column {output_column}"
+            )
+            return value
+        except JamaiException:
+            # Don't log expected JamaiExceptions
+            raise
+        except Exception as e:
+            logger.error(
+                f"Code Executor: {request.state.id} - Python code execution encountered error for column {output_column} : {e}"
+            )
+            raise
+
+
+# Runs the user code once per row within a single execution, collecting per-row results or errors
+_BATCH_SOURCE_TEMPLATE = """\
+__code = compile({source_code!r}, "<python column>", "exec")
+__results = []
+for __row in row["rows"]:
+    try:
+        exec(__code, {{"__name__": "__main__", "row": __row}})
+        __results.append((True, __row.get({output_column!r})))
+    except Exception as __e:
+        __results.append((False, f"{{type(__e).__name__}}: {{__e}}"))
+row[{output_column!r}] = __results
+"""
+
+
+async def code_executor_batch(
+    *,
+    request: Request,
+    organization_id: str,
+    project_id: str,
+    source_code: str,
+    output_column: str,
+    rows: list[dict],
+    dtype: str,
+) -> list[str | None | Exception]:
+    """
+    Execute Python code for multiple rows in a single code executor call.
+    The code is compiled once and run for each row in the same (warm) interpreter.
 
-                file_extension = f".{content_type.extension}"
+    Args:
+        request (Request): Request.
+        organization_id (str): Organization ID.
+        project_id (str): Project ID.
+        source_code (str): Python code, which reads from and writes to `row`.
+        output_column (str): Output column ID.
+        rows (list[dict]): List of row data.
+        dtype (str): Output column data type.
 
-                # Handle different data types
-                if (dtype == ColumnDtype.IMAGE and file_extension in IMAGE_FILE_EXTENSIONS) or (
-                    dtype == ColumnDtype.AUDIO and file_extension in AUDIO_FILE_EXTENSIONS
-                ):
-                    filename = f"{uuid.uuid4()}{file_extension}"
-                    # Upload the file
-                    uri = await s3_upload(
+    Returns:
+        results (list[str | None | Exception]): Per-row cell values,
+            or the exception raised while executing or processing that row.
+    """
+    async with observe_code_execution(
+        organization_id=organization_id,
+        project_id=project_id,
+        dtype=dtype,
+    ) as rec:
+        try:
+            results = await _execute(
+                source_code=_BATCH_SOURCE_TEMPLATE.format(
+                    source_code=source_code, output_column=output_column
+                ),
+                output_column=output_column,
+                row_data={"rows": rows, output_column: None},
+                organization_id=organization_id,
+                project_id=project_id,
+                dtype=dtype,
+                rec=rec,
+            )
+            if not (isinstance(results, list) and len(results) == len(rows)):
+                # The executor returns the error message if the wrapper itself failed
+                raise BadInputError(f"Execution exception: {str(results)[:500]}")
+
+            async def _process(ok: bool, result: Any) -> tuple[str | None, int] | Exception:
+                if not ok:
+                    return BadInputError(f"Execution exception: {result[:500]}")
+                try:
+                    return await _process_result(
+                        result,
                         organization_id=organization_id,
                         project_id=project_id,
-                        content=result,
-                        content_type=content_type.mime,
-                        filename=filename,
+                        dtype=dtype,
                     )
-                    logger.info(
-                        f"Code Executor: {request.state.id} - Python code execution completed for column {output_column}"
-                    )
-                    return uri
+                except Exception as e:
+                    return e
 
+            outputs = await asyncio.gather(*[_process(ok, r) for ok, r in results])
+            rec.set_result_bytes(sum(o[1] for o in outputs if not isinstance(o, Exception)))
+            logger.info(
+                (
+                    f"Code Executor: {request.state.id} - Python code batch execution completed "
+                    f"for column {output_column} ({len(rows):,d} rows)"
+                )
+            )
+            return [o if isinstance(o, Exception) else o[0] for o in outputs]
         except JamaiException:
-            # Don't log expected JamaiExceptions
             raise
         except Exception as e:
             logger.error(
-                f"Code Executor: {request.state.id} - Python code execution encountered error for column {output_column} : {e}"
+                f"Code Executor: {request.state.id} - Python code batch execution encountered error for column {output_column} : {e}"
             )
             raise
+
+
+class CodeBatcher:
+    """
+    Groups concurrent Python cell executions of the same column into batched executor calls.
+
+    Each submission waits at most `max_wait_sec` for other rows to join its batch,
+    and a batch is sent as soon as it reaches `max_batch_size` rows.
+    """
+
+    def __init__(
+        self,
+        *,
+        request: Request,
+        organization_id: str,
+        project_id: str,
+        max_batch_size: int,
+        max_wait_sec: float,
+    ) -> None:
+        self.request = request
+        self.organization_id = organization_id
+        self.project_id = project_id
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_sec = max_wait_sec
+        self._pending: dict[tuple[str, str, str], list[tuple[dict, asyncio.Future]]] = {}
+        self._timers: dict[tuple[str, str, str], asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        *,
+        source_code: str,
+        output_column: str,
+        row_data: dict,
+        dtype: str,
+    ) -> str | None:
+        loop = asyncio.get_running_loop()
+        key = (output_column, source_code, dtype)
+        fut = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((row_data, fut))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.max_wait_sec, self._flush, key)
+        return await fut
+
+    def _flush(self, key: tuple[str, str, str]) -> None:
+        if (timer := self._timers.pop(key, None)) is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if len(batch) == 0:
+            return
+        task = asyncio.create_task(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        key: tuple[str, str, str],
+        batch: list[tuple[dict, asyncio.Future]],
+    ) -> None:
+        output_column, source_code, dtype = key
+        try:
+            results = await code_executor_batch(
+                request=self.request,
+                organization_id=self.organization_id,
+                project_id=self.project_id,
+                source_code=source_code,
+                output_column=output_column,
+                rows=[row for row, _ in batch],
+                dtype=dtype,
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, fut), result in zip(batch, results, strict=True):
+            if fut.done():
+                continue
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
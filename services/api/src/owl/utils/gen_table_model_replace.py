@@ -199,17 +199,17 @@ class GenTableModelReplacer:
         async with async_session() as session:
             if self.organization_ids is None:
                 organizations: list[OrganizationRead] = []
-                offset = 0
+                after = None
                 while True:
                     page = await Organization.list_(
                         session=session,
                         return_type=OrganizationRead,
-                        offset=offset,
                         limit=ORG_PROJECT_PAGE_SIZE,
+                        after=after,
                     )
                     organizations.extend(page.items)
-                    offset += len(page.items)
-                    if offset >= page.total or not page.items:
+                    after = page.end_cursor
+                    if after is None:
                         return organizations
 
             organizations: list[OrganizationRead] = []
@@ -222,18 +222,18 @@ class GenTableModelReplacer:
     async def _list_projects(organization_id: str) -> list[ProjectRead]:
         async with async_session() as session:
             projects: list[ProjectRead] = []
-            offset = 0
+            after = None
             while True:
                 page = await Project.list_(
                     session=session,
                     return_type=ProjectRead,
                     filters=dict(organization_id=organization_id),
-                    offset=offset,
                     limit=ORG_PROJECT_PAGE_SIZE,
+                    after=after,
                 )
                 projects.extend(page.items)
-                offset += len(page.items)
-                if offset >= page.total or not page.items:
+                after = page.end_cursor
+                if after is None:
                     return projects
 
     @staticmethod
@@ -1,7 +1,9 @@
+import asyncio
 import ipaddress
 import os
 import socket
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from hashlib import blake2b
 from io import BytesIO
 from os.path import join, splitext
@@ -19,7 +21,6 @@ from pydantic_ai.retries import (
     RetryConfig,
     wait_retry_after,
 )
-from sqlmodel import select
 from tenacity import retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from jamaibase.utils.io import (  # noqa: F401
@@ -50,6 +51,7 @@ from owl.types import (
     DOCUMENT_FILE_EXTENSIONS,
     IMAGE_FILE_EXTENSIONS,
     DBStorageUsage,
+    TableImportUploadPart,
     TableType,
 )
 from owl.utils import uuid7_str
@@ -515,6 +517,9 @@ async def s3_upload(
                 Key=thumb_key,
                 ContentType=f"{content_type.split('/')[0]}/{'mpeg' if thumb_ext == 'mp3' else thumb_ext}",
             )
+    await adjust_file_storage_usage(
+        organization_id, len(content) + (len(thumbnail) if thumbnail else 0)
+    )
     logger.info(
         f"File uploaded: [{organization_id}/{project_id}] "
         f"Location: s3://{S3_BUCKET_NAME}/{raw_key} "
@@ -625,6 +630,210 @@ async def s3_temporary_file(
                 logger.warning(f'Failed to delete temporary S3 file "{uri}": {repr(e)}')
 
 
+def _table_import_upload_key(upload_id: str) -> str:
+    return f"table_import_upload:{upload_id}"
+
+
+async def _get_table_import_upload(upload_id: str, project_id: str) -> dict[str, str]:
+    from owl.configs import CACHE
+
+    state = await CACHE.get(_table_import_upload_key(upload_id))
+    if state is None or (state := json_loads(state))["project_id"] != project_id:
+        raise ResourceNotFoundError(f'Upload "{upload_id}" is not found or has expired.')
+    return state
+
+
+async def s3_create_table_import_upload(project_id: str) -> str:
+    """
+    Starts an S3 multipart upload of a Parquet file to be imported as a table.
+    The upload state is kept in Redis for `table_import_upload_ttl_sec`.
+
+    Args:
+        project_id (str): The ID of the project to import into.
+
+    Returns:
+        upload_id (str): The upload ID.
+    """
+    from owl.configs import CACHE
+
+    upload_id = uuid7_str()
+    s3_key = f"temp/import/{project_id}/{upload_id}.parquet"
+    async with get_s3_aclient() as aclient:
+        response = await aclient.create_multipart_upload(
+            Bucket=S3_BUCKET_NAME,
+            Key=s3_key,
+            ContentType="application/vnd.apache.parquet",
+        )
+    state = dict(project_id=project_id, key=s3_key, s3_upload_id=response["UploadId"])
+    await CACHE.set(
+        _table_import_upload_key(upload_id),
+        json_dumps(state),
+        ex=ENV_CONFIG.table_import_upload_ttl_sec,
+    )
+    return upload_id
+
+
+async def s3_upload_table_import_part(
+    upload_id: str,
+    project_id: str,
+    part_number: int,
+    content: bytes,
+) -> TableImportUploadPart:
+    state = await _get_table_import_upload(upload_id, project_id)
+    async with get_s3_aclient() as aclient:
+        try:
+            response = await aclient.upload_part(
+                Bucket=S3_BUCKET_NAME,
+                Key=state["key"],
+                UploadId=state["s3_upload_id"],
+                PartNumber=part_number,
+                Body=content,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchUpload":
+                raise ResourceNotFoundError(f'Upload "{upload_id}" is not found.') from e
+            raise
+    return TableImportUploadPart(part_number=part_number, size=len(content), etag=response["ETag"])
+
+
+async def s3_list_table_import_parts(
+    upload_id: str,
+    project_id: str,
+) -> list[TableImportUploadPart]:
+    state = await _get_table_import_upload(upload_id, project_id)
+    parts = []
+    async with get_s3_aclient() as aclient:
+        paginator = aclient.get_paginator("list_parts")
+        try:
+            async for page in paginator.paginate(
+                Bucket=S3_BUCKET_NAME, Key=state["key"], UploadId=state["s3_upload_id"]
+            ):
+                parts += [
+                    TableImportUploadPart(
+                        part_number=p["PartNumber"], size=p["Size"], etag=p["ETag"]
+                    )
+                    for p in page.get("Parts", [])
+                ]
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchUpload":
+                raise ResourceNotFoundError(f'Upload "{upload_id}" is not found.') from e
+            raise
+    return sorted(parts, key=lambda p: p.part_number)
+
+
+async def s3_abort_table_import_upload(upload_id: str, project_id: str) -> None:
+    from owl.configs import CACHE
+
+    state = await _get_table_import_upload(upload_id, project_id)
+    async with get_s3_aclient() as aclient:
+        try:
+            await aclient.abort_multipart_upload(
+                Bucket=S3_BUCKET_NAME, Key=state["key"], UploadId=state["s3_upload_id"]
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchUpload":
+                raise
+    await CACHE.delete(_table_import_upload_key(upload_id))
+
+
+async def s3_abort_expired_table_import_uploads() -> int:
+    """
+    Aborts table import multipart uploads (under `temp/import/`) that were started more than
+    `table_import_upload_ttl_sec` ago. Their upload state has expired from Redis by then,
+    so they can no longer be completed or aborted through the API, but S3 keeps their parts.
+
+    Returns:
+        num_aborted (int): Number of uploads aborted.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ENV_CONFIG.table_import_upload_ttl_sec)
+    num_aborted = 0
+    async with get_s3_aclient() as aclient:
+        paginator = aclient.get_paginator("list_multipart_uploads")
+        async for page in paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix="temp/import/"):
+            for upload in page.get("Uploads", []):
+                if upload["Initiated"] >= cutoff:
+                    continue
+                try:
+                    await aclient.abort_multipart_upload(
+                        Bucket=S3_BUCKET_NAME, Key=upload["Key"], UploadId=upload["UploadId"]
+                    )
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "NoSuchUpload":
+                        logger.warning(
+                            f'Failed to abort expired upload of "{upload["Key"]}": {repr(e)}'
+                        )
+                    continue
+                num_aborted += 1
+    if num_aborted > 0:
+        logger.info(f"Aborted {num_aborted:,d} expired table import uploads.")
+    return num_aborted
+
+
+@asynccontextmanager
+async def s3_completed_table_import_upload(
+    upload_id: str,
+    project_id: str,
+) -> AsyncGenerator[str, None]:
+    """
+    Assembles the uploaded parts into a single S3 object, yields its URI,
+    and deletes the object upon exit.
+
+    Args:
+        upload_id (str): The upload ID.
+        project_id (str): The ID of the project that started the upload.
+
+    Yields:
+        uri (str): The S3 URI of the assembled Parquet file.
+    """
+    from owl.configs import CACHE
+
+    state = await _get_table_import_upload(upload_id, project_id)
+    parts = await s3_list_table_import_parts(upload_id, project_id)
+    if len(parts) == 0:
+        raise BadInputError(f'Upload "{upload_id}" has no parts.')
+    if [p.part_number for p in parts] != list(range(1, len(parts) + 1)):
+        raise BadInputError(
+            f'Upload "{upload_id}" has missing parts, received: {[p.part_number for p in parts]}'
+        )
+    # S3 rejects undersized parts other than the last, so check against the advertised part size
+    part_size = ENV_CONFIG.table_import_part_size_bytes
+    if mis_sized := [p.part_number for p in parts[:-1] if p.size != part_size]:
+        raise BadInputError(
+            f'Upload "{upload_id}" has parts that are not {part_size:,d} bytes: {mis_sized}'
+        )
+    async with get_s3_aclient() as aclient:
+        try:
+            await aclient.complete_multipart_upload(
+                Bucket=S3_BUCKET_NAME,
+                Key=state["key"],
+                UploadId=state["s3_upload_id"],
+                MultipartUpload={
+                    "Parts": [{"PartNumber": p.part_number, "ETag": p.etag} for p in parts]
+                },
+            )
+        except ClientError as e:
+            match e.response["Error"]["Code"]:
+                case "NoSuchUpload":
+                    raise ResourceNotFoundError(f'Upload "{upload_id}" is not found.') from e
+                case "EntityTooSmall" | "InvalidPart" | "InvalidPartOrder":
+                    raise BadInputError(
+                        f'Upload "{upload_id}" has invalid parts: {e.response["Error"]["Message"]}'
+                    ) from e
+            raise
+    await CACHE.delete(_table_import_upload_key(upload_id))
+    uri = f"s3://{S3_BUCKET_NAME}/{state['key']}"
+    logger.info(f"Temporary S3 file assembled from {len(parts):,d} parts: {uri}")
+    try:
+        yield uri
+    finally:
+        try:
+            async with get_s3_aclient() as aclient:
+                await aclient.delete_object(Bucket=S3_BUCKET_NAME, Key=state["key"])
+            logger.info(f"Temporary S3 file deleted: {uri}")
+        except Exception as e:
+            logger.warning(f'Failed to delete temporary S3 file "{uri}": {repr(e)}')
+
+
 async def generate_presigned_s3_url(s3_client, bucket_name: str, key: str) -> str:
     try:
         response = await s3_client.list_objects_v2(Bucket=bucket_name, Prefix=key, MaxKeys=1)
@@ -731,31 +940,110 @@ async def generate_document_thumbnail(
         logger.exception(f"Failed to generate file thumbnail due to {e.__class__.__name__}: {e}")
 
 
-async def get_file_storage_usage(org_id: str) -> float | None:
+async def adjust_file_storage_usage(org_id: str, num_bytes: int) -> None:
+    """
+    Adds to (or subtracts from, if negative) the file storage counter of an organization.
+    Failures are logged and left for the next reconciliation scan to correct.
+
+    Args:
+        org_id (str): The ID of the organization.
+        num_bytes (int): The number of bytes written (positive) or deleted (negative).
+    """
+    from owl.configs import CACHE
+
+    if num_bytes == 0:
+        return
+    try:
+        await CACHE.add_file_storage_bytes(org_id, num_bytes)
+    except Exception as e:
+        logger.warning(
+            f'Failed to update file storage usage for organization "{org_id}": {repr(e)}'
+        )
+
+
+async def _list_prefix(aclient, prefix: str, delimiter: str = "") -> tuple[int, list[str]]:
+    """Returns the total size of objects directly under a prefix, and its sub-prefixes."""
+    paginator = aclient.get_paginator("list_objects_v2")
+    size = 0
+    sub_prefixes = []
+    async for page in paginator.paginate(
+        Bucket=S3_BUCKET_NAME, Prefix=prefix, Delimiter=delimiter
+    ):
+        size += sum(obj["Size"] for obj in page.get("Contents", []))
+        sub_prefixes += [p["Prefix"] for p in page.get("CommonPrefixes", [])]
+    return size, sub_prefixes
+
+
+async def scan_file_storage_usage(org_id: str) -> int:
+    """
+    Sums the sizes of all S3 objects under the 'raw/{org_id}/' and 'thumb/{org_id}/' prefixes.
+    Each project sub-prefix is listed concurrently, up to `file_storage_scan_concurrency` at a time.
+
+    Args:
+        org_id (str): The ID of the organization to measure.
+
+    Returns:
+        num_bytes (int): The total storage used in bytes.
+    """
+    semaphore = asyncio.Semaphore(ENV_CONFIG.file_storage_scan_concurrency)
+    async with get_s3_aclient() as aclient:
+
+        async def _size(prefix: str) -> int:
+            async with semaphore:
+                return (await _list_prefix(aclient, prefix))[0]
+
+        roots = await asyncio.gather(
+            *[_list_prefix(aclient, p, "/") for p in (f"raw/{org_id}/", f"thumb/{org_id}/")]
+        )
+        sizes = await asyncio.gather(*[_size(p) for _, sub in roots for p in sub])
+    return sum(size for size, _ in roots) + sum(sizes)
+
+
+async def get_file_storage_usage(org_id: str, *, reconcile: bool = False) -> float | None:
     """
-    Calculates the total file storage used by an organization in the S3 bucket.
+    Gets the total file storage used by an organization in the S3 bucket.
 
-    This function iterates through the S3 objects under the standard 'raw/{org_id}/'
-    and 'thumb/{org_id}/' prefixes, summing their sizes. It includes error
-    handling to prevent task failure if S3 is unavailable.
+    Uploads are counted incrementally in Redis. The bucket is only scanned when the counter
+    is missing or has expired (every `file_storage_reconcile_sec`), or if `reconcile` is True.
+    Errors are handled to prevent task failure if S3 is unavailable.
 
     Args:
         org_id (str): The ID of the organization to measure.
+        reconcile (bool, optional): Scan the bucket and reset the counter. Defaults to False.
 
     Returns:
         usage_gib (float | None): The total storage used in GiB. Returns None on error.
     """
+    from owl.configs import CACHE
+
     try:
-        async with get_s3_aclient() as aclient:
-            paginator = aclient.get_paginator("list_objects_v2")
-            total_size = 0
-            for prefix in [f"raw/{org_id}/", f"thumb/{org_id}/"]:
-                prefix_size = 0
-                async for page in paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix=prefix):
-                    for obj in page.get("Contents", []):
-                        prefix_size += obj["Size"]
-                total_size += prefix_size
-            return total_size / GiB
+        if not reconcile:
+            try:
+                num_bytes = await CACHE.get_file_storage_bytes(org_id)
+            except Exception as e:
+                logger.warning(
+                    f'Failed to read file storage usage for organization "{org_id}": {repr(e)}'
+                )
+                num_bytes = None
+            if num_bytes is not None:
+                return max(num_bytes, 0) / GiB
+        # Uploads and deletions during the scan are added on top of its result, not overwritten
+        try:
+            await CACHE.begin_file_storage_scan(org_id, ex=ENV_CONFIG.file_storage_reconcile_sec)
+        except Exception as e:
+            logger.warning(
+                f'Failed to start file storage scan for organization "{org_id}": {repr(e)}'
+            )
+        num_bytes = await scan_file_storage_usage(org_id)
+        try:
+            num_bytes = await CACHE.end_file_storage_scan(
+                org_id, num_bytes, ex=ENV_CONFIG.file_storage_reconcile_sec
+            )
+        except Exception as e:
+            logger.warning(
+                f'Failed to save file storage usage for organization "{org_id}": {repr(e)}'
+            )
+        return num_bytes / GiB
     except Exception as e:
         logger.exception(
             f'Failed to compute file storage usage for organization "{org_id}": {repr(e)}'
@@ -824,6 +1112,7 @@ async def get_schema_storage_usage_postgres(schema_name: str) -> DBStorageUsage:
 async def get_db_storage_usage(org_id: str) -> float | None:
     """
     Calculates the total DB storage used by an organization.
+    The sizes of all table schemas of all projects are summed in a single catalog query.
 
     Args:
         org_id (str): The ID of the organization to measure.
@@ -831,21 +1120,41 @@ async def get_db_storage_usage(org_id: str) -> float | None:
     Returns:
         usage_gib (float | None): The total storage used in GiB. Returns None on error.
     """
-    from owl.db import async_session
-    from owl.db.models import Project
+    from owl.db import SCHEMA, async_session, cached_text
 
     try:
-        db_usage = 0.0
+        query = cached_text(
+            f"""
+            SELECT
+                COALESCE(
+                    SUM(
+                        pg_total_relation_size(c.oid)::bigint
+                        + COALESCE(pg_total_relation_size(c.reltoastrelid), 0)::bigint
+                    ),
+                    0
+                ) AS total_size
+            FROM
+                pg_class c
+            JOIN
+                pg_namespace n ON (n.oid = c.relnamespace)
+            WHERE
+                n.nspname IN (
+                    SELECT p.id || '_' || t.table_type
+                    FROM {SCHEMA}."Project" p
+                    CROSS JOIN unnest(CAST(:table_types AS text[])) AS t(table_type)
+                    WHERE p.organization_id = :org_id
+                )
+                AND c.relkind IN ('r', 'm') -- r = table, m = materialized view
+            """
+        )
         async with async_session() as session:
-            projects_in_org = (
-                await session.exec(select(Project.id).where(Project.organization_id == org_id))
-            ).all()
-        for project_id in projects_in_org:
-            for table_type in TableType:
-                schema_name = f"{project_id}_{table_type}"
-                usage = await get_schema_storage_usage_postgres(schema_name)
-                db_usage += usage.total_size
-        return db_usage / GiB
+            total_size = (
+                await session.exec(
+                    query,
+                    params={"org_id": org_id, "table_types": [t.value for t in TableType]},
+                )
+            ).scalar_one()
+        return float(total_size) / GiB
     except Exception as e:
         logger.exception(
             f'Failed to compute DB storage usage for organization "{org_id}": {repr(e)}'
@@ -59,7 +59,10 @@ from owl.db import SCHEMA, async_session, cached_text
 from owl.db.models import Deployment, ModelConfig
 from owl.types import (
     AudioContent,
+    ChatCompletionChoice,
     ChatCompletionChunkResponse,
+    ChatCompletionDelta,
+    ChatCompletionMessage,
     ChatCompletionResponse,
     ChatCompletionUsage,
     ChatEntry,
@@ -104,6 +107,12 @@ from owl.utils.exceptions import (
     UnavailableError,
     UnexpectedError,
 )
+from owl.utils.lm_cache import (
+    CHAT_RESPONSE_CACHE,
+    QUERY_EMBEDDING_CACHE,
+    SEARCH_QUERY_CACHE,
+    normalise_text,
+)
 
 litellm.drop_params = True
 litellm.set_verbose = False
@@ -181,6 +190,45 @@ def _ensure_text_usage_details(usage: ChatCompletionUsage) -> ChatCompletionUsag
     return usage
 
 
+# Hyperparameters that do not affect the rewritten search query
+_SEARCH_QUERY_CACHE_EXCLUDED_PARAMS = {"id", "stream", "stream_options", "user"}
+# Hyperparameters that do not affect the generated response
+_CHAT_CACHE_EXCLUDED_PARAMS = {"id", "stream", "stream_options", "user"}
+
+
+def _cacheable_chat_response(response: ChatCompletionResponse) -> bool:
+    return (
+        len(response.choices) == 1
+        and response.message is not None
+        and response.finish_reason not in (None, "error")
+    )
+
+
+def _replay_chat_chunks(response: ChatCompletionResponse) -> list[ChatCompletionChunkResponse]:
+    """Replay a cached chat completion as synthetic stream chunks."""
+    message = response.message
+    kwargs = dict(id=response.id, created=response.created, model=response.model)
+    chunks = []
+    if message.reasoning_content:
+        delta = ChatCompletionDelta(reasoning_content=message.reasoning_content)
+        chunks.append(
+            ChatCompletionChunkResponse(
+                **kwargs, choices=[ChatCompletionChoice(index=0, delta=delta)]
+            )
+        )
+    delta = ChatCompletionDelta(content=message.content, tool_calls=message.tool_calls)
+    chunks.append(
+        ChatCompletionChunkResponse(
+            **kwargs,
+            choices=[
+                ChatCompletionChoice(index=0, delta=delta, finish_reason=response.finish_reason)
+            ],
+            usage=response.usage,
+        )
+    )
+    return chunks
+
+
 def _image_usage_to_chat_usage(
     usage: Usage | None,
     *,
@@ -1712,19 +1760,95 @@ class LMEngine:
                 )
         return model_config
 
-    @asynccontextmanager
-    async def _setup_chat(
+    def _chat_cache_key(
         self,
         model: str,
         messages: list[ChatEntry],
-    ):
-        # Validate model capability
-        self._check_messages_type(messages)
+        hyperparams: dict[str, Any],
+    ) -> str | None:
+        """
+        Cache key of a chat completion, or None if the response should not be cached.
+        Only deterministic requests of projects that opted in are cached.
+        """
+        if not (
+            getattr(self.project, "llm_response_cache", False) and CHAT_RESPONSE_CACHE.enabled
+        ):
+            return None
+        if hyperparams.get("temperature", None) != 0 or hyperparams.get("n", 1) != 1:
+            return None
+        return CHAT_RESPONSE_CACHE.make_key(
+            self.organization.id,
+            self.project.id,
+            model,
+            [m.model_dump(mode="json") for m in messages],
+            {k: v for k, v in hyperparams.items() if k not in _CHAT_CACHE_EXCLUDED_PARAMS},
+        )
+
+    async def _get_cached_chat(
+        self,
+        cache_key: str | None,
+        model: str,
+    ) -> ChatCompletionResponse | None:
+        if cache_key is None:
+            return None
+        data = await CHAT_RESPONSE_CACHE.get(cache_key)
+        if data is None:
+            return None
+        response = ChatCompletionResponse.model_validate_json(data)
+        self._create_llm_cache_events(model, hit=True, usage=response.usage)
+        return response
+
+    async def _set_cached_chat(
+        self,
+        cache_key: str | None,
+        model: str,
+        response: ChatCompletionResponse,
+    ) -> None:
+        if cache_key is None:
+            return
+        self._create_llm_cache_events(model, hit=False)
+        if _cacheable_chat_response(response):
+            await CHAT_RESPONSE_CACHE.set(
+                cache_key, response.model_dump_json(exclude={"references"}), scope=self.project.id
+            )
+
+    def _create_llm_cache_events(
+        self,
+        model: str,
+        *,
+        hit: bool,
+        usage: ChatCompletionUsage | None = None,
+    ) -> None:
+        if self.billing is None:
+            return
+        try:
+            self.billing.create_llm_cache_events(
+                model_id=model,
+                hit=hit,
+                input_tokens=getattr(usage, "prompt_tokens", 0),
+                output_tokens=getattr(usage, "completion_tokens", 0),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create LLM cache events due to error: {repr(e)}")
+
+    @staticmethod
+    def _chat_capabilities(messages: list[ChatEntry]) -> list[str]:
         capabilities = [str(ModelCapability.CHAT)]
         if any(m.has_image for m in messages):
             capabilities.append(str(ModelCapability.IMAGE))
         if any(m.has_audio for m in messages):
             capabilities.append(str(ModelCapability.AUDIO))
+        return capabilities
+
+    @asynccontextmanager
+    async def _setup_chat(
+        self,
+        model: str,
+        messages: list[ChatEntry],
+    ):
+        # Validate model capability
+        self._check_messages_type(messages)
+        capabilities = self._chat_capabilities(messages)
         # If model is empty string, we try to get a suitable model
         model_config = await self._get_default_model(model, capabilities)
         model = model_config.id
@@ -1809,20 +1933,54 @@ class LMEngine:
         """
         hyperparams.pop("stream", None)
         async with self._setup_chat(model, messages) as router:
+            cache_key = self._chat_cache_key(router.config.id, messages, hyperparams)
+            if (cached := await self._get_cached_chat(cache_key, router.config.id)) is not None:
+                for chunk in _replay_chat_chunks(cached):
+                    yield chunk
+                return
             completion: AsyncGenerator[ModelResponse, None] = await router.chat_completion(
                 messages=messages,
                 stream=True,
                 **hyperparams,
             )
+            # Accumulate the response for caching
+            reasoning, content, tool_calls, last = [], [], False, None
             async for chunk in completion:
                 if hasattr(chunk, "usage") and chunk.usage is not None:
                     usage = ChatCompletionUsage.model_validate(chunk.usage.model_dump())
                     usage = _ensure_text_usage_details(usage)
                     self._chat_usage = usage
                     chunk.usage = Usage(**usage.model_dump())
-                yield ChatCompletionChunkResponse(
+                chunk = ChatCompletionChunkResponse(
                     **chunk.model_dump(exclude_unset=True, exclude_none=True)
                 )
+                if cache_key is not None:
+                    reasoning.append(chunk.reasoning_content)
+                    content.append(chunk.content)
+                    tool_calls = tool_calls or bool(getattr(chunk.message, "tool_calls", None))
+                    if last is None or chunk.finish_reason is not None:
+                        last = chunk
+                yield chunk
+            # Tool call deltas are not reassembled, so such responses are not cached
+            if cache_key is not None and last is not None and not tool_calls:
+                message = ChatCompletionMessage(
+                    content="".join(content), reasoning_content="".join(reasoning) or None
+                )
+                await self._set_cached_chat(
+                    cache_key,
+                    router.config.id,
+                    ChatCompletionResponse(
+                        id=last.id,
+                        created=last.created,
+                        model=last.model,
+                        choices=[
+                            ChatCompletionChoice(
+                                index=0, message=message, finish_reason=last.finish_reason
+                            )
+                        ],
+                        usage=self._chat_usage,
+                    ),
+                )
 
     async def chat_completion(
         self,
@@ -1844,6 +2002,9 @@ class LMEngine:
         """
         hyperparams.pop("stream", None)
         async with self._setup_chat(model, messages) as router:
+            cache_key = self._chat_cache_key(router.config.id, messages, hyperparams)
+            if (cached := await self._get_cached_chat(cache_key, router.config.id)) is not None:
+                return cached
             completion: ModelResponse = await router.chat_completion(
                 messages=messages,
                 stream=False,
@@ -1854,6 +2015,7 @@ class LMEngine:
             )
             completion.usage = _ensure_text_usage_details(completion.usage)
             self._chat_usage = completion.usage
+            await self._set_cached_chat(cache_key, router.config.id, completion)
             return completion
 
     async def generate_title(
@@ -2093,6 +2255,36 @@ class LMEngine:
         messages: list[ChatEntry],
         type: str,
         **hyperparams,
+    ) -> str:
+        # Resolve the default model so that the key always refers to a concrete model
+        model = (await self._get_default_model(model, self._chat_capabilities(messages))).id
+        # Rows that share a prompt template produce identical rewrite requests.
+        # The rewrite prompt embeds the current date, so entries are only shared within a day.
+        key = SEARCH_QUERY_CACHE.make_key(
+            self.organization.id,
+            model,
+            type,
+            now().date().isoformat(),
+            [m.model_dump(mode="json") for m in messages],
+            {k: v for k, v in hyperparams.items() if k not in _SEARCH_QUERY_CACHE_EXCLUDED_PARAMS},
+        )
+        return await SEARCH_QUERY_CACHE.get_or_compute(
+            key,
+            lambda: self._rewrite_search_query(
+                model=model,
+                messages=messages,
+                type=type,
+                **hyperparams,
+            ),
+        )
+
+    async def _rewrite_search_query(
+        self,
+        *,
+        model: str,
+        messages: list[ChatEntry],
+        type: str,
+        **hyperparams,
     ) -> str:
         messages, prompt, multimodal_contents = self._extract_text_prompt(messages)
         # Retrieved system and user prompt, updated as of 2025-04-17
@@ -2502,13 +2694,22 @@ class LMEngine:
         Returns:
             vector (list[float]): The embedding vector.
         """
-        response = await self.embed_queries(
-            model=model,
-            texts=[text],
-            encoding_format="float",
-            **hyperparams,
+        # Resolve the default model so that the key always refers to a concrete model
+        model = (await self._get_default_model(model, [str(ModelCapability.EMBED)])).id
+
+        async def _embed() -> list[float]:
+            response = await self.embed_queries(
+                model=model,
+                texts=[text],
+                encoding_format="float",
+                **hyperparams,
+            )
+            return response.data[0].embedding
+
+        key = QUERY_EMBEDDING_CACHE.make_key(
+            self.organization.id, model, normalise_text(text), hyperparams
         )
-        return response.data[0].embedding
+        return await QUERY_EMBEDDING_CACHE.get_or_compute(key, _embed)
 
     ### --- Reranking --- ###
 
@@ -0,0 +1,270 @@
+import asyncio
+import unicodedata
+from hashlib import blake2b
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+import orjson
+from loguru import logger
+
+from owl.configs import CACHE, ENV_CONFIG
+from owl.utils.billing import OPENTELEMETRY_CLIENT
+from owl.utils.cache import LRUCache
+
+T = TypeVar("T")
+
+CACHE_REQ_COUNTER = OPENTELEMETRY_CLIENT.get_counter("lm_cache_requests_total")
+
+
+def normalise_text(text: str) -> str:
+    """
+    Normalise text for use in a cache key.
+    Applies Unicode NFC normalisation and collapses all whitespace runs into a single space.
+
+    Args:
+        text (str): Input text.
+
+    Returns:
+        text (str): Normalised text.
+    """
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+class ContentCache(Generic[T]):
+    """
+    Content-addressed, two-level cache for deterministic LM engine calls.
+
+    Lookups go through an in-process LRU first, then the shared Redis `CACHE`.
+    Concurrent misses for the same key within a process are coalesced into a single computation.
+    Redis errors are logged and treated as a miss so that the cache never fails a request.
+
+    Values larger than `max_value_bytes` are not cached. If `budget_bytes` is set, the total bytes
+    written per scope (e.g. a project) within a TTL window are capped at `budget_bytes`.
+    """
+
+    def __init__(
+        self,
+        *,
+        namespace: str,
+        maxsize: int,
+        ttl_sec: int,
+        dumps: Callable[[T], str],
+        loads: Callable[[str], T],
+        max_value_bytes: int = 0,
+        budget_bytes: int = 0,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl_sec = int(ttl_sec)
+        self.dumps = dumps
+        self.loads = loads
+        self.max_value_bytes = int(max_value_bytes)
+        self.budget_bytes = int(budget_bytes)
+        self._local: LRUCache[T] = LRUCache(maxsize=maxsize, ttl_sec=self.ttl_sec)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats: dict[str, int] = {"memory": 0, "inflight": 0, "redis": 0, "miss": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_sec > 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """In-process hit counts by source, plus the number of misses."""
+        return dict(self._stats)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Hash the key parts into a content address.
+        Dictionaries are serialised with sorted keys so that ordering does not matter.
+        """
+        data = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+        return blake2b(data, digest_size=20).hexdigest()
+
+    def _redis_key(self, key: str) -> str:
+        return f"lm_cache:{self.namespace}:{key}"
+
+    def _budget_key(self, scope: str) -> str:
+        return f"lm_cache:{self.namespace}:budget:{scope}"
+
+    def _record(self, source: str) -> None:
+        self._stats[source] += 1
+        CACHE_REQ_COUNTER.add(
+            1,
+            {
+                "cache": self.namespace,
+                "outcome": "miss" if source == "miss" else "hit",
+                "source": source,
+            },
+        )
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._stats = {k: 0 for k in self._stats}
+
+    async def get(self, key: str) -> T | None:
+        """
+        Return the cached value for `key`, or None on a miss.
+
+        Args:
+            key (str): Content address, usually from `make_key`.
+
+        Returns:
+            value (T | None): The cached value.
+        """
+        if not self.enabled:
+            return None
+        if (value := self._local.get(key)) is not None:
+            self._record("memory")
+            return value
+        if (value := await self._get_redis(key)) is not None:
+            self._record("redis")
+            self._local.set(key, value)
+            return value
+        self._record("miss")
+        return None
+
+    async def set(self, key: str, value: T, *, scope: str = "") -> bool:
+        """
+        Cache a value, subject to the size limit and the byte budget of `scope`.
+
+        Args:
+            key (str): Content address, usually from `make_key`.
+            value (T): Value to cache.
+            scope (str, optional): Budget scope such as a project ID.
+                Defaults to "" (no budget).
+
+        Returns:
+            cached (bool): Whether the value was cached.
+        """
+        if not self.enabled:
+            return False
+        data = self.dumps(value)
+        num_bytes = len(data.encode("utf-8"))
+        if self.max_value_bytes > 0 and num_bytes > self.max_value_bytes:
+            return False
+        if not await self._consume_budget(scope, num_bytes):
+            return False
+        self._local.set(key, value)
+        await self._set_redis(key, data)
+        return True
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        *,
+        scope: str = "",
+    ) -> T:
+        """
+        Return the cached value for `key`, or run `compute` and cache its result.
+
+        Args:
+            key (str): Content address, usually from `make_key`.
+            compute (Callable[[], Awaitable[T]]): Coroutine factory producing the value on a miss.
+            scope (str, optional): Budget scope such as a project ID.
+                Defaults to "" (no budget).
+
+        Returns:
+            value (T): The cached or computed value.
+        """
+        if not self.enabled:
+            return await compute()
+        if (value := self._local.get(key)) is not None:
+            self._record("memory")
+            return value
+        if (fut := self._inflight.get(key, None)) is not None:
+            try:
+                value = await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                # Only retry if the leader was cancelled, not us
+                if not fut.cancelled():
+                    raise
+                return await self.get_or_compute(key, compute, scope=scope)
+            self._record("inflight")
+            return value
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            value = await self._get_redis(key)
+            if value is None:
+                value = await compute()
+                self._record("miss")
+                await self.set(key, value, scope=scope)
+            else:
+                self._record("redis")
+                self._local.set(key, value)
+            fut.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            # Mark the exception as retrieved in case there are no waiters
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _get_redis(self, key: str) -> T | None:
+        try:
+            data = await CACHE.get(self._redis_key(key))
+            return None if data is None else self.loads(data)
+        except Exception as e:
+            logger.warning(f'Failed to read LM cache "{self.namespace}": {repr(e)}')
+            return None
+
+    async def _set_redis(self, key: str, data: str) -> None:
+        try:
+            await CACHE.set(self._redis_key(key), data, ex=self.ttl_sec)
+        except Exception as e:
+            logger.warning(f'Failed to write LM cache "{self.namespace}": {repr(e)}')
+
+    async def _consume_budget(self, scope: str, num_bytes: int) -> bool:
+        if self.budget_bytes <= 0 or not scope:
+            return True
+        try:
+            used = await CACHE.incrby_with_expiry(self._budget_key(scope), num_bytes, self.ttl_sec)
+        except Exception as e:
+            logger.warning(f'Failed to update LM cache budget "{self.namespace}": {repr(e)}')
+            return False
+        return used <= self.budget_bytes
+
+
+def _dumps_vector(vector: list[float]) -> str:
+    return orjson.dumps(vector).decode("utf-8")
+
+
+def _loads_vector(data: str) -> list[float]:
+    return orjson.loads(data)
+
+
+def _identity(data: str) -> str:
+    return data
+
+
+QUERY_EMBEDDING_CACHE: ContentCache[list[float]] = ContentCache(
+    namespace="query_embedding",
+    maxsize=ENV_CONFIG.lm_cache_max_entries,
+    ttl_sec=ENV_CONFIG.query_embedding_cache_ttl_sec,
+    dumps=_dumps_vector,
+    loads=_loads_vector,
+)
+SEARCH_QUERY_CACHE: ContentCache[str] = ContentCache(
+    namespace="search_query",
+    maxsize=ENV_CONFIG.lm_cache_max_entries,
+    ttl_sec=ENV_CONFIG.search_query_cache_ttl_sec,
+    dumps=_identity,
+    loads=_identity,
+)
+# Serialised `ChatCompletionResponse`, parsed on every hit so that callers can mutate it
+CHAT_RESPONSE_CACHE: ContentCache[str] = ContentCache(
+    namespace="chat_completion",
+    # Responses are much larger than the other cached values
+    maxsize=min(ENV_CONFIG.lm_cache_max_entries, 500),
+    ttl_sec=ENV_CONFIG.llm_response_cache_ttl_sec,
+    dumps=_identity,
+    loads=_identity,
+    max_value_bytes=ENV_CONFIG.llm_response_cache_max_entry_bytes,
+    budget_bytes=ENV_CONFIG.llm_response_cache_project_budget_bytes,
+)
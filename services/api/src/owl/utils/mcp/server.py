@@ -2,14 +2,20 @@ import asyncio
 import inspect
 from collections import defaultdict
 from functools import cached_property
-from typing import Any, Callable, get_type_hints
+from hashlib import blake2b
+from os import replace
+from time import perf_counter
+from typing import Annotated, Any, Callable, Literal, get_type_hints
 from urllib.parse import quote
 
-from fastapi import FastAPI
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.dependencies.utils import get_flat_dependant
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from loguru import logger
-from pydantic import BaseModel, ValidationError, create_model
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
 
 from jamaibase.types.db import RankedRole, UserAuth
 from jamaibase.types.mcp import (
@@ -30,7 +36,11 @@ from jamaibase.types.mcp import (
     ToolInputSchema,
 )
 from owl.client import JamaiASGIAsync
+from owl.configs import ENV_CONFIG
+from owl.types import UserAgent
+from owl.utils import uuid7_str
 from owl.utils.auth import has_permissions
+from owl.utils.billing import BillingManager
 from owl.utils.exceptions import (
     BadInputError,
     ForbiddenError,
@@ -39,8 +49,12 @@ from owl.utils.exceptions import (
     ResourceNotFoundError,
 )
 from owl.utils.handlers import INTERNAL_ERROR_MESSAGE
+from owl.utils.io import json_dumps, json_loads
+from owl.version import __version__
 
 MCP_TOOL_TAG = "mcp_tool"
+# (system membership, org membership, project membership, org role rank, project role rank)
+RoleKey = tuple[bool, bool, bool, int, int]
 
 
 class MCPServer:
@@ -53,15 +67,12 @@ class MCPServer:
         app: FastAPI,
         *,
         include_headers_in_input: bool = False,
+        dispatch: Literal["asgi", "direct"] | None = None,
     ):
         self.app = app
         self.include_headers_in_input = include_headers_in_input
-        self.openapi_schema = get_openapi(
-            title=self.app.title,
-            version=self.app.version,
-            description=self.app.description,
-            routes=self.app.routes,
-        )
+        # "asgi" calls tool routes through the ASGI client, "direct" calls them in-process
+        self.dispatch = ENV_CONFIG.mcp_tool_dispatch if dispatch is None else dispatch
         self.init_result = InitializeResult(
             capabilities=ServerCapabilities(),
             serverInfo=Implementation(
@@ -70,6 +81,8 @@ class MCPServer:
             ),
         )
         self.client = JamaiASGIAsync(app=self.app)
+        # `tools/list` results are memoised per role combination
+        self._list_tools_cache: dict[RoleKey, ListToolsResult] = {}
         _ = self.tools
 
     def tool(self, fn: Callable[..., Any]) -> Callable[..., Any]:
@@ -106,10 +119,109 @@ class MCPServer:
         self._custom_tools.append(tool)
         self._custom_callables[fn.__name__] = fn
         self._custom_models[fn.__name__] = Model
+        self._list_tools_cache.clear()
         return fn
 
+    @cached_property
+    def openapi_schema(self) -> dict[str, Any]:
+        return get_openapi(
+            title=self.app.title,
+            version=self.app.version,
+            description=self.app.description,
+            routes=self.app.routes,
+        )
+
+    @staticmethod
+    def _route_signature(route: APIRoute) -> list[str]:
+        """
+        Everything about a route that its tool definition is built from:
+        the tags of every route, plus the docs and parameter schemas of tool routes.
+        """
+        tags = [str(t) for t in route.tags]
+        signature = [",".join(sorted(route.methods)), route.path, route.name, ",".join(tags)]
+        if MCP_TOOL_TAG not in tags:
+            return signature
+        signature += [route.operation_id or "", route.summary or "", route.description or ""]
+        dependant = get_flat_dependant(route.dependant, skip_repeats=True)
+        for param in (
+            dependant.path_params
+            + dependant.query_params
+            + dependant.header_params
+            + dependant.cookie_params
+            + dependant.body_params
+        ):
+            info = param.field_info
+            # Constraints such as `le` are kept in the metadata rather than the annotation
+            annotation = (
+                Annotated[(info.annotation, *info.metadata)] if info.metadata else info.annotation
+            )
+            try:
+                schema = json_dumps(TypeAdapter(annotation).json_schema())
+            except Exception:
+                schema = repr(annotation)
+            signature.append(
+                f"{param.alias} {param.required} {info.default!r} {info.description} {schema}"
+            )
+        return signature
+
+    @cached_property
+    def routes_fingerprint(self) -> str:
+        """
+        Identifies the app version and its routes, including the parameter and body schemas of
+        tool routes, to detect stale tool snapshots. Unlike the full OpenAPI schema,
+        this only needs the JSON schemas of the tool routes' parameters.
+        """
+        routes = sorted(
+            "\n".join(self._route_signature(r)) for r in self.app.routes if isinstance(r, APIRoute)
+        )
+        data = "\n".join([self.app.version, str(self.include_headers_in_input), *routes])
+        return blake2b(data.encode(), digest_size=16).hexdigest()
+
+    def _load_tools_snapshot(self, path: str) -> list[ToolAPI] | None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json_loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Failed to load MCP tool snapshot "{path}": {repr(e)}')
+            return None
+        if snapshot.get("fingerprint", "") != self.routes_fingerprint:
+            logger.info(f'MCP tool snapshot "{path}" is stale and will be rebuilt.')
+            return None
+        return [ToolAPI.model_validate(t) for t in snapshot["tools"]]
+
+    def _save_tools_snapshot(self, path: str, tools: list[ToolAPI]) -> None:
+        snapshot = dict(
+            fingerprint=self.routes_fingerprint,
+            tools=[t.model_dump(mode="json", by_alias=True) for t in tools],
+        )
+        try:
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(json_dumps(snapshot))
+            replace(f"{path}.tmp", path)
+        except Exception as e:
+            logger.warning(f'Failed to save MCP tool snapshot "{path}": {repr(e)}')
+
     @cached_property
     def tools(self) -> list[ToolAPI]:
+        """
+        The tool catalogue, built from the OpenAPI schema once per process.
+        If `mcp_tool_snapshot_path` is set, it is loaded from that file instead,
+        unless the file was written for a different app version or set of routes.
+        """
+        snapshot_path = ENV_CONFIG.mcp_tool_snapshot_path
+        if snapshot_path:
+            tools = self._load_tools_snapshot(snapshot_path)
+            if tools is not None:
+                logger.info(f'Loaded {len(tools):,d} MCP tools from "{snapshot_path}".')
+                return tools
+        tools = self._build_tools()
+        if snapshot_path:
+            self._save_tools_snapshot(snapshot_path, tools)
+        return tools
+
+    def _build_tools(self) -> list[ToolAPI]:
         tools = []
         operation_ids = set()  # Track operation IDs to detect duplicates
 
@@ -223,25 +335,31 @@ class MCPServer:
             tool_map[key].append(t)
         return tool_map
 
-    def list_tools(
-        self,
-        *,
-        user: UserAuth,
-    ) -> ListToolsResult:
-        has_sys_membership = has_permissions(user, ["system"], raise_error=False)
+    @staticmethod
+    def _role_key(user: UserAuth) -> RoleKey:
         has_org_membership = len(user.org_memberships) > 0
         has_proj_membership = len(user.proj_memberships) > 0
-
-        org_permission = (
-            max([r.role.rank for r in user.org_memberships])
+        return (
+            has_permissions(user, ["system"], raise_error=False),
+            has_org_membership,
+            has_proj_membership,
+            # Guest has basically no permissions
+            max(r.role.rank for r in user.org_memberships)
             if has_org_membership
-            else RankedRole.GUEST
-        )  # Guest has basically no permissions
-        proj_permission = (
-            max([r.role.rank for r in user.proj_memberships])
+            else RankedRole.GUEST,
+            max(r.role.rank for r in user.proj_memberships)
             if has_proj_membership
-            else RankedRole.GUEST
-        )  # Guest has basically no permissions
+            else RankedRole.GUEST,
+        )
+
+    def _filter_tools(self, role_key: RoleKey) -> list[ToolAPI]:
+        (
+            has_sys_membership,
+            has_org_membership,
+            has_proj_membership,
+            org_permission,
+            proj_permission,
+        ) = role_key
         tool_list: list[ToolAPI] = []
         for permissions, tools in self.permission_tool_map.items():
             if has_sys_membership and "system" in permissions:
@@ -266,7 +384,23 @@ class MCPServer:
                         break
         # include all custom tools
         tool_list.extend(self._custom_tools)
-        return ListToolsResult(tools=tool_list)
+        return tool_list
+
+    def list_tools(
+        self,
+        *,
+        user: UserAuth,
+    ) -> ListToolsResult:
+        """
+        List the tools available to a user. The result only depends on the user's roles,
+        and is memoised per role combination. It is shared and must not be mutated.
+        """
+        role_key = self._role_key(user)
+        result = self._list_tools_cache.get(role_key, None)
+        if result is None:
+            result = ListToolsResult(tools=self._filter_tools(role_key))
+            self._list_tools_cache[role_key] = result
+        return result
 
     async def call_tool(
         self,
@@ -285,10 +419,39 @@ class MCPServer:
         if tool is None:
             raise ResourceNotFoundError(f'Tool "{body.params.name}" is not found.')
         # Call the tool
+        path_params, headers, query_params, body_params = self._prepare_call(
+            tool, body.params.arguments, headers
+        )
+        if self.dispatch == "direct":
+            text = await self._call_route(tool, path_params, headers, query_params, body_params)
+            return CallToolResult(content=[TextContent(text=text)])
+        path = tool.api_info.path
+        for name, value in path_params.items():
+            path = path.replace(f"{{{name}}}", quote(value))
+        response = await self.client.request(
+            tool.api_info.method,
+            path,
+            headers=headers,
+            params=query_params,
+            body=body_params,
+        )
+        return CallToolResult(content=[TextContent(text=response.text)])
+
+    @staticmethod
+    def _prepare_call(
+        tool: ToolAPI,
+        args: dict[str, Any] | None,
+        headers: dict[str, Any] | None,
+    ) -> tuple[
+        dict[str, str],
+        dict[str, Any] | None,
+        dict[str, Any] | None,
+        dict[str, Any] | None,
+    ]:
+        """Split tool arguments into path parameters, headers, query parameters and body."""
         path = tool.api_info.path
         args_types = tool.api_info.args_types
-        args = body.params.arguments
-        # Process parameters
+        path_params = {}
         query_params = None
         body_params = None
         if args is not None:
@@ -300,7 +463,7 @@ class MCPServer:
                 args_type = args_types.get(arg_name, "")
                 # Path parameters
                 if args_type == "path" and f"{{{arg_name}}}" in path:
-                    path = path.replace(f"{{{arg_name}}}", quote(arg_value))
+                    path_params[arg_name] = str(arg_value)
                 # Headers
                 elif args_type == "header":
                     headers[arg_name] = arg_value
@@ -316,17 +479,128 @@ class MCPServer:
                 query_params = None
             if len(body_params) == 0:
                 body_params = None
-            if body.params.name == "chat_completion" and len(body_params) != 0:
+            if tool.name == "chat_completion" and body_params is not None:
                 body_params["stream"] = False
+        return path_params, headers, query_params, body_params
 
-        response = await self.client.request(
-            tool.api_info.method,
-            path,
-            headers=headers,
-            params=query_params,
-            body=body_params,
+    @cached_property
+    def route_map(self) -> dict[tuple[str, str], APIRoute]:
+        # {("GET", "/api/v1/models"): APIRoute(...)}
+        return {
+            (method, route.path_format): route
+            for route in self.app.routes
+            if isinstance(route, APIRoute)
+            for method in route.methods
+        }
+
+    def _exception_handler(self, exc: Exception) -> Callable[..., Any] | None:
+        handlers = self.app.exception_handlers
+        if isinstance(exc, HTTPException) and exc.status_code in handlers:
+            return handlers[exc.status_code]
+        for cls in type(exc).__mro__:
+            if cls in handlers:
+                return handlers[cls]
+        return None
+
+    async def _call_route(
+        self,
+        tool: ToolAPI,
+        path_params: dict[str, str],
+        headers: dict[str, Any] | None,
+        query_params: dict[str, Any] | None,
+        body_params: dict[str, Any] | None,
+    ) -> str:
+        """
+        Call the route of a tool in-process, without going through the HTTP middleware stack.
+        The route's own dependencies still authenticate the user, check permissions and
+        set up billing, exceptions are converted by the app's exception handlers,
+        and the metering done by the `log_request` middleware is replicated.
+
+        Returns:
+            text (str): The response body.
+        """
+        method = tool.api_info.method.upper()
+        route = self.route_map.get((method, tool.api_info.path), None)
+        if route is None:
+            raise ResourceNotFoundError(f'Route of tool "{tool.name}" is not found.')
+        path = tool.api_info.path
+        for name, value in path_params.items():
+            path = path.replace(f"{{{name}}}", value)
+        body = b"" if body_params is None else json_dumps(body_params).encode()
+        headers = {
+            k.lower(): str(v)
+            for k, v in (headers or {}).items()
+            if k.lower() not in ("host", "content-length", "content-type", "transfer-encoding")
+        }
+        headers.setdefault("user-agent", f"MCP-Server/{__version__}")
+        if len(body) > 0:
+            headers["content-type"] = "application/json"
+            headers["content-length"] = str(len(body))
+        request_id = headers.get("x-request-id", uuid7_str())
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "server": ("apiserver", 80),
+            "client": ("127.0.0.1", 0),
+            "root_path": "",
+            "path": path,
+            "raw_path": quote(path).encode(),
+            "query_string": str(
+                httpx.QueryParams(self.client._filter_params(query_params))
+            ).encode(),
+            "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            "path_params": path_params,
+            "app": self.app,
+            "route": route,
+            "endpoint": route.endpoint,
+            "state": {
+                "id": request_id,
+                "request_start_time": perf_counter(),
+                "user_agent": UserAgent.from_user_agent_string(headers.get("user-agent", "")),
+                "timing": defaultdict(float),
+            },
+        }
+
+        async def receive() -> dict[str, Any]:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        request = Request(scope, receive)
+        try:
+            response = await route.get_route_handler()(request)
+        except Exception as e:
+            handler = self._exception_handler(e)
+            if handler is None:
+                raise
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, e)
+            else:
+                response = handler(request, e)
+        if isinstance(response, StreamingResponse):
+            content = b"".join(
+                [c if isinstance(c, bytes) else c.encode() async for c in response.body_iterator]
+            )
+        elif isinstance(response, FileResponse):
+            with open(response.path, "rb") as f:
+                content = f.read()
+        else:
+            content = response.body
+        if response.background is not None:
+            await response.background()
+        # Metering, as done by the `log_request` middleware
+        billing: BillingManager | None = getattr(request.state, "billing", None)
+        if billing is not None:
+            egress_bytes = float(response.headers.get("content-length", 0))
+            if egress_bytes > 0:
+                billing.create_egress_events(egress_bytes / (1024**3))
+            await billing.process_all()
+        # Raise the same exceptions as a call through the ASGI client
+        await self.client._raise_exception(
+            httpx.Response(response.status_code, headers=response.headers.items(), content=content)
         )
-        return CallToolResult(content=[TextContent(text=response.text)])
+        return content.decode()
 
     async def _call_custom_tool(
         self,
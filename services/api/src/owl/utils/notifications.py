@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, AsyncGenerator
 
 from loguru import logger
 from sqlalchemy import text
+from sqlmodel import select
 
-from owl.db import SCHEMA, async_session
+from owl.configs import ENV_CONFIG
+from owl.db import SCHEMA, AsyncSession, async_session
 from owl.db.models import NotificationGroup
 from owl.types import NotificationAudience, NotificationType, ProductType, Role
 from owl.utils.dates import now
@@ -60,29 +64,23 @@ class NotificationIntent:
     notif_admin_only: bool = False
 
 
-async def _fan_out_notifications(
-    session,
-    *,
-    group_id: str,
-    message: str,
+def _recipient_query(
     audience: NotificationAudience,
+    *,
     organization_id: str | None = None,
     project_id: str | None = None,
     recipient_ids: list[str] | None = None,
     notif_admin_only: bool = False,
-) -> int:
-    """INSERT...SELECT fan-out. Returns number of rows inserted."""
-    base_cols = f'{SCHEMA}."Notification" (user_id, notification_group_id, message, meta, created_at, updated_at)'
-    base_vals = ":group_id, :message, '{}'::jsonb, :ts, :ts"
-    params: dict = dict(group_id=group_id, message=message, ts=now())
-
+) -> tuple[str, dict[str, Any]] | None:
+    """Returns the recipient SELECT (ordered by user ID) and its params, or None."""
+    params: dict[str, Any] = {}
     if audience == NotificationAudience.ORGANIZATION:
         where = "om.organization_id = :org_id"
         params["org_id"] = organization_id
         if notif_admin_only:
             where += " AND om.role = :role"
             params["role"] = Role.ADMIN.value
-        sql = f'INSERT INTO {base_cols} SELECT om.user_id, {base_vals} FROM {SCHEMA}."OrgMember" om WHERE {where}'
+        sql = f'SELECT om.user_id FROM {SCHEMA}."OrgMember" om WHERE {where} AND om.user_id > :after ORDER BY om.user_id'
 
     elif audience == NotificationAudience.PROJECT:
         where = "pm.project_id = :proj_id"
@@ -90,27 +88,88 @@ async def _fan_out_notifications(
         if notif_admin_only:
             where += " AND pm.role = :role"
             params["role"] = Role.ADMIN.value
-        sql = f'INSERT INTO {base_cols} SELECT pm.user_id, {base_vals} FROM {SCHEMA}."ProjectMember" pm WHERE {where}'
+        sql = f'SELECT pm.user_id FROM {SCHEMA}."ProjectMember" pm WHERE {where} AND pm.user_id > :after ORDER BY pm.user_id'
 
     elif audience == NotificationAudience.USER:
         params["user_ids"] = recipient_ids or []
-        sql = f'INSERT INTO {base_cols} SELECT u.id, {base_vals} FROM {SCHEMA}."User" u WHERE u.id = ANY(:user_ids)'
+        sql = f'SELECT u.id AS user_id FROM {SCHEMA}."User" u WHERE u.id = ANY(:user_ids) AND u.id > :after ORDER BY u.id'
 
     elif audience == NotificationAudience.SYSTEM:
-        sql = f'INSERT INTO {base_cols} SELECT u.id, {base_vals} FROM {SCHEMA}."User" u'
+        sql = f'SELECT u.id AS user_id FROM {SCHEMA}."User" u WHERE u.id > :after ORDER BY u.id'
 
     else:
-        return 0
+        return None
+    return sql, params
 
-    result = await session.exec(text(sql), params=params)
-    return result.rowcount
+
+async def _fan_out_notifications(
+    session: AsyncSession,
+    group: NotificationGroup,
+    *,
+    recipient_ids: list[str] | None = None,
+    notif_admin_only: bool = False,
+    chunk_size: int | None = None,
+) -> AsyncGenerator[int, None]:
+    """
+    Keyset-paginated INSERT...SELECT fan-out, resuming from the group's checkpoint.
+
+    Each chunk of recipients is inserted and checkpointed on the group in its own transaction,
+    so that no single transaction spans the whole audience.
+    Any pending changes in the session (such as a new group) are committed with the first chunk.
+
+    Yields:
+        count (int): Number of recipients fanned out to so far, after each committed chunk.
+    """
+    if chunk_size is None:
+        chunk_size = ENV_CONFIG.notification_fan_out_chunk_size
+    query = _recipient_query(
+        group.audience,
+        organization_id=group.organization_id,
+        project_id=group.project_id,
+        recipient_ids=recipient_ids,
+        notif_admin_only=notif_admin_only,
+    )
+    while group.fan_out_completed_at is None:
+        num_selected, num_inserted, last_id = 0, 0, None
+        if query is not None:
+            recipient_sql, params = query
+            # ON CONFLICT skips recipients inserted by an interrupted run
+            sql = (
+                f"WITH recipients AS ({recipient_sql} LIMIT :limit), "
+                f'inserted AS (INSERT INTO {SCHEMA}."Notification" '
+                "(user_id, notification_group_id, message, meta, created_at, updated_at) "
+                "SELECT r.user_id, :group_id, :message, '{}'::jsonb, :ts, :ts FROM recipients r "
+                "ON CONFLICT DO NOTHING RETURNING 1) "
+                "SELECT (SELECT COUNT(*) FROM recipients), (SELECT COUNT(*) FROM inserted), "
+                "(SELECT MAX(user_id) FROM recipients)"
+            )
+            params = dict(
+                params,
+                after=group.fan_out_cursor,
+                limit=chunk_size,
+                group_id=group.id,
+                message=group.message,
+                ts=now(),
+            )
+            num_selected, num_inserted, last_id = (
+                await session.exec(text(sql), params=params)
+            ).one()
+        if last_id is not None:
+            group.fan_out_cursor = last_id
+        group.fan_out_count += num_inserted
+        group.updated_at = now()
+        if num_selected < chunk_size:
+            group.fan_out_completed_at = group.updated_at
+        session.add(group)
+        await session.commit()
+        yield group.fan_out_count
 
 
 async def dispatch_notification_intent(
     intent: NotificationIntent,
     group_id: str | None = None,
 ) -> None:
-    """Background task: create NotificationGroup (if needed) + fan-out via INSERT...SELECT."""
+    """Background task: create NotificationGroup (if needed) + chunked fan-out via INSERT...SELECT."""
     try:
         async with async_session() as session:
             if group_id is None:
@@ -122,39 +181,92 @@ async def dispatch_notification_intent(
                     actor_id=intent.actor_id,
                     subject_id=intent.subject_id,
                     message=intent.message,
+                    # Needed to resume the fan-out
+                    meta={"notif_admin_only": True} if intent.notif_admin_only else {},
                 )
                 session.add(group)
                 await session.flush()
-                group_id = group.id
-
-            row_count = await _fan_out_notifications(
-                session,
-                group_id=group_id,
-                message=intent.message,
-                audience=intent.audience,
-                organization_id=intent.organization_id,
-                project_id=intent.project_id,
-                recipient_ids=intent.recipient_ids,
-                notif_admin_only=intent.notif_admin_only,
-            )
-            await session.commit()
-
-            if row_count == 0:
-                logger.warning(
-                    f"No recipients resolved for notification {intent.event_type} "
-                    f"(audience={intent.audience}, org={intent.organization_id}, proj={intent.project_id})"
-                )
             else:
-                logger.bind(
-                    notif_group_id=group_id,
-                    event_type=intent.event_type,
-                    recipients=row_count,
-                ).info(f"Notification created: {intent.event_type} -> {row_count} recipients")
+                group = await session.get(NotificationGroup, group_id)
+                if group is None:
+                    logger.warning(f'Notification group "{group_id}" is not found.')
+                    return
+            await _dispatch_fan_out(session, group, recipient_ids=intent.recipient_ids)
 
     except Exception:
         logger.exception(f"Failed to create notification for event type {intent.event_type}")
 
 
+async def _dispatch_fan_out(
+    session: AsyncSession,
+    group: NotificationGroup,
+    *,
+    recipient_ids: list[str] | None = None,
+) -> None:
+    log = logger.bind(notif_group_id=group.id, event_type=group.event_type)
+    row_count = group.fan_out_count
+    async for row_count in _fan_out_notifications(
+        session,
+        group,
+        recipient_ids=recipient_ids,
+        notif_admin_only=group.meta.get("notif_admin_only", False),
+    ):
+        if group.fan_out_completed_at is None:
+            log.info(
+                f"Notification fan-out in progress: {group.event_type} -> {row_count:,d} recipients"
+            )
+
+    if row_count == 0:
+        logger.warning(
+            f"No recipients resolved for notification {group.event_type} "
+            f"(audience={group.audience}, org={group.organization_id}, proj={group.project_id})"
+        )
+    else:
+        log.bind(recipients=row_count).info(
+            f"Notification created: {group.event_type} -> {row_count} recipients"
+        )
+
+
+async def resume_notification_fan_outs(stale_sec: float | None = None) -> int:
+    """
+    Resume fan-outs that were interrupted (e.g. by a crash) from their checkpoints.
+    USER audience groups are not resumed since their recipients are not persisted.
+
+    Args:
+        stale_sec (float | None, optional): Only resume fan-outs without progress for this long.
+            Defaults to None (use `ENV_CONFIG.notification_fan_out_stale_sec`).
+
+    Returns:
+        num_resumed (int): Number of fan-outs resumed.
+    """
+    if stale_sec is None:
+        stale_sec = ENV_CONFIG.notification_fan_out_stale_sec
+    cutoff = now() - timedelta(seconds=stale_sec)
+    async with async_session() as session:
+        groups = (
+            await session.exec(
+                select(NotificationGroup)
+                .where(
+                    NotificationGroup.fan_out_completed_at.is_(None),
+                    NotificationGroup.audience != NotificationAudience.USER,
+                    NotificationGroup.updated_at < cutoff,
+                )
+                .order_by(NotificationGroup.created_at)
+            )
+        ).all()
+        for group in groups:
+            logger.info(
+                f'Resuming notification fan-out of group "{group.id}" '
+                f"from {group.fan_out_count:,d} recipients."
+            )
+            try:
+                await _dispatch_fan_out(session, group)
+            except Exception:
+                await session.rollback()
+                logger.exception(f'Failed to resume notification fan-out of group "{group.id}".')
+    return len(groups)
+
+
 def notify_org_invitation(
     *,
     actor_id: str,
@@ -0,0 +1,135 @@
+from time import monotonic
+from typing import AsyncGenerator, AsyncIterable
+
+from pydantic import BaseModel
+
+from owl.configs import ENV_CONFIG
+
+SSE_DONE = b"data: [DONE]\n\n"
+
+
+def sse_frame(data: BaseModel | str | bytes, *, exclude_unset: bool = False) -> bytes:
+    """
+    Encode a single SSE `data:` frame.
+
+    Pydantic models are serialised straight to bytes with their compiled serializer,
+    skipping the intermediate `str` that `model_dump_json` would create and re-encode.
+
+    Args:
+        data (BaseModel | str | bytes): Payload.
+        exclude_unset (bool, optional): Whether to exclude unset fields of a model.
+            Defaults to False.
+
+    Returns:
+        frame (bytes): The encoded frame.
+    """
+    if isinstance(data, BaseModel):
+        data = data.__pydantic_serializer__.to_json(data, exclude_unset=exclude_unset)
+    elif isinstance(data, str):
+        data = data.encode("utf-8")
+    return b"data: " + data + b"\n\n"
+
+
+class SSEBuffer:
+    """
+    Coalesces SSE frames into larger writes, and counts egress bytes.
+
+    Frames are buffered until `max_bytes` are buffered or `max_delay_ms` has passed since
+    the first buffered frame. Both checks happen when a frame is added, so callers that can
+    wait on their source with a timeout should also call `flush` once `timeout` elapses.
+    With the defaults of 0, every frame is written immediately.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_delay_ms: int | None = None,
+    ) -> None:
+        if max_bytes is None:
+            max_bytes = ENV_CONFIG.sse_coalesce_max_bytes
+        if max_delay_ms is None:
+            max_delay_ms = ENV_CONFIG.sse_coalesce_max_delay_ms
+        self.max_bytes = max_bytes
+        self.max_delay_sec = max_delay_ms / 1000
+        self.num_bytes = 0
+        self._frames: list[bytes] = []
+        self._size = 0
+        self._deadline = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.max_delay_sec > 0
+
+    @property
+    def timeout(self) -> float | None:
+        """Seconds until the buffered frames are due, or None if there is no deadline."""
+        if not self._frames or self.max_delay_sec <= 0:
+            return None
+        return max(0.0, self._deadline - monotonic())
+
+    def passthrough(self, frame: bytes) -> bytes:
+        """Count a frame that is written immediately without coalescing."""
+        self.num_bytes += len(frame)
+        return frame
+
+    def add(self, frame: bytes) -> bytes | None:
+        """
+        Add a frame.
+
+        Returns:
+            chunk (bytes | None): Data to write now, if any.
+        """
+        if not self.enabled:
+            return self.passthrough(frame)
+        if not self._frames:
+            self._deadline = monotonic() + self.max_delay_sec
+        self._frames.append(frame)
+        self._size += len(frame)
+        if (self.max_bytes > 0 and self._size >= self.max_bytes) or (
+            self.max_delay_sec > 0 and monotonic() >= self._deadline
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> bytes | None:
+        """
+        Flush all buffered frames.
+
+        Returns:
+            chunk (bytes | None): Data to write, or None if nothing is buffered.
+        """
+        if not self._frames:
+            return None
+        chunk = b"".join(self._frames)
+        self._frames.clear()
+        self._size = 0
+        self.num_bytes += len(chunk)
+        return chunk
+
+
+async def sse_stream(
+    chunks: AsyncIterable[BaseModel],
+    *,
+    buffer: SSEBuffer,
+    exclude_unset: bool = False,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Encode a stream of models as SSE frames, followed by the `[DONE]` frame.
+    The `[DONE]` frame is always written on its own.
+
+    Args:
+        chunks (AsyncIterable[BaseModel]): Stream of models.
+        buffer (SSEBuffer): Buffer used for coalescing and egress accounting.
+        exclude_unset (bool, optional): Whether to exclude unset fields of the models.
+            Defaults to False.
+
+    Yields:
+        chunk (bytes): Encoded SSE data.
+    """
+    async for chunk in chunks:
+        if (data := buffer.add(sse_frame(chunk, exclude_unset=exclude_unset))) is not None:
+            yield data
+    if (data := buffer.flush()) is not None:
+        yield data
+    yield buffer.passthrough(SSE_DONE)
@@ -1,4 +1,5 @@
 import builtins
+import os
 from dataclasses import dataclass
 from os.path import dirname, join, realpath
 from tempfile import TemporaryDirectory
@@ -7,6 +8,7 @@ from typing import Any
 
 import httpx
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
 from jamaibase import JamAI
@@ -19,6 +21,7 @@ from jamaibase.types import (
     OkResponse,
     OrganizationCreate,
     TableImportRequest,
+    TableImportUploadResponse,
     TableMetaResponse,
     TableType,
 )
@@ -828,6 +831,184 @@ def test_table_import_export(
             client.table.delete_table(table_type, table_id_dst)
 
 
+@pytest.mark.parametrize("table_type", TABLE_TYPES)
+def test_table_import_export_chunked(
+    setup: ServingContext,
+    table_type: TableType,
+):
+    """
+    Test streaming table export and resumable chunked table import.
+
+    Args:
+        setup (ServingContext): Setup.
+        table_type (TableType): Table type.
+    """
+    client = JamAI(user_id=setup.superuser_id, project_id=setup.project_id)
+    with create_table(client, table_type) as table:
+        with TemporaryDirectory() as tmp_dir:
+            file_path = join(tmp_dir, "test_table_import_export_chunked.csv")
+            data = _default_data(setup)
+            df_to_csv(_as_df(data.data_list), file_path, ",")
+            import_table_data(client, table_type, table.id, file_path, stream=False)
+
+        table_id_dst = f"{table.id}_import"
+        try:
+            with TemporaryDirectory() as tmp_dir:
+                ### --- Export table to file --- ###
+                file_path = join(tmp_dir, f"{table.id}.parquet")
+                progress = []
+                assert (
+                    client.table.export_table_to_file(
+                        table_type,
+                        table.id,
+                        file_path,
+                        on_progress=lambda n, total: progress.append((n, total)),
+                    )
+                    == file_path
+                )
+                with open(file_path, "rb") as f:
+                    pq_data = f.read()
+                assert len(pq_data) > 0
+                assert progress[-1] == (len(pq_data), len(pq_data))
+
+                ### --- Import table in parts --- ###
+                url = f"{client.table.api_base}/v2/gen_tables/{table_type}/import/uploads"
+                headers = client.table.headers
+                response = httpx.post(url, headers=headers)
+                assert response.status_code == 200
+                upload = TableImportUploadResponse.model_validate_json(response.text)
+                assert upload.part_size >= 5 * 1024**2
+                assert len(upload.parts) == 0
+
+                # Interrupted after the only part is uploaded
+                def _interrupt(n: int, total: int):
+                    raise RuntimeError("Interrupted")
+
+                request = TableImportRequest(file_path=file_path, table_id_dst=table_id_dst)
+                with pytest.raises(RuntimeError, match="Interrupted"):
+                    client.table.import_table_chunked(
+                        table_type, request, upload_id=upload.upload_id, on_progress=_interrupt
+                    )
+                response = httpx.get(f"{url}/{upload.upload_id}", headers=headers)
+                assert response.status_code == 200
+                upload = TableImportUploadResponse.model_validate_json(response.text)
+                assert [p.part_number for p in upload.parts] == [1]
+                assert upload.parts[0].size == len(pq_data)
+                # Resume, the uploaded part is skipped
+                progress = []
+                table_dst = client.table.import_table_chunked(
+                    table_type,
+                    request,
+                    upload_id=upload.upload_id,
+                    on_progress=lambda n, total: progress.append((n, total)),
+                )
+                assert len(progress) == 0
+                assert isinstance(table_dst, TableMetaResponse)
+                assert table_dst.id == table_id_dst
+                # Upload is gone after completion
+                response = httpx.get(f"{url}/{upload.upload_id}", headers=headers)
+                assert response.status_code == 404
+
+                ### --- Abort upload --- ###
+                response = httpx.post(url, headers=headers)
+                upload = TableImportUploadResponse.model_validate_json(response.text)
+                response = httpx.delete(f"{url}/{upload.upload_id}", headers=headers)
+                assert response.status_code == 200
+                response = httpx.get(f"{url}/{upload.upload_id}", headers=headers)
+                assert response.status_code == 404
+            rows = list_table_rows(client, table_type, table.id)
+            rows_dst = list_table_rows(client, table_type, table_id_dst)
+            assert rows_dst.total == rows.total == len(data.data_list)
+        finally:
+            client.table.delete_table(table_type, table_id_dst)
+
+
+def test_table_import_chunked_multiple_parts(setup: ServingContext):
+    """
+    Test chunked table import of a file spanning multiple parts,
+    with parts uploaded out of order and a mis-sized part that is uploaded again on resume.
+
+    Args:
+        setup (ServingContext): Setup.
+    """
+    table_type = TableType.ACTION
+    client = JamAI(user_id=setup.superuser_id, project_id=setup.project_id)
+    with create_table(client, table_type) as table:
+        with TemporaryDirectory() as tmp_dir:
+            file_path = join(tmp_dir, "test_table_import_chunked_multiple_parts.csv")
+            data = _default_data(setup)
+            df_to_csv(_as_df(data.data_list), file_path, ",")
+            import_table_data(client, table_type, table.id, file_path, stream=False)
+
+        table_id_dst = f"{table.id}_import"
+        url = f"{client.table.api_base}/v2/gen_tables/{table_type}/import/uploads"
+        headers = client.table.headers
+        response = httpx.post(url, headers=headers)
+        assert response.status_code == 200
+        upload = TableImportUploadResponse.model_validate_json(response.text)
+        part_size = upload.part_size
+        try:
+            with TemporaryDirectory() as tmp_dir:
+                # Pad the Parquet footer with incompressible metadata so that it spans two parts
+                file_path = join(tmp_dir, f"{table.id}.parquet")
+                client.table.export_table_to_file(table_type, table.id, file_path)
+                pa_table = pq.read_table(file_path)
+                # Stored twice, also within the serialised Arrow schema
+                padding = os.urandom(part_size // 4).hex().encode()
+                pa_table = pa_table.replace_schema_metadata(
+                    {**pa_table.schema.metadata, b"padding": padding}
+                )
+                pq.write_table(pa_table, file_path)
+                with open(file_path, "rb") as f:
+                    pq_data = f.read()
+                assert part_size < len(pq_data) <= 2 * part_size
+                parts = [pq_data[:part_size], pq_data[part_size:]]
+
+                # Last part first, then a truncated first part
+                for part_number, content in [(2, parts[1]), (1, parts[0][:1024])]:
+                    response = httpx.put(
+                        f"{url}/{upload.upload_id}/parts/{part_number}",
+                        headers=headers,
+                        content=content,
+                        timeout=60,
+                    )
+                    assert response.status_code == 200, response.text
+                response = httpx.get(f"{url}/{upload.upload_id}", headers=headers)
+                assert response.status_code == 200
+                upload = TableImportUploadResponse.model_validate_json(response.text)
+                assert [(p.part_number, p.size) for p in upload.parts] == [
+                    (1, 1024),
+                    (2, len(parts[1])),
+                ]
+                # Completing with an undersized middle part is rejected
+                response = httpx.post(
+                    f"{url}/{upload.upload_id}/complete",
+                    headers=headers,
+                    json={"table_id_dst": table_id_dst},
+                    timeout=60,
+                )
+                assert response.status_code == 400, response.text
+                assert "are not" in response.text
+
+                # Resume, only the mis-sized part is uploaded again
+                progress = []
+                table_dst = client.table.import_table_chunked(
+                    table_type,
+                    TableImportRequest(file_path=file_path, table_id_dst=table_id_dst),
+                    upload_id=upload.upload_id,
+                    on_progress=lambda n, total: progress.append((n, total)),
+                )
+                assert progress == [(len(pq_data), len(pq_data))]
+                assert isinstance(table_dst, TableMetaResponse)
+                assert table_dst.id == table_id_dst
+            rows = list_table_rows(client, table_type, table.id)
+            rows_dst = list_table_rows(client, table_type, table_id_dst)
+            assert rows_dst.total == rows.total == len(data.data_list)
+        finally:
+            httpx.delete(f"{url}/{upload.upload_id}", headers=headers)
+            client.table.delete_table(table_type, table_id_dst, missing_ok=True)
+
+
 @pytest.mark.parametrize("delimiter", [","], ids=["comma"])
 def test_table_import_wrong_type(
     setup: ServingContext,
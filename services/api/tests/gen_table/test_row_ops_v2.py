@@ -9,10 +9,11 @@ from types import NoneType
 from typing import Any
 
 import httpx
+import pandas as pd
 import pytest
 from flaky import flaky
 
-from jamaibase import JamAI
+from jamaibase import JamAI, JamAIAsync
 from jamaibase.types import (
     CITATION_PATTERN,
     CellCompletionResponse,
@@ -26,6 +27,7 @@ from jamaibase.types import (
     ModelConfigCreate,
     MultiRowAddRequest,
     MultiRowCompletionResponse,
+    MultiRowDeleteRequest,
     MultiRowUpdateRequest,
     OkResponse,
     OrganizationCreate,
@@ -33,6 +35,7 @@ from jamaibase.types import (
     PythonGenConfig,
     RAGParams,
     References,
+    RowBulkAddResponse,
     RowCompletionResponse,
     S3Content,
     TextContent,
@@ -2288,6 +2291,118 @@ def test_list_rows_case_insensitive_sort(setup: ServingContext):
         assert [r["str"] for r in rows.values] == ["a", "B", "C", "d"]
 
 
+async def test_iter_table_rows(setup: ServingContext):
+    table_type = TableType.ACTION
+    client = JamAI(user_id=setup.superuser_id, project_id=setup.project_id)
+    aclient = JamAIAsync(user_id=setup.superuser_id, project_id=setup.project_id)
+    cols = [ColumnSchemaCreate(id="int", dtype="int")]
+    with create_table(client, table_type, cols=cols) as table:
+        add_table_rows(
+            client, table_type, table.id, [dict(int=i) for i in range(25)], stream=False
+        )
+        expected = list_table_rows(client, table_type, table.id, order_by="int").values
+        ### --- Sync --- ###
+        pages = []
+        rows = list(
+            client.table.iter_table_rows(
+                table_type,
+                table.id,
+                page_size=10,
+                prefetch=2,
+                order_by="int",
+                on_page=lambda page, latency: pages.append(
+                    (page.offset, len(page.items), latency)
+                ),
+            )
+        )
+        assert [r["ID"] for r in rows] == [r["ID"] for r in expected]
+        assert [(o, n) for o, n, _ in pages] == [(0, 10), (10, 10), (20, 5)]
+        assert all(latency > 0 for _, _, latency in pages)
+        # Stopping early is fine
+        rows = client.table.iter_table_rows(table_type, table.id, page_size=10, prefetch=2)
+        assert next(rows)["ID"] == expected[0]["ID"]
+        rows.close()
+        ### --- Async --- ###
+        rows = [
+            r
+            async for r in aclient.table.iter_table_rows(
+                table_type, table.id, page_size=7, order_by="int", columns=["int"]
+            )
+        ]
+        assert [r["int"] for r in rows] == list(range(25))
+        ### --- Empty table --- ###
+        client.table.delete_table_rows(
+            table_type,
+            MultiRowDeleteRequest(table_id=table.id, row_ids=[r["ID"] for r in expected]),
+        )
+        assert list(client.table.iter_table_rows(table_type, table.id)) == []
+
+
+def test_bulk_add_rows(setup: ServingContext, tmp_path):
+    table_type = TableType.ACTION
+    client = JamAI(user_id=setup.superuser_id, project_id=setup.project_id)
+    cols = [ColumnSchemaCreate(id="int", dtype="int")]
+    with create_table(client, table_type, cols=cols) as table:
+        checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+        # Iterator input
+        response = client.table.bulk_add_rows(
+            table_type,
+            table.id,
+            (dict(int=i) for i in range(25)),
+            chunk_size=10,
+            concurrency=2,
+            checkpoint_path=checkpoint_path,
+        )
+        assert isinstance(response, RowBulkAddResponse)
+        assert response.num_rows == 25
+        assert response.num_chunks == 3
+        assert response.num_skipped_chunks == 0
+        assert response.rows_per_sec > 0
+        rows = list_table_rows(client, table_type, table.id, order_by="int")
+        assert [r["int"] for r in rows.values] == list(range(25))
+        # Completed chunks are skipped when resumed
+        response = client.table.bulk_add_rows(
+            table_type,
+            table.id,
+            [dict(int=i) for i in range(25)],
+            chunk_size=10,
+            checkpoint_path=checkpoint_path,
+        )
+        assert response.num_rows == 0
+        assert response.num_skipped_chunks == 3
+        assert list_table_rows(client, table_type, table.id).total == 25
+        # Checkpoint must match
+        with pytest.raises(ValueError, match="Checkpoint"):
+            client.table.bulk_add_rows(
+                table_type, table.id, [dict(int=0)], chunk_size=5, checkpoint_path=checkpoint_path
+            )
+        # Only the chunks actually skipped are counted
+        response = client.table.bulk_add_rows(
+            table_type,
+            table.id,
+            [dict(int=i) for i in range(15)],
+            chunk_size=10,
+            checkpoint_path=checkpoint_path,
+        )
+        assert response.num_rows == 0
+        assert response.num_skipped_chunks == 2
+        # An empty checkpoint file is a fresh checkpoint
+        empty_path = tmp_path / "empty.jsonl"
+        empty_path.touch()
+        response = client.table.bulk_add_rows(
+            table_type, table.id, [], chunk_size=10, checkpoint_path=str(empty_path)
+        )
+        assert response.num_rows == response.num_skipped_chunks == 0
+        assert empty_path.read_text().startswith("{")
+        # DataFrame input
+        df = pd.DataFrame({"int": list(range(25, 30))})
+        response = client.table.bulk_add_rows(table_type, table.id, df, chunk_size=2)
+        assert response.num_rows == 5
+        assert response.num_chunks == 3
+        rows = list_table_rows(client, table_type, table.id, order_by="int")
+        assert [r["int"] for r in rows.values] == list(range(30))
+
+
 @pytest.mark.parametrize("table_type", TABLE_TYPES)
 def test_update_row(
     setup: ServingContext,
@@ -9,7 +9,9 @@ import pandas as pd
 import pytest
 
 from jamaibase.types import ProjectRead
+from owl.configs import CACHE
 from owl.db.gen_table import (
+    _TABLE_META_CACHE,
     GENTABLE_ENGINE,
     ColumnDtype,
     ColumnMetadata,
@@ -926,6 +928,108 @@ class TestTableOperations:
             )
             assert setup.table_id not in [r["table_name"] for r in ret]
 
+    async def test_open_table_with_cache(self, setup: Setup):
+        """Test opening a table without counting rows and reusing cached metadata"""
+        _TABLE_META_CACHE.clear()
+        await setup.table.add_rows([{"col (1)": "a", "col (2)": 1}])
+        kwargs = dict(
+            project_id=setup.projects[0].id,
+            table_type=setup.table_type,
+            table_id=setup.table_id,
+        )
+        table = await GenerativeTableCore.open_table(**kwargs)
+        assert table.num_rows == 1
+        table = await GenerativeTableCore.open_table(**kwargs, count_rows=False, use_cache=True)
+        assert table.num_rows == -1
+        # Cache hit reuses the row model and does not share mutable metadata
+        cached = await GenerativeTableCore.open_table(**kwargs, use_cache=True)
+        assert cached.data_table_model is table.data_table_model
+        assert cached.table_metadata is not table.table_metadata
+        assert [c.column_id for c in cached.column_metadata] == [
+            c.column_id for c in table.column_metadata
+        ]
+        with pytest.raises(ResourceNotFoundError):
+            await GenerativeTableCore.open_table(**kwargs, created_by="someone", use_cache=True)
+
+    async def test_open_table_cache_invalidated_by_other_process(self, setup: Setup):
+        """Test that cached metadata is dropped when another process changes the table"""
+        _TABLE_META_CACHE.clear()
+        kwargs = dict(
+            project_id=setup.projects[0].id,
+            table_type=setup.table_type,
+            table_id=setup.table_id,
+        )
+        table = await GenerativeTableCore.open_table(**kwargs, use_cache=True)
+        cached = await GenerativeTableCore.open_table(**kwargs, use_cache=True)
+        assert cached.data_table_model is table.data_table_model
+        # Another process only bumps the version in Redis, leaving this process' entry in place
+        await CACHE.bump_table_meta_version(setup.schema_id, setup.table_id)
+        assert _TABLE_META_CACHE.get(f"{setup.schema_id}:{setup.table_id}") is not None
+        reopened = await GenerativeTableCore.open_table(**kwargs, use_cache=True)
+        assert reopened.data_table_model is not table.data_table_model
+        # Same for schema-wide changes
+        await CACHE.bump_table_meta_version(setup.schema_id)
+        assert (
+            await GenerativeTableCore.open_table(**kwargs, use_cache=True)
+        ).data_table_model is not reopened.data_table_model
+
+    async def test_conversation_thread_max_turns(self, setup: Setup):
+        """Test loading only the last N turns of a conversation thread"""
+        table = await setup.table.add_column(
+            ColumnMetadata(
+                column_id="AI",
+                table_id=setup.table_id,
+                dtype=ColumnDtype.STR,
+                gen_config=LLMGenConfig(
+                    model=setup.chat_model_id,
+                    system_prompt="System",
+                    prompt="${col (1)}",
+                    multi_turn=True,
+                ),
+            )
+        )
+        await table.add_rows([{"col (1)": f"Q{i}", "AI": f"A{i}"} for i in range(5)])
+        thread = (await table.get_conversation_thread(column_id="AI")).thread
+        assert len(thread) == 11
+        thread = (await table.get_conversation_thread(column_id="AI", max_turns=2)).thread
+        assert [m.role for m in thread] == ["system", "user", "assistant", "user", "assistant"]
+        assert [m.content for m in thread[1:]] == ["Q3", "A3", "Q4", "A4"]
+
+    async def test_conversation_threads_multi_column(self, setup: Setup, monkeypatch):
+        """Test building multiple conversation threads from a single read"""
+        table = setup.table
+        for column_id, prompt in [("AI", "${col (1)}"), ("AI2", "Again: ${col (1)}")]:
+            table = await table.add_column(
+                ColumnMetadata(
+                    column_id=column_id,
+                    table_id=setup.table_id,
+                    dtype=ColumnDtype.STR,
+                    gen_config=LLMGenConfig(
+                        model=setup.chat_model_id,
+                        system_prompt=f"System {column_id}",
+                        prompt=prompt,
+                        multi_turn=True,
+                    ),
+                )
+            )
+        await table.add_rows(
+            [{"col (1)": f"Q{i}", "AI": f"A{i}", "AI2": f"B{i}"} for i in range(5)]
+        )
+        threads = await table.get_conversation_threads(["AI", "AI2"])
+        for column_id in ["AI", "AI2"]:
+            single = await table.get_conversation_thread(column_id=column_id)
+            assert threads[column_id].model_dump() == single.model_dump()
+        assert [m.content for m in threads["AI2"].thread[-2:]] == ["Again: Q4", "B4"]
+        # Paginate over turns, latest first
+        threads = await table.get_conversation_threads(["AI", "AI2"], max_turns=2, offset=1)
+        assert [m.content for m in threads["AI"].thread] == ["System AI", "Q2", "A2", "Q3", "A3"]
+        assert [m.content for m in threads["AI2"].thread[1::2]] == ["Again: Q2", "Again: Q3"]
+        with pytest.raises(ResourceNotFoundError):
+            await table.get_conversation_threads(["AI", "missing"])
+        # No chat columns, no rows are read
+        monkeypatch.setattr(table, "list_rows", None)
+        assert await table.get_conversation_threads([]) == {}
+
 
 class TestColumnOperations:
     async def test_add_column(self, setup: Setup):
@@ -6,9 +6,11 @@ import pytest
 
 from jamaibase import JamAI
 from jamaibase.types import (
+    AddChatColumnSchema,
     AgentMetaResponse,
     CellCompletionResponse,
     ChatTableSchemaCreate,
+    ColumnRenameRequest,
     ColumnSchemaCreate,
     ConversationCreateRequest,
     ConversationMetaResponse,
@@ -410,6 +412,48 @@ def test_send_message(setup: ConversationContext):
     assert "text with [8] tokens" in conv_details.items[1]["AI"]
 
 
+def test_send_message_after_column_change(setup: ConversationContext):
+    """
+    Tests that column changes are visible to the very next message.
+    - Sends a message so that the conversation's table metadata is cached.
+    - Adds a column, then immediately sends a message with a value for it.
+    - Renames the column, then immediately sends a message with a value for it.
+    """
+    client = JamAI(user_id=setup.user_id, project_id=setup.project_id)
+    conv_id = _create_conversation_and_get_id(client, setup)
+    responses = list(
+        client.conversations.send_message(
+            MessageAddRequest(conversation_id=conv_id, data={"User": "Hi"})
+        )
+    )
+    assert len(responses) > 0
+    # Add column
+    client.table.add_chat_columns(
+        AddChatColumnSchema(id=conv_id, cols=[ColumnSchemaCreate(id="Mood", dtype="str")])
+    )
+    responses = list(
+        client.conversations.send_message(
+            MessageAddRequest(conversation_id=conv_id, data={"User": "Hey", "Mood": "happy"})
+        )
+    )
+    assert len(responses) > 0
+    # Rename column
+    client.table.rename_columns(
+        TableType.CHAT, ColumnRenameRequest(table_id=conv_id, column_map={"Mood": "Feeling"})
+    )
+    responses = list(
+        client.conversations.send_message(
+            MessageAddRequest(conversation_id=conv_id, data={"User": "Yo", "Feeling": "sad"})
+        )
+    )
+    assert len(responses) > 0
+    messages = client.conversations.list_messages(conv_id)
+    assert messages.total == 4
+    assert [m["User"] for m in messages.items] == ["First message", "Hi", "Hey", "Yo"]
+    assert [m.get("Feeling", None) for m in messages.items] == [None, None, "happy", "sad"]
+    assert all("Mood" not in m for m in messages.items)
+
+
 def test_list_messages(setup: ConversationContext):
     """
     Tests fetching the full message history of a conversation.
@@ -1,6 +1,8 @@
+import asyncio
 from time import sleep
 
 import pytest
+from sqlmodel import delete
 
 from jamaibase import JamAI
 from jamaibase.types import (
@@ -14,7 +16,10 @@ from jamaibase.types import (
     ProjectCreate,
     Role,
 )
+from owl.db import sync_session
+from owl.db.models import Notification, NotificationGroup
 from owl.utils.exceptions import ResourceNotFoundError
+from owl.utils.notifications import resume_notification_fan_outs
 from owl.utils.test import (
     create_user,
     setup_organizations,
@@ -602,3 +607,54 @@ def test_user_deletion_preserves_notifications():
 
                     finally:
                         client.notification_groups.delete_notification_group(group.id)
+
+
+def test_notification_fan_out_resume():
+    """
+    - Completed fan-out reports its recipient count.
+    - Interrupted fan-out resumes from its checkpoint without duplicates.
+    """
+    with setup_organizations() as ctx:
+        client = _admin_client(ctx.superuser.id)
+        client.organizations.join_organization(
+            ctx.user.id, organization_id=ctx.superorg.id, role=Role.ADMIN
+        )
+        group = _create_notification_group(
+            client,
+            audience=NotificationAudience.ORGANIZATION,
+            organization_id=ctx.superorg.id,
+            message="Resume me.",
+        )
+        try:
+            group = client.notification_groups.get_notification_group(group.id)
+            assert group.fan_out_count == 2
+            assert group.fan_out_completed_at is not None
+
+            # Simulate a crash after the first recipient
+            first_id, second_id = sorted([ctx.superuser.id, ctx.user.id])
+            with sync_session() as session:
+                session.exec(
+                    delete(Notification).where(
+                        Notification.notification_group_id == group.id,
+                        Notification.user_id == second_id,
+                    )
+                )
+                db_group = session.get(NotificationGroup, group.id)
+                db_group.fan_out_cursor = first_id
+                db_group.fan_out_count = 1
+                db_group.fan_out_completed_at = None
+                session.add(db_group)
+                session.commit()
+            group = client.notification_groups.get_notification_group(group.id)
+            assert group.fan_out_count == 1
+            assert group.fan_out_completed_at is None
+
+            assert asyncio.run(resume_notification_fan_outs(stale_sec=0)) >= 1
+            group = client.notification_groups.get_notification_group(group.id)
+            assert group.fan_out_count == 2
+            assert group.fan_out_completed_at is not None
+            for user_id in [first_id, second_id]:
+                notif = JamAI(user_id=user_id).notifications.get_notification(group.id)
+                assert notif.message == "Resume me."
+        finally:
+            client.notification_groups.delete_notification_group(group.id)
@@ -844,6 +844,75 @@ def test_get_llm_billing_metrics(setup: ServingContext, stream: bool, data_sourc
     assert _metrics_match_llm_spent(response.model_dump(), serving_info)
 
 
+def test_get_combined_metrics(setup: ServingContext):
+    data_source = "clickhouse"
+    setup = deepcopy(setup)
+    start_dt = datetime.now(tz=timezone.utc)
+    client = JamAI(user_id=setup.user_id, project_id=setup.project_ids[0])
+    response = client.generate_chat_completions(setup.chat_request)
+    serving_info = {
+        "model": setup.chat_model_id,
+        "prompt_tokens": response.prompt_tokens,
+        "completion_tokens": response.completion_tokens,
+    }
+    response_match = False
+    for _ in range(METER_RETRY):
+        response = client.meters.get_combined_metrics(
+            from_=start_dt,
+            to=start_dt + timedelta(minutes=2),
+            window_size="10s",
+            categories=["llm", "billing", "bandwidth"],
+            proj_ids=[setup.project_ids[0]],
+            group_by=["type", "model"],
+            data_source=data_source,
+        )
+        assert response.windowSize == "10s"
+        assert response.errors == {}
+        assert set(response.data) == {"llm", "billing", "bandwidth"}
+        if _metrics_match_llm_token_counts(response.data["llm"].model_dump(), serving_info):
+            response_match = True
+            break
+        sleep(METER_RETRY_DELAY)
+    assert response_match
+    # Defaults to all categories
+    response = client.meters.get_combined_metrics(
+        from_=start_dt, window_size="10s", proj_ids=[setup.project_ids[0]]
+    )
+    assert len(response.data) + len(response.errors) == 7
+
+
+def test_get_combined_metrics_victoriametrics(setup: ServingContext):
+    setup = deepcopy(setup)
+    start_dt = datetime.now(tz=timezone.utc)
+    client = JamAI(user_id=setup.user_id, project_id=setup.project_ids[0])
+    response = client.generate_chat_completions(setup.chat_request)
+    serving_info = {
+        "model": setup.chat_model_id,
+        "prompt_tokens": response.prompt_tokens,
+        "completion_tokens": response.completion_tokens,
+    }
+    response_match = False
+    for _ in range(METER_RETRY):
+        response = client.meters.get_combined_metrics(
+            from_=start_dt,
+            to=start_dt + timedelta(minutes=2),
+            window_size="10s",
+            categories=["llm", "billing", "bandwidth", "storage"],
+            proj_ids=[setup.project_ids[0]],
+            group_by=["type", "model"],
+            data_source="victoriametrics",
+        )
+        # Unsupported categories are reported without failing the supported ones
+        assert set(response.data) == {"llm", "billing"}
+        assert set(response.errors) == {"bandwidth", "storage"}
+        assert "not supported" in response.errors["bandwidth"]
+        if _metrics_match_llm_token_counts(response.data["llm"].model_dump(), serving_info):
+            response_match = True
+            break
+        sleep(METER_RETRY_DELAY)
+    assert response_match
+
+
 def _test_chat_reasoning_cloud(
     setup: ServingContext,
     provider: CloudProvider,
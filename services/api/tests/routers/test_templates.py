@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from os.path import dirname, join, realpath
 
+import httpx
 import pytest
 
 from jamaibase import JamAI
@@ -9,6 +10,7 @@ from jamaibase.types import (
     Page,
     ProjectCreate,
     ProjectRead,
+    ProjectUpdate,
     TableImportRequest,
     TableMetaResponse,
 )
@@ -170,6 +172,48 @@ def test_get_list_templates(setup: ServingContext):
             super_client.projects.delete_project(template.id)
 
 
+def test_template_http_caching(setup: ServingContext):
+    super_client = JamAI(user_id=setup.superuser_id)
+    public_client = JamAI()
+    template = _create_template(super_client, "Cached Template")
+    try:
+        url = f"{public_client.templates.api_base}/v2/templates"
+        headers = public_client.templates.headers
+        params = dict(template_id=template.id)
+        response = httpx.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["name"] == "Cached Template"
+        etag = response.headers["ETag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        assert "max-age=" in response.headers["Cache-Control"]
+        # Served from cache with the same ETag
+        cached = httpx.get(url, params=params, headers=headers)
+        assert cached.status_code == 200
+        assert cached.headers["ETag"] == etag
+        assert cached.content == response.content
+        # Conditional request
+        response = httpx.get(url, params=params, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+        # Other query parameters have their own ETag
+        response = httpx.get(f"{url}/list", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        # Updating the template changes its ETag
+        super_client.projects.update_project(template.id, ProjectUpdate(name="Updated Template"))
+        response = httpx.get(url, params=params, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["name"] == "Updated Template"
+        # Missing templates are not cached
+        response = httpx.get(url, params=dict(template_id="missing"), headers=headers)
+        assert response.status_code == 404
+        assert "ETag" not in response.headers
+    finally:
+        super_client.projects.delete_project(template.id)
+
+
 def test_get_list_template_tables_rows(setup: ServingContext):
     # Create template
     template = _create_template(JamAI(user_id=setup.superuser_id))
@@ -1,8 +1,14 @@
-from sqlmodel import select
+from datetime import timedelta
 
+import pytest
+from sqlmodel import delete, select, text
+
+from owl.configs import ENV_CONFIG
 from owl.db import async_session, sync_session
-from owl.db.models import User
-from owl.types import UserAuth
+from owl.db.models import Organization, Project, User
+from owl.types import UserAuth, UserRead
+from owl.utils.dates import now
+from owl.utils.exceptions import BadInputError
 from owl.utils.test import create_user
 
 
@@ -22,3 +28,84 @@ async def test_sync_session():
             users = (session.exec(select(User))).all()
             users = [UserAuth.model_validate(user) for user in users]
             assert len(users) == 1
+
+
+async def test_search_uses_trigram_index():
+    with create_user():
+        async with async_session() as session:
+            # The planner always picks a sequential scan for tiny tables
+            await session.exec(text("SET LOCAL enable_seqscan = off"))
+            for model in (User, Organization, Project):
+                _, total = model._list(
+                    offset=0,
+                    limit=None,
+                    order_by="id",
+                    order_ascending=True,
+                    search_query="jamaibase",
+                    search_columns=list(model.search_index_cols),
+                )
+                plan = str(await model._explain(session, total))
+                for column in model.search_index_cols:
+                    assert f"ix_{model.__tablename__}_{column}_trgm" in plan, plan
+
+
+async def test_list_estimated_count(monkeypatch):
+    with create_user() as user:
+        async with async_session() as session:
+            page = await User.list_(session, UserRead, search_query=user.name)
+            assert len(page.items) == 1
+            assert page.total == 1
+            assert page.total_is_estimate is False
+            # Estimates below the threshold are replaced by an exact count
+            monkeypatch.setattr(ENV_CONFIG, "db_list_count_estimate_min_rows", 10**9)
+            page = await User.list_(session, UserRead, search_query=user.name)
+            assert page.total == 1
+            assert page.total_is_estimate is False
+            # Planner estimates are at least 1 row
+            monkeypatch.setattr(ENV_CONFIG, "db_list_count_estimate_min_rows", 1)
+            page = await User.list_(session, UserRead, search_query=user.name)
+            assert len(page.items) == 1
+            assert page.total >= 1
+            assert page.total_is_estimate is True
+
+
+@pytest.mark.parametrize("order_ascending", [True, False])
+@pytest.mark.parametrize("order_by", ["id", "name", "created_at", "updated_at"])
+async def test_list_keyset_pagination(order_by: str, order_ascending: bool):
+    t0 = now()
+    ids = [f"keyset-{i:02d}" for i in range(25)]
+    async with async_session() as session:
+        # Mixed case names and duplicated timestamps exercise the ordering tiebreakers
+        session.add_all(
+            User(
+                id=user_id,
+                name=["alice", "Bob", "carol", "Dave", "ALICE"][i % 5],
+                email=f"{user_id}@up.com",
+                created_at=t0 + timedelta(seconds=i // 3),
+                updated_at=t0,
+            )
+            for i, user_id in enumerate(ids)
+        )
+        await session.commit()
+        try:
+            kwargs = dict(order_by=order_by, order_ascending=order_ascending, filters=dict(id=ids))
+            expected = [u.id for u in (await User.list_(session, UserRead, **kwargs)).items]
+            assert len(expected) == len(ids)
+            listed, after = [], None
+            while True:
+                page = await User.list_(session, UserRead, limit=7, after=after, **kwargs)
+                assert page.total == len(ids)
+                listed += [u.id for u in page.items]
+                after = page.end_cursor
+                if after is None:
+                    break
+            assert listed == expected
+            # Offset pagination agrees
+            page = await User.list_(session, UserRead, offset=7, limit=7, **kwargs)
+            assert [u.id for u in page.items] == expected[7:14]
+            # Invalid cursor
+            with pytest.raises(BadInputError):
+                await User.list_(session, UserRead, limit=7, after="invalid", **kwargs)
+        finally:
+            await session.exec(delete(User).where(User.id.in_(ids)))
+            await session.commit()
@@ -0,0 +1,179 @@
+import asyncio
+import os
+from datetime import timedelta
+
+import pytest
+from cloudevents.http import CloudEvent
+from redis.exceptions import ConnectionError
+
+from owl.configs import CACHE, ENV_CONFIG
+from owl.types import LlmUsageData, ProductType, UsageData
+from owl.utils.billing import CLICKHOUSE_CLIENT
+from owl.utils.billing.oss import aggregate_otel_events
+
+BUFFER_KEY = "__pytest__:clickhouse_insert_buffer"
+
+
+async def _delete_buffer_keys():
+    redis = await CACHE._aredis()
+    for key in await redis.keys(f"{BUFFER_KEY}*"):
+        await redis.delete(key)
+
+
+@pytest.fixture
+async def usage_buffer(monkeypatch, tmp_path):
+    monkeypatch.setattr(CACHE, "clickhouse_buffer_key", BUFFER_KEY)
+    monkeypatch.setattr(CACHE, "usage_spill_path", str(tmp_path / "usage_spill.jsonl"))
+    monkeypatch.setattr(ENV_CONFIG, "clickhouse_buffer_key", BUFFER_KEY)
+    monkeypatch.setattr(ENV_CONFIG, "clickhouse_flush_chunk_size", 10)
+    await _delete_buffer_keys()
+    yield
+    await _delete_buffer_keys()
+
+
+def _usage(i: int) -> UsageData:
+    return UsageData(
+        llm_usage=[
+            LlmUsageData(
+                org_id="org",
+                proj_id="proj",
+                user_id="user",
+                cost=0.0,
+                model=f"model-{i}-{j}",
+                input_token=1,
+                output_token=1,
+                input_cost=0.0,
+                output_cost=0.0,
+            )
+            for j in range(2)
+        ]
+    )
+
+
+async def test_flush_buffer_should_retry_failed_chunk_with_same_token(usage_buffer, monkeypatch):
+    for i in range(25):
+        await CACHE.add_usage_to_buffer(_usage(i))
+    assert await CACHE.get_usage_buffer_count() == 50
+
+    calls: list[tuple[int, str]] = []
+
+    async def _insert_usage(usage: UsageData, dedup_token: str | None = None):
+        calls.append((usage.total_usage_events, dedup_token))
+        if len(calls) == 2:
+            raise RuntimeError("ClickHouse is down")
+
+    monkeypatch.setattr(CLICKHOUSE_CLIENT, "insert_usage", _insert_usage)
+    # Second chunk fails, it stays claimed and the rest of the buffer is untouched
+    assert await CLICKHOUSE_CLIENT.flush_buffer() == 20
+    assert await CACHE.get_usage_buffer_count() == 30
+    # Next flush retries the failed chunk first, with the same dedup token
+    assert await CLICKHOUSE_CLIENT.flush_buffer() == 30
+    assert [n for n, _ in calls] == [20, 20, 20, 10]
+    assert calls[1][1] == calls[2][1]
+    assert len({token for _, token in calls}) == 3
+    assert await CACHE.get_usage_buffer_count() == 0
+    assert await CACHE.exists(BUFFER_KEY + ":shards", BUFFER_KEY + "_temp") == 0
+
+
+async def test_add_usage_to_buffer_should_elect_one_flusher(usage_buffer):
+    elected = await asyncio.gather(
+        *[CACHE.add_usage_to_buffer(_usage(i), flush_threshold=10) for i in range(20)]
+    )
+    # Each usage has 2 events, the 5th append crosses the threshold
+    assert sum(elected) == 1
+    assert await CACHE.get_usage_buffer_count() == 40
+    await CACHE.release_usage_flush_election()
+    assert await CACHE.add_usage_to_buffer(_usage(20), flush_threshold=10) is True
+
+
+async def test_flush_buffer_should_release_election_when_locked(usage_buffer):
+    for i in range(5):
+        await CACHE.add_usage_to_buffer(_usage(i), flush_threshold=10)
+    assert await CACHE.exists(BUFFER_KEY + ":elected") == 1
+    # Another flusher holds the lock
+    async with CACHE.alock(BUFFER_KEY + ":lock", blocking=False, expire=60) as lock_acquired:
+        assert lock_acquired
+        assert await CLICKHOUSE_CLIENT.flush_buffer() == 0
+    assert await CACHE.exists(BUFFER_KEY + ":elected") == 0
+    assert await CACHE.add_usage_to_buffer(_usage(5), flush_threshold=10) is True
+
+
+async def test_add_usage_to_buffer_should_spill_when_redis_is_down(usage_buffer, monkeypatch):
+    async def _push_usage(*args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+    with monkeypatch.context() as m:
+        m.setattr(CACHE, "_push_usage", _push_usage)
+        for i in range(3):
+            assert await CACHE.add_usage_to_buffer(_usage(i), flush_threshold=10) is False
+    with open(CACHE.usage_spill_path) as f:
+        spilled = f.read().splitlines()
+    assert len(spilled) == 3
+    assert await CACHE.get_usage_buffer_count() == 0
+    # Next successful append replays the spill file
+    await CACHE.add_usage_to_buffer(_usage(3))
+    assert await CACHE.get_usage_buffer_count() == 8
+    assert not os.path.exists(CACHE.usage_spill_path)
+    # Replaying the same entries again (crash before truncation) does not double count
+    with open(CACHE.usage_spill_path, "a") as f:
+        f.write("\n".join(spilled) + "\n")
+    assert await CACHE.replay_usage_spill() == 3
+    assert await CACHE.get_usage_buffer_count() == 8
+
+
+async def test_flush_buffer_should_invalidate_meters_cache_on_late_usage(
+    usage_buffer, monkeypatch
+):
+    async def _insert_usage(usage: UsageData, dedup_token: str | None = None):
+        pass
+
+    monkeypatch.setattr(CLICKHOUSE_CLIENT, "insert_usage", _insert_usage)
+    version = await CACHE.get_meters_cache_version()
+    # Recent usage leaves closed buckets untouched
+    await CACHE.add_usage_to_buffer(_usage(0))
+    assert await CLICKHOUSE_CLIENT.flush_buffer() == 2
+    assert await CACHE.get_meters_cache_version() == version
+    # Usage older than the settle time may belong to a cached closed bucket
+    usage = _usage(1)
+    for u in usage.llm_usage:
+        u.timestamp -= timedelta(seconds=ENV_CONFIG.meters_cache_settle_sec + 60)
+    await CACHE.add_usage_to_buffer(usage)
+    assert await CLICKHOUSE_CLIENT.flush_buffer() == 2
+    assert await CACHE.get_meters_cache_version() == version + 1
+
+
+def _event(event_type: str, **data) -> CloudEvent:
+    return CloudEvent(
+        attributes={"type": event_type, "source": "owl", "subject": "org"},
+        data={**data, "org_id": "org", "user_id": "user"},
+    )
+
+
+def test_aggregate_otel_events_should_emit_one_point_per_series():
+    events = []
+    for _ in range(1000):
+        events += [
+            _event(ProductType.LLM_TOKENS, model="a", tokens=3, type="input", proj_id="p"),
+            _event(ProductType.LLM_TOKENS, proj_id="p", type="output", tokens=2, model="a"),
+            _event("llm_cache", model="a", outcome="hit", saved_tokens=5, proj_id="p"),
+        ]
+    events += [
+        _event(ProductType.LLM_TOKENS, model="b", tokens=7, type="input", proj_id="p"),
+        _event("storage", amount_gib=1.0, type="db"),
+        _event("storage", amount_gib=2.0, type="db"),
+        _event("unknown", value=1),
+    ]
+    points = aggregate_otel_events(events)
+
+    def _attrs(**data) -> tuple:
+        return tuple(sorted({**data, "org_id": "org", "user_id": "user"}.items()))
+
+    assert points == {
+        ("counter", "llm_token_usage", _attrs(model="a", type="input", proj_id="p")): 3000,
+        ("counter", "llm_token_usage", _attrs(model="a", type="output", proj_id="p")): 2000,
+        ("counter", "llm_token_usage", _attrs(model="b", type="input", proj_id="p")): 7,
+        ("counter", "llm_cache_requests", _attrs(model="a", outcome="hit", proj_id="p")): 1000,
+        ("counter", "llm_cache_saved_tokens", _attrs(model="a", outcome="hit", proj_id="p")): 5000,
+        # Gauges keep the last value
+        ("gauge", "storage_usage", _attrs(type="db")): 2.0,
+    }
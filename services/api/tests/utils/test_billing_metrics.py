@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from owl.configs import CACHE, ENV_CONFIG
+from owl.utils import billing_metrics
+from owl.utils.billing_metrics import (
+    BillingMetrics,
+    _bucket_start,
+    _closed_until,
+    _dumps_rows,
+    _loads_rows,
+)
+from owl.utils.crypt import generate_key
+
+
+class _FakeClickHouse:
+    """Returns one row per query and records the SQL."""
+
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    async def query(self, sql: str):
+        self.queries.append(sql)
+        await asyncio.sleep(0.05)
+        ts = datetime(2025, 1, 1, len(self.queries) % 24, tzinfo=timezone.utc)
+        return SimpleNamespace(
+            summary={"result_rows": "1"},
+            column_names=["timestamp_interval", "org_id", "num_token"],
+            result_columns=[[ts], ["org"], [len(self.queries)]],
+        )
+
+
+def test_closed_until_aligns_to_bucket():
+    now = datetime.now(timezone.utc)
+    split = _closed_until(now - timedelta(days=1), now, "1h")
+    assert split is not None
+    assert split.minute == split.second == split.microsecond == 0
+    assert split <= now - timedelta(seconds=ENV_CONFIG.meters_cache_settle_sec)
+    assert split > now - timedelta(seconds=ENV_CONFIG.meters_cache_settle_sec + 3600)
+    # Nothing is closed yet
+    assert _closed_until(now - timedelta(seconds=1), now, "1h") is None
+    # Calendar units are not split
+    assert _closed_until(now - timedelta(days=30), now, "1w") is None
+
+
+def test_rows_round_trip():
+    rows = [
+        {
+            "timestamp_interval": datetime(2025, 1, 1, 3),
+            "org_id": "org",
+            "num_token": 10,
+            "cost": Decimal("0.000000000123"),
+        }
+    ]
+    assert _loads_rows(_dumps_rows(rows)) == rows
+
+
+async def test_bucket_query_caches_closed_buckets(monkeypatch):
+    for cache in (billing_metrics.CLOSED_BUCKET_CACHE, billing_metrics.OPEN_BUCKET_CACHE):
+        cache.clear()
+    client = _FakeClickHouse()
+    metrics = BillingMetrics(clickhouse_client=client)
+    org_ids = [generate_key(16, "org_")]
+    # Bucket-aligned, so that there is no partial head bucket
+    from_ = _bucket_start(datetime.now(timezone.utc), timedelta(hours=1)) - timedelta(days=2)
+
+    # Concurrent identical requests are coalesced: one closed and one open query
+    responses = await asyncio.gather(
+        *[metrics.query_embedding_usage(org_ids, None, from_, None, [], "1h") for _ in range(5)]
+    )
+    assert len(client.queries) == 2
+    assert all(r.data == responses[0].data for r in responses)
+
+    # Only the open trailing range is queried again
+    monkeypatch.setattr(billing_metrics.OPEN_BUCKET_CACHE, "ttl_sec", 0)
+    await metrics.query_embedding_usage(org_ids, None, from_, None, [], "1h")
+    assert len(client.queries) == 3
+
+
+async def test_bucket_query_caches_closed_buckets_with_rolling_from(monkeypatch):
+    for cache in (billing_metrics.CLOSED_BUCKET_CACHE, billing_metrics.OPEN_BUCKET_CACHE):
+        cache.clear()
+    monkeypatch.setattr(billing_metrics.OPEN_BUCKET_CACHE, "ttl_sec", 0)
+    client = _FakeClickHouse()
+    metrics = BillingMetrics(clickhouse_client=client)
+    org_ids = [generate_key(16, "org_")]
+    head = _bucket_start(datetime.now(timezone.utc), timedelta(hours=1)) - timedelta(days=2)
+    closed_where = f">= '{head:%Y-%m-%d %H:%M:%S}'"
+
+    # Dashboards send a rolling `from_` that is a few seconds later on every poll
+    await metrics.query_embedding_usage(
+        org_ids, None, head - timedelta(seconds=50), None, [], "1h"
+    )
+    assert len(client.queries) == 3
+    await metrics.query_embedding_usage(
+        org_ids, None, head - timedelta(seconds=45), None, [], "1h"
+    )
+    # Only the partial head bucket and the open trailing range are queried again
+    assert len(client.queries) == 5
+    assert sum(closed_where in sql for sql in client.queries) == 1
+
+
+async def test_bucket_query_recomputes_closed_buckets_after_late_usage(monkeypatch):
+    for cache in (billing_metrics.CLOSED_BUCKET_CACHE, billing_metrics.OPEN_BUCKET_CACHE):
+        cache.clear()
+    monkeypatch.setattr(billing_metrics.OPEN_BUCKET_CACHE, "ttl_sec", 0)
+    client = _FakeClickHouse()
+    metrics = BillingMetrics(clickhouse_client=client)
+    org_ids = [generate_key(16, "org_")]
+    from_ = _bucket_start(datetime.now(timezone.utc), timedelta(hours=1)) - timedelta(days=2)
+
+    await metrics.query_embedding_usage(org_ids, None, from_, None, [], "1h")
+    assert len(client.queries) == 2
+    await metrics.query_embedding_usage(org_ids, None, from_, None, [], "1h")
+    assert len(client.queries) == 3
+    # Flushing late usage invalidates the closed buckets
+    await CACHE.bump_meters_cache_version()
+    await metrics.query_embedding_usage(org_ids, None, from_, None, [], "1h")
+    assert len(client.queries) == 5
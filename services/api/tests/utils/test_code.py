@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from owl.types import ColumnDtype
+from owl.utils.code import (
+    _BATCH_SOURCE_TEMPLATE,
+    CodeBatcher,
+    CodeExecutorPool,
+    referenced_columns,
+    select_row_columns,
+)
+
+
+@pytest.mark.parametrize(
+    "source_code, expected",
+    [
+        ("row['out'] = row['a'] + row[\"b\"]", {"out", "a", "b"}),
+        ("row['out'] = row.get('a', '').upper()", {"out", "a"}),
+        ("import json\nrow['out'] = json.loads(row['a'])['key']", {"out", "a"}),
+        ("row['out'] = 'Hello World!'", {"out"}),
+    ],
+)
+def test_referenced_columns_should_find_constant_keys(source_code: str, expected: set[str]):
+    assert referenced_columns(source_code) == frozenset(expected)
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        "col = 'a'\nrow['out'] = row[col]",
+        "row['out'] = ', '.join(f'{k}={v}' for k, v in row.items())",
+        "row['out'] = str(row)",
+        "def f(r):\n    return r['a']\nrow['out'] = f(row)",
+        "row['out'] = row.get(name)",
+        "row['out'] = (",
+    ],
+)
+def test_referenced_columns_should_fallback_to_full_row(source_code: str):
+    assert referenced_columns(source_code) is None
+
+
+def test_select_row_columns():
+    row_data = {"ID": "0", "a": "x", "b": b"\x00" * 1024, "out": None}
+    assert select_row_columns("row['out'] = row['a']", row_data, "out") == {
+        "a": "x",
+        "out": None,
+    }
+    # Output column is always kept
+    assert select_row_columns("row['a'] = 'y'", row_data, "out") == {"a": "x", "out": None}
+    assert select_row_columns("row['out'] = str(row)", row_data, "out") is row_data
+
+
+def test_batch_source_should_run_code_per_row():
+    source_code = "import json\nrow['out'] = json.loads(row['a'])['k']"
+    row = {
+        "rows": [{"a": '{"k": 1}'}, {"a": "not json"}, {"a": '{"k": 3}'}],
+        "out": None,
+    }
+    # Simulate the code executor
+    exec(_BATCH_SOURCE_TEMPLATE.format(source_code=source_code, output_column="out"), {"row": row})
+    results = row["out"]
+    assert results[0] == (True, 1)
+    assert results[1][0] is False
+    assert results[1][1].startswith("JSONDecodeError")
+    assert results[2] == (True, 3)
+
+
+@pytest.mark.asyncio
+async def test_code_batcher_should_group_rows_and_return_per_row_results(monkeypatch):
+    calls: list[int] = []
+
+    async def _code_executor_batch(*, source_code, output_column, rows, dtype, **kwargs):
+        calls.append(len(rows))
+        return [
+            ValueError(f"bad {row['i']}") if row["i"] % 3 == 0 else str(row["i"]) for row in rows
+        ]
+
+    monkeypatch.setattr("owl.utils.code.code_executor_batch", _code_executor_batch)
+    batcher = CodeBatcher(
+        request=SimpleNamespace(state=SimpleNamespace(id="req")),
+        organization_id="org",
+        project_id="proj",
+        max_batch_size=4,
+        max_wait_sec=0.01,
+    )
+    results = await asyncio.gather(
+        *[
+            batcher.submit(
+                source_code="row['out'] = str(row['i'])",
+                output_column="out",
+                row_data={"i": i},
+                dtype=ColumnDtype.STR,
+            )
+            for i in range(10)
+        ],
+        return_exceptions=True,
+    )
+    # Full batches are sent immediately, the remainder after the wait window
+    assert calls == [4, 4, 2]
+    for i, result in enumerate(results):
+        if i % 3 == 0:
+            assert isinstance(result, ValueError)
+        else:
+            assert result == str(i)
+
+
+def test_code_executor_pool_should_close_client_of_previous_loop():
+    pool = CodeExecutorPool(base_url="http://localhost", timeout=1.0, max_connections=1)
+    first = asyncio.run(pool.client())
+    second = asyncio.run(pool.client())
+    assert second is not first
+    assert first.is_closed
+    assert not second.is_closed
+    asyncio.run(pool.aclose())
+    assert second.is_closed
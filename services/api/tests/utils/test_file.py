@@ -219,6 +219,36 @@ def test_get_raw_urls(setup: FileContext):
             raise ValueError(f"Unsupported URI or file not found: {url}")
 
 
+def test_proxy_file_range_and_conditional_requests(setup: FileContext):
+    client = JamAI(user_id=setup.user_id, project_id=setup.project_id)
+    file_path = FILES["gutter.wav"]
+    original_content = _read_file_content(file_path)
+    uri = upload_file(client, file_path).uri
+    url = client.file.get_raw_urls([uri]).urls[0]
+
+    response = httpx.get(url)
+    assert response.status_code == 200
+    assert response.content == original_content
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"]
+    # Overridden headers are not duplicated
+    assert response.headers.get_list("content-disposition") == ["inline"]
+    assert len(response.headers.get_list("content-type")) == 1
+    # Single range
+    response = httpx.get(url, headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == original_content[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(original_content)}"
+    # Suffix range
+    response = httpx.get(url, headers={"Range": "bytes=-10"})
+    assert response.status_code == 206
+    assert response.content == original_content[-10:]
+    # Conditional request
+    response = httpx.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
 def test_get_thumbnail_urls(setup: FileContext):
     client = JamAI(user_id=setup.user_id, project_id=setup.project_id)
 
@@ -6,7 +6,11 @@ import numpy as np
 import pandas as pd
 from PIL import ExifTags, Image
 
+from owl.configs import CACHE
+from owl.utils import io
+from owl.utils.crypt import generate_key
 from owl.utils.io import (
+    GiB,
     csv_to_df,
     df_to_csv,
     dump_json,
@@ -136,5 +140,51 @@ class TestFileOperations(unittest.TestCase):
         self.assertFalse(is_rotated)
 
 
+async def test_file_storage_usage_counter(monkeypatch):
+    org_id = generate_key(16, "org_")
+    num_scans = 0
+
+    async def _scan(_org_id: str) -> int:
+        nonlocal num_scans
+        num_scans += 1
+        return 2 * GiB
+
+    monkeypatch.setattr(io, "scan_file_storage_usage", _scan)
+    try:
+        # Uploads are not counted until the first scan sets the counter
+        await io.adjust_file_storage_usage(org_id, GiB)
+        assert await CACHE.get_file_storage_bytes(org_id) is None
+        assert await io.get_file_storage_usage(org_id) == 2.0
+        assert num_scans == 1
+        # Uploads and deletions adjust the counter without scanning
+        await io.adjust_file_storage_usage(org_id, GiB)
+        await io.adjust_file_storage_usage(org_id, -GiB // 2)
+        assert await io.get_file_storage_usage(org_id) == 2.5
+        assert num_scans == 1
+        # Reconciliation resets the counter
+        assert await io.get_file_storage_usage(org_id, reconcile=True) == 2.0
+        assert await io.get_file_storage_usage(org_id) == 2.0
+        assert num_scans == 2
+    finally:
+        await CACHE.delete(f"file_storage_bytes:{org_id}")
+
+
+async def test_file_storage_usage_counter_concurrent_upload(monkeypatch):
+    org_id = generate_key(16, "org_")
+
+    async def _scan(_org_id: str) -> int:
+        # Upload that finishes after its project prefix has been listed
+        await io.adjust_file_storage_usage(org_id, GiB)
+        return 2 * GiB
+
+    monkeypatch.setattr(io, "scan_file_storage_usage", _scan)
+    try:
+        assert await io.get_file_storage_usage(org_id) == 3.0
+        assert await io.get_file_storage_usage(org_id, reconcile=True) == 3.0
+        assert await CACHE.get(f"file_storage_scan_delta:{org_id}") is None
+    finally:
+        await CACHE.delete(f"file_storage_bytes:{org_id}")
+
+
 if __name__ == "__main__":
     unittest.main()
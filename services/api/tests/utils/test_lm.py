@@ -1,13 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import timedelta
 from types import SimpleNamespace
 
 import pytest
 
 from owl.configs import CACHE
-from owl.types import CloudProvider, ModelCapability, ModelProvider, ModelType, OnPremProvider
+from owl.types import (
+    ChatCompletionResponse,
+    ChatCompletionUsage,
+    ChatEntry,
+    CloudProvider,
+    EmbeddingResponse,
+    EmbeddingResponseData,
+    EmbeddingUsage,
+    ModelCapability,
+    ModelProvider,
+    ModelType,
+    OnPremProvider,
+    RAGParams,
+)
+from owl.utils import uuid7_str
 from owl.utils.dates import now
 from owl.utils.exceptions import InsufficientCreditsError, ModelOverloadError, RateLimitExceedError
-from owl.utils.lm import DeploymentContext, DeploymentRouter
+from owl.utils.lm import DeploymentContext, DeploymentRouter, LMEngine, _replay_chat_chunks
+from owl.utils.lm_cache import QUERY_EMBEDDING_CACHE, SEARCH_QUERY_CACHE
 
 
 class _BillingSpy:
@@ -563,3 +580,226 @@ def test_vllm_explicitly_disable_thinking() -> None:
     router._prepare_hyperparams(ctx, hyperparams)
 
     assert hyperparams["extra_body"] == {"chat_template_kwargs": {"enable_thinking": False}}
+
+
+def _make_engine() -> LMEngine:
+    engine = LMEngine.__new__(LMEngine)
+    # Unique org ID so that entries cached in Redis by earlier runs are never hit
+    engine.organization = SimpleNamespace(id=f"org_{uuid7_str()}")
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_search_query_cache_should_dedupe_rewrites_across_rows(monkeypatch) -> None:
+    await _require_cache()
+    engine = _make_engine()
+    calls: list[str] = []
+
+    async def _rewrite_search_query(*, model, messages, type, **hyperparams) -> str:
+        calls.append(type)
+        await asyncio.sleep(0.01)
+        return f"{type} query"
+
+    async def _get_default_model(model, capabilities):
+        return SimpleNamespace(id=model)
+
+    monkeypatch.setattr(engine, "_rewrite_search_query", _rewrite_search_query)
+    monkeypatch.setattr(engine, "_get_default_model", _get_default_model)
+    messages = [ChatEntry.system("You are a helpful assistant."), ChatEntry.user("What is RAG?")]
+    rag_params = RAGParams(table_id="kt", search_query="")
+    stats_before = SEARCH_QUERY_CACHE.stats
+
+    # Simulate a regen of 1,000 rows sharing the same context
+    results = await asyncio.gather(
+        *[
+            engine.generate_search_query(
+                model="openai/gpt-4.1-nano", messages=messages, rag_params=rag_params
+            )
+            for _ in range(1000)
+        ]
+    )
+
+    assert all(r == ("fts query", "vs query") for r in results)
+    assert sorted(calls) == ["fts", "vs"]
+    stats = SEARCH_QUERY_CACHE.stats
+    assert stats["miss"] - stats_before["miss"] == 2
+    hits = sum(stats[k] - stats_before[k] for k in ("memory", "inflight", "redis"))
+    assert hits == 1998
+
+    # A different prompt is a different content address
+    await engine.generate_search_query(
+        model="openai/gpt-4.1-nano",
+        messages=[ChatEntry.user("What is an LLM?")],
+        rag_params=rag_params,
+    )
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_search_query_cache_should_ignore_request_ids(monkeypatch) -> None:
+    await _require_cache()
+    engine = _make_engine()
+    calls: list[tuple[str, dict]] = []
+
+    async def _rewrite_search_query(*, model, messages, type, **hyperparams) -> str:
+        calls.append((model, hyperparams))
+        return f"{type} query"
+
+    async def _get_default_model(model, capabilities):
+        return SimpleNamespace(id="openai/gpt-4.1-nano")
+
+    monkeypatch.setattr(engine, "_rewrite_search_query", _rewrite_search_query)
+    monkeypatch.setattr(engine, "_get_default_model", _get_default_model)
+    messages = [ChatEntry.user("What is RAG?")]
+
+    # Per-request params and the default model alias do not change the rewrite
+    for request_id, model in [("req-1", ""), ("req-2", "openai/gpt-4.1-nano")]:
+        query = await engine._generate_search_query(
+            model=model,
+            messages=messages,
+            type="fts",
+            id=request_id,
+            user=request_id,
+            stream=True,
+            temperature=0.5,
+        )
+        assert query == "fts query"
+    assert len(calls) == 1
+    assert calls[0][0] == "openai/gpt-4.1-nano"
+
+    # Other hyperparams still do
+    await engine._generate_search_query(
+        model="", messages=messages, type="fts", id="req-3", temperature=0.7
+    )
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_embedding_cache_should_normalise_text(monkeypatch) -> None:
+    await _require_cache()
+    engine = _make_engine()
+    calls: list[list[str]] = []
+
+    async def _get_default_model(model, capabilities):
+        return SimpleNamespace(id="openai/text-embedding-3-small")
+
+    async def _embed_queries(*, model, texts, encoding_format=None, **hyperparams):
+        calls.append(texts)
+        return EmbeddingResponse(
+            data=[EmbeddingResponseData(embedding=[0.1, 0.2, 0.3], index=0)],
+            model=model,
+            usage=EmbeddingUsage(prompt_tokens=3, total_tokens=3),
+        )
+
+    monkeypatch.setattr(engine, "_get_default_model", _get_default_model)
+    monkeypatch.setattr(engine, "embed_queries", _embed_queries)
+
+    vectors = [
+        await engine.embed_query_as_vector("", text)
+        for text in ["What is RAG?", "  What  is\nRAG? ", "What is RAG?"]
+    ]
+    assert vectors == [[0.1, 0.2, 0.3]] * 3
+    assert len(calls) == 1
+
+    # Evict the in-process entry, the next lookup should be served by Redis
+    QUERY_EMBEDDING_CACHE._local.clear()
+    stats_before = QUERY_EMBEDDING_CACHE.stats
+    assert await engine.embed_query_as_vector("", "What is RAG?") == [0.1, 0.2, 0.3]
+    assert len(calls) == 1
+    assert QUERY_EMBEDDING_CACHE.stats["redis"] - stats_before["redis"] == 1
+
+
+class _FakeModelResponse(SimpleNamespace):
+    def model_dump(self, **kwargs) -> dict:
+        return dict(self.__dict__)
+
+
+def _make_chat_engine(monkeypatch, *, llm_response_cache: bool = True):
+    engine = _make_engine()
+    engine.project = SimpleNamespace(id="proj", llm_response_cache=llm_response_cache)
+    engine.billing = SimpleNamespace(cache_events=[])
+    engine.billing.create_llm_cache_events = lambda **kwargs: engine.billing.cache_events.append(
+        kwargs
+    )
+    engine._chat_usage = ChatCompletionUsage()
+    calls: list[bool] = []
+    response = dict(
+        id="chatcmpl-1",
+        model="gpt-4.1-nano",
+        choices=[dict(index=0, message=dict(content="Paris"), finish_reason="stop")],
+        usage=dict(prompt_tokens=10, completion_tokens=1, total_tokens=11),
+    )
+
+    async def _chat_completion(*, messages, stream, **hyperparams):
+        calls.append(stream)
+        return _FakeModelResponse(**response)
+
+    @asynccontextmanager
+    async def _setup_chat(model, messages):
+        yield SimpleNamespace(
+            config=SimpleNamespace(id="openai/gpt-4.1-nano"), chat_completion=_chat_completion
+        )
+
+    monkeypatch.setattr(engine, "_setup_chat", _setup_chat)
+    return engine, calls
+
+
+def test_chat_cache_key_should_only_cover_deterministic_requests(monkeypatch) -> None:
+    engine, _ = _make_chat_engine(monkeypatch)
+    messages = [ChatEntry.user("What is the capital of France?")]
+    key = engine._chat_cache_key("m", messages, {"temperature": 0, "top_p": 1, "id": "a"})
+    # Request ID and hyperparameter order do not matter
+    assert key == engine._chat_cache_key("m", messages, {"id": "b", "top_p": 1, "temperature": 0})
+    assert key != engine._chat_cache_key("m", messages, {"temperature": 0, "top_p": 0.5})
+    assert key != engine._chat_cache_key("m", messages, {"temperature": 0, "tools": [{"a": 1}]})
+    assert engine._chat_cache_key("m", messages, {"temperature": 0.2}) is None
+    assert engine._chat_cache_key("m", messages, {"temperature": 0, "n": 2}) is None
+    engine.project.llm_response_cache = False
+    assert engine._chat_cache_key("m", messages, {"temperature": 0}) is None
+
+
+@pytest.mark.asyncio
+async def test_chat_response_cache_should_replay_hits_as_stream(monkeypatch) -> None:
+    await _require_cache()
+    engine, calls = _make_chat_engine(monkeypatch)
+    messages = [ChatEntry.user("What is the capital of France?")]
+
+    first = await engine.chat_completion(model="", messages=messages, temperature=0)
+    second = await engine.chat_completion(model="", messages=messages, temperature=0)
+    assert calls == [False]
+    assert second.content == first.content == "Paris"
+    assert second.usage.total_tokens == 11
+    # Hits are replayed as a synthetic stream
+    chunks = [
+        c async for c in engine.chat_completion_stream(model="", messages=messages, temperature=0)
+    ]
+    assert calls == [False]
+    assert "".join(c.content for c in chunks) == "Paris"
+    assert chunks[-1].finish_reason == "stop"
+    assert chunks[-1].usage.total_tokens == 11
+    # Hits are metered as saved tokens instead of token usage
+    assert [e["hit"] for e in engine.billing.cache_events] == [False, True, True]
+    assert engine.billing.cache_events[-1]["input_tokens"] == 10
+    assert engine._chat_usage.total_tokens == 11  # From the miss only
+    # Non-deterministic requests always go to the model
+    await engine.chat_completion(model="", messages=messages, temperature=0.5)
+    assert calls == [False, False]
+
+
+def test_replay_chat_chunks_should_split_reasoning() -> None:
+    response = ChatCompletionResponse(
+        id="chatcmpl-1",
+        model="m",
+        choices=[
+            dict(
+                index=0,
+                message=dict(content="42", reasoning_content="Thinking"),
+                finish_reason="stop",
+            )
+        ],
+        usage=ChatCompletionUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3),
+    )
+    chunks = _replay_chat_chunks(response)
+    assert [(c.reasoning_content, c.content) for c in chunks] == [("Thinking", ""), ("", "42")]
+    assert chunks[0].usage is None
+    assert chunks[1].usage.total_tokens == 3
@@ -1,7 +1,11 @@
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from os.path import isfile
+from types import SimpleNamespace
+from typing import Annotated
 
 import pytest
+from fastapi import BackgroundTasks, FastAPI, Header, Query, Request
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 from mcp.types import (
@@ -11,6 +15,7 @@ from mcp.types import (
     InitializedNotification,
     ListToolsResult,
 )
+from pydantic import BaseModel
 
 from jamaibase import JamAIAsync
 from jamaibase.types import (
@@ -18,8 +23,14 @@ from jamaibase.types import (
     Page,
     ProjectRead,
     Role,
+    UserAuth,
 )
+from jamaibase.types.mcp import CallToolRequest
 from owl.configs import ENV_CONFIG
+from owl.utils.exceptions import BadInputError, JamaiException, ResourceNotFoundError
+from owl.utils.handlers import exception_handler
+from owl.utils.io import json_loads
+from owl.utils.mcp.server import MCP_TOOL_TAG, MCPServer
 from owl.utils.test import (
     create_organization,
     create_project,
@@ -225,3 +236,150 @@ async def test_call_tool(setup: SetupContext):
     p = await client.projects.get_project(proj.id)
     assert isinstance(p, ProjectRead)
     assert p.name == new_proj_name
+
+
+def _tool_app(version: str = "0.0.1", max_limit: int = 100) -> FastAPI:
+    app = FastAPI(title="MCP Test", version=version)
+
+    @app.get("/v1/models", tags=[MCP_TOOL_TAG, "project.MEMBER"], operation_id="list_models")
+    async def list_models(limit: Annotated[int, Query(le=max_limit)] = 10) -> dict:
+        return {"limit": limit}
+
+    @app.post(
+        "/v2/projects", tags=[MCP_TOOL_TAG, "organization.ADMIN"], operation_id="create_project"
+    )
+    async def create_project(name: str) -> dict:
+        return {"name": name}
+
+    return app
+
+
+def _user(org_roles: list[Role], proj_roles: list[Role]) -> UserAuth:
+    return UserAuth.model_construct(
+        org_memberships=[SimpleNamespace(organization_id="org", role=r) for r in org_roles],
+        proj_memberships=[SimpleNamespace(project_id="proj", role=r) for r in proj_roles],
+    )
+
+
+def test_list_tools_memoised():
+    server = MCPServer(_tool_app())
+    admin = server.list_tools(user=_user([Role.ADMIN], []))
+    assert {"create_project"} <= {t.name for t in admin.tools}
+    assert "list_models" not in {t.name for t in admin.tools}
+    # Same roles, same result object
+    assert server.list_tools(user=_user([Role.ADMIN], [])) is admin
+    member = server.list_tools(user=_user([Role.ADMIN], [Role.MEMBER]))
+    assert member is not admin
+    assert {"create_project", "list_models"} <= {t.name for t in member.tools}
+    guest = server.list_tools(user=_user([Role.GUEST], []))
+    assert {"create_project", "list_models"}.isdisjoint(t.name for t in guest.tools)
+
+
+def test_tool_snapshot(tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / "mcp_tools.json")
+    monkeypatch.setattr(ENV_CONFIG, "mcp_tool_snapshot_path", snapshot_path)
+    server = MCPServer(_tool_app())
+    assert "openapi_schema" in server.__dict__
+    assert isfile(snapshot_path)
+    # Loaded from the snapshot without building the OpenAPI schema
+    server_snap = MCPServer(_tool_app())
+    assert "openapi_schema" not in server_snap.__dict__
+    assert [t.model_dump() for t in server_snap.tools] == [t.model_dump() for t in server.tools]
+    # Stale snapshot is rebuilt
+    server_new = MCPServer(_tool_app(version="0.0.2"))
+    assert "openapi_schema" in server_new.__dict__
+    # Including when only a parameter schema changes
+    server_new = MCPServer(_tool_app(version="0.0.2", max_limit=50))
+    assert "openapi_schema" in server_new.__dict__
+    tool = next(t for t in server_new.tools if t.name == "list_models")
+    assert tool.inputSchema.properties["limit"]["maximum"] == 50
+
+
+class _Item(BaseModel):
+    name: str
+    tags: list[str] = []
+
+
+def _dispatch_app(background_calls: list[str]) -> FastAPI:
+    app = FastAPI(title="MCP Dispatch Test", version="0.0.1")
+    app.add_exception_handler(JamaiException, exception_handler)
+    app.add_exception_handler(Exception, exception_handler)
+
+    @app.middleware("http")
+    async def set_request_id(request: Request, call_next):
+        request.state.id = "test"
+        return await call_next(request)
+
+    @app.get("/v1/items/{item_id}", tags=[MCP_TOOL_TAG], operation_id="get_item")
+    async def get_item(
+        bg_tasks: BackgroundTasks,
+        item_id: str,
+        user_id: Annotated[str, Header(alias="X-USER-ID")] = "",
+        limit: int = 10,
+        tags: Annotated[list[str] | None, Query()] = None,
+    ) -> dict:
+        bg_tasks.add_task(background_calls.append, item_id)
+        return {"id": item_id, "user_id": user_id, "limit": limit, "tags": tags or []}
+
+    @app.post("/v1/items", tags=[MCP_TOOL_TAG], operation_id="create_item")
+    async def create_item(body: _Item) -> _Item:
+        return body
+
+    @app.get("/v1/missing/{item_id}", tags=[MCP_TOOL_TAG], operation_id="get_missing")
+    async def get_missing(item_id: str) -> dict:
+        raise ResourceNotFoundError(f'Item "{item_id}" is not found.')
+
+    return app
+
+
+def _call(name: str, arguments: dict) -> CallToolRequest:
+    return CallToolRequest.model_validate(
+        dict(jsonrpc="2.0", id=1, params=dict(name=name, arguments=arguments))
+    )
+
+
+async def test_call_tool_dispatch_equivalence():
+    background_calls = []
+    app = _dispatch_app(background_calls)
+    servers = [MCPServer(app, dispatch="asgi"), MCPServer(app, dispatch="direct")]
+    headers = {"X-USER-ID": "user"}
+    calls = [
+        ("get_item", dict(item_id="a b", limit=3, tags=["x", "y"])),
+        ("create_item", dict(name="item", tags=["t"])),
+    ]
+    for name, arguments in calls:
+        results = [await s.call_tool(_call(name, arguments), headers=headers) for s in servers]
+        texts = [json_loads(r.content[0].text) for r in results]
+        assert texts[0] == texts[1]
+    assert texts[0] == dict(name="item", tags=["t"])
+    assert background_calls == ["a b", "a b"]
+    # Errors are raised as the same exception types
+    for name, arguments, exc_cls in [
+        ("get_missing", dict(item_id="x"), ResourceNotFoundError),
+        ("create_item", dict(tags="t"), BadInputError),
+    ]:
+        for s in servers:
+            with pytest.raises(exc_cls):
+                await s.call_tool(_call(name, arguments), headers=headers)
+
+
+async def test_call_tool_dispatch_equivalence_api(setup: SetupContext):
+    from owl.entrypoints.api import app
+
+    servers = [MCPServer(app, dispatch="asgi"), MCPServer(app, dispatch="direct")]
+    headers = {"X-USER-ID": setup.superuser_id}
+    arguments = dict(
+        organization_id=setup.superorg_id,
+        limit=2,
+        order_by="created_at",
+        order_ascending=False,
+    )
+    results = [
+        await s.call_tool(
+            _call("list_projects_api_v2_projects_list_get", arguments), headers=headers
+        )
+        for s in servers
+    ]
+    pages = [Page[ProjectRead].model_validate_json(r.content[0].text) for r in results]
+    assert pages[0] == pages[1]
+    assert pages[0].items[0].id == setup.superproject_id
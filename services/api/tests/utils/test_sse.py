@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from owl.types import ChatCompletionChunkResponse
+from owl.utils.sse import SSE_DONE, SSEBuffer, sse_frame, sse_stream
+
+
+def _chunk(i: int) -> ChatCompletionChunkResponse:
+    return ChatCompletionChunkResponse(
+        id="chatcmpl-1",
+        model="ellm/describe",
+        choices=[dict(index=0, delta=dict(content=f"token{i} "))],
+    )
+
+
+async def _chunks(n: int, delay: float = 0.0):
+    for i in range(n):
+        if delay:
+            await asyncio.sleep(delay)
+        yield _chunk(i)
+
+
+@pytest.mark.parametrize("exclude_unset", [True, False])
+def test_sse_frame_should_match_model_dump_json(exclude_unset: bool):
+    chunk = _chunk(0)
+    expected = f"data: {chunk.model_dump_json(exclude_unset=exclude_unset)}\n\n"
+    assert sse_frame(chunk, exclude_unset=exclude_unset) == expected.encode("utf-8")
+    assert sse_frame("[DONE]") == SSE_DONE
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_without_coalescing():
+    buffer = SSEBuffer(max_bytes=0, max_delay_ms=0)
+    writes = [data async for data in sse_stream(_chunks(5), buffer=buffer)]
+    assert writes == [sse_frame(_chunk(i)) for i in range(5)] + [SSE_DONE]
+    assert buffer.num_bytes == sum(len(w) for w in writes)
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_should_coalesce_by_bytes():
+    frame_size = len(sse_frame(_chunk(0)))
+    buffer = SSEBuffer(max_bytes=frame_size * 4, max_delay_ms=0)
+    writes = [data async for data in sse_stream(_chunks(10), buffer=buffer)]
+    # 4 + 4 + 2 frames, then [DONE] on its own
+    assert len(writes) == 4
+    assert writes[-1] == SSE_DONE
+    assert b"".join(writes[:-1]) == b"".join(sse_frame(_chunk(i)) for i in range(10))
+    assert buffer.num_bytes == sum(len(w) for w in writes)
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_should_coalesce_by_delay():
+    buffer = SSEBuffer(max_bytes=0, max_delay_ms=30)
+    writes = [data async for data in sse_stream(_chunks(10, delay=0.01), buffer=buffer)]
+    assert 2 < len(writes) < 11
+    assert b"".join(writes[:-1]) == b"".join(sse_frame(_chunk(i)) for i in range(10))
+
+
+def test_sse_buffer_timeout():
+    buffer = SSEBuffer(max_bytes=0, max_delay_ms=50)
+    assert buffer.timeout is None
+    assert buffer.add(b"data: a\n\n") is None
+    assert 0 < buffer.timeout <= 0.05
+    assert buffer.flush() == b"data: a\n\n"
+    assert buffer.timeout is None
+    assert buffer.flush() is None
@@ -234,6 +234,7 @@ export interface CodeGenConfig {
 export interface PythonGenConfig {
 	object: 'gen_config.python';
 	python_code: string;
+	batch?: boolean;
 }
 
 export interface WebSearchTool {
@@ -540,6 +541,7 @@ export type Project = {
 	tags: string[];
 	profile_picture_url: string | null;
 	cover_picture_url: string | null;
+	llm_response_cache?: boolean;
 	created_by: string;
 	owner: string;
 	organization_id: string;